@@ -0,0 +1,79 @@
+"""Throughput of concurrent coroutine clients on AsyncTaskManager.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_async [--operations 2000] [--clients 1 10 100]
+
+Each client adds its share of tasks one at a time. The sync column adds the
+same number of tasks through TaskManager, one save per task.
+"""
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+
+from tuido.async_task_manager import AsyncTaskManager
+from tuido.async_task_repository import AsyncTaskRepository
+from tuido.bench import timings
+from tuido.repository_factory import create_repository
+from tuido.task_manager import TaskManager
+
+DEFAULT_CLIENTS = [1, 10, 100]
+
+
+def time_sync(file_path: Path, operations: int) -> float:
+    """Return adds per second through the synchronous TaskManager."""
+    manager = TaskManager(create_repository(file_path))
+
+    def add() -> None:
+        for index in range(operations):
+            manager.add_task(f"Task {index}")
+
+    (elapsed,) = timings(add)
+    return operations / (elapsed / 1000)
+
+
+def time_async(file_path: Path, operations: int, clients: int) -> float:
+    """Return adds per second from ``clients`` concurrent coroutines."""
+
+    async def client(manager: AsyncTaskManager, count: int) -> None:
+        for index in range(count):
+            await manager.add_task(f"Task {index}")
+
+    async def run(manager: AsyncTaskManager) -> None:
+        await asyncio.gather(
+            *(client(manager, operations // clients) for _ in range(clients))
+        )
+
+    manager = AsyncTaskManager(AsyncTaskRepository(create_repository(file_path)))
+    with asyncio.Runner() as runner:
+        (elapsed,) = timings(lambda: runner.run(run(manager)))
+        runner.run(manager.close())
+    return operations // clients * clients / (elapsed / 1000)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print adds per second for each client count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=2_000)
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS)
+    parser.add_argument("--extension", default=".json")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sync_rate = time_sync(
+            Path(directory) / f"tasks{args.extension}", args.operations
+        )
+
+    print(f"{'clients':>8}  {'sync (ops/s)':>13}  {'async (ops/s)':>14}")
+    for clients in args.clients:
+        with tempfile.TemporaryDirectory() as directory:
+            rate = time_async(
+                Path(directory) / f"tasks{args.extension}", args.operations, clients
+            )
+        print(f"{clients:>8}  {sync_rate:>13.0f}  {rate:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput of task writes through the ``tuido serve`` daemon.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_daemon [--operations 1000] [--clients 4]
+
+Compares adding tasks one load/save cycle at a time (what separate CLI
+invocations do, minus interpreter startup) with round trips to a daemon,
+both one request at a time and pipelined from several clients.
+"""
+
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+from tuido.bench import timings
+from tuido.daemon_client import DaemonClient
+from tuido.repository_factory import create_repository
+from tuido.task_manager import TaskManager
+from tuido.task_server import TaskServer
+
+
+def time_direct(file_path: Path, operations: int) -> float:
+    """Return operations per second adding tasks without a daemon."""
+
+    def add() -> None:
+        for index in range(operations):
+            TaskManager(create_repository(file_path)).add_task(f"Task {index}")
+
+    (elapsed,) = timings(add)
+    return operations / (elapsed / 1000)
+
+
+def time_daemon(file_path: Path, operations: int, clients: int, pipeline: int) -> float:
+    """Return operations per second adding tasks through a daemon."""
+    server = TaskServer(create_repository(file_path), file_path.with_suffix(".sock"))
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    def work(count: int) -> None:
+        with DaemonClient(server.path) as client:
+            for sent in range(0, count, pipeline):
+                client.call_many(
+                    ("add", {"description": f"Task {index}"})
+                    for index in range(sent, min(sent + pipeline, count))
+                )
+
+    workers = [
+        threading.Thread(target=work, args=(operations // clients,))
+        for _ in range(clients)
+    ]
+
+    def run() -> None:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    (elapsed,) = timings(run)
+
+    with DaemonClient(server.path) as client:
+        client.call("shutdown")
+    thread.join()
+    return (operations // clients * clients) / (elapsed / 1000)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print operations per second for each mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=1_000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--extension", default=".json")
+    args = parser.parse_args(argv)
+
+    modes = [
+        ("direct", lambda path: time_direct(path, args.operations)),
+        ("daemon", lambda path: time_daemon(path, args.operations, 1, 1)),
+        (
+            f"daemon x{args.clients}",
+            lambda path: time_daemon(path, args.operations, args.clients, 1),
+        ),
+        (
+            "daemon pipelined",
+            lambda path: time_daemon(path, args.operations, args.clients, 100),
+        ),
+    ]
+    print(f"{'mode':>18}  {'ops/s':>10}")
+    for name, run in modes:
+        with tempfile.TemporaryDirectory() as directory:
+            rate = run(Path(directory) / f"tasks{args.extension}")
+        print(f"{name:>18}  {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
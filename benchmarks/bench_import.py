@@ -0,0 +1,94 @@
+"""Benchmark for bulk import and export throughput per file format.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import [--tasks 100000] [--min-rate 100000]
+
+A year of tasks is exported from a JSON task file to each format, then
+imported into an empty JSON task file, and imported again with --dedupe so
+that every task is skipped. Import times include reading and checking the
+file, assigning ids and the single save.
+
+The run fails (exit status 1) if any import or export moves fewer than
+``--min-rate`` tasks per second, so it can be enforced in CI.
+"""
+
+import argparse
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_query import build_data
+from tuido.bench import timings
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.task_formats import FORMATS, read_tasks, write_tasks
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+
+DEFAULT_MIN_RATE = 100_000
+EXTENSIONS = {"jsonl": ".jsonl", "csv": ".csv", "tsv": ".tsv", "todotxt": ".txt"}
+
+
+def export_tasks(source: Path, path: Path, file_format: str) -> int:
+    """Export every task in ``source`` to ``path``, as ``tuido export`` does."""
+    manager = TaskManager(JsonTaskRepository(source))
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        return write_tasks(
+            manager.query_tasks(TaskQuery(), stream=True), file_format, file
+        )
+
+
+def import_tasks(path: Path, target: Path, file_format: str, dedupe=False) -> int:
+    """Import ``path`` into ``target``, as ``tuido import`` does.
+
+    Returns the number of tasks added.
+    """
+    manager = TaskManager(JsonTaskRepository(target))
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        return len(manager.import_tasks(read_tasks(file, file_format), dedupe))
+
+
+def rate(count: int, milliseconds: float) -> float:
+    """Return tasks per second."""
+    return count * 1000 / milliseconds if milliseconds else float("inf")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark, print one line per format and enforce the rate."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--min-rate", type=float, default=DEFAULT_MIN_RATE)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'format':>8}  {'export (tasks/s)':>16}  {'import (tasks/s)':>16}  "
+        f"{'dedupe (tasks/s)':>16}"
+    )
+    slowest = float("inf")
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "tasks.json"
+        JsonTaskRepository(source).save_data(build_data(args.tasks, datetime.now()))
+        for file_format in args.formats:
+            path = Path(directory) / f"export{EXTENSIONS[file_format]}"
+            target = Path(directory) / f"import-{file_format}.json"
+            rates = []
+            for run in (
+                lambda: export_tasks(source, path, file_format),
+                lambda: import_tasks(path, target, file_format),
+                lambda: import_tasks(path, target, file_format, dedupe=True),
+            ):
+                (elapsed,) = timings(run)
+                rates.append(rate(args.tasks, elapsed))
+            slowest = min(slowest, *rates)
+            print(f"{file_format:>8}  " + "  ".join(f"{r:>16,.0f}" for r in rates))
+
+    if slowest < args.min_rate:
+        print(f"FAIL: slowest run moves fewer than {args.min_rate:,.0f} tasks/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
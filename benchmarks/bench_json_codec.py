@@ -0,0 +1,67 @@
+"""Benchmark for loading and saving JSON task files per layout and codec.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json_codec [--sizes 1000 100000 1000000]
+
+Indented files are always encoded by the standard library, so the orjson
+rows differ from the stdlib ones only in how fast they load. orjson rows
+are skipped when it is not installed.
+"""
+
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_query import build_data
+from tuido.bench import timings
+from tuido.json_codec import get_codec
+from tuido.json_task_repository import JsonTaskRepository
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print one line per size, layout and codec."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    codecs = []
+    for name in ("json", "orjson"):
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"{name} is not installed; skipping it")
+
+    print(
+        f"{'tasks':>9}  {'layout':>8}  {'codec':>6}  {'size (MB)':>9}  "
+        f"{'load (ms)':>9}  {'save (ms)':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            data = build_data(size, datetime.now())
+            for compact in (False, True):
+                for codec in codecs:
+                    path = Path(directory) / f"tasks-{size}.json"
+
+                    def repository(path=path, compact=compact, codec=codec):
+                        return JsonTaskRepository(path, compact=compact, codec=codec)
+
+                    repository().save_data(data)
+                    save = min(
+                        timings(lambda: repository().save_data(data), args.repeat)
+                    )
+                    load = min(timings(lambda: repository().load_data(), args.repeat))
+                    megabytes = path.stat().st_size / 1e6
+                    layout = "compact" if compact else "indented"
+                    print(
+                        f"{size:>9}  {layout:>8}  {codec.name:>6}  {megabytes:>9.1f}  "
+                        f"{load:>9.1f}  {save:>9.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
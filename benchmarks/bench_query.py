@@ -0,0 +1,92 @@
+"""Benchmark for filtered list queries on large task files.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_query [--tasks 500000] [--backends json sqlite]
+
+Times "tasks completed in the last 7 days" two ways: loading every task
+and filtering in Python, as listing did before queries existed, and
+pushing the query down to the repository.
+"""
+
+import argparse
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from tuido.bench import timings
+from tuido.repository_factory import create_repository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+
+EXTENSIONS = {"json": ".json", "sqlite": ".db", "journal": ".journal"}
+
+
+def build_data(size: int, now: datetime) -> TaskData:
+    """Build a year of tasks, about half of them completed."""
+    rng = random.Random(size)
+    tasks = []
+    for task_id in range(1, size + 1):
+        created_at = now - timedelta(days=365 * (1 - task_id / size) + 1)
+        completed_at = None
+        if rng.random() < 0.5:
+            completed_at = created_at + timedelta(hours=rng.uniform(1, 24 * 30))
+            completed_at = min(completed_at, now)
+        tasks.append(
+            Task(
+                id=task_id,
+                description=f"Task {task_id}",
+                created_at=created_at,
+                completed_at=completed_at,
+            )
+        )
+    return TaskData(tasks=tasks, next_id=size + 1)
+
+
+def full_load(path: Path, since: datetime) -> int:
+    """Load every task and filter completed ones by date."""
+    manager = TaskManager(create_repository(path))
+    return sum(1 for task in manager.completed_tasks() if task.completed_at >= since)
+
+
+def pushed_down(path: Path, since: datetime) -> int:
+    """Let the repository answer the query."""
+    manager = TaskManager(create_repository(path))
+    return sum(1 for _ in manager.query_tasks(TaskQuery(completed=True, since=since)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print a table of query times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500_000)
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(EXTENSIONS), default=["json", "sqlite"]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    now = datetime.now()
+    since = now - timedelta(days=7)
+    data = build_data(args.tasks, now)
+
+    print(f"{'backend':>8}  {'matches':>8}  {'full load (ms)':>14}  {'query (ms)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            path = Path(directory) / f"tasks{EXTENSIONS[backend]}"
+            repository = create_repository(path)
+            repository.save_data(data)
+            if hasattr(repository, "close"):
+                repository.close()
+
+            matches = pushed_down(path, since)
+            assert matches == full_load(path, since)
+            before = min(timings(lambda: full_load(path, since), args.repeat))
+            after = min(timings(lambda: pushed_down(path, since), args.repeat))
+            print(f"{backend:>8}  {matches:>8}  {before:>14.1f}  {after:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark for saving one changed task: a full rewrite vs. the tracked delta.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_save [--tasks 100000] [--backends json binary]
+
+The data is loaded once, as a long-running process such as ``tuido serve``
+holds it, and one task is toggled before each save.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_query import build_data
+from tuido.bench import timings
+from tuido.repository_factory import DEFAULT_EXTENSIONS, create_repository
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print one line per backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(DEFAULT_EXTENSIONS),
+        default=["json", "sqlite", "binary"],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from datetime import datetime  # pylint: disable=import-outside-toplevel
+
+    print(f"{'backend':>8}  {'full save (ms)':>14}  {'delta save (ms)':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            path = Path(directory) / f"tasks{DEFAULT_EXTENSIONS[backend]}"
+            create_repository(path).save_data(build_data(args.tasks, datetime.now()))
+            repository = create_repository(path)
+            data = repository.load_data()
+            task = data.tasks.get(args.tasks // 2)
+
+            def toggle(save) -> float:
+                if not task.mark_complete():
+                    task.mark_pending()
+                data.tasks.refresh(task)
+                (elapsed,) = timings(save)
+                data.mark_saved()
+                return elapsed
+
+            full = min(
+                toggle(lambda: repository.save_data(data)) for _ in range(args.repeat)
+            )
+            delta = min(
+                toggle(lambda: repository.save_changes(data, data.changes()))
+                for _ in range(args.repeat)
+            )
+            print(f"{backend:>8}  {full:>14.1f}  {delta:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Startup benchmark for the ``tuido`` entry point.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--runs 20] [--budget-ms 150]
+
+Two measurements are taken:
+
+* ``python -X importtime`` for ``tuido.__main__``, reporting the total
+  import time and the slowest modules.
+* A cold-start harness that runs ``python -m tuido add`` against a fresh
+  temporary task file in a new interpreter each time.
+
+The run fails (exit status 1) if the median cold start or the import time
+exceeds its budget, so it can be enforced in CI.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tuido.bench import timings
+
+DEFAULT_STARTUP_BUDGET_MS = 150.0
+DEFAULT_IMPORT_BUDGET_MS = 60.0
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])
+    )
+    env.pop("TODO_FILE", None)
+    return env
+
+
+def measure_imports(top: int) -> tuple[float, list[tuple[float, str]]]:
+    """Return total import time (ms) of ``tuido.__main__`` and the slowest modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tuido.__main__"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_environment(),
+    )
+    modules = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        if not cumulative.isdigit():
+            continue
+        modules.append((int(cumulative) / 1000, name))
+        if name == "tuido.__main__":
+            total = int(cumulative) / 1000
+    modules.sort(reverse=True)
+    return total, modules[:top]
+
+
+def measure_cold_start(runs: int) -> list[float]:
+    """Return wall-clock times (ms) of ``python -m tuido add`` in new interpreters."""
+    env = _environment()
+    with tempfile.TemporaryDirectory() as directory:
+        task_file = str(Path(directory) / "tasks.json")
+        command = [sys.executable, "-m", "tuido", "--file", task_file, "add", "Task"]
+        return timings(
+            lambda: subprocess.run(
+                command, check=True, stdout=subprocess.DEVNULL, env=env
+            ),
+            runs,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run both measurements and enforce the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS)
+    parser.add_argument(
+        "--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS
+    )
+    args = parser.parse_args(argv)
+
+    import_total, slowest = measure_imports(args.top)
+    print(f"import tuido.__main__: {import_total:.1f} ms")
+    for cumulative, name in slowest:
+        print(f"  {cumulative:8.1f} ms  {name}")
+
+    times = measure_cold_start(args.runs)
+    median = statistics.median(times)
+    print(
+        f"cold start 'tuido add' ({args.runs} runs): median {median:.1f} ms, "
+        f"min {min(times):.1f} ms, max {max(times):.1f} ms"
+    )
+
+    failed = False
+    if import_total > args.import_budget_ms:
+        print(f"FAIL: import time exceeds budget of {args.import_budget_ms} ms")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median cold start exceeds budget of {args.budget_ms} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Benchmark for file size and single-task operations per storage backend.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_storage [--tasks 100000] [--backends json binary]
+
+Each operation uses a fresh repository, as a one-shot ``tuido`` command
+does, so it includes whatever the backend reads to answer it.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_query import build_data
+from tuido.bench import timings
+from tuido.repository_factory import DEFAULT_EXTENSIONS, create_repository
+from tuido.task_manager import TaskManager
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print a table per backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(DEFAULT_EXTENSIONS),
+        default=["json", "sqlite", "binary"],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from datetime import datetime  # pylint: disable=import-outside-toplevel
+
+    data = build_data(args.tasks, datetime.now())
+    middle = args.tasks // 2
+
+    def toggle(path: Path) -> None:
+        manager = TaskManager(create_repository(path))
+        if not manager.set_task_complete(middle):
+            manager.set_task_pending(middle)
+
+    print(
+        f"{'backend':>8}  {'size (MB)':>9}  {'load (ms)':>9}  {'get (ms)':>8}  "
+        f"{'pending (ms)':>12}  {'toggle (ms)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            path = Path(directory) / f"tasks{DEFAULT_EXTENSIONS[backend]}"
+            repository = create_repository(path)
+            repository.save_data(data)
+            if hasattr(repository, "close"):
+                repository.close()
+
+            size = sum(
+                file.stat().st_size
+                for file in Path(directory).glob(f"tasks{DEFAULT_EXTENSIONS[backend]}*")
+            )
+            load = min(
+                timings(lambda: create_repository(path).load_data(), args.repeat)
+            )
+            get = timings(
+                lambda: TaskManager(create_repository(path)).get_task(middle),
+                args.repeat,
+            )
+            pending = timings(
+                lambda: TaskManager(create_repository(path)).count_tasks(False),
+                args.repeat,
+            )
+            toggled = timings(lambda: toggle(path), args.repeat)
+            print(
+                f"{backend:>8}  {size / 1e6:>9.1f}  {load:>9.1f}  {min(get):>8.2f}  "
+                f"{min(pending):>12.2f}  {min(toggled):>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Micro-benchmark for the task link indexes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_task_graph [--sizes 1000 100000 1000000]
+
+Every task is a subtask of one of a few hundred parents and is blocked by
+the task before it. Building the graph is O(N); completing or reopening a
+task should stay flat as the number of tasks grows, since only the tasks
+it blocks are touched.
+"""
+
+import argparse
+import random
+
+from tuido.bench import timings
+from tuido.task import Task
+from tuido.task_data import TaskList
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+PARENTS = 500
+
+
+def build_tasks(size: int) -> TaskList:
+    """Build ``size`` pending tasks, each blocked by the previous one."""
+    return TaskList(
+        Task(
+            id=task_id,
+            description=f"Task {task_id}",
+            parent_id=task_id % PARENTS + 1 if task_id > PARENTS else None,
+            blocked_by=(task_id - 1,) if task_id > 1 else (),
+        )
+        for task_id in range(1, size + 1)
+    )
+
+
+def time_toggles(tasks: TaskList, size: int, operations: int) -> float:
+    """Return the mean latency of completing and reopening a task in ns.
+
+    Only the graph is updated: moving an older task between the status
+    views of the list is O(N) and is measured by other benchmarks.
+    """
+    graph = tasks.graph
+    ids = [random.randint(1, size) for _ in range(operations)]
+
+    def toggle() -> None:
+        for task_id in ids:
+            task = tasks.get(task_id)
+            task.mark_complete()
+            graph.update(task)
+            task.mark_pending()
+            graph.update(task)
+
+    (elapsed,) = timings(toggle)
+    return elapsed * 1e6 / operations
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print a table of latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--operations", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'tasks':>10}  {'build (ms)':>10}  {'ready (ms)':>10}  {'toggle (ns)':>12}")
+    for size in args.sizes:
+        tasks = build_tasks(size)
+        (build,) = timings(lambda: tasks.graph)
+        (ready,) = timings(tasks.ready)
+        toggle = time_toggles(tasks, size, args.operations)
+        print(f"{size:>10}  {build:>10.1f}  {ready:>10.1f}  {toggle:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
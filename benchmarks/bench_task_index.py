@@ -0,0 +1,63 @@
+"""Micro-benchmark for id lookups and deletes on TaskData.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_task_index [--sizes 10 1000 100000 1000000]
+
+Per-operation latency should stay flat as the number of tasks grows.
+"""
+
+import argparse
+import random
+
+from tuido.bench import timings
+from tuido.task import Task
+from tuido.task_data import TaskData
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+
+def build_data(size: int) -> TaskData:
+    """Build TaskData holding ``size`` pending tasks."""
+    return TaskData(
+        tasks=[
+            Task(id=task_id, description=f"Task {task_id}")
+            for task_id in range(1, size + 1)
+        ],
+        next_id=size + 1,
+    )
+
+
+def time_lookups(data: TaskData, size: int, operations: int) -> float:
+    """Return the mean lookup latency in nanoseconds."""
+    ids = [random.randint(1, size) for _ in range(operations)]
+    get = data.tasks.get
+    (elapsed,) = timings(lambda: [get(task_id) for task_id in ids])
+    return elapsed * 1e6 / operations
+
+
+def time_deletes(data: TaskData, size: int, operations: int) -> float:
+    """Return the mean delete latency in nanoseconds."""
+    ids = random.sample(range(1, size + 1), min(operations, size))
+    remove_id = data.tasks.remove_id
+    (elapsed,) = timings(lambda: [remove_id(task_id) for task_id in ids])
+    return elapsed * 1e6 / len(ids)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print a table of per-operation latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--operations", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'tasks':>10}  {'lookup (ns)':>12}  {'delete (ns)':>12}")
+    for size in args.sizes:
+        data = build_data(size)
+        lookup = time_lookups(data, size, args.operations)
+        delete = time_deletes(data, size, args.operations)
+        print(f"{size:>10}  {lookup:>12.0f}  {delete:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Memory benchmark for the Task representation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_task_memory [--count 1000000]
+
+Compares bytes per task, measured with tracemalloc, for:
+
+* the previous ``@dataclass`` Task holding ``datetime`` objects,
+* the slotted Task built from ``datetime`` timestamps,
+* the slotted Task as loaded from JSON, from ISO strings.
+
+Both slotted variants store datetimes, so they should measure the same;
+the second checks that nothing from the decoded JSON is kept alive.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from tuido.task import Task
+
+START = datetime(2024, 1, 1)
+
+
+@dataclass
+class LegacyTask:
+    """The Task representation before it was slotted."""
+
+    id: int
+    description: str
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: datetime | None = None
+
+
+def _timestamps(index: int) -> tuple[datetime, datetime | None]:
+    created = START + timedelta(seconds=index)
+    completed = created + timedelta(hours=1) if index % 2 else None
+    return created, completed
+
+
+def legacy(index: int) -> LegacyTask:
+    """Build a task as the old JSON loader did."""
+    created, completed = _timestamps(index)
+    return LegacyTask(index, f"Task number {index}", created, completed)
+
+
+def slotted(index: int) -> Task:
+    """Build a slotted task with parsed datetimes."""
+    created, completed = _timestamps(index)
+    return Task(index, f"Task number {index}", created, completed)
+
+
+def from_json(index: int) -> Task:
+    """Build a slotted task from ISO strings, as the JSON loader does."""
+    created, completed = _timestamps(index)
+    return Task(
+        index,
+        f"Task number {index}",
+        created.isoformat(),
+        completed.isoformat() if completed else None,
+    )
+
+
+def measure(factory, count: int) -> float:
+    """Return the traced bytes per task for ``count`` tasks from ``factory``."""
+    gc.collect()
+    tracemalloc.start()
+    tasks = [factory(index) for index in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return size / count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and print bytes per task for each representation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    baseline = measure(legacy, args.count)
+    print(f"{'representation':<28}  {'bytes/task':>10}  {'vs legacy':>9}")
+    for name, factory in [
+        ("legacy dataclass", legacy),
+        ("slotted, datetime", slotted),
+        ("slotted, from ISO strings", from_json),
+    ]:
+        per_task = baseline if factory is legacy else measure(factory, args.count)
+        print(f"{name:<28}  {per_task:>10.0f}  {per_task / baseline:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
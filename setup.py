@@ -22,6 +22,9 @@ setup(
         "rich",
         "humanize",
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
     entry_points={
         "console_scripts": [
             "tuido=tuido.__main__:main",  # command_name=package.module:function
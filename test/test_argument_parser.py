@@ -1,9 +1,12 @@
 """Test suite for the ArgumentParser in the tuido module."""
 
 import os
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
-from tuido.argument_parser import DEFAULT_TASK_FILE, ArgumentParser
+import pytest
+
+from tuido.argument_parser import DEFAULT_TASK_FILE, ArgumentParser, find_command
 
 
 class TestArgumentParser:
@@ -26,7 +29,7 @@ class TestArgumentParser:
     def test_all_subcommands_are_registered(self):
         """Test that all expected subcommands are registered."""
         parser = ArgumentParser()
-        expected_commands = ["add", "list", "do", "undo", "delete"]
+        expected_commands = ["add", "list", "do", "undo", "delete", "migrate"]
 
         # Get the subparsers from the parser
         subparsers_actions = [
@@ -50,22 +53,209 @@ class TestArgumentParser:
         assert args.command == "add"
         assert args.description == "Test task"
 
-        # Test 'do' requires task_id and parses as int
+        # Test 'do' requires task ids and parses them as ints
         args = parser.parse_args(["do", "5"])
         assert args.command == "do"
-        assert args.task_id == 5
-        assert isinstance(args.task_id, int)
+        assert args.task_ids == [5]
+        assert isinstance(args.task_ids[0], int)
 
-        # Test 'undo' requires task_id
+        # Test 'undo' requires task ids
         args = parser.parse_args(["undo", "3"])
         assert args.command == "undo"
-        assert args.task_id == 3
+        assert args.task_ids == [3]
 
-        # Test 'delete' requires task_id
+        # Test 'delete' requires task ids
         args = parser.parse_args(["delete", "7"])
         assert args.command == "delete"
-        assert args.task_id == 7
+        assert args.task_ids == [7]
 
         # Test 'list' requires no additional arguments
         args = parser.parse_args(["list"])
         assert args.command == "list"
+
+    def test_migrate_arguments(self):
+        """Test that 'migrate' parses source, target and output backends."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["migrate", "--from", "json", "--to", "sqlite"])
+        assert args.command == "migrate"
+        assert args.source_backend == "json"
+        assert args.target_backend == "sqlite"
+        assert args.output is None
+
+        args = parser.parse_args(["migrate", "--to", "json", "-o", "out.json"])
+        assert args.source_backend is None
+        assert args.output == "out.json"
+
+    def test_search_arguments(self):
+        """Test that 'search' collects the query words and a limit."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["search", "deploy", "stag", "-n", "5"])
+
+        assert args.command == "search"
+        assert args.query == ["deploy", "stag"]
+        assert args.limit == 5
+
+    def test_serve_and_no_daemon(self):
+        """Test the 'serve' command and the global --no-daemon flag."""
+        parser = ArgumentParser()
+
+        assert parser.parse_args(["serve"]).command == "serve"
+        assert not parser.parse_args(["list"]).no_daemon
+        assert parser.parse_args(["--no-daemon", "list"]).no_daemon
+
+    def test_list_filters(self):
+        """Test the list command's status, date, text and sort options."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(
+            ["list", "--completed", "--since", "7d", "--until", "2024-05-01"]
+        )
+        assert args.completed is True
+        assert datetime.now() - args.since - timedelta(days=7) < timedelta(minutes=1)
+        assert args.until == datetime(2024, 5, 2)
+
+        args = parser.parse_args(
+            ["list", "--pending", "--match", "x", "--sort", "created"]
+        )
+        assert args.completed is False
+        assert (args.match, args.sort) == ("x", "created")
+        assert parser.parse_args(["list"]).completed is None
+
+        for bad in (["--pending", "--completed"], ["--since", "soon"], ["--sort", "x"]):
+            with pytest.raises(SystemExit):
+                parser.parse_args(["list", *bad])
+
+    def test_archive_arguments(self):
+        """Test the archive command's age threshold and list --all."""
+        parser = ArgumentParser()
+
+        assert parser.parse_args(["archive"]).older_than == timedelta(days=30)
+        args = parser.parse_args(["archive", "--older-than", "2w"])
+        assert args.older_than == timedelta(weeks=2)
+        assert parser.parse_args(["list", "--all"]).include_archive
+        assert not parser.parse_args(["list"]).include_archive
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["archive", "--older-than", "soon"])
+
+    def test_workspace_arguments(self, monkeypatch):
+        """Test --all-files and --jobs, and the workspace's default."""
+        monkeypatch.setenv("TUIDO_WORKSPACE", "~/projects")
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["list", "--all-files", "-j", "4"])
+        assert (args.all_files, args.jobs, args.workspace) == (True, 4, "~/projects")
+        args = parser.parse_args(["--workspace", "*.json", "search", "x"])
+        assert (args.all_files, args.jobs, args.workspace) == (False, 1, "*.json")
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["list", "--jobs", "0"])
+
+    def test_tui_arguments(self):
+        """Test the tui command's starting filter."""
+        parser = ArgumentParser()
+
+        assert parser.parse_args(["tui", "--pending"]).pending_only
+        assert not parser.parse_args(["tui"]).pending_only
+
+    def test_stats_arguments(self):
+        """Test the stats options."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["stats", "--days", "30", "--json"])
+        assert (args.days, args.json) == (30, True)
+        assert parser.parse_args(["stats"]).days == 7
+        with pytest.raises(SystemExit):
+            parser.parse_args(["stats", "--days", "0"])
+
+    def test_format_argument(self):
+        """Test that --format is global and limited to the known formats."""
+        parser = ArgumentParser()
+
+        assert parser.parse_args(["--format", "jsonl", "list"]).format == "jsonl"
+        assert parser.parse_args(["--format", "tsv"]).format == "tsv"
+        assert parser.parse_args(["list"]).format is None
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--format", "xml", "list"])
+
+    @pytest.mark.parametrize("command", ["list", "ready", "import", "export"])
+    def test_format_after_command(self, command):
+        """Test that --format also follows the command without losing a global one."""
+        parser = ArgumentParser()
+        args = [command, "tasks.csv"] if command == "import" else [command]
+
+        assert parser.parse_args(args + ["--format", "csv"]).format == "csv"
+        assert parser.parse_args(["--format", "tsv"] + args).format == "tsv"
+        assert parser.parser.parse_args(["--format", "tsv"] + args).format == "tsv"
+        assert parser.parse_args(args).format is None
+
+    def test_import_and_export_arguments(self):
+        """Test the import and export options."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["--format", "csv", "import", "-", "--dedupe"])
+        assert (args.format, args.source, args.dedupe) == ("csv", "-", True)
+        args = parser.parse_args(["export", "tasks.txt", "--all"])
+        assert (args.output, args.include_archive) == ("tasks.txt", True)
+        assert parser.parse_args(["export"]).output is None
+
+    def test_link_arguments(self):
+        """Test the link options of add and link."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["add", "Tag", "--parent", "1", "--after", "2-3", "5"])
+        assert (args.parent, args.blocked_by) == (1, [2, 3, 5])
+        args = parser.parse_args(["link", "4", "--no-parent", "--unblock", "2"])
+        assert (args.task_id, args.no_parent, args.unblock) == (4, True, [2])
+        assert parser.parse_args(["add", "Plain"]).blocked_by == []
+        with pytest.raises(SystemExit):
+            parser.parse_args(["link", "4", "--parent", "1", "--no-parent"])
+
+    def test_profile_arguments(self):
+        """Test the global profiling options, which come before the command."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["--profile-output", "out.prof", "do", "3"])
+        assert args.profile_output == "out.prof"
+        assert not args.profile
+        assert parser.parse_args(["--profile", "list"]).profile
+
+    def test_task_ids_accept_lists_and_ranges(self):
+        """Test that ids and ranges are flattened in order without duplicates."""
+        parser = ArgumentParser()
+
+        args = parser.parse_args(["do", "3", "7", "10-12", "3"])
+
+        assert args.task_ids == [3, 7, 10, 11, 12]
+
+    def test_task_ids_reject_invalid_ranges(self):
+        """Test that malformed ids and reversed ranges are rejected."""
+        parser = ArgumentParser()
+
+        for value in ["abc", "5-2", "1-x"]:
+            with pytest.raises(SystemExit):
+                parser.parse_args(["delete", value])
+
+    @pytest.mark.parametrize(
+        "args, command",
+        [
+            (["add", "Task"], "add"),
+            (["--file", "do", "do", "3"], "do"),
+            (["-v", "-f", "x.json", "list"], "list"),
+            (["--help", "add"], None),
+            (["unknown"], None),
+            ([], None),
+        ],
+    )
+    def test_find_command(self, args, command):
+        """Test that the subcommand is spotted while skipping option values."""
+        assert find_command(args) == command
+
+    def test_single_command_parse_matches_full_parser(self):
+        """Test that the fast single-command path parses like the full parser."""
+        parser = ArgumentParser()
+        args = ["-f", "x.json", "do", "1-3"]
+
+        assert parser.parse_args(args) == parser.parser.parse_args(args)
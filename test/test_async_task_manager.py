@@ -0,0 +1,156 @@
+"""Unit tests for AsyncTaskManager and AsyncTaskRepository."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from tuido.async_task_manager import AsyncTaskManager
+from tuido.async_task_repository import AsyncTaskRepository
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.sqlite_task_repository import SqliteTaskRepository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_graph import TaskLinkError
+from tuido.task_manager import TaskManager
+
+
+@pytest.fixture(params=["tasks.json", "tasks.db"])
+def task_file(request, tmp_path):
+    """Fixture for an empty task file path for each storage backend."""
+    return tmp_path / request.param
+
+
+def open_repository(task_file):
+    """Create the synchronous repository for a task file."""
+    if task_file.suffix == ".db":
+        return SqliteTaskRepository(task_file)
+    return JsonTaskRepository(task_file)
+
+
+def test_concurrent_adds_are_batched(task_file):
+    """Mutations from many coroutines are saved together."""
+    repository = open_repository(task_file)
+
+    async def run():
+        async with AsyncTaskManager(AsyncTaskRepository(repository)) as manager:
+            with patch.object(
+                repository, "save_changes", wraps=repository.save_changes
+            ) as save_changes:
+                tasks = await asyncio.gather(
+                    *(manager.add_task(f"Task {index}") for index in range(50))
+                )
+            return tasks, save_changes.call_count
+
+    tasks, saves = asyncio.run(run())
+
+    assert sorted(task.id for task in tasks) == list(range(1, 51))
+    assert saves == 1
+    assert len(open_repository(task_file).load_data().tasks) == 50
+
+
+def test_mutations_and_reads(task_file):
+    """Each mutation is visible to reads once it returns."""
+
+    async def run():
+        repository = AsyncTaskRepository(open_repository(task_file))
+        async with AsyncTaskManager(repository) as manager:
+            first = await manager.add_task("First")
+            await manager.add_many(["Second", "Third"])
+            assert await manager.complete_many([first.id, 99]) == {
+                1: True,
+                99: False,
+            }
+            assert (await manager.delete_task(2)).description == "Second"
+            assert await manager.set_task_pending(1)
+            assert [task.id for task in await manager.pending_tasks()] == [1, 3]
+            assert await manager.count_tasks(completed=True) == 0
+            assert (await manager.get_task(3)).description == "Third"
+
+    asyncio.run(run())
+
+    data = open_repository(task_file).load_data()
+    assert [task.id for task in data.tasks] == [1, 3]
+    assert data.next_id == 4
+
+
+def test_failed_operation_only_fails_its_caller(tmp_path):
+    """An exception in one queued mutation does not fail the batch."""
+    task_file = tmp_path / "tasks.json"
+
+    async def run():
+        repository = AsyncTaskRepository(JsonTaskRepository(task_file))
+        async with AsyncTaskManager(repository) as manager:
+            results = await asyncio.gather(
+                manager.add_task("Kept"),
+                manager._submit(lambda _: 1 / 0),  # pylint: disable=protected-access
+                return_exceptions=True,
+            )
+        return results
+
+    kept, error = asyncio.run(run())
+
+    assert kept.id == 1
+    assert isinstance(error, ZeroDivisionError)
+
+
+def test_failed_operation_keeps_earlier_changes_in_batch(tmp_path):
+    """A mutation that fails after changing data does not undo the ones before it."""
+    task_file = tmp_path / "tasks.json"
+    cycle = [Task(1, "A", parent_id=2), Task(2, "B", parent_id=1)]
+
+    async def run():
+        repository = AsyncTaskRepository(JsonTaskRepository(task_file))
+        async with AsyncTaskManager(repository) as manager:
+            results = await asyncio.gather(
+                manager.add_task("First"),
+                manager._submit(  # pylint: disable=protected-access
+                    lambda manager: manager.import_tasks(cycle)
+                ),
+                manager.add_task("Third"),
+                return_exceptions=True,
+            )
+            return results, await manager.all_tasks()
+
+    (first, error, third), tasks = asyncio.run(run())
+
+    assert isinstance(error, TaskLinkError)
+    assert (first.id, third.id) == (1, 2)
+    assert [task.description for task in tasks] == ["First", "Third"]
+    saved = open_repository(task_file).load_data()
+    assert [task.description for task in saved.tasks] == ["First", "Third"]
+    assert saved.next_id == 3
+
+
+def test_sees_changes_from_other_writers(tmp_path):
+    """Data saved by a synchronous writer is reloaded before the next batch."""
+    task_file = tmp_path / "tasks.json"
+
+    async def run():
+        repository = AsyncTaskRepository(JsonTaskRepository(task_file))
+        async with AsyncTaskManager(repository) as manager:
+            await manager.add_task("Async")
+            TaskManager(JsonTaskRepository(task_file)).add_task("Sync")
+            task = await manager.add_task("Async again")
+            return task, await manager.all_tasks()
+
+    task, tasks = asyncio.run(run())
+
+    assert task.id == 3
+    assert [task.description for task in tasks] == ["Async", "Sync", "Async again"]
+
+
+def test_repository_runs_off_the_event_loop(tmp_path):
+    """AsyncTaskRepository forwards calls to the synchronous repository."""
+    sync_repository = JsonTaskRepository(tmp_path / "tasks.json")
+
+    async def run():
+        repository = AsyncTaskRepository(sync_repository)
+        await repository.save_data(TaskData(next_id=1))
+        async with repository.lock():
+            assert sync_repository.lock().held
+        count = await repository.count_tasks()
+        repository.close()
+        return count
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,136 @@
+"""Tests for the release benchmark suite and its task generator."""
+
+import importlib
+import inspect
+import json
+
+import pytest
+
+from tuido.bench import (
+    OPERATIONS,
+    STANDALONE,
+    find_regressions,
+    generate_data,
+    main,
+    timings,
+)
+from tuido.json_task_repository import JsonTaskRepository
+
+
+def row(operation: str, best_ms: float) -> dict:
+    """A result row for the JSON backend on 1000 tasks."""
+    return {
+        "backend": "json",
+        "tasks": 1000,
+        "operation": operation,
+        "best_ms": best_ms,
+        "median_ms": best_ms,
+    }
+
+
+def test_generate_data_is_deterministic():
+    """Test that the generator honours the size and completion ratio."""
+    data = generate_data(1000, completed_ratio=0.8)
+    completed = sum(task.is_complete() for task in data.tasks)
+
+    assert len(data.tasks) == 1000
+    assert data.next_id == 1001
+    assert 750 < completed < 850
+    assert [task.description for task in generate_data(1000, 0.8).tasks] == [
+        task.description for task in data.tasks
+    ]
+
+
+def test_generate_data_rejects_bad_ratio():
+    """Test that a completion ratio outside 0..1 is refused."""
+    with pytest.raises(ValueError):
+        generate_data(10, completed_ratio=1.5)
+
+
+def test_find_regressions():
+    """Test that only large enough slowdowns count as regressions."""
+    baseline = [row("load", 10.0), row("save", 10.0), row("add", 0.2)]
+    results = [
+        row("load", 11.5),  # within the threshold
+        row("save", 13.0),  # 30% slower
+        row("add", 0.5),  # much slower, but by less than min_change
+        row("do", 50.0),  # not in the baseline
+    ]
+
+    regressions = find_regressions(results, baseline, threshold=20, min_change=1)
+
+    assert [item["operation"] for item in regressions] == ["save"]
+    assert regressions[0]["baseline_ms"] == 10.0
+    assert regressions[0]["change_pct"] == pytest.approx(30)
+
+
+def test_main_writes_report_and_fails_on_regression(tmp_path, capsys):
+    """Test a small run end to end, then compare against a faster baseline."""
+    output = tmp_path / "results.json"
+
+    status = main(
+        ["--tasks", "20", "--backends", "json", "binary", "--output", str(output)]
+    )
+
+    report = json.loads(output.read_text())
+    assert status == 0
+    assert report["format"] == 1
+    assert [(item["backend"], item["operation"]) for item in report["results"]] == [
+        (backend, operation)
+        for backend in ("json", "binary")
+        for operation in OPERATIONS
+    ]
+
+    for item in report["results"]:
+        item["best_ms"] = 0.0001
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    capsys.readouterr()
+
+    status = main(
+        ["--tasks", "20", "--backends", "json", "--baseline", str(baseline)]
+        + ["--min-change", "0"]
+    )
+
+    assert status == 1
+    assert "Regression: json load on 20 tasks" in capsys.readouterr().err
+
+
+def test_main_generates_task_file(tmp_path):
+    """Test that --generate only writes a task file."""
+    path = tmp_path / "tasks.json"
+
+    assert main(["--generate", str(path), "--tasks", "50"]) == 0
+    assert len(JsonTaskRepository(path).load_data().tasks) == 50
+
+
+def test_timings():
+    """Test that timings calls the function once per run."""
+    calls = []
+
+    times = timings(lambda: calls.append(None), repeat=3)
+
+    assert len(calls) == 3
+    assert len(times) == 3
+    assert all(time >= 0 for time in times)
+
+
+@pytest.mark.parametrize("name", sorted(STANDALONE))
+def test_standalone_benchmarks_take_arguments(name):
+    """Test that every benchmark --run names has a main taking argv."""
+    module = importlib.import_module(STANDALONE[name])
+
+    assert "argv" in inspect.signature(module.main).parameters
+
+
+def test_main_runs_standalone_benchmark(capsys):
+    """Test that --run passes the remaining arguments to the benchmark."""
+    assert main(["--run", "task-index", "--sizes", "10", "--operations", "5"]) == 0
+    assert "lookup (ns)" in capsys.readouterr().out
+
+
+def test_main_rejects_unknown_standalone_benchmark(capsys):
+    """Test that --run with an unknown name is a usage error."""
+    with pytest.raises(SystemExit):
+        main(["--run", "nonsense"])
+    assert "--run takes one of" in capsys.readouterr().err
@@ -0,0 +1,143 @@
+"""Unit tests for the BinaryTaskRepository class in the tuido module."""
+
+import datetime
+import os
+
+import pytest
+
+from tuido.binary_task_repository import HEADER_SIZE, RECORD, BinaryTaskRepository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError, InvalidTaskFileError
+
+
+class TestBinaryTaskRepository:
+    """Unit tests for the BinaryTaskRepository class."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Fixture to create a BinaryTaskRepository in a temporary directory."""
+        return BinaryTaskRepository(tmp_path / "tasks.tuido")
+
+    @pytest.fixture
+    def populated_repo(self, repo):
+        """Fixture holding tasks 1, 2, 4, 5 and 6, with 2 and 4 completed."""
+        tasks = [
+            Task(id=task_id, description=f"Task {task_id} ✓")
+            for task_id in (1, 2, 4, 5, 6)
+        ]
+        tasks[1].mark_complete()
+        tasks[2].mark_complete()
+        repo.save_data(TaskData(tasks=tasks, next_id=7))
+        return repo
+
+    def test_load_tasks_when_file_does_not_exist(self, repo):
+        """Returns empty TaskData without creating the file."""
+        task_data = repo.load_data()
+
+        assert task_data.tasks == []
+        assert task_data.next_id == 1
+        assert repo.count_tasks() == 0
+        assert repo.get_task(1) is None
+        assert not repo.file_path.exists()
+
+    def test_save_and_load_tasks(self, repo):
+        """Tasks, timestamps and next_id survive a round trip."""
+        tasks = [
+            Task(id=1, description="Desc 1"),
+            Task(id=2, description="Déjà vu", completed_at=datetime.datetime.now()),
+        ]
+        repo.save_data(TaskData(tasks=tasks, next_id=3))
+
+        loaded_data = repo.load_data()
+
+        assert loaded_data.tasks == tasks
+        assert loaded_data.next_id == 3
+
+    def test_file_is_compact(self, populated_repo):
+        """Each task takes one record plus its description."""
+        descriptions = sum(len(f"Task {n} ✓".encode()) for n in (1, 2, 4, 5, 6))
+
+        assert populated_repo.file_path.stat().st_size == (
+            HEADER_SIZE + 5 * RECORD.size + descriptions
+        )
+
+    def test_reads_without_loading(self, populated_repo):
+        """Lookups, counts and pages are answered from the mapped file."""
+        assert populated_repo.get_task(4).description == "Task 4 ✓"
+        assert populated_repo.get_task(3) is None
+        assert populated_repo.count_tasks() == 5
+        assert populated_repo.count_tasks(completed=True) == 2
+        assert populated_repo.count_tasks(completed=False) == 3
+        assert [task.id for task in populated_repo.iter_tasks(offset=3)] == [5, 6]
+        assert [task.id for task in populated_repo.iter_tasks(False, 1, 1)] == [5]
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            TaskQuery(),
+            TaskQuery(completed=False),
+            TaskQuery(match="task", sort="created"),
+        ],
+    )
+    def test_queries_stopped_early_release_the_mapping(self, populated_repo, query):
+        """Abandoning a query partway closes the mapped file cleanly."""
+        tasks = populated_repo.query_tasks(query)
+        next(tasks)
+        tasks.close()
+
+        assert populated_repo.count_matching(TaskQuery(match="task")) == 5
+
+    def test_toggle_is_written_in_place(self, populated_repo):
+        """Completing a task rewrites its record without replacing the file."""
+        manager = TaskManager(populated_repo)
+        inode = populated_repo.file_path.stat().st_ino
+
+        assert manager.set_task_complete(1)
+        assert manager.set_task_pending(2)
+
+        assert populated_repo.file_path.stat().st_ino == inode
+        fresh = BinaryTaskRepository(populated_repo.file_path)
+        assert fresh.load_data().tasks == manager.all_tasks()
+        assert fresh.count_tasks(completed=False) == 3
+
+    def test_adding_rewrites_the_file(self, populated_repo):
+        """Adding a task keeps the records sorted and the counts right."""
+        manager = TaskManager(populated_repo)
+        manager.add_task("New")
+        manager.delete_task(2)
+
+        fresh = BinaryTaskRepository(populated_repo.file_path)
+        assert [task.id for task in fresh.load_data().tasks] == [1, 4, 5, 6, 7]
+        assert fresh.count_tasks(completed=False) == 4
+        assert fresh.get_task(7).description == "New"
+
+    def test_concurrent_change_is_detected(self, populated_repo):
+        """Saving over a file another process changed raises."""
+        data = populated_repo.load_data()
+        other = BinaryTaskRepository(populated_repo.file_path)
+        other_data = other.load_data()
+        other_data.tasks.get(1).mark_complete()
+        other.update_task(other_data, other_data.tasks.get(1))
+
+        with pytest.raises(ConcurrentModificationError):
+            populated_repo.save_data(data)
+
+    def test_touch_is_not_a_conflict(self, populated_repo):
+        """A changed mtime alone does not block saving."""
+        data = populated_repo.load_data()
+        os.utime(populated_repo.file_path, ns=(0, 0))
+
+        populated_repo.save_data(data)
+
+    @pytest.mark.parametrize("content", [b"{}" * 40, b"{}"])
+    def test_rejects_other_files(self, repo, content):
+        """Files in another format are refused."""
+        repo.file_path.write_bytes(content)
+
+        with pytest.raises(InvalidTaskFileError, match="not a tuido binary"):
+            repo.load_data()
+        with pytest.raises(InvalidTaskFileError):
+            list(repo.query_tasks(TaskQuery(completed=True)))
@@ -0,0 +1,40 @@
+"""Tests for concurrent access to task files from several processes."""
+
+import multiprocessing
+
+import pytest
+
+from tuido.repository_factory import create_repository
+from tuido.task_manager import TaskManager
+
+PROCESSES = 4
+TASKS_PER_PROCESS = 15
+
+
+def add_tasks(file_path: str, worker: int) -> None:
+    """Add tasks one at a time, each in its own load/save cycle."""
+    for index in range(TASKS_PER_PROCESS):
+        TaskManager(create_repository(file_path)).add_task(f"{worker}-{index}")
+
+
+@pytest.mark.parametrize("extension", [".json", ".db", ".journal", ".tuido"])
+def test_concurrent_adds_are_not_lost(tmp_path, extension):
+    """Tasks added by concurrent processes all survive with unique ids."""
+    file_path = str(tmp_path / f"tasks{extension}")
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=add_tasks, args=(file_path, worker))
+        for worker in range(PROCESSES)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    data = create_repository(file_path).load_data()
+    total = PROCESSES * TASKS_PER_PROCESS
+
+    assert sorted(task.id for task in data.tasks) == list(range(1, total + 1))
+    assert len({task.description for task in data.tasks}) == total
+    assert data.next_id == total + 1
@@ -0,0 +1,68 @@
+"""Tests for phase timings and the profiling hooks."""
+
+import io
+import pstats
+
+from tuido import instrumentation
+from tuido.instrumentation import Tracer, span
+
+
+def test_span_does_nothing_when_tracing_is_off():
+    """Test that spans are a shared no-op without an active tracer."""
+    assert instrumentation.current_tracer() is None
+    assert span("a") is span("b")
+    with span("load"):
+        pass
+
+
+def test_spans_nest_and_measure_memory():
+    """Test that nested spans record their depth and allocations."""
+    tracer = instrumentation.enable()
+    try:
+        with span("outer"):
+            with span("inner"):
+                kept = [bytearray(1024) for _ in range(100)]
+                del kept
+            held = bytearray(50 * 1024)
+    finally:
+        assert instrumentation.disable() is tracer
+
+    outer, inner = tracer.spans
+    assert (outer.name, outer.depth, inner.name, inner.depth) == (
+        "outer",
+        0,
+        "inner",
+        1,
+    )
+    assert outer.seconds >= inner.seconds
+    assert inner.peak >= 100 * 1024 > inner.allocated
+    # The inner peak carries over to the enclosing span.
+    assert outer.peak >= inner.peak
+    assert outer.allocated >= len(held)
+
+
+def test_tracer_without_memory():
+    """Test that timings work without tracing allocations."""
+    tracer = Tracer(memory=False)
+    tracer.add("startup", 0.5)
+    with tracer.span("save"):
+        pass
+
+    assert [item.allocated for item in tracer.spans] == [None, None]
+    output = io.StringIO()
+    tracer.report(output)
+    assert output.getvalue().splitlines()[1].split() == ["startup", "500.00"]
+
+
+def test_profile_writes_report_and_cprofile_dump(tmp_path):
+    """Test that profile() reports to a file and can dump cProfile stats."""
+    output = io.StringIO()
+    dump = tmp_path / "run.prof"
+
+    with instrumentation.profile(str(dump), memory=False, file=output):
+        with span("work"):
+            sum(range(1000))
+
+    assert instrumentation.current_tracer() is None
+    assert "work" in output.getvalue()
+    assert pstats.Stats(str(dump)).total_calls > 0
@@ -0,0 +1,136 @@
+"""Unit tests for the JournalTaskRepository class in the tuido module."""
+
+import json
+import os
+
+import pytest
+
+from tuido.journal_task_repository import JournalTaskRepository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+
+
+class TestJournalTaskRepository:
+    """Unit tests for the JournalTaskRepository class."""
+
+    @pytest.fixture
+    def journal_file(self, tmp_path):
+        """Fixture providing a journal path in a temporary directory."""
+        return tmp_path / "tasks.journal"
+
+    def test_load_when_nothing_exists(self, journal_file):
+        """Returns empty TaskData when neither journal nor snapshot exist."""
+        task_data = JournalTaskRepository(journal_file).load_data()
+
+        assert task_data.tasks == []
+        assert task_data.next_id == 1
+
+    def test_mutations_append_one_line_each(self, journal_file):
+        """Each TaskManager mutation appends exactly one journal entry."""
+        manager = TaskManager(JournalTaskRepository(journal_file))
+        manager.add_task("First")
+        manager.add_task("Second")
+        manager.set_task_complete(1)
+        manager.set_task_pending(1)
+        manager.delete_task(2)
+
+        entries = [json.loads(line) for line in journal_file.read_text().splitlines()]
+        assert [entry["op"] for entry in entries] == [
+            "add",
+            "add",
+            "complete",
+            "pending",
+            "delete",
+        ]
+
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert [task.description for task in reloaded.tasks] == ["First"]
+        assert not reloaded.tasks[0].is_complete()
+        assert reloaded.next_id == 3
+
+    def test_links_survive_replay(self, journal_file):
+        """Link changes are journaled with the task and restored on load."""
+        manager = TaskManager(JournalTaskRepository(journal_file))
+        manager.add_task("Release")
+        manager.add_task("Tag", parent_id=1)
+        manager.block(1, [2])
+        manager.set_parent(2, None)
+
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert reloaded.tasks.get(1).blocked_by == (2,)
+        assert reloaded.tasks.get(2).parent_id is None
+        assert [task.id for task in reloaded.tasks.ready()] == [2]
+
+    def test_compaction_after_snapshot_interval(self, journal_file):
+        """The journal is folded into a snapshot every K operations."""
+        manager = TaskManager(JournalTaskRepository(journal_file, snapshot_interval=3))
+        for index in range(4):
+            manager.add_task(f"Task {index}")
+
+        assert len(journal_file.read_text().splitlines()) == 1
+        assert journal_file.with_name("tasks.journal.snapshot").exists()
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert [task.id for task in reloaded.tasks] == [1, 2, 3, 4]
+
+    def test_compaction_after_size_threshold(self, journal_file):
+        """The journal is compacted once it passes the size threshold."""
+        manager = TaskManager(JournalTaskRepository(journal_file, compact_threshold=1))
+        manager.add_task("Compact me")
+
+        assert journal_file.read_text() == ""
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert [task.description for task in reloaded.tasks] == ["Compact me"]
+
+    def test_replay_over_snapshot_is_idempotent(self, journal_file):
+        """Entries already folded into the snapshot can be replayed safely."""
+        repo = JournalTaskRepository(journal_file)
+        task = Task(id=1, description="Done")
+        data = TaskData(tasks=[task], next_id=2)
+        repo.insert_task(data, task)
+        task.mark_complete()
+        repo.update_task(data, task)
+        journal = journal_file.read_text()
+
+        repo.save_data(data)
+        journal_file.write_text(journal)  # crash before truncation
+
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert len(reloaded.tasks) == 1
+        assert reloaded.tasks[0].completed_at == task.completed_at
+
+    def test_torn_final_line_is_discarded(self, journal_file):
+        """A partially written last entry is skipped, then cut off on append."""
+        manager = TaskManager(JournalTaskRepository(journal_file))
+        manager.add_task("Survives")
+        with journal_file.open("a", encoding="utf-8") as file:
+            file.write('{"op": "add", "task": {"id"')
+
+        torn = journal_file.read_text()
+        manager = TaskManager(JournalTaskRepository(journal_file))
+        assert [task.description for task in manager.all_tasks()] == ["Survives"]
+        assert journal_file.read_text() == torn
+
+        manager.add_task("After crash")
+
+        reloaded = JournalTaskRepository(journal_file).load_data()
+        assert [task.description for task in reloaded.tasks] == [
+            "Survives",
+            "After crash",
+        ]
+
+    @pytest.mark.skipif(os.geteuid() == 0, reason="root ignores file permissions")
+    def test_read_only_journal_with_torn_line_loads(self, journal_file):
+        """Loading never writes, so a read-only journal can be read."""
+        manager = TaskManager(JournalTaskRepository(journal_file))
+        manager.add_task("Readable")
+        with journal_file.open("a", encoding="utf-8") as file:
+            file.write('{"op": "delete"')
+        journal_file.chmod(0o444)
+
+        try:
+            reloaded = JournalTaskRepository(journal_file).load_data()
+        finally:
+            journal_file.chmod(0o644)
+
+        assert [task.description for task in reloaded.tasks] == ["Readable"]
@@ -0,0 +1,58 @@
+"""Tests for choosing a JSON codec."""
+
+import pytest
+
+from tuido import json_codec
+from tuido.json_codec import CODEC_VARIABLE, STDLIB_CODEC, get_codec
+
+
+@pytest.fixture(params=["json", "orjson"])
+def codec(request):
+    """Fixture for each codec, skipping orjson when it is not installed."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return get_codec(request.param)
+
+
+def test_round_trip(codec):
+    """Compact output has no whitespace and decodes to the same data."""
+    data = {"tasks": [{"id": 1, "description": "Café ☕", "completed_at": None}]}
+
+    encoded = codec.dumps(data)
+
+    assert b", " not in encoded and b": " not in encoded
+    assert codec.loads(encoded) == data
+    assert STDLIB_CODEC.loads(encoded) == data
+
+
+def test_environment_variable_selects_codec(monkeypatch):
+    """$TUIDO_JSON_CODEC overrides the automatic choice."""
+    monkeypatch.setenv(CODEC_VARIABLE, "json")
+
+    assert get_codec() is STDLIB_CODEC
+
+
+def test_falls_back_to_stdlib_without_orjson(monkeypatch):
+    """Without orjson the standard library is used."""
+
+    def missing():
+        raise ImportError("No module named 'orjson'")
+
+    monkeypatch.delenv(CODEC_VARIABLE, raising=False)
+    monkeypatch.setattr(json_codec, "_default", None)
+    monkeypatch.setattr(json_codec, "_orjson_codec", missing)
+
+    assert get_codec() is STDLIB_CODEC
+
+
+def test_small_documents_use_stdlib(monkeypatch):
+    """Small documents skip importing orjson."""
+    monkeypatch.delenv(CODEC_VARIABLE, raising=False)
+
+    assert get_codec(size=1024) is STDLIB_CODEC
+
+
+def test_unknown_codec():
+    """Asking for an unknown codec raises ValueError."""
+    with pytest.raises(ValueError):
+        get_codec("yaml")
@@ -0,0 +1,69 @@
+"""Unit tests for the incremental JSON reader in the tuido module."""
+
+import io
+import json
+
+import pytest
+
+from tuido.json_stream import JsonStreamReader, iter_object
+
+DOCUMENT = {
+    "tasks": [
+        {"id": 1, "description": "Brackets ] and braces } in text"},
+        {"id": 22, "description": "Unicode ✓", "completed_at": None},
+    ],
+    "next_id": 123456789,
+}
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+def test_iter_object_streams_array(indent, chunk_size):
+    """Test that elements and trailing members survive any chunk boundary."""
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False)
+
+    items = list(iter_object(io.StringIO(text), "tasks", chunk_size))
+
+    assert items == [
+        ("tasks", DOCUMENT["tasks"][0]),
+        ("tasks", DOCUMENT["tasks"][1]),
+        ("next_id", 123456789),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [5, 64, 64 * 1024])
+def test_iter_object_decodes_runs_of_elements(chunk_size):
+    """Test that elements decoded in batches match one-by-one decoding."""
+    tasks = [
+        {"id": n, "description": "{" * (n % 3) + "}" * (n % 5), "meta": {"n": [n]}}
+        for n in range(200)
+    ] + [1, "two", None]
+    text = json.dumps({"tasks": tasks, "next_id": 200})
+
+    items = [value for _, value in iter_object(io.StringIO(text), "tasks", chunk_size)]
+
+    assert items == tasks + [200]
+
+
+def test_iter_object_empty_cases():
+    """Test empty objects and empty arrays."""
+    assert list(iter_object(io.StringIO("{}"), "tasks")) == []
+    assert list(iter_object(io.StringIO('{"tasks": [], "next_id": 1}'), "tasks")) == [
+        ("next_id", 1)
+    ]
+
+
+def test_iter_object_is_lazy():
+    """Test that elements are available before the rest of the file is read."""
+    text = '{"tasks": [{"id": 1}, {"id": 2}, ' + "x" * 10
+    items = iter_object(io.StringIO(text), "tasks")
+
+    assert next(items) == ("tasks", {"id": 1})
+
+
+def test_reader_rejects_malformed_input():
+    """Test that truncated or malformed documents raise ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_object(io.StringIO('{"tasks": [{"id": 1}'), "tasks"))
+    with pytest.raises(ValueError):
+        JsonStreamReader(io.StringIO("[1, 2]")).expect("{")
@@ -1,14 +1,20 @@
 """Unit tests for the TaskRepository class in the tuido module."""
 
 import datetime
+import json
+import os
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from tuido.json_task_repository import JsonTaskRepository
+from tuido import json_task_repository
+from tuido.json_task_repository import CompactJsonTaskRepository, JsonTaskRepository
 from tuido.task import Task
 from tuido.task_data import TaskData
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError
+from tuido.task_stats import TaskStats
 
 
 class TestJsonTaskRepository:
@@ -60,3 +66,302 @@ class TestJsonTaskRepository:
 
         assert task_data.tasks == []
         assert task_data.next_id == 1
+
+    @pytest.fixture
+    def populated_repo(self, repo):
+        """Fixture with five tasks, of which ids 2 and 4 are complete."""
+        tasks = [
+            Task(id=task_id, description=f"Task {task_id}") for task_id in range(1, 6)
+        ]
+        for task in (tasks[1], tasks[3]):
+            task.mark_complete()
+        repo.save_data(TaskData(tasks=tasks, next_id=6))
+        return repo
+
+    def test_iter_tasks_streams_pages(self, populated_repo):
+        """Streams tasks filtered by status with offset and limit."""
+        assert [task.id for task in populated_repo.iter_tasks()] == [1, 2, 3, 4, 5]
+        assert [task.id for task in populated_repo.iter_tasks(False, 1, 1)] == [3]
+        assert [task.id for task in populated_repo.iter_tasks(True)] == [2, 4]
+        assert list(populated_repo.iter_tasks(limit=0)) == []
+
+    def test_iter_tasks_decodes_only_yielded_tasks(self, populated_repo, monkeypatch):
+        """Only the tasks that are yielded are converted to Task objects."""
+        decoded = []
+        original = json_task_repository.dict_to_task
+
+        def tracking_dict_to_task(data):
+            decoded.append(data["id"])
+            return original(data)
+
+        monkeypatch.setattr(json_task_repository, "dict_to_task", tracking_dict_to_task)
+
+        list(populated_repo.iter_tasks(completed=False, offset=1, limit=1))
+
+        assert decoded == [3]
+
+    def test_get_and_count_tasks(self, populated_repo):
+        """Looks up single tasks and counts by status without a full load."""
+        assert populated_repo.get_task(4).description == "Task 4"
+        assert populated_repo.get_task(99) is None
+        assert populated_repo.count_tasks() == 5
+        assert populated_repo.count_tasks(completed=True) == 2
+        assert populated_repo.count_tasks(completed=False) == 3
+
+    def test_streaming_reads_handle_missing_file(self):
+        """Streaming reads on a missing file return nothing."""
+        repo = JsonTaskRepository(Path("non_existent.json"))
+
+        assert list(repo.iter_tasks()) == []
+        assert repo.count_tasks() == 0
+
+    def test_save_replaces_file_atomically(self, temp_file, repo):
+        """Saving leaves no temporary files behind and bumps the version."""
+        repo.save_data(TaskData(tasks=[Task(id=1, description="One")], next_id=2))
+        repo.save_data(TaskData(tasks=[Task(id=1, description="One")], next_id=2))
+
+        assert json.loads(temp_file.read_text())["version"] == 2
+        assert list(temp_file.parent.glob(f".{temp_file.name}.*.tmp")) == []
+
+    def test_save_refuses_concurrent_modification(self, temp_file, repo):
+        """Saving over a file another writer changed raises an error."""
+        repo.save_data(TaskData(next_id=1))
+        repo.load_data()
+        other = JsonTaskRepository(temp_file)
+        other.load_data()
+        other.save_data(TaskData(tasks=[Task(id=1, description="Other")], next_id=2))
+
+        assert repo.has_changed()
+        with pytest.raises(ConcurrentModificationError):
+            repo.save_data(TaskData(tasks=[Task(id=1, description="Mine")], next_id=2))
+
+    def test_touch_is_not_a_conflict(self, temp_file, repo):
+        """A changed mtime alone does not block a save."""
+        repo.save_data(TaskData(next_id=1))
+        stat = temp_file.stat()
+        os.utime(temp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        repo.save_data(TaskData(next_id=1))
+
+        assert not repo.has_changed()
+
+    def test_save_changes_matches_a_full_save(self, temp_file, populated_repo):
+        """Saving a delta writes the same document as rewriting every task."""
+        data = populated_repo.load_data()
+        data.tasks.get(3).mark_complete()
+        data.tasks.refresh(data.tasks.get(3))
+        data.tasks.remove_id(1)
+        data.tasks.append(Task(id=6, description='New "quoted" task'))
+        data.next_id = 7
+
+        populated_repo.save_changes(data, data.changes())
+
+        expected = {
+            "version": 2,
+            "stats": TaskStats.from_tasks(data.tasks).to_dict(),
+            "tasks": [json_task_repository.task_to_dict(task) for task in data.tasks],
+            "next_id": 7,
+        }
+        assert temp_file.read_text() == json.dumps(expected, indent=4)
+
+    def test_save_changes_encodes_only_changed_tasks(self, populated_repo, monkeypatch):
+        """Unchanged tasks are copied from the file rather than encoded again."""
+        data = populated_repo.load_data()
+        task = data.tasks.get(2)
+        task.mark_pending()
+        data.tasks.refresh(task)
+        encoded = []
+        original = json_task_repository.encode_tasks
+
+        def tracking_encode_tasks(tasks):
+            tasks = list(tasks)
+            encoded.extend(task.id for task in tasks)
+            return original(tasks)
+
+        monkeypatch.setattr(json_task_repository, "encode_tasks", tracking_encode_tasks)
+
+        populated_repo.save_changes(data, data.changes())
+
+        assert encoded == [2]
+        assert populated_repo.load_data().tasks == data.tasks
+
+    def test_save_changes_falls_back_for_reformatted_files(self, temp_file, repo):
+        """A file not laid out as saved by tuido is rewritten in full."""
+        temp_file.write_text(
+            json.dumps(
+                {
+                    "tasks": [
+                        {
+                            "id": 1,
+                            "description": "Hand-written",
+                            "created_at": "2024-05-01T09:00:00",
+                            "completed_at": None,
+                        }
+                    ],
+                    "next_id": 2,
+                }
+            )
+        )
+        data = repo.load_data()
+        data.tasks.append(Task(id=2, description="Added"))
+        data.next_id = 3
+
+        repo.save_changes(data, data.changes())
+
+        assert [task.description for task in repo.load_data().tasks] == [
+            "Hand-written",
+            "Added",
+        ]
+        assert temp_file.read_text().startswith('{\n    "version": 1,')
+
+    def test_save_matches_indented_json_dumps(self, temp_file, repo):
+        """The fast encoder writes exactly what json.dumps(indent=4) would."""
+        tasks = [
+            Task(id=1, description='Tricky },\n            { "text"'),
+            Task(
+                id=2, description="Café ☕ \\ tab\t", completed_at="2024-05-02T10:00:00"
+            ),
+        ]
+        repo.save_data(TaskData(tasks=tasks, next_id=3))
+
+        expected = {
+            "version": 1,
+            "stats": TaskStats.from_tasks(tasks).to_dict(),
+            "tasks": [json_task_repository.task_to_dict(task) for task in tasks],
+            "next_id": 3,
+        }
+        assert temp_file.read_text() == json.dumps(expected, indent=4)
+        assert repo.load_data().tasks == tasks
+
+    def test_load_stats_reads_only_the_header(
+        self, temp_file, populated_repo, monkeypatch
+    ):
+        """Saved stats are read without decoding tasks; older files are scanned."""
+        expected = TaskStats.from_tasks(populated_repo.load_data().tasks)
+
+        def fail(data):
+            raise AssertionError("tasks were decoded")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(json_task_repository, "dict_to_task", fail)
+            assert populated_repo.load_stats() == expected
+
+        document = json.loads(temp_file.read_text())
+        del document["stats"]
+        temp_file.write_text(json.dumps(document))
+        assert JsonTaskRepository(temp_file).load_stats() == expected
+
+    def test_links_are_saved_and_patched(self, temp_file, repo):
+        """Tasks with links are encoded like json.dumps(indent=4) and reloaded."""
+        tasks = [
+            Task(id=1, description="Release"),
+            Task(id=2, description="Notes", parent_id=1),
+            Task(id=3, description="Tag", parent_id=1, blocked_by=[2]),
+            Task(id=4, description="Announce", blocked_by=[3, 1]),
+            Task(id=5, description="Party"),
+        ]
+        repo.save_data(TaskData(tasks=tasks, next_id=6))
+
+        expected = {
+            "version": 1,
+            "stats": TaskStats.from_tasks(tasks).to_dict(),
+            "tasks": [json_task_repository.task_to_dict(task) for task in tasks],
+            "next_id": 6,
+        }
+        assert temp_file.read_text() == json.dumps(expected, indent=4)
+
+        data = repo.load_data()
+        assert data.tasks == tasks
+        task = data.tasks.get(5)
+        task.blocked_by = (4,)
+        data.tasks.mark_changed(task)
+        repo.save_changes(data, data.changes())
+
+        assert repo.load_data().tasks == data.tasks
+        expected["version"] = 2
+        expected["tasks"][4]["blocked_by"] = [4]
+        assert temp_file.read_text() == json.dumps(expected, indent=4)
+
+
+class TestCompactJson:
+    """Tests for the compact layout."""
+
+    @pytest.fixture
+    def tasks(self):
+        """Fixture for two tasks with timestamps down to the microsecond."""
+        created = datetime.datetime(2024, 5, 1, 9, 30, 15, 123456)
+        return [
+            Task(id=1, description="Pending", created_at=created),
+            Task(
+                id=2,
+                description="Done",
+                created_at=created,
+                completed_at=created + datetime.timedelta(hours=2),
+            ),
+        ]
+
+    def test_compact_round_trip(self, tmp_path, tasks):
+        """Compact files have no whitespace and keep exact timestamps."""
+        path = tmp_path / "tasks.json"
+        CompactJsonTaskRepository(path).save_data(TaskData(tasks=tasks, next_id=3))
+
+        raw = json.loads(path.read_bytes())
+        assert b"\n" not in path.read_bytes()
+        assert raw["format"] == "compact"
+        assert raw["tasks"][1]["completed_at"] == "2024-05-01T11:30:15.123456"
+
+        loaded = JsonTaskRepository(path).load_data()
+        assert loaded.tasks == tasks
+        assert loaded.next_id == 3
+
+    def test_compact_files_stay_compact(self, tmp_path, tasks):
+        """A plain JSON repository keeps saving a compact file compactly."""
+        path = tmp_path / "tasks.json"
+        CompactJsonTaskRepository(path).save_data(TaskData(tasks=tasks, next_id=3))
+        repo = JsonTaskRepository(path)
+        data = repo.load_data()
+        data.tasks.append(Task(id=3, description="Added"))
+        data.next_id = 4
+
+        repo.save_changes(data, data.changes())
+
+        assert json.loads(path.read_bytes())["format"] == "compact"
+        assert len(JsonTaskRepository(path).load_data().tasks) == 3
+
+    def test_indented_files_are_converted(self, tmp_path, tasks):
+        """An indented file is read and saved compact on request."""
+        path = tmp_path / "tasks.json"
+        JsonTaskRepository(path).save_data(TaskData(tasks=tasks, next_id=3))
+        repo = CompactJsonTaskRepository(path)
+
+        repo.save_data(repo.load_data())
+
+        assert json.loads(path.read_bytes())["format"] == "compact"
+        assert JsonTaskRepository(path).load_data().tasks == tasks
+
+    def test_streaming_reads_handle_epoch_timestamps(self, tmp_path, tasks):
+        """Streaming reads and queries work on compact files with epoch seconds."""
+        for task in tasks:
+            task.created_at = task.created_at.replace(microsecond=0)
+        tasks[1].completed_at = tasks[1].completed_at.replace(microsecond=0)
+        path = tmp_path / "tasks.json"
+        records = []
+        for task in tasks:
+            created_at, completed_at = task.epoch_timestamps()
+            records.append(
+                {
+                    "id": task.id,
+                    "description": task.description,
+                    "created_at": int(created_at),
+                    "completed_at": None if completed_at is None else int(completed_at),
+                }
+            )
+        path.write_text(
+            json.dumps({"format": "compact", "tasks": records, "next_id": 3})
+        )
+        repo = JsonTaskRepository(path)
+
+        assert repo.get_task(2) == tasks[1]
+        assert repo.count_tasks(completed=True) == 1
+        query = TaskQuery(since=tasks[1].completed_at)
+        assert [task.id for task in repo.query_tasks(query)] == [2]
@@ -0,0 +1,51 @@
+"""Tests for the tuido entry point's startup path."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CHECK_IMPORTS = """
+import sys
+from tuido.__main__ import main
+
+sys.argv = ["tuido"] + sys.argv[1:]
+main()
+print(sorted(name for name in ("rich", "humanize", "sqlite3") if name in sys.modules))
+"""
+
+
+def _run(*args):
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK_IMPORTS, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    )
+    lines = result.stdout.splitlines()
+    return lines[:-1], json.loads(lines[-1].replace("'", '"'))
+
+
+def test_mutating_command_skips_rendering_imports(tmp_path):
+    """Test that 'add' with piped output never imports rich, humanize or sqlite3."""
+    task_file = str(tmp_path / "tasks.json")
+
+    output, imported = _run("--file", task_file, "add", "Fast path")
+
+    assert imported == []
+    assert output[-1] == "✓ Added task 1: 'Fast path'"
+
+
+def test_piped_list_is_plain_text(tmp_path):
+    """Test that 'list' with piped output prints plain text without Rich."""
+    task_file = str(tmp_path / "tasks.json")
+    _run("--file", task_file, "add", "Plain")
+
+    output, imported = _run("--file", task_file, "list")
+
+    assert "rich" not in imported
+    assert "PENDING TASKS (1)" in output
+    assert not any("[" in line for line in output)
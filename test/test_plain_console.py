@@ -0,0 +1,30 @@
+"""Unit tests for the PlainConsole fallback in the tuido module."""
+
+import io
+
+from tuido.plain_console import PlainConsole, render_markup
+
+
+def test_render_markup_strips_known_tags():
+    """Test that known style tags are removed when colour is off."""
+    assert render_markup("[bold green]✓[/bold green] Done") == "✓ Done"
+
+
+def test_render_markup_keeps_unknown_brackets():
+    """Test that bracketed text that is not a known style is left alone."""
+    assert render_markup("Fix [WIP] and [draft] items") == "Fix [WIP] and [draft] items"
+
+
+def test_render_markup_ansi_colours():
+    """Test that known style tags become ANSI escapes when colour is on."""
+    assert render_markup("[yellow]x[/yellow]", color=True) == "\x1b[33mx\x1b[0m"
+
+
+def test_plain_console_print_joins_objects():
+    """Test that print joins objects with spaces and ignores Rich options."""
+    buffer = io.StringIO()
+    console = PlainConsole(file=buffer)
+
+    console.print("  1: Task ", "[dim](added now)[/dim]", highlight=False)
+
+    assert buffer.getvalue() == "  1: Task  (added now)\n"
@@ -0,0 +1,42 @@
+"""Unit tests for repository backend selection in the tuido module."""
+
+import pytest
+
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.repository_factory import backend_for_path, create_repository
+from tuido.sqlite_task_repository import SqliteTaskRepository
+
+
+@pytest.mark.parametrize(
+    "file_name, backend",
+    [
+        ("tasks.json", "json"),
+        ("tasks.db", "sqlite"),
+        ("tasks.SQLITE3", "sqlite"),
+        ("tasks.journal", "journal"),
+        ("tasks.tuido", "binary"),
+        ("tasks", "json"),
+        ("tasks.txt", "json"),
+    ],
+)
+def test_backend_for_path(file_name, backend):
+    """Test that the backend is chosen from the file extension."""
+    assert backend_for_path(file_name) == backend
+
+
+def test_create_repository_uses_extension(tmp_path):
+    """Test that create_repository picks the class matching the extension."""
+    assert isinstance(create_repository(tmp_path / "a.json"), JsonTaskRepository)
+    assert isinstance(create_repository(tmp_path / "a.db"), SqliteTaskRepository)
+
+
+def test_create_repository_explicit_backend(tmp_path):
+    """Test that an explicit backend overrides the extension."""
+    repository = create_repository(tmp_path / "a.json", "sqlite")
+    assert isinstance(repository, SqliteTaskRepository)
+
+
+def test_create_repository_unknown_backend(tmp_path):
+    """Test that an unknown backend name raises ValueError."""
+    with pytest.raises(ValueError):
+        create_repository(tmp_path / "a.json", "xml")
@@ -0,0 +1,198 @@
+"""Unit tests for the SearchIndex class in the tuido module."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from tuido import search_index
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.search_index import SearchIndex, tokenize
+from tuido.task import Task
+from tuido.task_manager import TaskManager
+
+
+def test_tokenize():
+    """Descriptions are split into lower-case words."""
+    assert tokenize("Deploy STAGING, then re-run CI!") == [
+        "deploy",
+        "staging",
+        "then",
+        "re",
+        "run",
+        "ci",
+    ]
+
+
+class TestSearch:
+    """Tests for queries against an in-memory index."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Fixture with a handful of indexed tasks."""
+        index = SearchIndex([tmp_path / "tasks.json"])
+        for task_id, description in enumerate(
+            [
+                "Deploy staging server",
+                "Deploy production",
+                "Review staging deploy deploy",
+                "Write release notes",
+                "Stage rollout",
+            ],
+            start=1,
+        ):
+            index.add(task_id, description, completed=task_id == 4)
+        return index
+
+    def test_all_words_must_match(self, index):
+        """Only tasks containing every query word are returned."""
+        assert {result.id for result in index.search("deploy staging")} == {1, 3}
+
+    def test_prefix_matching(self, index):
+        """Query words match words they are a prefix of."""
+        assert {result.id for result in index.search("stag")} == {1, 3, 5}
+        assert index.search("stagingx") == []
+
+    def test_ranking(self, index):
+        """Whole-word and repeated matches rank higher."""
+        assert [result.id for result in index.search("deploy")] == [3, 2, 1]
+        assert index.search("stage")[0].id == 5
+
+    def test_limit_and_status(self, index):
+        """Results can be limited and report completion."""
+        results = index.search("notes", limit=1)
+
+        assert len(results) == 1
+        assert results[0].completed
+
+    def test_remove_and_replace(self, index):
+        """Removed tasks stop matching and re-adding replaces a task."""
+        index.remove(1)
+        index.add(3, "Something else")
+
+        assert index.search("staging") == []
+        assert [result.id for result in index.search("some")] == [3]
+
+
+class TestPersistence:
+    """Tests for keeping the persisted index in step with the task file."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Fixture for a TaskManager that maintains a search index."""
+        repository = JsonTaskRepository(tmp_path / "tasks.json")
+        return TaskManager(repository, SearchIndex.for_repository(repository))
+
+    def build(self, manager):
+        """Load (or rebuild) the manager's index and return whether it rebuilt."""
+        index = SearchIndex.for_repository(manager.repository)
+        rebuilt = index.ensure_current(manager.repository.iter_tasks)
+        return index, rebuilt
+
+    def test_changes_are_appended(self, manager):
+        """Changes made through TaskManager keep the index current."""
+        manager.add_task("Deploy staging")
+        _, rebuilt = self.build(manager)
+        assert rebuilt
+
+        manager.add_many(["Fix staging", "Write docs"])
+        manager.delete_task(1)
+        manager.set_task_complete(2)
+        index, rebuilt = self.build(manager)
+
+        assert not rebuilt
+        assert [(result.id, result.completed) for result in index.search("stag")] == [
+            (2, True)
+        ]
+
+    def test_external_change_triggers_rebuild(self, manager):
+        """Changes made behind the index's back are picked up by a rebuild."""
+        manager.add_task("Deploy staging")
+        self.build(manager)
+
+        TaskManager(manager.repository).add_task("Unindexed staging")
+        index, rebuilt = self.build(manager)
+
+        assert rebuilt
+        assert len(index.search("staging")) == 2
+
+    def test_touch_does_not_rebuild(self, manager):
+        """A newer mtime with unchanged contents keeps the index."""
+        manager.add_task("Deploy staging")
+        self.build(manager)
+        stat = manager.repository.file_path.stat()
+        os.utime(
+            manager.repository.file_path,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9),
+        )
+
+        _, rebuilt = self.build(manager)
+
+        assert not rebuilt
+
+    def test_compaction(self, manager, monkeypatch):
+        """Many appended changes are folded into a new snapshot."""
+        monkeypatch.setattr(search_index, "COMPACT_AFTER", 3)
+        manager.add_task("First")
+        self.build(manager)
+        for number in range(3):
+            manager.add_task(f"Task {number}")
+
+        index, _ = self.build(manager)
+
+        lines = index.path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert len(json.loads(lines[1])["documents"]) == 4
+
+    def test_corrupt_index_is_rebuilt(self, manager):
+        """An unreadable index file is replaced."""
+        manager.add_task("Deploy staging")
+        SearchIndex.for_repository(manager.repository).path.write_text("garbage")
+
+        index, rebuilt = self.build(manager)
+
+        assert rebuilt
+        assert [result.id for result in index.search("deploy")] == [1]
+
+    def test_snapshot_loads_without_tokenizing(self, manager, monkeypatch):
+        """Postings and lengths are restored from the snapshot as saved."""
+        manager.add_many(["Deploy staging", "Deploy prod twice, deploy", "Docs"])
+        built, _ = self.build(manager)
+        expected = built.search("dep")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(search_index, "tokenize", None)
+            index, rebuilt = self.build(manager)
+
+        assert not rebuilt
+        assert index.search("dep") == expected
+
+    def test_unwritable_index_is_not_saved(self, manager, tmp_path):
+        """Searching works when the index file cannot be written."""
+        manager.add_task("Deploy staging")
+        index = SearchIndex([manager.repository.file_path], tmp_path / "missing" / "x")
+
+        assert index.ensure_current(manager.repository.iter_tasks)
+        assert [result.id for result in index.search("deploy")] == [1]
+        assert not index.path.exists()
+
+    def test_failed_append_removes_index(self, manager, monkeypatch):
+        """A change that cannot be appended drops the index for a rebuild."""
+        manager.add_task("Deploy staging")
+        index, _ = self.build(manager)
+        open_path = Path.open
+
+        def failing_open(path, mode="r", *args, **kwargs):
+            if path == index.path and mode == "a":
+                raise PermissionError(path)
+            return open_path(path, mode, *args, **kwargs)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(Path, "open", failing_open)
+            manager.add_task("Fix staging")
+
+        assert not index.path.exists()
+        index, rebuilt = self.build(manager)
+        assert rebuilt
+        assert [result.id for result in index.search("staging")] == [1, 2]
@@ -0,0 +1,107 @@
+"""Unit tests for the SqliteTaskRepository class in the tuido module."""
+
+import datetime
+import sqlite3
+
+import pytest
+
+from tuido.sqlite_task_repository import SqliteTaskRepository
+from tuido.task import Task
+from tuido.task_data import TaskData
+
+
+class TestSqliteTaskRepository:
+    """Unit tests for the SqliteTaskRepository class."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Fixture to create a SqliteTaskRepository in a temporary directory."""
+        repository = SqliteTaskRepository(tmp_path / "tasks.db")
+        yield repository
+        repository.close()
+
+    def test_load_tasks_when_file_does_not_exist(self, tmp_path):
+        """Returns empty TaskData without creating the database."""
+        repo = SqliteTaskRepository(tmp_path / "missing.db")
+        task_data = repo.load_data()
+
+        assert task_data.tasks == []
+        assert task_data.next_id == 1
+        assert not (tmp_path / "missing.db").exists()
+
+    def test_save_and_load_tasks(self, repo):
+        """Can save and load tasks correctly."""
+        tasks = [
+            Task(id=1, description="Desc 1"),
+            Task(id=2, description="Desc 2", completed_at=datetime.datetime.now()),
+        ]
+        repo.save_data(TaskData(tasks=tasks, next_id=3))
+
+        loaded_data = repo.load_data()
+
+        assert loaded_data.tasks == tasks
+        assert loaded_data.next_id == 3
+
+    def test_row_level_writes(self, repo):
+        """Insert, update and delete touch only the affected row."""
+        data = TaskData(tasks=[Task(id=1, description="Keep")], next_id=2)
+        repo.save_data(data)
+
+        added = Task(id=2, description="Added")
+        data.tasks.append(added)
+        data.next_id = 3
+        repo.insert_task(data, added)
+
+        added.mark_complete()
+        repo.update_task(data, added)
+
+        loaded_data = repo.load_data()
+        assert [task.id for task in loaded_data.tasks] == [1, 2]
+        assert loaded_data.tasks[1].is_complete()
+        assert loaded_data.next_id == 3
+
+        repo.delete_task(data, data.tasks[0])
+        assert [task.id for task in repo.load_data().tasks] == [2]
+
+    def test_indexes_exist(self, repo, tmp_path):
+        """The tasks table is indexed on completed_at."""
+        repo.save_data(TaskData())
+
+        with sqlite3.connect(tmp_path / "tasks.db") as connection:
+            indexes = {row[1] for row in connection.execute("PRAGMA index_list(tasks)")}
+
+        assert "idx_tasks_completed_at" in indexes
+
+    def test_save_batch(self, repo):
+        """Inserts, updates and deletes are applied in one batch."""
+        keep, drop = Task(id=1, description="Keep"), Task(id=2, description="Drop")
+        data = TaskData(tasks=[keep, drop], next_id=3)
+        repo.save_data(data)
+
+        added = Task(id=3, description="Added")
+        keep.mark_complete()
+        data.next_id = 4
+        repo.save_batch(data, inserted=[added], updated=[keep], deleted=[drop])
+
+        loaded_data = repo.load_data()
+        assert [task.id for task in loaded_data.tasks] == [1, 3]
+        assert loaded_data.tasks[0].is_complete()
+        assert loaded_data.next_id == 4
+
+    def test_iter_and_count_tasks(self, repo):
+        """Pages and counts are read straight from the database."""
+        tasks = [Task(id=task_id, description=str(task_id)) for task_id in range(1, 8)]
+        for task in tasks[::2]:
+            task.mark_complete()
+        repo.save_data(TaskData(tasks=tasks, next_id=8))
+
+        assert repo.count_tasks() == 7
+        assert repo.count_tasks(completed=True) == 4
+        assert repo.count_tasks(completed=False) == 3
+        assert [
+            task.id for task in repo.iter_tasks(completed=True, offset=1, limit=2)
+        ] == [
+            3,
+            5,
+        ]
+        assert [task.id for task in repo.iter_tasks(offset=5)] == [6, 7]
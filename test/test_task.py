@@ -1,5 +1,7 @@
 """Unit tests for the Task class in the tuido module."""
 
+from datetime import datetime
+
 from tuido.task import Task
 
 
@@ -50,3 +52,60 @@ def test_mark_pending_on_pending_task_returns_false():
     result = task.mark_pending()
 
     assert result is False
+
+
+def test_task_uses_slots():
+    """Test that tasks have no per-instance __dict__."""
+    task = Task(id=1, description="Test task")
+
+    assert not hasattr(task, "__dict__")
+
+
+def test_iso_timestamps_are_parsed():
+    """Test that ISO strings are stored as datetimes and round-trip."""
+    task = Task(
+        id=1,
+        description="Test task",
+        created_at="2024-01-02T03:04:05",
+        completed_at="2024-01-03T00:00:00",
+    )
+
+    assert task.created_at == datetime(2024, 1, 2, 3, 4, 5)
+    assert task.completed_at == datetime(2024, 1, 3)
+    assert task.is_complete()
+    assert task.iso_timestamps() == ("2024-01-02T03:04:05", "2024-01-03T00:00:00")
+
+    task.completed_at = "2024-01-04T00:00:00"
+    assert task.completed_at == datetime(2024, 1, 4)
+
+
+def test_epoch_timestamps():
+    """Test that epoch seconds are accepted and round-trip to ISO strings."""
+    moment = datetime(2024, 5, 6, 7, 8, 9)
+    task = Task(id=1, description="Test task", created_at=moment.timestamp())
+
+    assert task.created_at == moment
+    assert task.iso_timestamps() == (moment.isoformat(), None)
+
+
+def test_equality_compares_parsed_values():
+    """Test that tasks compare equal regardless of timestamp representation."""
+    moment = datetime(2024, 1, 2, 3, 4, 5)
+
+    assert Task(id=1, description="A", created_at=moment) == Task(
+        id=1, description="A", created_at=moment.isoformat()
+    )
+    assert Task(id=1, description="A", created_at=moment) != Task(
+        id=2, description="A", created_at=moment
+    )
+
+
+def test_links_take_part_in_equality_and_repr():
+    """Test that parent and blocker links are compared and shown when set."""
+    moment = datetime(2024, 1, 2, 3, 4, 5)
+    task = Task(id=3, description="A", created_at=moment, parent_id=1, blocked_by=[2])
+
+    assert task.blocked_by == (2,)
+    assert task != Task(id=3, description="A", created_at=moment, parent_id=1)
+    assert repr(task).endswith("completed_at=None, parent_id=1, blocked_by=(2,))")
+    assert "parent_id" not in repr(Task(id=1, description="A"))
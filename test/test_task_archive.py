@@ -0,0 +1,159 @@
+"""Tests for archiving completed tasks and reading across both tiers."""
+
+import gzip
+from datetime import datetime
+
+import pytest
+
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.task import Task
+from tuido.task_archive import TaskArchive
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError
+from tuido.tiered_repository import TieredTaskRepository
+
+
+def sample_tasks() -> list[Task]:
+    """Pending tasks 3 and 5; 1, 2 and 4 completed in March, April and May."""
+    created = datetime(2024, 3, 1, 9, 0)
+    completed = {
+        1: datetime(2024, 3, 10, 12, 0),
+        2: datetime(2024, 4, 20, 12, 0),
+        4: datetime(2024, 5, 30, 12, 0),
+    }
+    return [
+        Task(
+            id=task_id,
+            description=f"Task {task_id}",
+            created_at=created,
+            completed_at=completed.get(task_id),
+        )
+        for task_id in range(1, 6)
+    ]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture for a JSON task file holding the sample tasks."""
+    repository = JsonTaskRepository(tmp_path / "tasks.json")
+    repository.save_data(TaskData(tasks=sample_tasks(), next_id=6))
+    return repository
+
+
+@pytest.fixture
+def archive(repository):
+    """Fixture for the (initially empty) archive of the task file."""
+    return TaskArchive.for_repository(repository)
+
+
+def test_archive_moves_old_completed_tasks(repository, archive):
+    """Tasks completed before the cutoff move into monthly segments."""
+    manager = TaskManager(repository)
+
+    moved = manager.archive_completed(archive, datetime(2024, 5, 1))
+
+    assert [task.id for task in moved] == [1, 2]
+    assert [segment.name for segment in archive.segments()] == [
+        "2024-03.jsonl.gz",
+        "2024-04.jsonl.gz",
+    ]
+    data = JsonTaskRepository(repository.file_path).load_data()
+    assert [task.id for task in data.tasks] == [3, 4, 5]
+    assert data.next_id == 6
+    assert manager.archive_completed(archive, datetime(2024, 5, 1)) == []
+
+
+def test_archive_is_written_once_when_save_is_retried(repository, archive, monkeypatch):
+    """A save that conflicts does not archive the same tasks again."""
+    manager = TaskManager(repository)
+    save_changes = repository.save_changes
+    conflicts = iter([ConcurrentModificationError()])
+
+    def save_once_conflicting(data, delta):
+        for error in conflicts:
+            raise error
+        save_changes(data, delta)
+
+    monkeypatch.setattr(repository, "save_changes", save_once_conflicting)
+
+    moved = manager.archive_completed(archive, datetime(2024, 5, 1))
+
+    assert [task.id for task in moved] == [1, 2]
+    lines = []
+    for segment in archive.segments():
+        with gzip.open(segment, "rt", encoding="utf-8") as file:
+            lines.extend(file)
+    assert len(lines) == 2
+
+
+def test_archive_removes_links_to_archived_tasks(repository, archive):
+    """Subtasks move up and dependents stop waiting, as on delete."""
+    manager = TaskManager(repository)
+    manager.set_parent(3, 1)
+    manager.block(5, [2])
+
+    manager.archive_completed(archive, datetime(2024, 5, 1))
+
+    data = JsonTaskRepository(repository.file_path).load_data()
+    assert data.tasks.get(3).parent_id is None
+    assert data.tasks.get(5).blocked_by == ()
+
+
+def test_archive_appends_to_existing_segments(archive):
+    """Archiving into a month twice adds a gzip member to its segment."""
+    first, second = sample_tasks()[0], Task(
+        id=9, description="Later", completed_at=datetime(2024, 3, 20)
+    )
+    archive.add([first])
+    archive.add([second])
+
+    with gzip.open(archive.segments()[0], "rt", encoding="utf-8") as file:
+        assert len(file.readlines()) == 2
+    assert [task.id for task in archive.query_tasks(TaskQuery())] == [1, 9]
+
+
+def test_queries_skip_months_outside_the_range(archive, monkeypatch):
+    """Only segments that can hold matching tasks are read."""
+    archive.add(task for task in sample_tasks() if task.is_complete())
+    opened = []
+    original = gzip.open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path.name)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(gzip, "open", tracking_open)
+
+    query = TaskQuery(since=datetime(2024, 4, 15), until=datetime(2024, 5, 1))
+
+    assert [task.id for task in archive.query_tasks(query)] == [2]
+    assert opened == ["2024-04.jsonl.gz"]
+
+
+def test_tiered_reads_cover_both_tiers(repository, archive):
+    """Reads through the tiered repository merge both tiers by id."""
+    TaskManager(repository).archive_completed(archive, datetime(2024, 5, 1))
+    tiered = TieredTaskRepository(repository, archive)
+    manager = TaskManager(tiered)
+
+    assert [task.id for task in manager.iter_tasks()] == [1, 2, 3, 4, 5]
+    assert [task.id for task in manager.iter_tasks(True)] == [1, 2, 4]
+    assert [task.id for task in manager.iter_tasks(offset=1, limit=2)] == [2, 3]
+    assert manager.count_tasks() == 5
+    assert manager.count_tasks(False) == 2
+    assert manager.get_task(2).description == "Task 2"
+    query = TaskQuery(completed=True, sort="completed")
+    assert [task.id for task in manager.query_tasks(query)] == [1, 2, 4]
+
+
+def test_tasks_in_both_tiers_are_read_once(repository, archive):
+    """A task archived but not removed from the file is listed and counted once."""
+    archive.add([sample_tasks()[0]])
+    tiered = TieredTaskRepository(repository, archive)
+
+    assert [task.id for task in tiered.iter_tasks()] == [1, 2, 3, 4, 5]
+    assert tiered.count_tasks() == 5
+    assert tiered.count_tasks(True) == 3
+    assert tiered.count_matching(TaskQuery(match="task 1")) == 1
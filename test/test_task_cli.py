@@ -1,10 +1,16 @@
 """Unit tests for the TaskCLI class in the tuido module."""
 
+import io
+import json
+import re
 from unittest.mock import Mock
 
 import pytest
 
-from tuido.task_cli import TaskCLI
+from tuido.repository_factory import create_repository
+from tuido.task import Task
+from tuido.task_cli import TaskCLI, format_task_ids
+from tuido.task_data import TaskData
 
 
 class TestTaskCLI:
@@ -63,59 +69,425 @@ class TestTaskCLI:
     def test_complete_task_success(self, cli, mock_task_manager):
         """Test completing a task successfully."""
         task_cli, _ = cli
-        mock_task_manager.set_task_complete.return_value = True
+        mock_task_manager.complete_many.return_value = {1: True}
 
-        task_cli._handle_do(mock_task_manager, 1)  # pylint: disable=protected-access
+        task_cli._handle_do(mock_task_manager, [1])  # pylint: disable=protected-access
 
-        mock_task_manager.set_task_complete.assert_called_once_with(1)
+        mock_task_manager.complete_many.assert_called_once_with([1])
 
     def test_complete_nonexistent_task_fails(self, cli, mock_task_manager):
         """Test completing a nonexistent task raises SystemExit."""
         task_cli, _ = cli
-        mock_task_manager.set_task_complete.return_value = False
+        mock_task_manager.complete_many.return_value = {999: False}
 
         with pytest.raises(SystemExit):
             task_cli._handle_do(  # pylint: disable=protected-access
-                mock_task_manager, 999
+                mock_task_manager, [999]
             )
 
     def test_undo_task_success(self, cli, mock_task_manager):
         """Test undoing a completed task successfully."""
         task_cli, _ = cli
-        mock_task_manager.set_task_pending.return_value = True
+        mock_task_manager.pending_many.return_value = {1: True}
 
-        task_cli._handle_undo(mock_task_manager, 1)  # pylint: disable=protected-access
+        task_cli._handle_undo(
+            mock_task_manager, [1]
+        )  # pylint: disable=protected-access
 
-        mock_task_manager.set_task_pending.assert_called_once_with(1)
+        mock_task_manager.pending_many.assert_called_once_with([1])
 
     def test_delete_task_success(self, cli, mock_task_manager):
         """Test deleting a task successfully."""
         task_cli, _ = cli
         deleted_task = Mock(id=1, description="Deleted task")
-        mock_task_manager.delete_task.return_value = deleted_task
+        mock_task_manager.delete_many.return_value = {1: deleted_task}
 
         task_cli._handle_delete(  # pylint: disable=protected-access
-            mock_task_manager, 1
+            mock_task_manager, [1]
         )
 
-        mock_task_manager.delete_task.assert_called_once_with(1)
+        mock_task_manager.delete_many.assert_called_once_with([1])
 
     def test_delete_nonexistent_task_fails(self, cli, mock_task_manager):
         """Test deleting a nonexistent task raises SystemExit."""
         task_cli, _ = cli
-        mock_task_manager.delete_task.return_value = None
+        mock_task_manager.delete_many.return_value = {999: None}
 
         with pytest.raises(SystemExit):
             task_cli._handle_delete(  # pylint: disable=protected-access
-                mock_task_manager, 999
+                mock_task_manager, [999]
             )
 
+    def test_batch_reports_all_ids_before_failing(self, cli, mock_task_manager):
+        """Test that a partial batch reports successes and failures, then exits."""
+        task_cli, console = cli
+        mock_task_manager.complete_many.return_value = {
+            3: True,
+            4: True,
+            5: True,
+            9: False,
+        }
+
+        with pytest.raises(SystemExit):
+            task_cli._handle_do(  # pylint: disable=protected-access
+                mock_task_manager, [3, 4, 5, 9]
+            )
+
+        printed = [call.args[0] for call in console.print.call_args_list]
+        assert "Tasks 3-5 marked as complete." in printed[0]
+        assert "Task 9 not found or already complete." in printed[1]
+
+    def test_add_many_from_stdin(self, cli, mock_task_manager, monkeypatch):
+        """Test that 'add -' adds one task per non-empty stdin line."""
+        task_cli, console = cli
+        monkeypatch.setattr("sys.stdin", io.StringIO("First\n\n  Second  \n"))
+        mock_task_manager.add_many.return_value = [Mock(id=1), Mock(id=2)]
+
+        task_cli._handle_add(mock_task_manager, "-")  # pylint: disable=protected-access
+
+        mock_task_manager.add_many.assert_called_once_with(["First", "Second"])
+        console.print.assert_called_once()
+
     def test_list_empty_tasks(self, cli, mock_task_manager):
         """Test listing tasks when there are no tasks."""
         task_cli, console = cli
-        mock_task_manager.all_tasks.return_value = []
+        mock_task_manager.count_matching.return_value = 0
 
         task_cli._handle_list(mock_task_manager)  # pylint: disable=protected-access
 
-        mock_task_manager.all_tasks.assert_called_once()
+        mock_task_manager.query_tasks.assert_not_called()
         console.print.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "args, expected_ids",
+        [
+            ([], [1, 3, 5, 2, 4]),
+            (["--limit", "2"], [1, 3]),
+            (["--limit", "2", "--offset", "2"], [5, 2]),
+            (["--offset", "4"], [4]),
+            (["--page", "2", "--limit", "2"], [5, 2]),
+        ],
+    )
+    def test_list_pagination_spans_sections(self, cli, tmp_path, args, expected_ids):
+        """Test that list pages run through pending then completed tasks."""
+        task_cli, console = cli
+        task_file = str(tmp_path / "tasks.db")
+        for number in range(1, 6):
+            task_cli.run(["--file", task_file, "add", f"Task {number}"])
+        task_cli.run(["--file", task_file, "do", "2", "4"])
+        console.reset_mock()
+
+        task_cli.run(["--file", task_file, "list", *args])
+
+        printed = [call.args[0] for call in console.print.call_args_list if call.args]
+        rows = "\n".join(text for text in printed if isinstance(text, str))
+        listed = [int(task_id) for task_id in re.findall(r"^  (\d+): ", rows, re.M)]
+        assert listed == expected_ids
+
+    @pytest.mark.parametrize("file_name", ["tasks.json", "tasks.db"])
+    def test_list_filters_and_sorts(self, cli, tmp_path, file_name):
+        """Test that list options filter and order the listed tasks."""
+        task_cli, console = cli
+        task_file = str(tmp_path / file_name)
+        for description in ["Fix login", "Write docs", "fix typo", "Release"]:
+            task_cli.run(["--file", task_file, "add", description])
+        task_cli.run(["--file", task_file, "do", "3"])
+        task_cli.run(["--file", task_file, "do", "1"])
+
+        def listed(*args):
+            console.reset_mock()
+            task_cli.run(["--file", task_file, "list", *args])
+            printed = [c.args[0] for c in console.print.call_args_list if c.args]
+            rows = "\n".join(text for text in printed if isinstance(text, str))
+            return [int(task_id) for task_id in re.findall(r"^  (\d+): ", rows, re.M)]
+
+        assert listed("--match", "FIX") == [1, 3]
+        assert listed("--completed", "--sort", "completed") == [3, 1]
+        assert listed("--pending", "--since", "1h") == [2, 4]
+        assert listed("--until", "1h") == []
+        assert "No tasks match" in console.print.call_args.args[0]
+
+    @pytest.mark.parametrize("file_name", ["tasks.json", "tasks.journal"])
+    def test_search_ranks_matches(self, cli, tmp_path, file_name):
+        """Test that search finds prefix matches and follows later changes."""
+        task_cli, console = cli
+        task_file = str(tmp_path / file_name)
+        for description in ["Deploy staging", "Staging review", "Write docs"]:
+            task_cli.run(["--file", task_file, "add", description])
+        task_cli.run(["--file", task_file, "search", "stag"])
+        task_cli.run(["--file", task_file, "delete", "2"])
+        task_cli.run(["--file", task_file, "add", "Stage the deploy"])
+        console.reset_mock()
+
+        task_cli.run(["--file", task_file, "search", "dep", "stag"])
+
+        rows = console.print.call_args.args[0]
+        listed = [int(task_id) for task_id in re.findall(r"^  (\d+): ", rows, re.M)]
+        assert listed == [1, 4]
+
+    def test_list_and_search_all_files(self, cli, tmp_path):
+        """Test listing and searching every task file in the workspace."""
+        task_cli, console = cli
+        for name, description in [("home", "Pay rent"), ("work", "Pay invoices")]:
+            task_cli.run(["--file", str(tmp_path / f"{name}.json"), "add", description])
+        task_cli.run(["--file", str(tmp_path / "home.json"), "add", "Water plants"])
+
+        def printed(*args):
+            console.reset_mock()
+            task_cli.run(["--workspace", str(tmp_path), *args])
+            return "\n".join(c.args[0] for c in console.print.call_args_list if c.args)
+
+        listing = printed("list", "--all-files", "--match", "pay")
+        assert listing.index("home.json") < listing.index("Pay rent")
+        assert listing.index("work.json") < listing.index("Pay invoices")
+        assert "Water plants" not in listing
+
+        results = printed("search", "--all-files", "pay")
+        assert "  home.json:1: Pay rent" in results
+        assert "  work.json:1: Pay invoices" in results
+
+    @pytest.mark.parametrize("file_name", ["tasks.json", "tasks.journal"])
+    def test_ready_and_link(self, cli, tmp_path, file_name):
+        """Test that ready lists unblocked tasks as links and statuses change."""
+        task_cli, console = cli
+        task_file = str(tmp_path / file_name)
+        task_cli.run(["--file", task_file, "add", "Release"])
+        task_cli.run(["--file", task_file, "add", "Write notes", "--parent", "1"])
+        task_cli.run(
+            ["--file", task_file, "add", "Tag", "--parent", "1", "--after", "2"]
+        )
+
+        def ready():
+            console.reset_mock()
+            task_cli.run(["--file", task_file, "ready"])
+            rows = console.print.call_args.args[0]
+            return [int(task_id) for task_id in re.findall(r"^  (\d+): ", rows, re.M)]
+
+        assert ready() == [1, 2]
+        task_cli.run(["--file", task_file, "do", "2"])
+        assert ready() == [1, 3]
+        task_cli.run(["--file", task_file, "link", "1", "--blocked-by", "3"])
+        assert ready() == [3]
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--file", task_file, "link", "2", "--parent", "2"])
+        assert "cannot be its own parent" in console.print.call_args.args[0]
+
+        task_cli.run(["--file", task_file, "do", "1"])
+        console.reset_mock()
+        task_cli.run(["--file", task_file, "ready"])
+        assert "No tasks are ready" in console.print.call_args.args[0]
+
+    def test_stats(self, cli, tmp_path, capsys):
+        """Test that stats prints counts and completions, or JSON for collectors."""
+        task_cli, console = cli
+        task_file = str(tmp_path / "tasks.json")
+        for description in ["One", "Two", "Three"]:
+            task_cli.run(["--file", task_file, "add", description])
+        task_cli.run(["--file", task_file, "do", "2"])
+        console.reset_mock()
+
+        task_cli.run(["--file", task_file, "stats", "--days", "1"])
+        printed = "\n".join(
+            text
+            for c in console.print.call_args_list
+            for text in c.args
+            if isinstance(text, str)
+        )
+        assert "3 tasks:[/bold] 2 pending, 1 completed" in printed
+        assert "Completed today (1 per day):" in printed
+
+        console.reset_mock()
+        task_cli.run(["--file", task_file, "stats", "--json"])
+        summary = json.loads(capsys.readouterr().out)
+        assert (summary["pending"], summary["completed"]) == (2, 1)
+        assert sum(summary["completed_per_day"].values()) == 1
+        console.print.assert_not_called()
+
+    def test_foreign_binary_file_fails_cleanly(self, cli, tmp_path):
+        """Test that a .tuido file in another format exits with an error."""
+        task_cli, console = cli
+        task_file = tmp_path / "tasks.tuido"
+        task_file.write_bytes(b"{}" * 40)
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--file", str(task_file), "list"])
+
+        message = console.print.call_args.args[0]
+        assert message.startswith("Error: ") and "not a tuido binary" in message
+
+    def test_format_writes_records_without_console(self, cli, tmp_path, capsys):
+        """Test that --format streams list and ready records straight to stdout."""
+        task_cli, console = cli
+        task_file = str(tmp_path / "tasks.json")
+        for description in ["One", "Two", "Three"]:
+            task_cli.run(["--file", task_file, "add", description])
+        task_cli.run(["--file", task_file, "do", "2"])
+        task_cli.run(["--file", task_file, "link", "3", "--after", "1"])
+        capsys.readouterr()
+        console.reset_mock()
+
+        task_cli.run(["--format", "jsonl", "--file", task_file, "list"])
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [record["id"] for record in records] == [1, 2, 3]
+        assert records[1]["completed_at"] is not None
+        assert records[2]["blocked_by"] == [1]
+
+        task_cli.run(["--file", task_file, "list", "--pending", "--format", "csv"])
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("id,description,created_at")
+        rows = [line.split(",")[:2] for line in lines[1:]]
+        assert rows == [["1", "One"], ["3", "Three"]]
+
+        task_cli.run(["--file", task_file, "ready", "--format", "tsv"])
+        assert capsys.readouterr().out.splitlines()[1].startswith("1\tOne\t")
+        console.print.assert_not_called()
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--format", "jsonl", "--file", task_file, "stats"])
+
+    def test_export_and_import(self, cli, tmp_path, capsys):
+        """Test that exported tasks import into another file with their links."""
+        task_cli, console = cli
+        task_file = str(tmp_path / "tasks.json")
+        copy_file = str(tmp_path / "copy.json")
+        export_file = tmp_path / "tasks.csv"
+        for description in ["One", "Two"]:
+            task_cli.run(["--file", task_file, "add", description])
+        task_cli.run(["--file", task_file, "link", "2", "--parent", "1"])
+        task_cli.run(["--file", copy_file, "add", "Existing"])
+        capsys.readouterr()
+
+        task_cli.run(["--file", task_file, "export", str(export_file)])
+        assert export_file.read_text().startswith("id,description")
+        task_cli.run(["--file", task_file, "export"])
+        assert len(capsys.readouterr().out.splitlines()) == 2
+
+        console.reset_mock()
+        task_cli.run(["--file", copy_file, "import", str(export_file)])
+        console.print.assert_called_with(
+            "[bold green]✓[/bold green] Imported 2 tasks: 2-3"
+        )
+        copied = create_repository(copy_file).load_data().tasks.get(3)
+        assert (copied.description, copied.parent_id) == ("Two", 2)
+
+        task_cli.run(["--file", copy_file, "import", "--dedupe", str(export_file)])
+        console.print.assert_called_with(
+            "[bold green]✓[/bold green] Imported 0 tasks (skipped 2 duplicates)"
+        )
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--file", copy_file, "import", str(tmp_path / "tasks.xml")])
+
+    def test_profile_reports_phases(self, cli, tmp_path, monkeypatch, capsys):
+        """Test that --profile and $TUIDO_TRACE print phase timings to stderr."""
+        task_cli, _ = cli
+        task_file = str(tmp_path / "tasks.json")
+
+        task_cli.run(["--profile", "--file", task_file, "add", "Profiled"])
+
+        report = capsys.readouterr().err
+        assert re.search(r"^add +\d", report, re.M)
+        assert re.search(r"^  save +\d", report, re.M)
+        assert re.search(r"^    write +\d", report, re.M)
+
+        monkeypatch.setenv("TUIDO_TRACE", str(tmp_path / "list.prof"))
+        task_cli.run(["--file", task_file, "list"])
+
+        assert re.search(r"^  render +\d", capsys.readouterr().err, re.M)
+        assert (tmp_path / "list.prof").exists()
+
+    def test_archive_and_list_all(self, cli, tmp_path, monkeypatch):
+        """Test that archived tasks leave the file but stay listable and searchable."""
+        task_cli, console = cli
+        task_file = tmp_path / "tasks.json"
+        repository = create_repository(task_file)
+        repository.save_data(
+            TaskData(
+                tasks=[
+                    Task(
+                        id=1,
+                        description="Old report",
+                        completed_at="2024-01-05T10:00:00",
+                    ),
+                    Task(id=2, description="Current report"),
+                ],
+                next_id=3,
+            )
+        )
+
+        def listed(*args):
+            console.reset_mock()
+            task_cli.run(["--file", str(task_file), *args])
+            printed = [c.args[0] for c in console.print.call_args_list if c.args]
+            rows = "\n".join(text for text in printed if isinstance(text, str))
+            return [int(task_id) for task_id in re.findall(r"^  (\d+): ", rows, re.M)]
+
+        task_cli.run(["--file", str(task_file), "search", "report"])
+        task_cli.run(["--file", str(task_file), "archive", "--older-than", "30d"])
+
+        assert [task.id for task in repository.load_data().tasks] == [2]
+        assert listed("list") == [2]
+        assert listed("list", "--all") == [2, 1]
+        assert listed("search", "report") == [1, 2]
+
+        monkeypatch.setenv("TUIDO_ARCHIVE_AFTER", "1h")
+        task_cli.run(["--file", str(task_file), "do", "2"])
+        assert [task.id for task in repository.load_data().tasks] == [2]
+
+        monkeypatch.setenv("TUIDO_ARCHIVE_AFTER", "0m")
+        task_cli.run(["--file", str(task_file), "add", "Next"])
+        assert [task.id for task in repository.load_data().tasks] == [3]
+        assert listed("list", "--all", "--completed") == [1, 2]
+
+    def test_migrate_json_to_sqlite(self, cli, tmp_path):
+        """Test migrating a JSON task file into a SQLite database."""
+        task_cli, _ = cli
+        json_file = tmp_path / "tasks.json"
+        task_cli.run(["--file", str(json_file), "add", "Migrate me"])
+
+        task_cli.run(["--file", str(json_file), "migrate", "--to", "sqlite"])
+
+        repository = create_repository(tmp_path / "tasks.db")
+        data = repository.load_data()
+        repository.close()
+        assert [task.description for task in data.tasks] == ["Migrate me"]
+        assert data.next_id == 2
+
+    def test_migrate_refuses_to_drop_links(self, cli, tmp_path):
+        """Test that linked tasks are not migrated to a backend without links."""
+        task_cli, _ = cli
+        json_file = tmp_path / "tasks.json"
+        task_cli.run(["--file", str(json_file), "add", "Release"])
+        task_cli.run(["--file", str(json_file), "add", "Tag", "--parent", "1"])
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--file", str(json_file), "migrate", "--to", "sqlite"])
+        assert not (tmp_path / "tasks.db").exists()
+
+        task_cli.run(["--file", str(json_file), "migrate", "--to", "journal"])
+        data = create_repository(tmp_path / "tasks.journal").load_data()
+        assert data.tasks.get(2).parent_id == 1
+
+    def test_migrate_refuses_to_overwrite(self, cli, tmp_path):
+        """Test that migration does not overwrite an existing destination."""
+        task_cli, _ = cli
+        json_file = tmp_path / "tasks.json"
+        (tmp_path / "tasks.db").write_bytes(b"")
+
+        with pytest.raises(SystemExit):
+            task_cli.run(["--file", str(json_file), "migrate", "--to", "sqlite"])
+
+
+@pytest.mark.parametrize(
+    "task_ids, expected",
+    [
+        ([5], "5"),
+        ([3, 7, 10, 11, 12], "3, 7, 10-12"),
+        ([12, 10, 11], "10-12"),
+        ([], ""),
+    ],
+)
+def test_format_task_ids(task_ids, expected):
+    """Test that ids are sorted and consecutive runs are collapsed."""
+    assert format_task_ids(task_ids) == expected
@@ -1,7 +1,9 @@
 """Unit tests for TaskData class in tuido module."""
 
+import pytest
+
 from tuido.task import Task
-from tuido.task_data import TaskData
+from tuido.task_data import TaskData, TaskList
 
 
 def test_taskdata_default_initialization():
@@ -21,3 +23,104 @@ def test_taskdata_list_isolation():
 
     assert len(data1.tasks) == 1
     assert len(data2.tasks) == 0  # Should not be affected
+
+
+def test_taskdata_wraps_plain_list():
+    """Test that a plain list of tasks is converted into an indexed TaskList."""
+    tasks = [Task(id=1, description="A"), Task(id=2, description="B")]
+    data = TaskData(tasks=tasks)
+
+    assert isinstance(data.tasks, TaskList)
+    assert data.tasks.get(2).description == "B"
+    assert data.tasks == tasks
+
+
+def test_tasklist_remove_id_keeps_order_and_index():
+    """Test that removing by id updates the index and preserves order."""
+    tasks = TaskList(Task(id=task_id, description=str(task_id)) for task_id in range(5))
+
+    removed = tasks.remove_id(2)
+
+    assert removed.id == 2
+    assert tasks.get(2) is None
+    assert tasks.remove_id(2) is None
+    assert [task.id for task in tasks] == [0, 1, 3, 4]
+    assert tasks[2].id == 3
+
+
+def test_tasklist_deleting_the_last_task_clears_positions():
+    """Test that emptying the list by position leaves no stale index."""
+    tasks = TaskList([Task(id=1, description="A")])
+    assert tasks[0].id == 1
+
+    del tasks[0]
+
+    assert len(tasks) == 0
+    assert tasks[:] == []
+    assert tasks.pending() == []
+
+
+def test_tasklist_rejects_duplicate_ids():
+    """Test that appending a task with an existing id raises ValueError."""
+    tasks = TaskList([Task(id=1, description="A")])
+
+    with pytest.raises(ValueError):
+        tasks.append(Task(id=1, description="B"))
+
+
+def test_tasklist_status_views_follow_refresh():
+    """Test that pending/completed views track status changes in list order."""
+    tasks = TaskList(Task(id=task_id, description=str(task_id)) for task_id in range(4))
+
+    for task_id in (3, 1):
+        task = tasks.get(task_id)
+        task.mark_complete()
+        tasks.refresh(task)
+
+    assert [task.id for task in tasks.pending()] == [0, 2]
+    assert [task.id for task in tasks.completed()] == [1, 3]
+
+    task = tasks.get(1)
+    task.mark_pending()
+    tasks.refresh(task)
+
+    assert [task.id for task in tasks.pending()] == [0, 1, 2]
+    assert [task.id for task in tasks.completed()] == [3]
+
+
+def test_taskdata_tracks_changes_since_load():
+    """Test that appends, refreshes and removals are recorded and merged."""
+    data = TaskData(
+        tasks=[Task(id=task_id, description=str(task_id)) for task_id in range(3)],
+        next_id=3,
+    )
+    assert not data.dirty
+
+    added = Task(id=3, description="3")
+    data.tasks.append(added)
+    data.next_id += 1
+    done = data.tasks.get(1)
+    done.mark_complete()
+    data.tasks.refresh(done)
+    data.tasks.refresh(added)
+    short_lived = Task(id=4, description="4")
+    data.tasks.append(short_lived)
+    data.tasks.remove_id(4)
+    removed = data.tasks.remove_id(0)
+
+    assert data.dirty
+    assert data.changes() == ([added], [done], [removed], 1, False)
+
+    data.mark_saved()
+
+    assert not data.dirty
+    assert data.changes() == ([], [], [], 0, False)
+
+
+def test_taskdata_positional_edits_need_a_rewrite():
+    """Test that replacing tasks by position is recorded as a full rewrite."""
+    data = TaskData(tasks=[Task(id=1, description="A"), Task(id=2, description="B")])
+    del data.tasks[0]
+
+    assert data.dirty
+    assert data.changes().rewrite
@@ -0,0 +1,152 @@
+"""Unit tests for the machine-readable task formats in tuido.task_formats."""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from tuido.task import Task
+from tuido.task_formats import (
+    FIELDS,
+    FORMATS,
+    TaskFormatError,
+    format_for_path,
+    read_tasks,
+    write_tasks,
+)
+
+
+@pytest.fixture
+def tasks():
+    """A completed task and a pending one with links and awkward characters."""
+    return [
+        Task(1, "Plan", datetime(2024, 5, 1, 9), datetime(2024, 5, 2, 17, 30)),
+        Task(
+            2,
+            'Ship "v2", then\nrelax\t☕',
+            datetime(2024, 5, 3, 8),
+            parent_id=1,
+            blocked_by=[1, 3],
+        ),
+    ]
+
+
+def test_jsonl_writes_one_object_per_line(tasks):
+    """Every line is a JSON object with the same fields and ISO timestamps."""
+    output = io.StringIO()
+
+    assert write_tasks(tasks, "jsonl", output, chunk_size=1) == 2
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [list(record) for record in records] == [FIELDS, FIELDS]
+    assert records[0] == {
+        "id": 1,
+        "description": "Plan",
+        "created_at": "2024-05-01T09:00:00",
+        "completed_at": "2024-05-02T17:30:00",
+        "parent_id": None,
+        "blocked_by": [],
+    }
+    assert records[1]["description"] == tasks[1].description
+    assert (records[1]["parent_id"], records[1]["blocked_by"]) == (1, [1, 3])
+
+
+@pytest.mark.parametrize(
+    "output_format, dialect", [("csv", "excel"), ("tsv", "excel-tab")]
+)
+def test_csv_and_tsv_start_with_a_header(tasks, output_format, dialect):
+    """Rows follow a header, with empty cells for missing values."""
+    output = io.StringIO()
+
+    write_tasks(tasks, output_format, output)
+
+    rows = list(csv.reader(io.StringIO(output.getvalue()), dialect))
+    assert rows == [
+        FIELDS,
+        ["1", "Plan", "2024-05-01T09:00:00", "2024-05-02T17:30:00", "", ""],
+        ["2", tasks[1].description, "2024-05-03T08:00:00", "", "1", "1 3"],
+    ]
+
+
+def test_no_tasks_writes_only_the_header():
+    """An empty listing is empty JSON Lines, or just the CSV header."""
+    output = io.StringIO()
+    assert write_tasks([], "jsonl", output) == 0
+    assert output.getvalue() == ""
+
+    write_tasks([], "csv", output)
+    assert output.getvalue() == ",".join(FIELDS) + "\n"
+
+
+@pytest.mark.parametrize("file_format", ["jsonl", "csv", "tsv"])
+def test_written_tasks_read_back_unchanged(tasks, file_format):
+    """Tasks keep their ids, timestamps and links through every record format."""
+    output = io.StringIO()
+    write_tasks(tasks, file_format, output)
+
+    assert list(read_tasks(io.StringIO(output.getvalue()), file_format, 1)) == tasks
+
+
+def test_todo_txt_round_trip(tasks):
+    """todo.txt keeps status, dates and priority, with ids numbered by line."""
+    tasks[1].description = "(A) Call +family @phone"
+    output = io.StringIO()
+    write_tasks(tasks, "todotxt", output)
+
+    assert output.getvalue() == (
+        "x 2024-05-02 2024-05-01 Plan\n(A) 2024-05-03 Call +family @phone\n"
+    )
+    plan, call = read_tasks(io.StringIO("\n" + output.getvalue()), "todotxt")
+    assert (plan.id, plan.completed_at, plan.created_at) == (
+        2,
+        datetime(2024, 5, 2),
+        datetime(2024, 5, 1),
+    )
+    assert (call.id, call.description, call.completed_at) == (
+        3,
+        tasks[1].description,
+        None,
+    )
+
+
+def test_records_may_leave_out_optional_fields():
+    """Only the description is required; records are numbered by line."""
+    (task,) = read_tasks(io.StringIO("Note,description\nignored,Buy milk\n"), "csv")
+    assert (task.id, task.description, task.linked) == (2, "Buy milk", False)
+
+    (task,) = read_tasks(
+        io.StringIO(
+            '\n{"description": "Zoned", ' '"created_at": "2024-05-01T09:00:00+00:00"}\n'
+        ),
+        "jsonl",
+    )
+    assert task.id == 2
+    assert task.created_at.tzinfo is None
+
+
+@pytest.mark.parametrize(
+    "file_format, text, message",
+    [
+        ("jsonl", '{"description": "Fine"}\n{"description": \n', "Line 2"),
+        ("jsonl", '{"description": "Fine"}\n\n[1]\n', "Line 3: expected a JSON"),
+        ("jsonl", '{"description": "x", "created_at": "soon"}\n', "Line 1"),
+        ("csv", "id,description\n1,Fine\nx,Bad id\n", "Line 3"),
+        ("csv", "id,text\n1,No description\n", "no description column"),
+        ("todotxt", "2024-02-30 Not a day\n", "Line 1"),
+    ],
+)
+def test_unreadable_records_name_their_line(file_format, text, message):
+    """Errors say which line of the file could not be read."""
+    with pytest.raises(TaskFormatError, match=message):
+        list(read_tasks(io.StringIO(text), file_format))
+
+
+def test_format_for_path():
+    """Formats are recognized from file extensions."""
+    assert [
+        format_for_path(f"tasks.{ext}") for ext in ["jsonl", "CSV", "tsv", "txt"]
+    ] == FORMATS
+    assert format_for_path("tasks.json") is None
+    assert format_for_path(None) is None
@@ -0,0 +1,90 @@
+"""Unit tests for the task link indexes in tuido.task_graph."""
+
+import pytest
+
+from tuido.task import Task
+from tuido.task_data import TaskList
+from tuido.task_graph import TaskLinkError
+
+
+@pytest.fixture
+def tasks():
+    """A release (1) with two subtasks, where tagging (3) waits for notes (2)."""
+    return TaskList(
+        [
+            Task(1, "Release"),
+            Task(2, "Write notes", parent_id=1),
+            Task(3, "Tag", parent_id=1, blocked_by=[2]),
+            Task(4, "Announce", blocked_by=[3, 99]),
+        ]
+    )
+
+
+def test_graph_indexes_links_both_ways(tasks):
+    """Children and dependents are found from the task they point at."""
+    graph = tasks.graph
+
+    assert graph.children(1) == [2, 3]
+    assert sorted(graph.descendants(1)) == [2, 3]
+    assert graph.dependents(2) == [3]
+    assert graph.blocked() == {3, 4}
+    assert [task.id for task in tasks.ready()] == [1, 2]
+
+
+def test_ready_set_follows_status_changes(tasks):
+    """Completing and reopening a blocker moves only the tasks it blocks."""
+    tasks.graph  # pylint: disable=pointless-statement
+    notes, tag = tasks.get(2), tasks.get(3)
+
+    notes.mark_complete()
+    tasks.refresh(notes)
+    assert [task.id for task in tasks.ready()] == [1, 3]
+
+    tag.mark_complete()
+    tasks.refresh(tag)
+    assert [task.id for task in tasks.ready()] == [1, 4]
+
+    notes.mark_pending()
+    tasks.refresh(notes)
+    assert [task.id for task in tasks.ready()] == [1, 2, 4]
+    assert tasks.graph.blocked() == {3}
+
+
+def test_graph_follows_added_removed_and_relinked_tasks(tasks):
+    """Tasks added, removed or relinked after the graph is built are indexed."""
+    graph = tasks.graph
+
+    tasks.append(Task(99, "Book venue"))
+    assert graph.is_blocked(4)
+
+    tasks.remove_id(3)
+    tasks.remove_id(99)
+    assert graph.children(1) == [2]
+    assert graph.blocked() == set()
+
+    announce = tasks.get(4)
+    announce.parent_id, announce.blocked_by = 2, (1,)
+    tasks.mark_changed(announce)
+    assert graph.children(2) == [4]
+    assert sorted(graph.descendants(1)) == [2, 4]
+    assert graph.blocked() == {4}
+    assert graph.dependents(3) == []
+
+
+def test_links_to_missing_or_cyclic_tasks_are_rejected(tasks):
+    """Checks catch missing tasks, self-links and cycles."""
+    graph = tasks.graph
+
+    with pytest.raises(TaskLinkError, match="Task 7 not found"):
+        graph.check_parent(4, 7)
+    with pytest.raises(TaskLinkError, match="own parent"):
+        graph.check_parent(1, 1)
+    with pytest.raises(TaskLinkError, match="Task 3 is a subtask of task 1"):
+        graph.check_parent(1, 3)
+    with pytest.raises(TaskLinkError, match="cannot block itself"):
+        graph.check_blockers(2, [2])
+    with pytest.raises(TaskLinkError, match="Task 4 is already waiting for task 2"):
+        graph.check_blockers(2, [4])
+
+    graph.check_parent(4, 3)
+    graph.check_blockers(2, [1])
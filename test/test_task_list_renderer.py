@@ -0,0 +1,39 @@
+"""Unit tests for the TaskListRenderer class in the tuido module."""
+
+from unittest.mock import Mock
+
+from tuido.task import Task
+from tuido.task_list_renderer import TaskListRenderer
+
+
+def test_render_section_writes_in_chunks():
+    """Test that rows are written in batches of chunk_size lines."""
+    console = Mock()
+    renderer = TaskListRenderer(console, chunk_size=4)
+    tasks = [Task(id=task_id, description=f"Task {task_id}") for task_id in range(6)]
+
+    rows = renderer.render_section("TITLE", iter(tasks))
+
+    assert rows == 6
+    chunks = [call.args[0].splitlines() for call in console.print.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [4, 3]
+    assert chunks[0][0] == "TITLE"
+
+
+def test_render_section_skips_title_when_empty():
+    """Test that an empty section prints nothing at all."""
+    console = Mock()
+
+    assert TaskListRenderer(console).render_section("TITLE", []) == 0
+    console.print.assert_not_called()
+
+
+def test_format_task_shows_status():
+    """Test that pending rows show when they were added and completed rows when done."""
+    renderer = TaskListRenderer(Mock())
+    task = Task(id=7, description="Ship it")
+
+    assert renderer.format_task(task).startswith("  7: Ship it  [dim](added ")
+
+    task.mark_complete()
+    assert "(completed " in renderer.format_task(task)
@@ -1,10 +1,16 @@
 """Unit tests for the TaskManager class in the tuido module."""
 
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
-from tuido.task_manager import TaskManager
+from tuido import task_manager as task_manager_module
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_graph import TaskLinkError
+from tuido.task_manager import MAX_SAVE_ATTEMPTS, TaskManager
+from tuido.task_repository import ConcurrentModificationError, TaskRepository
+from tuido.task_stats import TaskStats
 
 
 class MockData:
@@ -15,7 +21,6 @@ class MockData:
         self.tasks = []
         self.next_id = 1
 
-
     @pytest.fixture
     def task_manager(self):
         """Fixture to create a TaskManager instance with a mock repository."""
@@ -23,7 +28,6 @@ class MockData:
         repo.load_data.return_value = MockData()
         return TaskManager(repo)
 
-
     def test_add_task(self):
         """Test adding a new task to the task manager."""
         task = self.task_manager.add_task("Test task")
@@ -32,7 +36,6 @@ class MockData:
         assert task.description == "Test task"
         assert len(self.task_manager.all_tasks()) == 1
 
-
     def test_delete_task(self):
         """Test deleting a task from the task manager."""
         task = self.task_manager.add_task("Task to delete")
@@ -41,7 +44,6 @@ class MockData:
         assert len(self.task_manager.all_tasks()) == 0
         assert self.task_manager.delete_task(999) is None
 
-
     def test_complete_task(self):
         """Test marking a task as complete."""
         task = self.task_manager.add_task("Task to complete")
@@ -50,7 +52,6 @@ class MockData:
         assert task.is_complete() is True
         assert self.task_manager.set_task_complete(task.id) is False  # Already complete
 
-
     def test_pending_task(self):
         """Test marking a task as pending."""
         task = self.task_manager.add_task("Task to make pending")
@@ -60,7 +61,6 @@ class MockData:
         assert task.is_complete() is False
         assert self.task_manager.set_task_pending(task.id) is False  # Already pending
 
-
     def test_all_tasks(self):
         """Test retrieving all tasks from the task manager."""
         assert self.task_manager.all_tasks() == []
@@ -72,3 +72,415 @@ class MockData:
         assert len(tasks) == 2
         assert task1 in tasks
         assert task2 in tasks
+
+
+def mock_repository(**attributes):
+    """Create a mock repository whose storage is never changed externally."""
+    repo = MagicMock(**attributes)
+    repo.has_changed.return_value = False
+    repo.save_changes.side_effect = lambda tasks, delta: TaskRepository.save_changes(
+        repo, tasks, delta
+    )
+    return repo
+
+
+class TestTaskManagerViews:
+    """Tests for the indexed lookups and status views of TaskManager."""
+
+    @pytest.fixture
+    def task_manager(self):
+        """Fixture to create a TaskManager backed by an in-memory TaskData."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+        return TaskManager(repo)
+
+    def test_status_views(self, task_manager):
+        """Test that pending and completed views follow task status."""
+        first = task_manager.add_task("First")
+        second = task_manager.add_task("Second")
+
+        task_manager.set_task_complete(first.id)
+
+        assert task_manager.pending_tasks() == [second]
+        assert task_manager.completed_tasks() == [first]
+
+        task_manager.set_task_pending(first.id)
+
+        assert task_manager.pending_tasks() == [first, second]
+        assert task_manager.completed_tasks() == []
+
+    def test_delete_removes_from_views(self, task_manager):
+        """Test that deleting a task removes it from the index and views."""
+        task = task_manager.add_task("Delete me")
+
+        assert task_manager.delete_task(task.id) is task
+        assert task_manager.delete_task(task.id) is None
+        assert task_manager.pending_tasks() == []
+        task_manager.repository.delete_task.assert_called_once()
+
+
+class TestTaskManagerLinks:
+    """Tests for subtasks and blocked-by links in TaskManager."""
+
+    @pytest.fixture
+    def task_manager(self):
+        """Fixture with a release (1), its subtasks 2 and 3, and 3 waiting for 2."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+        manager.add_task("Release")
+        manager.add_task("Write notes", parent_id=1)
+        manager.add_task("Tag", parent_id=1, blocked_by=[2])
+        return manager
+
+    def test_ready_tasks_follow_completion(self, task_manager):
+        """Test that completing a blocker makes the tasks it blocks ready."""
+        assert [task.id for task in task_manager.ready_tasks()] == [1, 2]
+
+        task_manager.set_task_complete(2)
+        assert [task.id for task in task_manager.ready_tasks()] == [1, 3]
+
+        task_manager.set_task_pending(2)
+        assert [task.id for task in task_manager.ready_tasks()] == [1, 2]
+
+    def test_completing_a_parent_completes_subtasks(self, task_manager):
+        """Test that completing a task cascades to all of its subtasks."""
+        task_manager.set_parent(2, 3)
+
+        assert task_manager.complete_many([1]) == {1: True}
+        assert task_manager.pending_tasks() == []
+
+    def test_links_are_validated(self, task_manager):
+        """Test that missing tasks and cycles are rejected without saving."""
+        task_manager.repository.reset_mock()
+
+        with pytest.raises(TaskLinkError):
+            task_manager.add_task("Orphan", parent_id=99)
+        with pytest.raises(TaskLinkError):
+            task_manager.set_parent(1, 3)
+        with pytest.raises(TaskLinkError):
+            task_manager.block(2, [3])
+
+        task_manager.repository.save_changes.assert_not_called()
+        assert task_manager.data.next_id == 4
+
+    def test_block_and_unblock(self, task_manager):
+        """Test that blockers are added once and can be removed again."""
+        task_manager.block(1, [2, 3, 2])
+        assert task_manager.get_task(1).blocked_by == (2, 3)
+        assert [task.id for task in task_manager.ready_tasks()] == [2]
+
+        task_manager.unblock(1, [3, 2])
+        assert task_manager.get_task(1).blocked_by == ()
+        assert task_manager.block(99, [1]) is None
+
+    def test_delete_moves_links_to_the_deleted_task(self, task_manager):
+        """Test that deleting a task reparents its subtasks and unblocks others."""
+        task_manager.set_parent(1, None)
+        task_manager.add_task("Release party", parent_id=3)
+
+        task_manager.delete_task(2)
+        assert task_manager.get_task(3).blocked_by == ()
+
+        task_manager.delete_task(3)
+        assert task_manager.get_task(4).parent_id == 1
+        assert task_manager.subtasks(1) == [task_manager.get_task(4)]
+
+    def test_stats_follow_every_change(self, task_manager):
+        """Test that stats kept on each change match stats computed afresh."""
+        task_manager.data.stats = None
+        task_manager.set_task_complete(1)
+        task_manager.set_task_pending(2)
+        task_manager.add_task("Announce")
+        task_manager.delete_task(3)
+
+        stats = task_manager.stats()
+        assert stats is task_manager.data.stats
+        assert stats == TaskStats.from_tasks(task_manager.all_tasks())
+        assert (stats.pending, stats.completed) == (2, 1)
+
+    def test_repositories_without_links_refuse_them(self):
+        """Test that links are refused when the repository cannot save them."""
+        repo = mock_repository(stores_links=False)
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+        manager.add_task("Release")
+
+        with pytest.raises(TaskLinkError, match="cannot be saved"):
+            manager.add_task("Tag", blocked_by=[1])
+
+
+class TestTaskManagerBatch:
+    """Tests for the bulk TaskManager operations."""
+
+    @pytest.fixture
+    def task_manager(self):
+        """Fixture to create a TaskManager with three pending tasks."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+        manager.add_many(["One", "Two", "Three"])
+        repo.reset_mock()
+        return manager
+
+    def test_add_many_saves_once(self, task_manager):
+        """Test that add_many assigns consecutive ids and saves once."""
+        tasks = task_manager.add_many(["Four", "Five"])
+
+        assert [task.id for task in tasks] == [4, 5]
+        task_manager.repository.save_batch.assert_called_once()
+
+    def test_import_tasks_renumbers_tasks_and_links(self, task_manager):
+        """Test that imported tasks get new ids, links follow them, and one save."""
+        imported = task_manager.import_tasks(
+            [
+                Task(10, "Release"),
+                Task(11, "Notes", parent_id=10, blocked_by=[12, 99]),
+                Task(12, "Tag", parent_id=98),
+            ]
+        )
+
+        assert [task.id for task in imported] == [4, 5, 6]
+        assert (imported[1].parent_id, imported[1].blocked_by) == (4, (6,))
+        assert imported[2].parent_id is None
+        assert task_manager.data.next_id == 7
+        assert task_manager.stats().pending == 6
+        task_manager.repository.save_batch.assert_called_once()
+
+    def test_import_tasks_dedupe(self, task_manager):
+        """Test that dedupe skips known descriptions and relinks to the kept task."""
+        imported = task_manager.import_tasks(
+            [Task(1, "Two"), Task(2, "Four", blocked_by=[1]), Task(3, "Four")],
+            dedupe=True,
+        )
+
+        assert [(task.id, task.description) for task in imported] == [(4, "Four")]
+        assert imported[0].blocked_by == (2,)
+
+    @pytest.mark.parametrize(
+        "tasks",
+        [
+            [Task(1, "A", parent_id=2), Task(2, "B", parent_id=1)],
+            [Task(3, "C", blocked_by=[4]), Task(4, "D", blocked_by=[3])],
+            [
+                Task(5, "E", blocked_by=[7]),
+                Task(6, "F", blocked_by=[5]),
+                Task(7, "G", blocked_by=[6]),
+            ],
+        ],
+    )
+    def test_import_tasks_refuses_cycles(self, task_manager, tasks):
+        """Test that links forming a cycle fail the import and change nothing."""
+        repo = task_manager.repository
+        repo.load_data.side_effect = lambda: TaskData(tasks=[Task(1, "One")])
+
+        with pytest.raises(TaskLinkError, match="form a cycle"):
+            task_manager.import_tasks(tasks)
+
+        repo.save_batch.assert_not_called()
+        assert [task.id for task in task_manager.all_tasks()] == [1]
+
+    def test_import_tasks_reads_an_iterator_once(self, task_manager, monkeypatch):
+        """Test that a retried import adds the tasks again without rereading."""
+        monkeypatch.setattr(task_manager_module, "IMPORT_CHUNK_SIZE", 2)
+        repo = task_manager.repository
+        repo.load_data.return_value = None
+        repo.load_data.side_effect = lambda: TaskData(
+            tasks=[Task(1, "One"), Task(2, "Two"), Task(3, "Three")], next_id=4
+        )
+        repo.save_batch.side_effect = [ConcurrentModificationError, None]
+        read = []
+
+        def tasks():
+            for task_id in (7, 8, 9):
+                read.append(task_id)
+                yield Task(task_id, f"Task {task_id}", blocked_by=[task_id + 1])
+
+        imported = task_manager.import_tasks(tasks())
+
+        assert read == [7, 8, 9]
+        assert [(task.id, task.blocked_by) for task in imported] == [
+            (4, (5,)),
+            (5, (6,)),
+            (6, ()),
+        ]
+        assert repo.save_batch.call_count == 2
+        assert task_manager.data.next_id == 7
+
+    def test_import_tasks_saves_nothing_if_reading_fails(
+        self, task_manager, monkeypatch
+    ):
+        """Test that an error partway through the tasks discards them all."""
+        monkeypatch.setattr(task_manager_module, "IMPORT_CHUNK_SIZE", 1)
+        repo = task_manager.repository
+        repo.load_data.side_effect = lambda: TaskData(tasks=[Task(1, "One")])
+
+        def tasks():
+            yield Task(1, "Read")
+            raise ValueError("bad record")
+
+        with pytest.raises(ValueError):
+            task_manager.import_tasks(tasks())
+
+        repo.save_batch.assert_not_called()
+        assert [task.description for task in task_manager.all_tasks()] == ["One"]
+
+    def test_complete_many_reports_per_id(self, task_manager):
+        """Test that complete_many reports each id and saves once."""
+        task_manager.set_task_complete(2)
+        task_manager.repository.reset_mock()
+
+        results = task_manager.complete_many([1, 2, 3, 99])
+
+        assert results == {1: True, 2: False, 3: True, 99: False}
+        task_manager.repository.save_batch.assert_called_once()
+        assert task_manager.pending_tasks() == []
+
+    def test_pending_many(self, task_manager):
+        """Test that pending_many only reverts completed tasks."""
+        task_manager.complete_many([1])
+
+        assert task_manager.pending_many([1, 2]) == {1: True, 2: False}
+
+    def test_delete_many(self, task_manager):
+        """Test that delete_many returns deleted tasks and None for misses."""
+        results = task_manager.delete_many([1, 3, 99])
+
+        assert results[1].description == "One"
+        assert results[3].description == "Three"
+        assert results[99] is None
+        assert [task.id for task in task_manager.all_tasks()] == [2]
+        task_manager.repository.save_batch.assert_called_once()
+
+    def test_nothing_to_save(self, task_manager):
+        """Test that a batch with no successful ids does not save."""
+        task_manager.delete_many([99])
+        task_manager.complete_many([99])
+
+        task_manager.repository.save_batch.assert_not_called()
+
+
+class TestTaskManagerReads:
+    """Tests for paged reads through TaskManager."""
+
+    def test_data_is_loaded_lazily(self):
+        """Test that creating a TaskManager does not load the repository."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+
+        manager = TaskManager(repo)
+        repo.load_data.assert_not_called()
+
+        manager.all_tasks()
+        repo.load_data.assert_called_once()
+
+    def test_indexed_repository_answers_reads(self):
+        """Test that indexed repositories serve pages without a full load."""
+        repo = mock_repository(indexed=True)
+        repo.iter_tasks.return_value = iter([])
+        repo.count_tasks.return_value = 0
+        manager = TaskManager(repo)
+
+        list(manager.iter_tasks(False, 10, 5))
+        manager.count_tasks(True)
+
+        repo.iter_tasks.assert_called_once_with(False, 10, 5)
+        repo.count_tasks.assert_called_once_with(True)
+        repo.load_data.assert_not_called()
+
+    def test_in_memory_pages(self):
+        """Test that loaded data is paged from the status views."""
+        repo = mock_repository(indexed=False)
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+        manager.add_many(["A", "B", "C", "D"])
+        manager.complete_many([2])
+
+        assert [task.id for task in manager.iter_tasks(False, 1, 1)] == [3]
+        assert manager.count_tasks(False) == 3
+        assert manager.count_tasks() == 4
+
+
+class TestTaskManagerTransactions:
+    """Tests for locking and conflict handling in TaskManager writes."""
+
+    def test_writes_hold_the_repository_lock(self):
+        """Test that each write runs inside the repository lock."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+
+        manager.add_task("Locked")
+
+        repo.lock.return_value.__enter__.assert_called_once()
+        repo.lock.return_value.__exit__.assert_called_once()
+
+    def test_reloads_when_storage_changed(self):
+        """Test that data changed by another process is reloaded before a write."""
+        repo = mock_repository()
+        repo.load_data.side_effect = [
+            TaskData(),
+            TaskData(tasks=[Task(id=1, description="Theirs")], next_id=2),
+        ]
+        manager = TaskManager(repo)
+        manager.all_tasks()
+        repo.has_changed.return_value = True
+
+        task = manager.add_task("Mine")
+
+        assert task.id == 2
+        assert [task.description for task in manager.all_tasks()] == ["Theirs", "Mine"]
+
+    def test_retries_after_conflict(self):
+        """Test that a conflicting save is retried against fresh data."""
+        repo = mock_repository()
+        repo.load_data.side_effect = [
+            TaskData(),
+            TaskData(tasks=[Task(id=1, description="Theirs")], next_id=2),
+        ]
+        repo.insert_task.side_effect = [ConcurrentModificationError, None]
+        manager = TaskManager(repo)
+
+        task = manager.add_task("Mine")
+
+        assert task.id == 2
+        assert repo.insert_task.call_count == 2
+
+    def test_gives_up_after_repeated_conflicts(self):
+        """Test that persistent conflicts are eventually raised."""
+        repo = mock_repository()
+        repo.load_data.side_effect = lambda: TaskData()
+        repo.insert_task.side_effect = ConcurrentModificationError
+        manager = TaskManager(repo)
+
+        with pytest.raises(ConcurrentModificationError):
+            manager.add_task("Never saved")
+
+        assert repo.insert_task.call_count == MAX_SAVE_ATTEMPTS
+
+    def test_no_op_does_not_write(self):
+        """Test that an operation that changes nothing never saves."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData(
+            tasks=[Task(id=1, description="Done", completed_at=1700000000)], next_id=2
+        )
+        manager = TaskManager(repo)
+
+        assert manager.set_task_complete(1) is False
+        assert manager.set_task_pending(99) is False
+        assert manager.delete_task(99) is None
+
+        repo.save_changes.assert_not_called()
+
+    def test_saves_only_the_changes_since_the_last_save(self):
+        """Test that each save is handed only what changed since the previous one."""
+        repo = mock_repository()
+        repo.load_data.return_value = TaskData()
+        manager = TaskManager(repo)
+        first = manager.add_task("First")
+        manager.set_task_complete(first.id)
+
+        assert [call.args[1] for call in repo.save_changes.call_args_list] == [
+            ([first], [], [], 1, False),
+            ([], [first], [], 0, False),
+        ]
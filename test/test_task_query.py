@@ -0,0 +1,101 @@
+"""Tests for task queries and their push-down into repositories."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from tuido.repository_factory import create_repository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+
+START = datetime(2024, 5, 1, 9, 0)
+
+
+def day(number: int) -> datetime:
+    """Return the start time plus ``number`` days."""
+    return START + timedelta(days=number)
+
+
+def sample_tasks() -> list[Task]:
+    """Tasks created on days 0-5; tasks 2, 4 and 5 completed out of order."""
+    descriptions = ["Fix login", "Write docs", "fix typo", "100% done", "Deploy", "x_y"]
+    completed = {2: day(9), 4: day(7), 5: day(8)}
+    return [
+        Task(
+            id=task_id,
+            description=description,
+            created_at=day(task_id - 1),
+            completed_at=completed.get(task_id),
+        )
+        for task_id, description in enumerate(descriptions, start=1)
+    ]
+
+
+QUERIES = [
+    (TaskQuery(), [1, 2, 3, 4, 5, 6]),
+    (TaskQuery(completed=True), [2, 4, 5]),
+    (TaskQuery(completed=False, offset=1, limit=1), [3]),
+    (TaskQuery(match="FIX"), [1, 3]),
+    (TaskQuery(match="%"), [4]),
+    (TaskQuery(match="_"), [6]),
+    (TaskQuery(completed=True, since=day(8)), [2, 5]),
+    (TaskQuery(completed=False, since=day(2), until=day(5)), [3]),
+    (TaskQuery(since=day(5)), [2, 4, 5, 6]),
+    (TaskQuery(sort="completed"), [4, 5, 2, 1, 3, 6]),
+    (TaskQuery(sort="completed", offset=1, limit=2), [5, 2]),
+    (TaskQuery(completed=True, sort="created", limit=2), [2, 4]),
+]
+
+
+class TestTaskQuery:
+    """Every backend answers queries the same way."""
+
+    @pytest.fixture(
+        params=[
+            ("tasks.json", None),
+            ("tasks.json", "json-compact"),
+            ("tasks.db", None),
+            ("tasks.journal", None),
+            ("tasks.tuido", None),
+        ]
+    )
+    def repository(self, request, tmp_path):
+        """Fixture for each backend holding the sample tasks."""
+        file_name, backend = request.param
+        repository = create_repository(tmp_path / file_name, backend)
+        repository.save_data(TaskData(tasks=sample_tasks(), next_id=7))
+        yield repository
+        if hasattr(repository, "close"):
+            repository.close()
+
+    @pytest.mark.parametrize("query, expected_ids", QUERIES)
+    def test_repository_queries(self, repository, query, expected_ids):
+        """Repositories filter, sort and page in storage."""
+        assert [task.id for task in repository.query_tasks(query)] == expected_ids
+        paging = query._replace(offset=0, limit=None)
+        assert repository.count_matching(query) == len(
+            list(repository.query_tasks(paging))
+        )
+
+    @pytest.mark.parametrize("query, expected_ids", QUERIES)
+    def test_loaded_manager_queries(self, repository, query, expected_ids):
+        """Tasks already in memory are filtered the same way."""
+        manager = TaskManager(repository)
+        manager.all_tasks()
+
+        assert [task.id for task in manager.query_tasks(query)] == expected_ids
+
+
+def test_query_params_round_trip():
+    """Queries survive conversion to JSON-RPC params."""
+    query = TaskQuery(completed=True, since=day(1), match="fix", sort="created")
+
+    assert TaskQuery.from_params(query.to_params()) == query
+
+
+def test_unknown_sort_key():
+    """Only known sort keys are accepted."""
+    with pytest.raises(ValueError):
+        TaskQuery.from_params({"sort": "priority"})
@@ -0,0 +1,194 @@
+"""Tests for the tuido serve daemon and its client."""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from tuido.daemon_client import DaemonClient, DaemonError, connect, socket_path
+from tuido.deferred_repository import DeferredRepository
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.sqlite_task_repository import SqliteTaskRepository
+from tuido.task import Task
+from tuido.task_cli import TaskCLI
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_graph import TaskLinkError
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_server import METHOD_NOT_FOUND, TaskServer
+
+
+class TestDeferredRepository:
+    """Tests for coalescing writes in DeferredRepository."""
+
+    @pytest.fixture
+    def buffer(self):
+        """Fixture wrapping a mock repository."""
+        return DeferredRepository(Mock())
+
+    def test_changes_are_merged_into_one_batch(self, buffer):
+        """Adding then completing a task writes a single insert."""
+        data = TaskData()
+        task = Task(id=1, description="One")
+        kept = Task(id=2, description="Two")
+        buffer.insert_task(data, task)
+        buffer.update_task(data, task)
+        buffer.update_task(data, kept)
+
+        assert buffer.flush(data)
+        buffer.repository.save_changes.assert_called_once_with(
+            data, TaskDelta(inserted=[task], updated=[kept], deleted=[])
+        )
+
+    def test_added_then_deleted_task_is_not_written(self, buffer):
+        """A task deleted before the flush never reaches the repository."""
+        data = TaskData()
+        task = Task(id=1, description="Short-lived")
+        buffer.insert_task(data, task)
+        buffer.delete_task(data, task)
+        buffer.flush(data)
+
+        buffer.repository.save_changes.assert_called_once_with(
+            data, TaskDelta(inserted=[], updated=[], deleted=[])
+        )
+
+    def test_nothing_to_flush(self, buffer):
+        """Flushing without changes does not write."""
+        assert not buffer.flush(TaskData())
+        buffer.repository.save_changes.assert_not_called()
+
+    def test_links_are_refused_for_wrapped_backend(self, tmp_path):
+        """Link checks see the wrapped repository's file and capabilities."""
+        repository = SqliteTaskRepository(tmp_path / "tasks.db")
+        buffer = DeferredRepository(repository)
+        manager = TaskManager(buffer)
+        manager.add_task("One")
+
+        assert buffer.file_path == repository.file_path
+        assert buffer.storage_paths() == repository.storage_paths()
+        with pytest.raises(TaskLinkError, match="tasks.db"):
+            manager.add_task("Two", blocked_by=[1])
+
+
+class TestTaskServer:
+    """End-to-end tests against a daemon running in a thread."""
+
+    @pytest.fixture
+    def task_file(self, tmp_path, monkeypatch):
+        """Fixture for a task file whose daemon socket lives under tmp_path."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        return tmp_path / "tasks.json"
+
+    @pytest.fixture
+    def server(self, task_file):
+        """Fixture running a daemon for the task file until the test ends."""
+        server = TaskServer(JsonTaskRepository(task_file))
+        server.bind()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield server
+        with DaemonClient(server.path) as client:
+            client.call("shutdown")
+        thread.join(timeout=5)
+
+    def test_socket_path_is_per_file(self, task_file):
+        """Different task files get different sockets."""
+        assert socket_path(task_file) != socket_path(task_file.with_name("b.json"))
+        assert socket_path(task_file).parent.parent == task_file.parent
+
+    def test_calls_are_saved(self, server, task_file):
+        """Changes made through the daemon are written to the task file."""
+        remote = connect(task_file)
+        first = remote.add_task("First")
+        remote.add_many(["Second", "Third"])
+
+        assert remote.complete_many([first.id, 99]) == {1: True, 99: False}
+        assert remote.delete_many([2])[2].description == "Second"
+        assert remote.count_tasks() == 2
+        assert [task.id for task in remote.iter_tasks(completed=False)] == [3]
+        query = TaskQuery(match="THIRD", sort="created")
+        assert [task.id for task in remote.query_tasks(query)] == [3]
+        assert remote.count_matching(TaskQuery(completed=True)) == 1
+
+        data = JsonTaskRepository(task_file).load_data()
+        assert [task.id for task in data.tasks] == [1, 3]
+        assert data.tasks[0].is_complete()
+        assert data.next_id == 4
+
+    def test_pipelined_calls(self, server, task_file):
+        """Many requests sent at once are all applied."""
+        with DaemonClient(server.path) as client:
+            results = client.call_many(
+                ("add", {"description": f"Task {index}"}) for index in range(200)
+            )
+
+        assert [result["id"] for result in results] == list(range(1, 201))
+        assert len(JsonTaskRepository(task_file).load_data().tasks) == 200
+
+    def test_errors_are_reported(self, server):
+        """Unknown methods and bad params come back as JSON-RPC errors."""
+        with DaemonClient(server.path) as client:
+            with pytest.raises(DaemonError) as error:
+                client.call("frobnicate")
+            assert error.value.code == METHOD_NOT_FOUND
+
+            with pytest.raises(DaemonError):
+                client.call("complete", ids="1")
+
+            assert client.call("ping") == "pong"
+
+    def test_cli_forwards_to_daemon(self, server, task_file):
+        """The CLI sends commands to a running daemon."""
+        TaskCLI(console=Mock()).run(["--file", str(task_file), "add", "Remote"])
+
+        assert [task.description for task in server.task_manager.all_tasks()] == [
+            "Remote"
+        ]
+
+    def test_cli_writes_records_from_daemon(self, server, task_file, capsys):
+        """--format output is read from a running daemon too."""
+        server.task_manager.add_many(["One", "Two"])
+
+        TaskCLI(console=Mock()).run(
+            ["--file", str(task_file), "list", "--format", "jsonl"]
+        )
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [record["description"] for record in records] == ["One", "Two"]
+
+    def test_second_daemon_is_refused(self, server, task_file):
+        """Only one daemon can serve a task file."""
+        with pytest.raises(RuntimeError):
+            TaskServer(JsonTaskRepository(task_file)).bind()
+
+    def test_shared_socket_directory_is_refused(self, task_file):
+        """The daemon will not listen in a directory others can reach."""
+        directory = socket_path(task_file).parent
+        directory.mkdir(mode=0o755)
+        directory.chmod(0o755)
+
+        with pytest.raises(RuntimeError, match="Refusing"):
+            TaskServer(JsonTaskRepository(task_file)).bind()
+
+    def test_client_ignores_daemon_in_shared_directory(self, server, task_file):
+        """Clients do not connect through a directory others can write to."""
+        connect(task_file).client.close()
+        server.path.parent.chmod(0o777)
+        try:
+            assert connect(task_file) is None
+        finally:
+            server.path.parent.chmod(0o700)
+
+
+def test_connect_without_daemon(tmp_path, monkeypatch):
+    """Without a daemon, connect returns None, even with a stale socket."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    task_file = tmp_path / "tasks.json"
+
+    assert connect(task_file) is None
+
+    path = socket_path(task_file)
+    path.parent.mkdir()
+    path.touch()
+    assert connect(task_file) is None
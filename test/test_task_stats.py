@@ -0,0 +1,71 @@
+"""Unit tests for the summary statistics in tuido.task_stats."""
+
+from datetime import date, datetime
+
+import pytest
+
+from tuido.task import Task
+from tuido.task_stats import TaskStats, percentiles
+
+TODAY = date(2024, 5, 10)
+
+
+@pytest.fixture
+def tasks():
+    """Two pending tasks and three completed over the previous days."""
+    return [
+        Task(1, "Old", datetime(2024, 4, 10, 9), None),
+        Task(2, "New", datetime(2024, 5, 9, 9), None),
+        Task(3, "Quick", datetime(2024, 5, 8, 9), datetime(2024, 5, 8, 17)),
+        Task(4, "Slow", datetime(2024, 5, 1, 9), datetime(2024, 5, 9, 8)),
+        Task(5, "Same day", datetime(2024, 5, 9, 9), datetime(2024, 5, 9, 10)),
+    ]
+
+
+def test_stats_count_tasks_by_day(tasks):
+    """Counters and histograms are keyed by local calendar day."""
+    stats = TaskStats.from_tasks(tasks)
+
+    assert (stats.pending, stats.completed, stats.total) == (2, 3, 5)
+    assert stats.completed_per_day == {"2024-05-08": 1, "2024-05-09": 2}
+    assert stats.pending_per_day == {"2024-04-10": 1, "2024-05-09": 1}
+    assert stats.lead_time_days == {"0": 2, "7": 1}
+
+
+def test_add_and_remove_undo_each_other(tasks):
+    """Removing a task as it was added leaves no empty histogram buckets."""
+    stats = TaskStats.from_tasks(tasks)
+    task = tasks[0]
+
+    stats.remove(task)
+    task.completed_at = datetime(2024, 5, 10, 12)
+    stats.add(task)
+
+    assert stats == TaskStats.from_tasks(tasks)
+    assert "2024-04-10" not in stats.pending_per_day
+    assert TaskStats.from_dict(stats.to_dict()) == stats
+
+
+def test_summary_derives_throughput_and_ages(tasks):
+    """Throughput covers the last days and ages are nearest-rank percentiles."""
+    summary = TaskStats.from_tasks(tasks).summary(days=3, today=TODAY)
+
+    assert summary["completed_per_day"] == {
+        "2024-05-08": 1,
+        "2024-05-09": 2,
+        "2024-05-10": 0,
+    }
+    assert summary["throughput_per_day"] == 1.0
+    assert summary["pending_age_days"] == {"p50": 1, "p90": 30, "p99": 30, "max": 30}
+    assert summary["lead_time_days"] == {"p50": 0, "p90": 7, "p99": 7, "max": 7}
+
+
+def test_percentiles_of_empty_histogram():
+    """An empty histogram has no percentiles."""
+    assert percentiles({}) == {"p50": None, "p90": None, "p99": None, "max": None}
+
+
+def test_invalid_saved_stats_are_rejected():
+    """Stats missing a field cannot be rebuilt."""
+    with pytest.raises(ValueError):
+        TaskStats.from_dict({"pending": 1})
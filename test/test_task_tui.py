@@ -0,0 +1,162 @@
+"""Tests for the full-screen task browser."""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from tuido.deferred_repository import DeferredRepository
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_manager import TaskManager
+from tuido.task_tui import DebouncedSaver, TaskBrowser, TaskTUI
+
+
+class FakeScreen:
+    """Records what would be drawn on a 10x60 terminal."""
+
+    def __init__(self, height: int = 10, width: int = 60) -> None:
+        self.size = (height, width)
+        self.lines: dict[int, str] = {}
+
+    def getmaxyx(self):
+        return self.size
+
+    def erase(self):
+        self.lines.clear()
+
+    def addnstr(self, y, x, text, n, attributes=0):  # pylint: disable=unused-argument
+        self.lines[y] = text[:n]
+
+    def refresh(self):
+        pass
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture for a JSON task file with 1000 tasks; every third is completed."""
+    repository = JsonTaskRepository(tmp_path / "tasks.json")
+    repository.save_data(
+        TaskData(
+            tasks=[
+                Task(
+                    id=task_id,
+                    description=f"Task {task_id}",
+                    created_at=datetime(2024, 5, 1),
+                    completed_at=datetime(2024, 5, 2) if task_id % 3 == 0 else None,
+                )
+                for task_id in range(1, 1001)
+            ],
+            next_id=1001,
+        )
+    )
+    return repository
+
+
+@pytest.fixture
+def browser(repository):
+    """Fixture for a browser whose changes are held in a DeferredRepository."""
+    task_manager = TaskManager(DeferredRepository(repository))
+    return TaskBrowser(task_manager)
+
+
+def test_visible_rows_follow_the_cursor(browser):
+    """Test that only a window of rows around the cursor is returned."""
+    assert [task.id for task in browser.visible(5)] == [1, 2, 3, 4, 5]
+
+    browser.move(7)
+    assert [task.id for task in browser.visible(5)] == [4, 5, 6, 7, 8]
+
+    browser.move(10_000)
+    assert browser.current.id == 1000
+    assert [task.id for task in browser.visible(5)][-1] == 1000
+
+    browser.move(-10_000)
+    assert [task.id for task in browser.visible(5)] == [1, 2, 3, 4, 5]
+
+
+def test_edits_update_rows_and_counts(browser):
+    """Test completing, undoing, deleting and adding from the browser."""
+    browser.move(1)
+    assert browser.toggle() == "Task 2 marked as complete."
+    assert browser.toggle() == "Task 2 marked pending."
+
+    assert browser.delete() == "Deleted task 2."
+    assert browser.current.id == 3
+    assert browser.add("  Write tests ") == "Added task 1001."
+    assert browser.current.description == "Write tests"
+    assert browser.add(" ") == "Task description cannot be empty."
+    assert browser.counts() == (667, 333)
+
+
+def test_pending_only(browser):
+    """Test that the pending filter hides completed tasks as they are done."""
+    browser.move(3)  # task 4
+    browser.toggle_filter()
+
+    assert browser.current.id == 4
+    assert all(not task.is_complete() for task in browser.rows)
+
+    browser.toggle()
+    assert browser.current.id == 5
+    assert 4 not in [task.id for task in browser.rows]
+
+
+def test_saver_writes_a_burst_of_edits_once(repository, browser):
+    """Test that edits are saved together once they pause, then on close."""
+    buffer = browser.task_manager.repository
+    saver = DebouncedSaver(buffer, browser.task_manager, browser.lock, delay=0.05)
+    try:
+        with patch.object(
+            repository, "save_changes", wraps=repository.save_changes
+        ) as save:
+            for _ in range(5):
+                browser.toggle()
+                browser.move(1)
+                saver.touch()
+            deadline = time.monotonic() + 5
+            while saver.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert save.call_count == 1
+            assert len(save.call_args.args[1].updated) == 5
+
+            browser.delete()
+        saver.touch()
+    finally:
+        saver.close()
+
+    tasks = JsonTaskRepository(repository.file_path).load_data().tasks
+    assert len(tasks) == 999
+    # Task 3 was already complete, so toggling it made it pending.
+    assert [task.is_complete() for task in list(tasks)[:5]] == [
+        True,
+        True,
+        False,
+        True,
+        True,
+    ]
+    assert tasks.get(6) is None
+
+
+def test_draw_formats_only_visible_rows(browser):
+    """Test that drawing touches one screen of rows, however many tasks exist."""
+    saver = DebouncedSaver(
+        browser.task_manager.repository, browser.task_manager, threading.Lock()
+    )
+    try:
+        tui = TaskTUI(browser, saver, "tasks.json")
+        screen = FakeScreen()
+        with patch.object(tui, "format_row", wraps=tui.format_row) as format_row:
+            tui.draw(screen)
+
+        assert format_row.call_count == 8
+        assert "667 pending, 333 completed" in screen.lines[0]
+        assert screen.lines[1].startswith("[ ]      1  Task 1")
+        assert screen.lines[3].startswith("[x]      3  Task 3")
+        assert len(screen.lines[1]) == 59
+    finally:
+        saver.close()
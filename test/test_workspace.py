@@ -0,0 +1,157 @@
+"""Tests for workspaces of several task files and their catalog."""
+
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from tuido.json_task_repository import JsonTaskRepository
+from tuido.repository_factory import create_repository
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_query import TaskQuery
+from tuido.workspace import CATALOG_NAME, Workspace, scan_file, search_files
+
+
+def write_tasks(path, *descriptions, completed=()):
+    """Save tasks with the given descriptions; ids in ``completed`` are done."""
+    create_repository(path).save_data(
+        TaskData(
+            tasks=[
+                Task(
+                    id=task_id,
+                    description=description,
+                    created_at=datetime(2024, 5, 1),
+                    completed_at=datetime(2024, 5, 2) if task_id in completed else None,
+                )
+                for task_id, description in enumerate(descriptions, start=1)
+            ],
+            next_id=len(descriptions) + 1,
+        )
+    )
+
+
+@pytest.fixture
+def directory(tmp_path):
+    """Fixture for a directory with a JSON, a SQLite and an unrelated file."""
+    write_tasks(tmp_path / "home.json", "Water plants", "Pay rent", completed={2})
+    write_tasks(tmp_path / "work.db", "Deploy release", "Review deploy script")
+    (tmp_path / "notes.txt").write_text("not a task file")
+    return tmp_path
+
+
+def test_refresh_catalogs_task_files(directory):
+    """Test that every task file is cataloged and unrelated files are not."""
+    files = Workspace(directory).refresh()
+
+    assert [file.path.name for file in files] == ["home.json", "work.db"]
+    assert [(file.pending, file.completed) for file in files] == [(1, 1), (2, 0)]
+    assert (directory / CATALOG_NAME).exists()
+
+
+def test_refresh_only_rereads_changed_files(directory):
+    """Test that a second refresh parses nothing until a file changes."""
+    workspace = Workspace(directory)
+    workspace.refresh()
+
+    with patch("tuido.workspace.scan_file", wraps=scan_file) as scan:
+        workspace.refresh()
+        assert scan.call_count == 0
+
+        repository = JsonTaskRepository(directory / "home.json")
+        data = repository.load_data()
+        data.tasks.append(Task(id=3, description="Buy milk"))
+        data.next_id = 4
+        repository.save_data(data)
+        files = workspace.refresh()
+
+    scan.assert_called_once_with(str(directory / "home.json"))
+    assert files[0].pending == 2
+
+
+def test_refresh_drops_removed_files_and_reports_errors(directory):
+    """Test that deleted files leave the catalog and broken ones are flagged."""
+    workspace = Workspace(directory)
+    workspace.refresh()
+    os.remove(directory / "work.db")
+    (directory / "broken.json").write_text("{not json")
+
+    files = Workspace(directory).refresh()
+
+    assert [file.path.name for file in files] == ["broken.json", "home.json"]
+    assert files[0].error
+    assert (
+        str(directory / "work.db") not in workspace._load()
+    )  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_refresh_flags_foreign_binary_files(directory, jobs):
+    """Test that a .tuido file in another format is flagged, not fatal."""
+    (directory / "foreign.tuido").write_bytes(b"{}" * 40)
+
+    files = Workspace(directory).refresh(jobs=jobs)
+
+    assert [file.path.name for file in files] == [
+        "foreign.tuido",
+        "home.json",
+        "work.db",
+    ]
+    assert "is not a tuido binary task file" in files[0].error
+    assert files[1].pending == 1
+
+
+def test_glob_pattern_and_parallel_refresh(directory):
+    """Test a pattern workspace whose files are read in a process pool."""
+    (directory / "archive").mkdir()
+    write_tasks(directory / "archive" / "old.json", "Old task")
+
+    workspace = Workspace(str(directory / "**" / "*.json"))
+    files = workspace.refresh(jobs=2)
+
+    assert workspace.root == directory
+    assert [file.path.name for file in files] == ["old.json", "home.json"]
+    assert files[0].pending == 1
+
+
+def test_catalog_file_queries(directory):
+    """Test counting and querying cataloged tasks without loading the file."""
+    home, work = Workspace(directory).refresh()
+
+    assert home.count_matching(TaskQuery(completed=True)) == 1
+    assert work.count_matching(TaskQuery(match="deploy")) == 2
+    assert [
+        task.description for task in home.query_tasks(TaskQuery(completed=False))
+    ] == ["Water plants"]
+    assert [task.id for task in work.query_tasks(TaskQuery(limit=1))] == [1]
+
+
+def test_catalog_keeps_exact_timestamps(tmp_path):
+    """Test that cataloged tasks keep their timestamps to the microsecond."""
+    created = datetime(2024, 5, 1, 9, 30, 15, 123456)
+    task = Task(id=1, description="Exact", created_at=created, completed_at=created)
+    create_repository(tmp_path / "tasks.json").save_data(
+        TaskData(tasks=[task], next_id=2)
+    )
+
+    (file,) = Workspace(tmp_path).refresh()
+
+    assert list(file.query_tasks(TaskQuery())) == [task]
+    assert file.count_matching(TaskQuery(until=created)) == 0
+
+
+def test_search_files_merges_results(directory):
+    """Test that search covers every file and honours the limit overall."""
+    files = Workspace(directory).refresh()
+
+    results = search_files(files, "deploy")
+
+    assert [(file.path.name, result.id) for file, result in results] == [
+        ("work.db", 1),
+        ("work.db", 2),
+    ]
+    assert [result.description for _, result in search_files(files, "pa")] == [
+        "Pay rent"
+    ]
+    assert len(search_files(files, "r", limit=1)) == 1
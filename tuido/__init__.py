@@ -0,0 +1,6 @@
+"""TuiDo - a terminal-based todo list manager."""
+
+import time
+
+# When the package started importing, which --profile reports as startup.
+IMPORT_STARTED = time.perf_counter()
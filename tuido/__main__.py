@@ -2,12 +2,17 @@
 
 import sys
 
+# This is the whole startup path of the ``tuido`` command, and it is kept
+# this thin on purpose: the expensive parts are deferred inside TaskCLI,
+# which builds only the named subcommand's parser, loads Rich and humanize
+# only to render listings, and imports storage backends on demand. Doing
+# any of that here would only duplicate TaskCLI's dispatch, and
+# benchmarks/bench_startup.py measures this module's imports as they are.
 from tuido.task_cli import TaskCLI
 
 
 def main():
-    """
-    Main entry point for the TUIDO application."""
+    """Main entry point for the TUIDO application."""
     cli = TaskCLI()
     return cli.run()
 
@@ -2,9 +2,196 @@
 
 import argparse
 import os
+import re
+import sys
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 
+from tuido.task_formats import FORMATS as OUTPUT_FORMATS
+
 DEFAULT_TASK_FILE = "~/.tasks.json"
+STORAGE_BACKENDS = ["json", "json-compact", "sqlite", "journal", "binary"]
+COMMANDS = [
+    "add",
+    "list",
+    "ready",
+    "search",
+    "stats",
+    "link",
+    "do",
+    "undo",
+    "delete",
+    "archive",
+    "import",
+    "export",
+    "tui",
+    "migrate",
+    "serve",
+]
+GLOBAL_OPTIONS_WITH_VALUES = [
+    "--file",
+    "-f",
+    "--workspace",
+    "--format",
+    "--profile-output",
+]
+SORT_KEYS = ["id", "created", "completed"]
+RECORDS_HELP = (
+    "Write the tasks as JSON Lines, CSV, TSV or todo.txt records instead of "
+    "a formatted listing"
+)
+
+DURATION = re.compile(r"(\d+)([mhdw])")
+DURATION_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def find_command(args: List[str]) -> Optional[str]:
+    """Return the subcommand named in ``args`` without running argparse.
+
+    Returns None when no known subcommand is found or help is requested
+    before it, in which case the full parser is needed.
+    """
+    expect_value = False
+    for arg in args:
+        if expect_value:
+            expect_value = False
+        elif arg in GLOBAL_OPTIONS_WITH_VALUES:
+            expect_value = True
+        elif arg in ("-h", "--help"):
+            return None
+        elif not arg.startswith("-"):
+            return arg if arg in COMMANDS else None
+    return None
+
+
+def task_id_range(value: str) -> List[int]:
+    """Parse a task id (``7``) or an inclusive range of ids (``10-40``)."""
+    start, separator, end = value.partition("-")
+    try:
+        first = int(start)
+        last = int(end) if separator else first
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid task id or range: '{value}'"
+        ) from None
+    if first > last:
+        raise argparse.ArgumentTypeError(f"invalid task id range: '{value}'")
+    return list(range(first, last + 1))
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration such as ``90m``, ``12h``, ``7d`` or ``2w``."""
+    match = DURATION.fullmatch(value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid duration: '{value}'")
+    amount, unit = match.groups()
+    return timedelta(**{DURATION_UNITS[unit]: int(amount)})
+
+
+def point_in_time(value: str, end_of_day: bool = False) -> datetime:
+    """Parse an ISO date or date-time, or a duration meaning that long ago.
+
+    With ``end_of_day``, a bare date means the end of that day, so that
+    an exclusive upper bound still includes it.
+    """
+    if DURATION.fullmatch(value.strip()):
+        return datetime.now() - parse_duration(value)
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        pass
+    else:
+        moment = datetime.combine(day, datetime.min.time())
+        return moment + timedelta(days=1) if end_of_day else moment
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date or duration: '{value}'"
+        ) from None
+    if moment.tzinfo is not None:
+        # Task timestamps are naive local times.
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def _until(value: str) -> datetime:
+    return point_in_time(value, end_of_day=True)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: '{value}'")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: '{value}'")
+    return number
+
+
+class _FlattenTaskIds(argparse.Action):  # pylint: disable=too-few-public-methods
+    """Collect ids and ranges into one list, keeping the first occurrence."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        task_ids = dict.fromkeys(task_id for ids in values for task_id in ids)
+        setattr(namespace, self.dest, list(task_ids))
+
+
+def _add_task_ids_argument(parser: argparse.ArgumentParser, verb: str) -> None:
+    parser.add_argument(
+        "task_ids",
+        metavar="task_id",
+        nargs="+",
+        type=task_id_range,
+        action=_FlattenTaskIds,
+        help=f"IDs or ranges (e.g. 3 7 10-40) of the tasks to {verb}",
+    )
+
+
+def _add_blocked_by_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--blocked-by",
+        "--after",
+        metavar="ID",
+        nargs="+",
+        type=task_id_range,
+        action=_FlattenTaskIds,
+        default=[],
+        help="Wait until these tasks (e.g. 3 7 10-40) are complete",
+    )
+
+
+def _add_format_argument(parser: argparse.ArgumentParser, help_text: str) -> None:
+    """Accept --format after the subcommand as well as before it.
+
+    The default is suppressed so that leaving it out after the subcommand
+    does not overwrite a --format given before it.
+    """
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=argparse.SUPPRESS,
+        help=help_text,
+    )
+
+
+def _add_workspace_arguments(parser: argparse.ArgumentParser, verb: str) -> None:
+    parser.add_argument(
+        "--all-files",
+        action="store_true",
+        help=f"{verb} every task file in the workspace",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=1,
+        help="With --all-files, read changed files in this many processes",
+    )
 
 
 class ArgumentParser:  # pylint: disable=too-few-public-methods
@@ -20,78 +207,372 @@ class ArgumentParser:  # pylint: disable=too-few-public-methods
             prog_name: Program name (useful for testing)
             description: Program description
         """
-        self.parser = argparse.ArgumentParser(
-            prog=prog_name,
-            description=description
-            or f"{prog_name} - A terminal-based todo list manager",
+        self.prog_name = prog_name
+        self.description = (
+            description or f"{prog_name} - A terminal-based todo list manager"
         )
-        self._setup_arguments()
+        self._parser: Optional[argparse.ArgumentParser] = None
+
+    @property
+    def parser(self) -> argparse.ArgumentParser:
+        """The full parser with every subcommand, built on first use."""
+        if self._parser is None:
+            self._parser = self._build_parser()
+        return self._parser
 
-    def _setup_arguments(self) -> None:
-        """Set up all command-line arguments and subcommands."""
-        self._add_global_arguments()
-        self._add_subcommands()
+    def _build_parser(
+        self, commands: Optional[List[str]] = None
+    ) -> argparse.ArgumentParser:
+        """Build a parser with the global arguments and the given subcommands.
 
-    def _add_global_arguments(self) -> None:
+        Args:
+            commands: Subcommands to include (defaults to all of them)
+        """
+        parser = argparse.ArgumentParser(
+            prog=self.prog_name, description=self.description
+        )
+        self._add_global_arguments(parser)
+        self._add_subcommands(parser, commands)
+        return parser
+
+    def _add_global_arguments(self, parser: argparse.ArgumentParser) -> None:
         """Add global arguments that apply to all commands."""
         default_file = os.getenv("TODO_FILE", DEFAULT_TASK_FILE)
-        self.parser.add_argument(
+        parser.add_argument(
             "--file", "-f", type=str, default=default_file, help="Task file to use"
         )
 
-        self.parser.add_argument(
+        parser.add_argument(
+            "--workspace",
+            default=os.getenv("TUIDO_WORKSPACE"),
+            help="Directory or glob pattern of task files for --all-files "
+            "(default: the task file's directory)",
+        )
+
+        parser.add_argument(
             "--verbose", "-v", action="store_true", help="Enable verbose output"
         )
 
-    def _add_subcommands(self) -> None:
-        """Add all subcommands and their arguments."""
-        subparsers = self.parser.add_subparsers(
+        parser.add_argument(
+            "--no-daemon",
+            action="store_true",
+            help="Access the task file directly even if a daemon is serving it",
+        )
+
+        parser.add_argument(
+            "--format",
+            choices=OUTPUT_FORMATS,
+            help="Write the tasks that list or ready selects as JSON Lines, CSV, "
+            "TSV or todo.txt records instead of a formatted listing; for import "
+            "and export, the format of the file (default: from its extension)",
+        )
+
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Print how long each phase of the command took to stderr",
+        )
+
+        parser.add_argument(
+            "--profile-output",
+            metavar="FILE",
+            help="Also write cProfile statistics for the command to FILE",
+        )
+
+    def _add_subcommands(
+        self, parser: argparse.ArgumentParser, commands: Optional[List[str]] = None
+    ) -> None:
+        """Add subcommands and their arguments."""
+        subparsers = parser.add_subparsers(
             title="commands", dest="command", help="Available commands"
         )
 
-        self._add_add_command(subparsers)
-        self._add_list_command(subparsers)
-        self._add_complete_command(subparsers)
-        self._add_undo_command(subparsers)
-        self._add_delete_command(subparsers)
+        builders = {
+            "add": self._add_add_command,
+            "list": self._add_list_command,
+            "ready": self._add_ready_command,
+            "search": self._add_search_command,
+            "stats": self._add_stats_command,
+            "link": self._add_link_command,
+            "do": self._add_complete_command,
+            "undo": self._add_undo_command,
+            "delete": self._add_delete_command,
+            "archive": self._add_archive_command,
+            "import": self._add_import_command,
+            "export": self._add_export_command,
+            "tui": self._add_tui_command,
+            "migrate": self._add_migrate_command,
+            "serve": self._add_serve_command,
+        }
+        for name, add_command in builders.items():
+            if commands is None or name in commands:
+                add_command(subparsers)
 
     def _add_add_command(self, subparsers) -> None:
         """Add the 'add' subcommand."""
         add_parser = subparsers.add_parser("add", help="Add a new task")
-        add_parser.add_argument("description", help="Task description")
+        add_parser.add_argument(
+            "description",
+            help="Task description, or '-' to add one task per line of stdin",
+        )
+        add_parser.add_argument(
+            "--parent", type=int, metavar="ID", help="Add it as a subtask of this task"
+        )
+        _add_blocked_by_argument(add_parser)
 
     def _add_list_command(self, subparsers) -> None:
         """Add the 'list' subcommand."""
-        subparsers.add_parser("list", help="List all tasks")
+        list_parser = subparsers.add_parser("list", help="List all tasks")
+        list_parser.add_argument(
+            "--limit", "-n", type=_positive_int, help="Show at most this many tasks"
+        )
+        window = list_parser.add_mutually_exclusive_group()
+        window.add_argument(
+            "--offset", type=_non_negative_int, help="Skip this many tasks first"
+        )
+        window.add_argument(
+            "--page",
+            "-p",
+            type=_positive_int,
+            help="Show this page (pages hold --limit tasks, 20 by default)",
+        )
+        list_parser.add_argument(
+            "--pager", action="store_true", help="Show the listing in a pager"
+        )
+        list_parser.add_argument(
+            "--all",
+            "-a",
+            dest="include_archive",
+            action="store_true",
+            help="Include archived tasks",
+        )
+        status = list_parser.add_mutually_exclusive_group()
+        status.add_argument(
+            "--pending",
+            dest="completed",
+            action="store_const",
+            const=False,
+            help="Only show pending tasks",
+        )
+        status.add_argument(
+            "--completed",
+            dest="completed",
+            action="store_const",
+            const=True,
+            help="Only show completed tasks",
+        )
+        list_parser.add_argument(
+            "--since",
+            type=point_in_time,
+            help="Only tasks completed (or, if pending, created) at or after "
+            "this date or time, or this long ago (e.g. 2024-05-01, 7d, 12h)",
+        )
+        list_parser.add_argument(
+            "--until",
+            type=_until,
+            help="Only tasks completed (or, if pending, created) before this "
+            "date or time; a bare date includes that day",
+        )
+        list_parser.add_argument(
+            "--match", help="Only tasks whose description contains this text"
+        )
+        list_parser.add_argument(
+            "--sort",
+            choices=SORT_KEYS,
+            default="id",
+            help="Order tasks within each section (default: id)",
+        )
+        _add_format_argument(list_parser, RECORDS_HELP)
+        _add_workspace_arguments(list_parser, "List")
+
+    def _add_ready_command(self, subparsers) -> None:
+        """Add the 'ready' subcommand."""
+        ready_parser = subparsers.add_parser(
+            "ready", help="List pending tasks that are not waiting for other tasks"
+        )
+        _add_format_argument(ready_parser, RECORDS_HELP)
+
+    def _add_search_command(self, subparsers) -> None:
+        """Add the 'search' subcommand."""
+        search_parser = subparsers.add_parser(
+            "search", help="Find tasks by words in their description"
+        )
+        search_parser.add_argument(
+            "query",
+            nargs="+",
+            help="Words to look for; each also matches words it is a prefix of",
+        )
+        search_parser.add_argument(
+            "--limit", "-n", type=_positive_int, help="Show at most this many tasks"
+        )
+        _add_workspace_arguments(search_parser, "Search")
+
+    def _add_stats_command(self, subparsers) -> None:
+        """Add the 'stats' subcommand."""
+        stats_parser = subparsers.add_parser(
+            "stats", help="Show task counts, completions per day and task ages"
+        )
+        stats_parser.add_argument(
+            "--days",
+            type=_positive_int,
+            default=7,
+            help="Show completions for this many days, today included (default: 7)",
+        )
+        stats_parser.add_argument(
+            "--json", action="store_true", help="Print the statistics as JSON"
+        )
+
+    def _add_link_command(self, subparsers) -> None:
+        """Add the 'link' subcommand."""
+        link_parser = subparsers.add_parser(
+            "link", help="Set a task's parent or the tasks it waits for"
+        )
+        link_parser.add_argument("task_id", type=int, help="ID of the task to change")
+        parent = link_parser.add_mutually_exclusive_group()
+        parent.add_argument(
+            "--parent", type=int, metavar="ID", help="Make it a subtask of this task"
+        )
+        parent.add_argument(
+            "--no-parent", action="store_true", help="Make it a top-level task"
+        )
+        _add_blocked_by_argument(link_parser)
+        link_parser.add_argument(
+            "--unblock",
+            metavar="ID",
+            nargs="+",
+            type=task_id_range,
+            action=_FlattenTaskIds,
+            default=[],
+            help="Stop waiting for these tasks",
+        )
 
     def _add_complete_command(self, subparsers) -> None:
         """Add the 'do' subcommand."""
-        complete_parser = subparsers.add_parser("do", help="Mark a task as complete")
-        complete_parser.add_argument(
-            "task_id", help="ID of the task to complete", type=int
-        )
+        complete_parser = subparsers.add_parser("do", help="Mark tasks as complete")
+        _add_task_ids_argument(complete_parser, "complete")
 
     def _add_undo_command(self, subparsers) -> None:
         """Add the 'undo' subcommand."""
         undo_parser = subparsers.add_parser(
-            "undo", help="Mark a previously completed task as active"
+            "undo", help="Mark previously completed tasks as active"
         )
-
-        undo_parser.add_argument("task_id", help="ID of the task to revert", type=int)
+        _add_task_ids_argument(undo_parser, "revert")
 
     def _add_delete_command(self, subparsers) -> None:
         """Add the 'delete' subcommand."""
-        delete_parser = subparsers.add_parser("delete", help="Delete a task")
-        delete_parser.add_argument("task_id", help="ID of the task to delete", type=int)
+        delete_parser = subparsers.add_parser("delete", help="Delete tasks")
+        _add_task_ids_argument(delete_parser, "delete")
+
+    def _add_archive_command(self, subparsers) -> None:
+        """Add the 'archive' subcommand."""
+        archive_parser = subparsers.add_parser(
+            "archive", help="Move old completed tasks out of the task file"
+        )
+        archive_parser.add_argument(
+            "--older-than",
+            type=parse_duration,
+            default="30d",
+            help="Archive tasks completed longer ago than this (default: 30d)",
+        )
+
+    def _add_import_command(self, subparsers) -> None:
+        """Add the 'import' subcommand."""
+        import_parser = subparsers.add_parser(
+            "import", help="Add tasks from a JSON Lines, CSV, TSV or todo.txt file"
+        )
+        import_parser.add_argument(
+            "source", help="File to read, or '-' to read stdin (needs --format)"
+        )
+        import_parser.add_argument(
+            "--dedupe",
+            action="store_true",
+            help="Skip tasks whose description matches an existing task",
+        )
+        _add_format_argument(
+            import_parser, "Format of the file (default: from its extension)"
+        )
+
+    def _add_export_command(self, subparsers) -> None:
+        """Add the 'export' subcommand."""
+        export_parser = subparsers.add_parser(
+            "export", help="Write all tasks to a JSON Lines, CSV, TSV or todo.txt file"
+        )
+        export_parser.add_argument(
+            "output",
+            nargs="?",
+            help="File to write (default: stdout, as JSON Lines unless --format)",
+        )
+        export_parser.add_argument(
+            "--all",
+            "-a",
+            dest="include_archive",
+            action="store_true",
+            help="Include archived tasks",
+        )
+        _add_format_argument(
+            export_parser,
+            "Format to write (default: from the file's extension, or JSON Lines)",
+        )
+
+    def _add_tui_command(self, subparsers) -> None:
+        """Add the 'tui' subcommand."""
+        tui_parser = subparsers.add_parser(
+            "tui", help="Browse and edit tasks in a full-screen view"
+        )
+        tui_parser.add_argument(
+            "--pending",
+            dest="pending_only",
+            action="store_true",
+            help="Start by showing only pending tasks",
+        )
+
+    def _add_migrate_command(self, subparsers) -> None:
+        """Add the 'migrate' subcommand."""
+        migrate_parser = subparsers.add_parser(
+            "migrate", help="Copy the task file into another storage backend"
+        )
+        migrate_parser.add_argument(
+            "--from",
+            dest="source_backend",
+            choices=STORAGE_BACKENDS,
+            help="Backend of the task file (default: from its extension)",
+        )
+        migrate_parser.add_argument(
+            "--to",
+            dest="target_backend",
+            choices=STORAGE_BACKENDS,
+            required=True,
+            help="Backend to migrate to",
+        )
+        migrate_parser.add_argument(
+            "--output",
+            "-o",
+            help="Destination file (default: task file with the backend's extension)",
+        )
+
+    def _add_serve_command(self, subparsers) -> None:
+        """Add the 'serve' subcommand."""
+        subparsers.add_parser(
+            "serve",
+            help="Keep the task file loaded and serve other tuido commands",
+        )
 
     def parse_args(self, args: Optional[List[str]] = None) -> argparse.Namespace:
         """
         Parse command-line arguments.
 
+        When the subcommand can be spotted up front, only that subcommand's
+        parser is built, which keeps startup cheap for one-shot commands.
+
         Args:
             args: List of arguments to parse (defaults to sys.argv)
 
         Returns:
             Parsed arguments namespace
         """
-        return self.parser.parse_args(args)
+        if args is None:
+            args = sys.argv[1:]
+        command = find_command(args)
+        if command is None:
+            return self.parser.parse_args(args)
+        return self._build_parser([command]).parse_args(args)
@@ -0,0 +1,224 @@
+"""Asyncio counterpart of TaskManager with write-behind saving."""
+
+import asyncio
+from typing import Any, Callable, Iterable, TypeVar
+
+from tuido.async_task_repository import AsyncTaskRepository
+from tuido.deferred_repository import DeferredRepository
+from tuido.task import Task
+from tuido.task_manager import MAX_SAVE_ATTEMPTS, TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError
+
+T = TypeVar("T")
+
+DEFAULT_FLUSH_DELAY = 0.005
+
+Operation = Callable[[TaskManager], Any]
+
+
+class AsyncTaskManager:
+    """Manage tasks from coroutines without blocking the event loop.
+
+    Mutations go into a write-behind queue. Everything queued within
+    ``flush_delay`` seconds of the first queued mutation is applied and
+    saved with a single write on the repository's I/O thread, and each
+    mutation returns once the save that contains it has finished.
+
+    All access to the task data happens on that I/O thread, so reads never
+    observe a half-applied batch.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncTaskRepository,
+        flush_delay: float = DEFAULT_FLUSH_DELAY,
+    ) -> None:
+        self.repository = repository
+        self.flush_delay = flush_delay
+        self._buffer = DeferredRepository(repository.repository)
+        self._manager = TaskManager(self._buffer)
+        self._queue: list[tuple[Operation, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "AsyncTaskManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def add_task(self, description: str) -> Task:
+        """Add a new task with the given description."""
+        return await self._submit(lambda manager: manager.add_task(description))
+
+    async def add_many(self, descriptions: Iterable[str]) -> list[Task]:
+        """Add a task for each description."""
+        descriptions = list(descriptions)
+        return await self._submit(lambda manager: manager.add_many(descriptions))
+
+    async def delete_task(self, task_id: int) -> Task | None:
+        """Delete a task by its ID."""
+        return await self._submit(lambda manager: manager.delete_task(task_id))
+
+    async def set_task_complete(self, task_id: int) -> bool:
+        """Mark a task as complete by its ID."""
+        return await self._submit(lambda manager: manager.set_task_complete(task_id))
+
+    async def set_task_pending(self, task_id: int) -> bool:
+        """Mark a task as pending by its ID."""
+        return await self._submit(lambda manager: manager.set_task_pending(task_id))
+
+    async def delete_many(self, task_ids: Iterable[int]) -> dict[int, Task | None]:
+        """Delete several tasks."""
+        task_ids = list(task_ids)
+        return await self._submit(lambda manager: manager.delete_many(task_ids))
+
+    async def complete_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as complete."""
+        task_ids = list(task_ids)
+        return await self._submit(lambda manager: manager.complete_many(task_ids))
+
+    async def pending_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as pending."""
+        task_ids = list(task_ids)
+        return await self._submit(lambda manager: manager.pending_many(task_ids))
+
+    async def get_task(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        return await self._read(lambda manager: manager.get_task(task_id))
+
+    async def list_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> list[Task]:
+        """Return one page of tasks, optionally filtered by status."""
+        return await self._read(
+            lambda manager: list(manager.iter_tasks(completed, offset, limit))
+        )
+
+    async def all_tasks(self) -> list[Task]:
+        """Return all tasks."""
+        return await self.list_tasks()
+
+    async def pending_tasks(self) -> list[Task]:
+        """Return pending tasks."""
+        return await self.list_tasks(completed=False)
+
+    async def completed_tasks(self) -> list[Task]:
+        """Return completed tasks."""
+        return await self.list_tasks(completed=True)
+
+    async def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally filtered by status."""
+        return await self._read(lambda manager: manager.count_tasks(completed))
+
+    async def query_tasks(self, query: TaskQuery) -> list[Task]:
+        """Return the tasks matching a query."""
+        return await self._read(lambda manager: list(manager.query_tasks(query)))
+
+    async def count_matching(self, query: TaskQuery) -> int:
+        """Count the tasks matching a query."""
+        return await self._read(lambda manager: manager.count_matching(query))
+
+    async def flush(self) -> None:
+        """Save queued mutations now and wait for saves in progress."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self._flush_queue()
+
+    async def close(self) -> None:
+        """Flush queued mutations and stop the repository's I/O thread."""
+        await self.flush()
+        self.repository.close()
+
+    async def _submit(self, operation: Operation) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((operation, future))
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _read(self, read: Callable[[TaskManager], T]) -> T:
+        def run() -> T:
+            if self._manager.loaded and self._buffer.repository.has_changed():
+                self._manager.reload()
+            return read(self._manager)
+
+        return await self.repository.run(run)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        self._flusher = None
+        await self._flush_queue()
+
+    async def _flush_queue(self) -> None:
+        batch, self._queue = self._queue, []
+        if not batch:
+            # Wait for a batch that is already being saved on the I/O thread.
+            await self.repository.run(lambda: None)
+            return
+
+        try:
+            results = await self.repository.run(
+                self._apply, [operation for operation, _ in batch]
+            )
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _apply(self, operations: list[Operation]) -> list[Any]:
+        """Apply a batch to current data and save it once (on the I/O thread).
+
+        Mirrors TaskManager's transactions: the repository lock is held from
+        refreshing the data through saving, and the whole batch is applied
+        again if the save reports a concurrent modification.
+        """
+        repository = self._buffer.repository
+        failed: dict[int, Exception] = {}
+        for attempt in range(1, MAX_SAVE_ATTEMPTS + 1):
+            with repository.lock():
+                if self._manager.loaded and repository.has_changed():
+                    self._manager.reload()
+                results = self._run(operations, failed)
+                try:
+                    self._buffer.flush(self._manager.data)
+                except ConcurrentModificationError:
+                    self._manager.reload()
+                    if attempt == MAX_SAVE_ATTEMPTS:
+                        raise
+                    continue
+                return results
+        raise AssertionError("unreachable")
+
+    def _run(self, operations: list[Operation], failed: dict[int, Exception]) -> list:
+        """Apply operations in order, returning each one's result or exception.
+
+        An operation that fails after changing the data makes TaskManager
+        drop it, and loading it again also drops the buffered changes of the
+        operations before it. The batch is then applied again to the
+        reloaded data, skipping the failed operation, which is recorded in
+        ``failed``.
+        """
+        while True:
+            results: list[Any] = []
+            for index, operation in enumerate(operations):
+                if index in failed:
+                    results.append(failed[index])
+                    continue
+                buffered = self._buffer.dirty
+                try:
+                    results.append(operation(self._manager))
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    if buffered and not self._manager.loaded:
+                        failed[index] = e
+                        break
+                    results.append(e)
+            else:
+                return results
@@ -0,0 +1,91 @@
+"""Asyncio interface to task repositories."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+
+from tuido.task import Task
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_repository import TaskRepository
+
+T = TypeVar("T")
+
+
+class AsyncTaskRepository:
+    """Runs a TaskRepository's blocking I/O off the event loop.
+
+    Every call is handed to a single worker thread, so calls on one
+    repository never overlap and the event loop is never blocked on disk.
+    """
+
+    def __init__(
+        self, repository: TaskRepository, executor: ThreadPoolExecutor | None = None
+    ) -> None:
+        self.repository = repository
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tuido-io"
+        )
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Call ``function(*args)`` on the I/O thread and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    async def load_data(self) -> TaskData:
+        """Load tasks from the repository."""
+        return await self.run(self.repository.load_data)
+
+    async def save_data(self, tasks: TaskData) -> None:
+        """Save tasks to the repository."""
+        await self.run(self.repository.save_data, tasks)
+
+    async def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Persist several changes with a single write."""
+        await self.run(
+            lambda: self.repository.save_batch(tasks, inserted, updated, deleted)
+        )
+
+    async def save_changes(self, tasks: TaskData, delta: TaskDelta) -> None:
+        """Persist the changes made since the data was loaded or saved."""
+        await self.run(self.repository.save_changes, tasks, delta)
+
+    async def list_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> list[Task]:
+        """Return one page of tasks, optionally filtered by status."""
+        return await self.run(
+            lambda: list(self.repository.iter_tasks(completed, offset, limit))
+        )
+
+    async def get_task(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        return await self.run(self.repository.get_task, task_id)
+
+    async def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally filtered by status."""
+        return await self.run(self.repository.count_tasks, completed)
+
+    async def has_changed(self) -> bool:
+        """Whether storage changed since the last load or save."""
+        return await self.run(self.repository.has_changed)
+
+    @asynccontextmanager
+    async def lock(self) -> AsyncIterator[None]:
+        """Hold the repository lock without blocking the event loop."""
+        lock = self.repository.lock()
+        await self.run(lock.__enter__)
+        try:
+            yield
+        finally:
+            await self.run(lock.__exit__, None, None, None)
+
+    def close(self) -> None:
+        """Stop the I/O thread once queued calls have finished."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,36 @@
+"""Atomic replacement of task files."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Temporary files are created private; new task files get the usual mode.
+NEW_FILE_MODE = 0o644
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Replace ``path`` with ``content`` so that readers never see a partial file.
+
+    The content is written and synced to a temporary file in the same
+    directory, which then takes the place of ``path``. An existing file's
+    permissions are kept.
+    """
+    temp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as file:
+            temp_path = file.name
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        os.replace(temp_path, path)
+        temp_path = None
+    finally:
+        if temp_path is not None:
+            Path(temp_path).unlink(missing_ok=True)
@@ -0,0 +1,357 @@
+"""Benchmark suite comparing TuiDo's storage backends between releases.
+
+Run it against an installed or checked-out TuiDo:
+
+    python -m tuido.bench [--tasks 1000 100000] [--backends json sqlite]
+                          [--output results.json]
+                          [--baseline previous.json] [--threshold 20]
+
+For every backend and task count, a synthetic task file is generated and
+load, save, add, do, delete and list are timed. load and save call the
+repository directly; the other operations run the one-shot ``tuido``
+command, as a user would. Each timing is the best of ``--repeat`` runs.
+
+With ``--baseline``, the results are compared with those of an earlier
+run and the exit status is 1 if any operation got slower by more than
+``--threshold`` percent (and by at least ``--min-change`` milliseconds,
+which keeps sub-millisecond timings from failing on noise).
+
+The generator can also be used on its own to write a task file:
+
+    python -m tuido.bench --generate tasks.json --tasks 100000
+
+The standalone benchmarks in the repository's ``benchmarks/`` directory
+are run through the same entry point from a checkout, with their own
+options after the name:
+
+    python -m tuido.bench --run query --tasks 100000
+
+They time their operations with ``timings``, like the suite does.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from tuido.plain_console import PlainConsole
+from tuido.repository_factory import DEFAULT_EXTENSIONS, create_repository
+from tuido.task import Task
+from tuido.task_cli import TaskCLI
+from tuido.task_data import TaskData
+
+OPERATIONS = ["load", "save", "list", "add", "do", "delete"]
+DEFAULT_SIZES = [1_000, 100_000]
+DEFAULT_THRESHOLD = 20.0
+DEFAULT_MIN_CHANGE = 1.0
+
+# Bump when the layout of the JSON report changes.
+REPORT_FORMAT = 1
+
+# The standalone benchmarks, by the name --run takes. They live outside the
+# package, so they can only be run from a checkout of the repository.
+STANDALONE = {
+    "async": "benchmarks.bench_async",
+    "daemon": "benchmarks.bench_daemon",
+    "import": "benchmarks.bench_import",
+    "json-codec": "benchmarks.bench_json_codec",
+    "query": "benchmarks.bench_query",
+    "save": "benchmarks.bench_save",
+    "startup": "benchmarks.bench_startup",
+    "storage": "benchmarks.bench_storage",
+    "task-graph": "benchmarks.bench_task_graph",
+    "task-index": "benchmarks.bench_task_index",
+    "task-memory": "benchmarks.bench_task_memory",
+}
+
+WORDS = (
+    "review write fix call email plan update test deploy clean read book "
+    "report invoice meeting garden kitchen release draft budget"
+).split()
+
+
+def generate_data(
+    size: int,
+    completed_ratio: float = 0.5,
+    now: datetime | None = None,
+    seed: int = 0,
+) -> TaskData:
+    """Build ``size`` tasks created over the past year.
+
+    About ``completed_ratio`` of them are completed, up to 30 days after
+    they were created. The same arguments always give the same tasks.
+    """
+    if not 0 <= completed_ratio <= 1:
+        raise ValueError(f"Completed ratio out of range: {completed_ratio}")
+    now = now or datetime.now().replace(microsecond=0)
+    rng = random.Random(seed)
+    tasks = []
+    for task_id in range(1, size + 1):
+        created_at = now - timedelta(days=365 * (1 - task_id / size) + 1)
+        completed_at = None
+        if rng.random() < completed_ratio:
+            completed_at = created_at + timedelta(hours=rng.uniform(1, 24 * 30))
+            completed_at = min(completed_at, now)
+        description = " ".join(rng.choices(WORDS, k=3)) + f" #{task_id}"
+        tasks.append(Task(task_id, description, created_at, completed_at))
+    return TaskData(tasks=tasks, next_id=size + 1)
+
+
+def write_task_file(path: Path, data: TaskData, backend: str | None = None) -> None:
+    """Save tasks to a new task file in the given backend."""
+    create_repository(path, backend).save_data(data)
+
+
+def timings(function: Callable[[], object], repeat: int = 1) -> list[float]:
+    """Return the times of ``repeat`` calls to ``function`` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def time_operations(
+    path: Path, backend: str, data: TaskData, repeat: int
+) -> dict[str, list[float]]:
+    """Time every operation on a task file holding ``data``.
+
+    The file is written first. add, do and delete change it, so each run
+    works on a task that no earlier run has touched.
+    """
+    write_task_file(path, data, backend)
+    pending = [task.id for task in data.tasks if not task.is_complete()]
+    completed = [task.id for task in data.tasks if task.is_complete()]
+    if len(pending) < repeat or len(completed) < repeat:
+        raise ValueError(
+            f"Need at least {repeat} pending and completed tasks to benchmark"
+        )
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        cli = TaskCLI(console=PlainConsole(devnull))
+
+        def tuido(*args: str) -> None:
+            cli.run(["--file", str(path), "--no-daemon", *args])
+
+        return {
+            "load": timings(
+                lambda: create_repository(path, backend).load_data(), repeat
+            ),
+            "save": timings(
+                lambda: create_repository(path, backend).save_data(data), repeat
+            ),
+            "list": timings(lambda: tuido("list"), repeat),
+            "add": timings(lambda: tuido("add", "Benchmark task"), repeat),
+            "do": timings(lambda: tuido("do", str(pending.pop())), repeat),
+            "delete": timings(lambda: tuido("delete", str(completed.pop())), repeat),
+        }
+
+
+def run_suite(
+    sizes: list[int],
+    backends: list[str],
+    completed_ratio: float = 0.5,
+    repeat: int = 3,
+    progress: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Benchmark each backend at each size and return one row per operation."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            data = generate_data(size, completed_ratio)
+            for backend in backends:
+                path = (
+                    Path(directory) / f"{backend}-{size}{DEFAULT_EXTENSIONS[backend]}"
+                )
+                times = time_operations(path, backend, data, repeat)
+                for operation in OPERATIONS:
+                    row = {
+                        "backend": backend,
+                        "tasks": size,
+                        "operation": operation,
+                        "best_ms": round(min(times[operation]), 3),
+                        "median_ms": round(statistics.median(times[operation]), 3),
+                    }
+                    results.append(row)
+                    if progress is not None:
+                        progress(row)
+    return results
+
+
+def run_standalone(name: str, argv: list[str]) -> int:
+    """Run one of the ``STANDALONE`` benchmarks with its own arguments."""
+    module_name = STANDALONE[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if e.name not in ("benchmarks", module_name):
+            raise
+        print(
+            f"Error: {module_name} not found; run from the root of a checkout",
+            file=sys.stderr,
+        )
+        return 2
+    return module.main(argv) or 0
+
+
+def _version() -> str:
+    # pylint: disable=import-outside-toplevel
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("tuido")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def build_report(results: list[dict], completed_ratio: float, repeat: int) -> dict:
+    """Wrap benchmark rows with what is needed to compare them later."""
+    return {
+        "format": REPORT_FORMAT,
+        "tuido": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "completed_ratio": completed_ratio,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def find_regressions(
+    results: list[dict],
+    baseline: list[dict],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_change: float = DEFAULT_MIN_CHANGE,
+) -> list[dict]:
+    """Return the rows that got slower than in ``baseline``.
+
+    A row regresses when its best time grew by more than ``threshold``
+    percent and by at least ``min_change`` milliseconds. Rows without a
+    counterpart in the baseline are ignored.
+    """
+
+    def key(row: dict) -> tuple:
+        return row["backend"], row["tasks"], row["operation"]
+
+    before = {key(row): row["best_ms"] for row in baseline}
+    regressions = []
+    for row in results:
+        previous = before.get(key(row))
+        if previous is None:
+            continue
+        change = row["best_ms"] - previous
+        if change >= min_change and change > previous * threshold / 100:
+            percent = change / previous * 100 if previous else float("inf")
+            regressions.append({**row, "baseline_ms": previous, "change_pct": percent})
+    return regressions
+
+
+def _print_row(row: dict) -> None:
+    print(
+        f"{row['backend']:>12}  {row['tasks']:>9}  {row['operation']:>9}  "
+        f"{row['best_ms']:>10.2f}  {row['median_ms']:>10.2f}",
+        flush=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite, or generate a task file, and return the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tuido.bench", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--tasks", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(DEFAULT_EXTENSIONS),
+        default=list(DEFAULT_EXTENSIONS),
+    )
+    parser.add_argument("--completed-ratio", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", "-o", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Slowdown in percent that fails the run (default: {DEFAULT_THRESHOLD:g})",
+    )
+    parser.add_argument(
+        "--min-change",
+        type=float,
+        default=DEFAULT_MIN_CHANGE,
+        help="Smallest slowdown in milliseconds that counts as a regression "
+        f"(default: {DEFAULT_MIN_CHANGE:g})",
+    )
+    parser.add_argument(
+        "--generate",
+        metavar="FILE",
+        help="Only write a task file with the first --tasks size and exit",
+    )
+    parser.add_argument(
+        "--backend", help="Backend of the generated file (default: from its extension)"
+    )
+    parser.add_argument(
+        "--run",
+        nargs=argparse.REMAINDER,
+        metavar="NAME",
+        help="Run a standalone benchmark from benchmarks/ instead, passing it "
+        f"the arguments that follow ({', '.join(STANDALONE)})",
+    )
+    args = parser.parse_args(argv)
+
+    if args.run is not None:
+        if not args.run or args.run[0] not in STANDALONE:
+            parser.error(f"--run takes one of: {', '.join(STANDALONE)}")
+        return run_standalone(args.run[0], args.run[1:])
+
+    if args.generate:
+        data = generate_data(args.tasks[0], args.completed_ratio)
+        write_task_file(Path(args.generate), data, args.backend)
+        print(f"Wrote {len(data.tasks)} tasks to {args.generate}")
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    print(
+        f"{'backend':>12}  {'tasks':>9}  {'operation':>9}  "
+        f"{'best (ms)':>10}  {'median (ms)':>10}"
+    )
+    results = run_suite(
+        args.tasks, args.backends, args.completed_ratio, args.repeat, _print_row
+    )
+    if args.output:
+        report = build_report(results, args.completed_ratio, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    if baseline is None:
+        return 0
+    regressions = find_regressions(results, baseline, args.threshold, args.min_change)
+    for row in regressions:
+        print(
+            f"Regression: {row['backend']} {row['operation']} on {row['tasks']} "
+            f"tasks took {row['best_ms']:.2f}ms, {row['change_pct']:.0f}% "
+            f"slower than {row['baseline_ms']:.2f}ms",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""Repository for tasks stored in a compact binary file read through mmap."""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from tuido.atomic_file import write_atomically
+from tuido.file_lock import FileLock
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_query import TaskQuery
+from tuido.task_repository import (
+    ConcurrentModificationError,
+    FileSignature,
+    InvalidTaskFileError,
+    TaskRepository,
+    file_signature,
+    resolve_path,
+)
+
+MAGIC = b"TUIDOBIN"
+FORMAT = 1
+
+# magic, format, task count, pending count, next id, version
+HEADER = struct.Struct("<8sIIIQQ")
+HEADER_SIZE = 64
+
+# id, created_at, completed_at (epoch seconds, NaN while pending),
+# description offset into the heap and length in bytes
+RECORD = struct.Struct("<qddII")
+TASK_ID = struct.Struct("<q")
+
+Record = tuple[int, float, float, int, int]
+
+
+class BinaryTaskRepository(TaskRepository):
+    """Repository for tasks stored in a compact binary file.
+
+    The file holds a fixed-size header, a table of fixed-width records
+    sorted by id, and a heap of UTF-8 descriptions that the records point
+    into. Reads map the file with ``mmap``, so looking up an id (a binary
+    search over the records) or counting tasks (kept in the header) only
+    touches the pages involved.
+
+    Completing a task or making it pending again rewrites its record and
+    the header in place. Adding or deleting tasks rewrites the whole file
+    atomically, as the JSON backend does.
+    """
+
+    indexed = True
+
+    def __init__(self, file_path: str | Path) -> None:
+        """Initialize the repository with the given file path."""
+        self.file_path = resolve_path(file_path)
+        self._lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+        self._tracking = False
+        self._signature: FileSignature | None = None
+        self._version = 0
+
+    def lock(self) -> FileLock:
+        """Return the advisory lock on ``<file>.lock``."""
+        return self._lock
+
+    def has_changed(self) -> bool:
+        """Whether the file was replaced or modified since the last load or save."""
+        return self._tracking and file_signature(self.file_path) != self._signature
+
+    def load_data(self) -> TaskData:
+        """Load every task from the file."""
+        self._tracking = True
+        self._signature = file_signature(self.file_path)
+        self._version = 0
+        mapped = self._map()
+        if mapped is None:
+            return TaskData()
+
+        with mapped, self._io_errors():
+            count, _, next_id, self._version = self._header(mapped)
+            heap = HEADER_SIZE + count * RECORD.size
+            tasks = [
+                _to_task(mapped, heap, record)
+                for record in _records(mapped, HEADER_SIZE, heap)
+            ]
+        return TaskData(tasks=tasks, next_id=next_id)
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Binary-search the records for a single task."""
+        mapped = self._map()
+        if mapped is None:
+            return None
+
+        with mapped, self._io_errors():
+            count = self._header(mapped)[0]
+            index = _find(mapped, count, task_id)
+            if index is None:
+                return None
+            record = RECORD.unpack_from(mapped, HEADER_SIZE + index * RECORD.size)
+            return _to_task(mapped, HEADER_SIZE + count * RECORD.size, record)
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Read the counts kept in the header."""
+        mapped = self._map()
+        if mapped is None:
+            return 0
+
+        with mapped, self._io_errors():
+            count, pending, _, _ = self._header(mapped)
+        if completed is None:
+            return count
+        return count - pending if completed else pending
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over one page of tasks from the mapped file."""
+        return self.query_tasks(TaskQuery(completed, offset=offset, limit=limit))
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Filter the fixed-width records, decoding only matching tasks."""
+        mapped = self._map()
+        if mapped is None:
+            return iter(())
+        return self._query(mapped, query)
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching records without building tasks."""
+        if not query.filtered:
+            return self.count_tasks(query.completed)
+        mapped = self._map()
+        if mapped is None:
+            return 0
+
+        with mapped, self._io_errors():
+            count = self._header(mapped)[0]
+            heap = HEADER_SIZE + count * RECORD.size
+            return sum(
+                map(
+                    _record_filter(mapped, heap, query),
+                    _records(mapped, HEADER_SIZE, heap),
+                )
+            )
+
+    def _query(self, mapped: mmap.mmap, query: TaskQuery) -> Iterator[Task]:
+        # The record iterators are never bound to names, so that they are
+        # gone, and the mapping can be closed, as soon as iteration stops.
+        with mapped, self._io_errors():
+            count = self._header(mapped)[0]
+            heap = HEADER_SIZE + count * RECORD.size
+            if query.completed is None and not query.filtered and query.sorted_by_id:
+                # A page of all tasks starts at a known record.
+                start = min(query.offset, count)
+                stop = count if query.limit is None else min(start + query.limit, count)
+                first, last = (HEADER_SIZE + i * RECORD.size for i in (start, stop))
+                for record in _records(mapped, first, last):
+                    yield _to_task(mapped, heap, record)
+                return
+
+            matches = _record_filter(mapped, heap, query)
+            if query.sorted_by_id:
+                for record in query.page(
+                    filter(matches, _records(mapped, HEADER_SIZE, heap))
+                ):
+                    yield _to_task(mapped, heap, record)
+            else:
+                yield from query.order_and_page(
+                    _to_task(mapped, heap, record)
+                    for record in filter(matches, _records(mapped, HEADER_SIZE, heap))
+                )
+
+    def save_data(self, tasks: TaskData) -> None:
+        """Write the whole file, atomically replacing the old one.
+
+        If the file was changed by someone else since it was loaded, the
+        save is refused with ConcurrentModificationError.
+        """
+        with self._io_errors(), self._lock:
+            self._check_for_conflicts()
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            write_atomically(self.file_path, _encode(tasks, self._version + 1))
+            self._saved()
+
+    def update_task(self, tasks: TaskData, task: Task) -> None:
+        """Rewrite the task's record in place."""
+        self.save_batch(tasks, updated=[task])
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Persist several changes with a single write.
+
+        Updates are written in place; adding or removing tasks rewrites
+        the file.
+        """
+        inserted, updated, deleted = list(inserted), list(updated), list(deleted)
+        with self._io_errors(), self._lock:
+            if not inserted and not deleted:
+                self._check_for_conflicts()
+                if self._update_in_place(tasks, updated):
+                    self._saved()
+                    return
+            self.save_data(tasks)
+
+    def _update_in_place(self, tasks: TaskData, updated: list[Task]) -> bool:
+        """Overwrite the records of updated tasks and the header.
+
+        Returns False without writing anything if a task is not in the file
+        or its description changed, since that needs a new heap.
+        """
+        try:
+            fd = os.open(self.file_path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                count, pending, _, version = self._header(mapped)
+                heap = HEADER_SIZE + count * RECORD.size
+                writes = []
+                for task in {task.id: task for task in updated}.values():
+                    index = _find(mapped, count, task.id)
+                    if index is None:
+                        return False
+                    position = HEADER_SIZE + index * RECORD.size
+                    _, _, completed_at, offset, length = RECORD.unpack_from(
+                        mapped, position
+                    )
+                    start = heap + offset
+                    description = task.description.encode("utf-8")
+                    if mapped[start : start + length] != description:
+                        return False
+                    record = _to_record(task, offset, len(description))
+                    pending += math.isnan(record[2]) - math.isnan(completed_at)
+                    writes.append((position, RECORD.pack(*record)))
+
+            for position, data in writes:
+                os.pwrite(fd, data, position)
+            header = HEADER.pack(
+                MAGIC, FORMAT, count, pending, tasks.next_id, version + 1
+            )
+            os.pwrite(fd, header, 0)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return True
+
+    def _saved(self) -> None:
+        self._version += 1
+        self._tracking = True
+        self._signature = file_signature(self.file_path)
+
+    def _check_for_conflicts(self) -> None:
+        """Raise ConcurrentModificationError if the file changed under us.
+
+        A changed signature alone is not a conflict if the header still
+        carries the version that was loaded (for example after a ``touch``).
+        """
+        if not self.has_changed():
+            return
+
+        version = 0
+        mapped = self._map()
+        if mapped is not None:
+            with mapped:
+                version = self._header(mapped)[3]
+        if version == 0 or version != self._version:
+            raise ConcurrentModificationError(
+                f"{self.file_path} was modified by another process"
+            )
+
+    def _map(self) -> mmap.mmap | None:
+        """Map the file read-only, or return None if it is missing or empty."""
+        try:
+            with self.file_path.open("rb") as file:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _header(self, mapped: mmap.mmap) -> tuple[int, int, int, int]:
+        """Return (task count, pending count, next id, version)."""
+        if len(mapped) < HEADER_SIZE:
+            raise InvalidTaskFileError(
+                f"{self.file_path} is not a tuido binary task file"
+            )
+        magic, file_format, count, pending, next_id, version = HEADER.unpack_from(
+            mapped
+        )
+        if magic != MAGIC or file_format != FORMAT:
+            raise InvalidTaskFileError(
+                f"{self.file_path} is not a tuido binary task file"
+            )
+        return count, pending, next_id, version
+
+    @contextmanager
+    def _io_errors(self) -> Iterator[None]:
+        try:
+            yield
+        except PermissionError:
+            print(f"Error: Permission denied writing to {self.file_path}")
+            print("Check file permissions or try running with appropriate privileges")
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: System error writing file - {e}")
+            sys.exit(1)
+
+
+def _records(mapped: mmap.mmap, start: int, stop: int) -> Iterator[Record]:
+    """Unpack the records between two offsets without copying the table.
+
+    The records are read through a memoryview of the mapping, which must
+    be dropped before the mapping is closed.
+    """
+    return RECORD.iter_unpack(memoryview(mapped)[start:stop])
+
+
+def _encode(tasks: TaskData, version: int) -> bytes:
+    """Serialize tasks into the binary file format."""
+    records = []
+    heap = bytearray()
+    pending = 0
+    for task in sorted(tasks.tasks, key=lambda task: task.id):
+        description = task.description.encode("utf-8")
+        records.append(RECORD.pack(*_to_record(task, len(heap), len(description))))
+        heap += description
+        pending += not task.is_complete()
+    header = HEADER.pack(MAGIC, FORMAT, len(records), pending, tasks.next_id, version)
+    return header.ljust(HEADER_SIZE, b"\0") + b"".join(records) + heap
+
+
+def _to_record(task: Task, offset: int, length: int) -> Record:
+    created_at, completed_at = task.epoch_timestamps()
+    if completed_at is None:
+        completed_at = math.nan
+    return task.id, created_at, completed_at, offset, length
+
+
+def _to_task(mapped: mmap.mmap, heap: int, record: Record) -> Task:
+    task_id, created_at, completed_at, offset, length = record
+    start = heap + offset
+    return Task(
+        id=task_id,
+        description=str(mapped[start : start + length], "utf-8"),
+        created_at=created_at,
+        completed_at=None if math.isnan(completed_at) else completed_at,
+    )
+
+
+def _find(mapped: mmap.mmap, count: int, task_id: int) -> int | None:
+    """Return the index of the record for ``task_id``, or None."""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        found = TASK_ID.unpack_from(mapped, HEADER_SIZE + middle * RECORD.size)[0]
+        if found == task_id:
+            return middle
+        if found < task_id:
+            low = middle + 1
+        else:
+            high = middle
+    return None
+
+
+def _record_filter(
+    mapped: mmap.mmap, heap: int, query: TaskQuery
+) -> Callable[[Record], bool]:
+    """Return a predicate applying a query to raw records.
+
+    Status and dates are compared as epoch seconds, and descriptions are
+    only decoded when the query matches on text.
+    """
+    completed = query.completed
+    since = None if query.since is None else query.since.timestamp()
+    until = None if query.until is None else query.until.timestamp()
+    needle = query.match.casefold() if query.match else None
+
+    def matches(record: Record) -> bool:
+        _, created_at, completed_at, offset, length = record
+        is_complete = not math.isnan(completed_at)
+        if completed is not None and is_complete != completed:
+            return False
+        when = completed_at if is_complete else created_at
+        if since is not None and when < since:
+            return False
+        if until is not None and when >= until:
+            return False
+        if needle is None:
+            return True
+        start = heap + offset
+        return needle in str(mapped[start : start + length], "utf-8").casefold()
+
+    return matches
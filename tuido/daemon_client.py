@@ -0,0 +1,263 @@
+"""Client side of the ``tuido serve`` daemon.
+
+The daemon listens on a Unix domain socket and speaks newline-delimited
+JSON-RPC 2.0: one request object per line, answered by one response object
+per line on the same connection. ``connect`` returns a ``RemoteTaskManager``
+when a daemon is serving the task file, so the CLI can use it in place of a
+local ``TaskManager``.
+"""
+
+import hashlib
+import os
+import stat
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from tuido.task import Task
+from tuido.task_query import TaskQuery
+from tuido.task_repository import resolve_path
+
+# The CLI imports this module on every run to look for a daemon, so socket
+# and JSON handling are only imported once a daemon is actually found.
+if TYPE_CHECKING:
+    import socket
+
+CONNECT_TIMEOUT = 1.0
+CALL_TIMEOUT = 60.0
+
+
+class DaemonError(Exception):
+    """Raised when the daemon reports an error or the connection fails."""
+
+    def __init__(self, message: str, code: int | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def socket_path(file_path: str | Path) -> Path:
+    """Return the socket a daemon serving ``file_path`` listens on.
+
+    Sockets live in a per-user runtime directory and are named after a hash
+    of the resolved task file path, which keeps them short enough for the
+    ``AF_UNIX`` path limit wherever the task file is.
+    """
+    runtime_dir = (
+        os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    )
+    digest = hashlib.sha1(str(resolve_path(file_path)).encode("utf-8")).hexdigest()
+    return Path(runtime_dir) / f"tuido-{os.getuid()}" / f"{digest[:16]}.sock"
+
+
+def check_socket_dir(directory: Path) -> None:
+    """Check that only the current user can reach sockets in ``directory``.
+
+    The runtime directory may be a shared one such as ``/tmp``, where
+    another user could create ``tuido-<uid>`` first and then intercept or
+    impersonate the daemon. The directory is inspected without following
+    symlinks and must belong to us with no group or other permissions.
+
+    Raises:
+        DaemonError: If the directory is not private to the current user
+    """
+    try:
+        info = os.lstat(directory)
+    except OSError as e:
+        raise DaemonError(f"Cannot inspect socket directory {directory}: {e}") from e
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise DaemonError(
+            f"Refusing to use socket directory {directory}: it must be a "
+            "directory owned by you and inaccessible to other users"
+        )
+
+
+class DaemonClient:
+    """A connection to a running daemon."""
+
+    def __init__(self, path: str | Path, timeout: float = CONNECT_TIMEOUT) -> None:
+        import socket  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        self.path = Path(path)
+        self._socket: "socket.socket" = socket.socket(
+            socket.AF_UNIX, socket.SOCK_STREAM
+        )
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(str(self.path))
+            self._socket.settimeout(CALL_TIMEOUT)
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+        self._next_id = 1
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def call(self, method: str, **params) -> Any:
+        """Call ``method`` on the daemon and return its result."""
+        return self.call_many([(method, params)])[0]
+
+    def call_many(self, calls: Iterable[tuple[str, dict]]) -> list[Any]:
+        """Send several calls at once and return their results in order.
+
+        All requests are written before any response is read, so the daemon
+        can apply them together and save once.
+        """
+        import json  # pylint: disable=import-outside-toplevel
+
+        requests = []
+        for method, params in calls:
+            requests.append(
+                {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+                | ({"params": params} if params else {})
+            )
+            self._next_id += 1
+        try:
+            self._socket.sendall(
+                b"".join(
+                    json.dumps(request, separators=(",", ":")).encode("utf-8") + b"\n"
+                    for request in requests
+                )
+            )
+            lines = [self._reader.readline() for _ in requests]
+        except OSError as e:
+            raise DaemonError(f"Lost connection to daemon: {e}") from e
+
+        results = []
+        for line in lines:
+            if not line:
+                raise DaemonError("Daemon closed the connection")
+            response = json.loads(line)
+            if "error" in response:
+                error = response["error"]
+                raise DaemonError(error["message"], error.get("code"))
+            results.append(response["result"])
+        return results
+
+
+def _to_task(data: dict) -> Task:
+    return Task(
+        id=data["id"],
+        description=data["description"],
+        created_at=data["created_at"],
+        completed_at=data.get("completed_at") or None,
+        parent_id=data.get("parent_id"),
+        blocked_by=data.get("blocked_by", ()),
+    )
+
+
+class RemoteTaskManager:
+    """TaskManager look-alike that forwards every call to a daemon."""
+
+    def __init__(self, client: DaemonClient) -> None:
+        self.client = client
+
+    def add_task(self, description: str) -> Task:
+        """Add a new task with the given description."""
+        return _to_task(self.client.call("add", description=description))
+
+    def add_many(self, descriptions: Iterable[str]) -> list[Task]:
+        """Add a task for each description, saving once."""
+        tasks = self.client.call("add_many", descriptions=list(descriptions))
+        return [_to_task(task) for task in tasks]
+
+    def delete_task(self, task_id: int) -> Task | None:
+        """Delete a task by its ID."""
+        return self.delete_many([task_id])[task_id]
+
+    def set_task_complete(self, task_id: int) -> bool:
+        """Mark a task as complete by its ID."""
+        return self.complete_many([task_id])[task_id]
+
+    def set_task_pending(self, task_id: int) -> bool:
+        """Mark a task as pending by its ID."""
+        return self.pending_many([task_id])[task_id]
+
+    def delete_many(self, task_ids: Iterable[int]) -> dict[int, Task | None]:
+        """Delete several tasks, saving once."""
+        results = self.client.call("delete", ids=list(task_ids))
+        return {
+            int(task_id): _to_task(task) if task else None
+            for task_id, task in results.items()
+        }
+
+    def complete_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as complete, saving once."""
+        results = self.client.call("complete", ids=list(task_ids))
+        return {int(task_id): ok for task_id, ok in results.items()}
+
+    def pending_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as pending, saving once."""
+        results = self.client.call("pending", ids=list(task_ids))
+        return {int(task_id): ok for task_id, ok in results.items()}
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        task = self.client.call("get", id=task_id)
+        return _to_task(task) if task else None
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over one page of tasks held by the daemon."""
+        tasks = self.client.call(
+            "list", completed=completed, offset=offset, limit=limit
+        )
+        return map(_to_task, tasks)
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally filtered by status."""
+        return self.client.call("count", completed=completed)
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Run a query against the daemon's tasks, which are always in memory.
+
+        The daemon sends all matching tasks in one reply, so there is no
+        ``stream`` option as in TaskManager.query_tasks.
+        """
+        return map(_to_task, self.client.call("query", **query.to_params()))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count the daemon's tasks matching a query."""
+        return self.client.call("count_matching", **query.to_params())
+
+    def all_tasks(self) -> list[Task]:
+        """Return all tasks."""
+        return list(self.iter_tasks())
+
+    def pending_tasks(self) -> list[Task]:
+        """Return pending tasks."""
+        return list(self.iter_tasks(completed=False))
+
+    def completed_tasks(self) -> list[Task]:
+        """Return completed tasks."""
+        return list(self.iter_tasks(completed=True))
+
+
+def connect(file_path: str | Path) -> RemoteTaskManager | None:
+    """Connect to the daemon serving ``file_path``, if one is running."""
+    path = socket_path(file_path)
+    if not path.exists():
+        return None
+    try:
+        check_socket_dir(path.parent)
+    except DaemonError:
+        # Not a daemon we can trust; work on the task file directly.
+        return None
+    try:
+        return RemoteTaskManager(DaemonClient(path))
+    except OSError:
+        # A socket left behind by a daemon that did not shut down cleanly.
+        return None
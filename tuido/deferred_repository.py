@@ -0,0 +1,155 @@
+"""A repository wrapper that holds changes until they are flushed."""
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from tuido.task import Task
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_query import TaskQuery
+from tuido.task_repository import TaskRepository
+
+
+class DeferredRepository(TaskRepository):
+    """Collects changes in memory until ``flush`` writes them in one batch.
+
+    Changes to the same task are merged, so adding and then completing a
+    task writes it once, and adding and then deleting it writes nothing.
+    Reads are passed through to the wrapped repository; TaskManager only
+    makes them before loading, when there is nothing waiting to be flushed.
+    """
+
+    def __init__(self, repository: TaskRepository) -> None:
+        self.repository = repository
+        self._inserted: dict[int, Task] = {}
+        self._updated: dict[int, Task] = {}
+        self._deleted: dict[int, Task] = {}
+        self._rewrite = False
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        """Whether there are changes waiting to be flushed."""
+        return self._dirty
+
+    @property
+    def file_path(self) -> Path:  # type: ignore[override]
+        """The wrapped repository's task file."""
+        return self.repository.file_path
+
+    @property
+    def indexed(self) -> bool:  # type: ignore[override]
+        """Whether the wrapped repository answers reads from an index."""
+        return self.repository.indexed
+
+    @property
+    def streaming(self) -> bool:  # type: ignore[override]
+        """Whether the wrapped repository streams reads."""
+        return self.repository.streaming
+
+    @property
+    def stores_links(self) -> bool:  # type: ignore[override]
+        """Whether the wrapped repository saves task links."""
+        return self.repository.stores_links
+
+    def storage_paths(self) -> list[Path]:
+        """The files of the wrapped repository."""
+        return self.repository.storage_paths()
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over tasks in the wrapped repository."""
+        return self.repository.iter_tasks(completed, offset, limit)
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Run a query against the wrapped repository."""
+        return self.repository.query_tasks(query)
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching tasks in the wrapped repository."""
+        return self.repository.count_matching(query)
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Look up a task in the wrapped repository."""
+        return self.repository.get_task(task_id)
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks in the wrapped repository."""
+        return self.repository.count_tasks(completed)
+
+    def load_data(self) -> TaskData:
+        """Load tasks from the wrapped repository, dropping unsaved changes."""
+        self.discard()
+        return self.repository.load_data()
+
+    def save_data(self, tasks: TaskData) -> None:
+        """Schedule a full rewrite."""
+        self._rewrite = self._dirty = True
+
+    def insert_task(self, tasks: TaskData, task: Task) -> None:
+        """Schedule a task to be inserted."""
+        self._inserted[task.id] = task
+        self._dirty = True
+
+    def update_task(self, tasks: TaskData, task: Task) -> None:
+        """Schedule a task to be updated."""
+        if task.id not in self._inserted:
+            self._updated[task.id] = task
+        self._dirty = True
+
+    def delete_task(self, tasks: TaskData, task: Task) -> None:
+        """Schedule a task to be deleted."""
+        if self._inserted.pop(task.id, None) is None:
+            self._updated.pop(task.id, None)
+            self._deleted[task.id] = task
+        self._dirty = True
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Schedule several changes."""
+        for task in inserted:
+            self.insert_task(tasks, task)
+        for task in updated:
+            self.update_task(tasks, task)
+        for task in deleted:
+            self.delete_task(tasks, task)
+
+    def save_changes(self, tasks: TaskData, delta: TaskDelta) -> None:
+        """Schedule every change in ``delta``, even a bare ``next_id`` bump."""
+        if delta.rewrite:
+            self.save_data(tasks)
+        else:
+            self.save_batch(tasks, delta.inserted, delta.updated, delta.deleted)
+        self._dirty = True
+
+    def flush(self, tasks: TaskData) -> bool:
+        """Write all scheduled changes with one save. Returns whether it wrote."""
+        if not self._dirty:
+            return False
+        try:
+            if self._rewrite:
+                self.repository.save_data(tasks)
+            else:
+                self.repository.save_changes(
+                    tasks,
+                    TaskDelta(
+                        inserted=list(self._inserted.values()),
+                        updated=list(self._updated.values()),
+                        deleted=list(self._deleted.values()),
+                    ),
+                )
+        finally:
+            self.discard()
+        return True
+
+    def discard(self) -> None:
+        """Forget all scheduled changes."""
+        self._inserted.clear()
+        self._updated.clear()
+        self._deleted.clear()
+        self._rewrite = self._dirty = False
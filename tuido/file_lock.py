@@ -0,0 +1,45 @@
+"""Advisory file locking for task files."""
+
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class FileLock:
+    """A reentrant, exclusive advisory lock held on a sidecar lock file.
+
+    Uses ``fcntl.flock`` so the lock is released automatically if the
+    process dies. On platforms without ``fcntl`` the lock is a no-op.
+    The lock file is never removed, since unlinking it would let two
+    processes lock different inodes.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = None
+        self._depth = 0
+
+    def __enter__(self) -> "FileLock":
+        if self._depth == 0 and fcntl is not None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            # pylint: disable-next=consider-using-with
+            self._file = open(self.path, "a", encoding="utf-8")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    @property
+    def held(self) -> bool:
+        """Whether this process currently holds the lock."""
+        return self._depth > 0
@@ -0,0 +1,182 @@
+"""Phase timings and memory use for finding out where a command spends time.
+
+Tracing is off until ``tuido --profile`` or ``$TUIDO_TRACE`` turns it on;
+until then ``span`` only looks up a global and returns a shared no-op
+context manager. Repositories and other extensions can report their own
+phases, which show up nested under the phase that called them:
+
+    from tuido.instrumentation import span
+
+    with span("fetch"):
+        response = session.get(url)
+"""
+
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, ContextManager, Iterator, NamedTuple, TextIO
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Set to 1 to profile every command, or to a file name to also write a
+# cProfile dump there.
+TRACE_VARIABLE = "TUIDO_TRACE"
+
+_NO_SPAN = nullcontext()
+
+
+class Span(NamedTuple):
+    """One timed phase.
+
+    ``allocated`` is the memory still held at the end of the phase and
+    ``peak`` the most it held at once, both relative to its start. They are
+    None if memory was not traced during the phase.
+    """
+
+    name: str
+    depth: int
+    seconds: float
+    allocated: int | None = None
+    peak: int | None = None
+
+
+class Tracer:
+    """Records the spans of one command, in the order they started."""
+
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.spans: list[Span] = []
+        self._depth = 0
+        # Highest traced memory seen in each open span, innermost last.
+        self._peaks: list[int] = []
+
+    def start(self) -> None:
+        """Start tracing memory allocations, if asked to."""
+        if self.memory:
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        """Stop tracing memory allocations."""
+        if self.memory:
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            tracemalloc.stop()
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record a phase that was timed elsewhere, such as startup."""
+        self.spans.append(Span(name, self._depth, seconds))
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the body and, if memory is traced, measure its allocations."""
+        index = len(self.spans)
+        self.spans.append(Span(name, self._depth, 0.0))
+        self._depth += 1
+        tracemalloc = sys.modules.get("tracemalloc") if self.memory else None
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        if tracing:
+            # The peak is reset for every span, so carry the peak seen so
+            # far over to the span that encloses this one.
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._peaks.append(current)
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._depth -= 1
+            allocated = peak = None
+            if tracing:
+                end, highest = tracemalloc.get_traced_memory()
+                highest = max(self._peaks.pop(), highest)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], highest)
+                tracemalloc.reset_peak()
+                allocated = end - current
+                peak = highest - current
+            self.spans[index] = Span(name, self._depth, seconds, allocated, peak)
+
+    def report(self, file: TextIO) -> None:
+        """Print the spans as an indented table."""
+        width = max([len("phase")] + [2 * s.depth + len(s.name) for s in self.spans])
+        file.write(
+            f"{'phase':<{width}}  {'time (ms)':>10}  "
+            f"{'net (KiB)':>10}  {'peak (KiB)':>10}\n"
+        )
+        for item in self.spans:
+            name = "  " * item.depth + item.name
+            line = f"{name:<{width}}  {item.seconds * 1000:>10.2f}"
+            if item.allocated is not None:
+                line += f"  {item.allocated / 1024:>10.1f}  {item.peak / 1024:>10.1f}"
+            file.write(line + "\n")
+        if self.memory:
+            file.write("Times include the overhead of tracing memory.\n")
+
+
+_tracer: Tracer | None = None
+
+
+def span(name: str) -> ContextManager[None]:
+    """Report a phase to the active tracer, if there is one."""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name)
+
+
+def current_tracer() -> Tracer | None:
+    """Return the active tracer, or None when tracing is off."""
+    return _tracer
+
+
+def enable(memory: bool = True) -> Tracer:
+    """Start recording spans with a new tracer and return it."""
+    global _tracer  # pylint: disable=global-statement
+    disable()
+    _tracer = Tracer(memory)
+    _tracer.start()
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    """Stop recording spans and return the tracer that recorded them."""
+    global _tracer  # pylint: disable=global-statement
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.stop()
+    return tracer
+
+
+@contextmanager
+def profile(
+    output: str | None = None, memory: bool = True, file: TextIO | None = None
+) -> Iterator[Tracer]:
+    """Trace the body, then print the spans to ``file`` (stderr by default).
+
+    With ``output``, the body also runs under cProfile and its statistics
+    are written there, for ``python -m pstats`` or a viewer.
+    """
+    tracer = enable(memory)
+    profiler: "cProfile.Profile | None" = None
+    if output:
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield tracer
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        disable()
+        file = file or sys.stderr
+        tracer.report(file)
+        if profiler is not None:
+            profiler.dump_stats(output)
+            file.write(f"cProfile statistics written to {output}\n")
@@ -0,0 +1,248 @@
+"""Repository that stores tasks as an append-only journal of mutations."""
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from tuido.file_lock import FileLock
+from tuido.json_task_repository import dict_to_task, task_to_dict
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_repository import (
+    FileSignature,
+    TaskRepository,
+    file_signature,
+    resolve_path,
+)
+
+DEFAULT_SNAPSHOT_INTERVAL = 1000
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class JournalTaskRepository(TaskRepository):
+    """Repository that appends one line per mutation to a journal file.
+
+    The journal sits next to a JSON snapshot (``<file>.snapshot``). Loading
+    reads the snapshot and replays the journal on top of it. Once the journal
+    holds ``snapshot_interval`` operations or grows past ``compact_threshold``
+    bytes, it is folded back into a new snapshot and truncated.
+
+    Journal entries set absolute state (the whole task on ``add``, the
+    completion time on ``complete``), so replaying entries that are already
+    part of the snapshot is harmless. That keeps a crash between writing the
+    snapshot and truncating the journal from corrupting anything.
+    """
+
+    stores_links = True
+
+    def __init__(
+        self,
+        file_path: str | Path,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ) -> None:
+        """Initialize the repository with the given journal path."""
+        self.file_path = resolve_path(file_path)
+        self.snapshot_path = self.file_path.with_name(self.file_path.name + ".snapshot")
+        self.snapshot_interval = snapshot_interval
+        self.compact_threshold = compact_threshold
+        self._pending_ops = 0
+        self._lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+        self._signature: tuple[FileSignature | None, FileSignature | None] | None = None
+
+    def lock(self) -> FileLock:
+        """Serialize read-modify-write cycles across processes."""
+        return self._lock
+
+    def has_changed(self) -> bool:
+        """Whether the journal or snapshot changed since the last load or write."""
+        return self._signature is not None and self._signature != self._signatures()
+
+    def storage_paths(self) -> list[Path]:
+        """The journal and its snapshot."""
+        return [self.file_path, self.snapshot_path]
+
+    def _signatures(self) -> tuple[FileSignature | None, FileSignature | None]:
+        return file_signature(self.file_path), file_signature(self.snapshot_path)
+
+    def load_data(self) -> TaskData:
+        """Load the snapshot and replay the journal on top of it."""
+        tasks: dict[int, Task] = {}
+        next_id = 1
+
+        if self.snapshot_path.exists():
+            with self.snapshot_path.open("r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            tasks = {
+                task.id: task for task in map(dict_to_task, snapshot.get("tasks", []))
+            }
+            next_id = snapshot.get("next_id", 1)
+
+        self._pending_ops = 0
+        for entry in self._read_journal():
+            next_id = self._apply(tasks, entry, next_id)
+            self._pending_ops += 1
+
+        self._signature = self._signatures()
+        return TaskData(tasks=list(tasks.values()), next_id=next_id)
+
+    def save_data(self, tasks: TaskData) -> None:
+        """Write a full snapshot and truncate the journal."""
+        snapshot = {
+            "tasks": [task_to_dict(task) for task in tasks.tasks],
+            "next_id": tasks.next_id,
+        }
+        temp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with self._io_errors():
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(temp_path, mode="w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            with open(self.file_path, mode="w", encoding="utf-8"):
+                pass
+        self._pending_ops = 0
+        self._signature = self._signatures()
+
+    def insert_task(self, tasks: TaskData, task: Task) -> None:
+        """Append an ``add`` entry."""
+        self._append(tasks, [self._add_entry(tasks, task)])
+
+    def update_task(self, tasks: TaskData, task: Task) -> None:
+        """Append a ``complete`` or ``pending`` entry with the task's links."""
+        self._append(tasks, [self._update_entry(task)])
+
+    def delete_task(self, tasks: TaskData, task: Task) -> None:
+        """Append a ``delete`` entry."""
+        self._append(tasks, [self._delete_entry(task)])
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Append one entry per change with a single write and fsync."""
+        entries = [self._add_entry(tasks, task) for task in inserted]
+        entries.extend(self._update_entry(task) for task in updated)
+        entries.extend(self._delete_entry(task) for task in deleted)
+        self._append(tasks, entries)
+
+    def compact(self, tasks: TaskData) -> None:
+        """Fold the journal into a fresh snapshot."""
+        self.save_data(tasks)
+
+    def _add_entry(self, tasks: TaskData, task: Task) -> dict:
+        return {"op": "add", "task": task_to_dict(task), "next_id": tasks.next_id}
+
+    def _update_entry(self, task: Task) -> dict:
+        if task.completed_at is not None:
+            entry = {
+                "op": "complete",
+                "id": task.id,
+                "completed_at": task.iso_timestamps()[1],
+            }
+        else:
+            entry = {"op": "pending", "id": task.id}
+        # Links are absolute state too: an entry without them clears them.
+        if task.parent_id is not None:
+            entry["parent_id"] = task.parent_id
+        if task.blocked_by:
+            entry["blocked_by"] = list(task.blocked_by)
+        return entry
+
+    def _delete_entry(self, task: Task) -> dict:
+        return {"op": "delete", "id": task.id}
+
+    def _append(self, tasks: TaskData, entries: list[dict]) -> None:
+        lines = "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        )
+        with self._io_errors():
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            self._truncate_torn_line()
+            with open(self.file_path, mode="a", encoding="utf-8") as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+                size = file.tell()
+
+        self._pending_ops += len(entries)
+        if (
+            self._pending_ops >= self.snapshot_interval
+            or size >= self.compact_threshold
+        ):
+            self.compact(tasks)
+        else:
+            self._signature = self._signatures()
+
+    def _read_journal(self) -> Iterator[dict]:
+        """Yield journal entries, skipping a torn final line from a crash.
+
+        The torn line is only cut off by the next append, which holds the
+        lock; reading never writes, so a read-only journal can be loaded.
+        """
+        if not self.file_path.exists():
+            return
+
+        with self.file_path.open("r", encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    return
+                yield json.loads(line)
+
+    def _truncate_torn_line(self) -> None:
+        """Cut a torn final line off the journal before appending to it.
+
+        Called with the lock held, so no other writer is mid-append.
+        """
+        try:
+            file = open(self.file_path, mode="rb+")
+        except FileNotFoundError:
+            return
+        with file:
+            end = file.seek(0, os.SEEK_END)
+            offset = end
+            while offset > 0:
+                start = max(0, offset - 4096)
+                file.seek(start)
+                block = file.read(offset - start)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    offset = start + newline + 1
+                    break
+                offset = start
+            if offset < end:
+                file.truncate(offset)
+
+    def _apply(self, tasks: dict[int, Task], entry: dict, next_id: int) -> int:
+        op = entry["op"]
+        if op == "add":
+            task = dict_to_task(entry["task"])
+            tasks[task.id] = task
+            return max(next_id, entry["next_id"])
+        task = tasks.get(entry["id"])
+        if op == "delete":
+            tasks.pop(entry["id"], None)
+        elif task is not None and op in ("complete", "pending"):
+            task.completed_at = entry["completed_at"] if op == "complete" else None
+            task.parent_id = entry.get("parent_id")
+            task.blocked_by = tuple(entry.get("blocked_by", ()))
+        return next_id
+
+    @contextmanager
+    def _io_errors(self) -> Iterator[None]:
+        try:
+            yield
+        except PermissionError:
+            print(f"Error: Permission denied writing to {self.file_path}")
+            print("Check file permissions or try running with appropriate privileges")
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: System error writing file - {e}")
+            sys.exit(1)
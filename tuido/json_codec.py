@@ -0,0 +1,66 @@
+"""JSON codecs for task files: the standard library, or orjson when installed.
+
+The codec decodes task files and encodes compact ones. Indented files are
+always written by the standard library, whose layout they keep.
+"""
+
+import json
+import os
+from typing import Any, Callable, NamedTuple
+
+CODEC_VARIABLE = "TUIDO_JSON_CODEC"
+
+# Importing orjson takes longer than the standard library needs to read or
+# write a file smaller than this.
+ORJSON_MIN_SIZE = 256 * 1024
+
+
+class JsonCodec(NamedTuple):
+    """A pair of JSON functions working on UTF-8 bytes."""
+
+    name: str
+    loads: Callable[[bytes], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+STDLIB_CODEC = JsonCodec("json", json.loads, _stdlib_dumps)
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    return JsonCodec("orjson", orjson.loads, orjson.dumps)
+
+
+CODECS = {"json": lambda: STDLIB_CODEC, "orjson": _orjson_codec}
+
+_default: JsonCodec | None = None
+
+
+def get_codec(name: str | None = None, size: int | None = None) -> JsonCodec:
+    """Return the named codec, or the fastest one available.
+
+    Without a name, ``$TUIDO_JSON_CODEC`` is used if set; otherwise orjson
+    is picked when it can be imported, unless ``size`` says the document is
+    too small for it to pay off. Raises ValueError for an unknown name and
+    ImportError if orjson is asked for but not installed.
+    """
+    global _default  # pylint: disable=global-statement
+    name = name or os.environ.get(CODEC_VARIABLE)
+    if name:
+        try:
+            return CODECS[name]()
+        except KeyError:
+            raise ValueError(f"Unknown JSON codec: {name}") from None
+    if size is not None and size < ORJSON_MIN_SIZE:
+        return STDLIB_CODEC
+    if _default is None:
+        try:
+            _default = _orjson_codec()
+        except ImportError:
+            _default = STDLIB_CODEC
+    return _default
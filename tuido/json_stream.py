@@ -0,0 +1,141 @@
+"""Incremental reading of large JSON documents.
+
+Task files are a single JSON object whose ``tasks`` array can hold hundreds
+of thousands of entries. The helpers here walk that object a chunk at a
+time, yielding array elements one by one so that callers never hold the
+whole document in memory.
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JsonStreamReader:
+    """Reads JSON values one at a time from a text stream."""
+
+    def __init__(self, file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, discarding consumed input. Returns False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise ValueError."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def consume(self, char: str) -> bool:
+        """Consume ``char`` if it is next. Returns whether it was consumed."""
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array_items(self) -> Iterator[Any]:
+        """Yield the elements of the array that starts at the current position."""
+        self.expect("[")
+        if self.consume("]"):
+            return
+        while True:
+            items = self._buffered_objects()
+            if items:
+                yield from items
+            else:
+                yield self.value()
+            if self.consume("]"):
+                return
+            self.expect(",")
+
+    def _buffered_objects(self) -> list:
+        """Decode the run of whole object elements already in the buffer.
+
+        One ``json.loads`` call over the run is several times faster than
+        decoding its elements one by one. The run is assumed to end at one
+        of the last two ``}`` in the buffer; a brace inside a string or a
+        nested object makes the run invalid JSON, and then nothing is
+        decoded so that the caller falls back to a single value.
+        """
+        end = len(self._buffer)
+        for _ in range(2):
+            end = self._buffer.rfind("}", self._pos, end)
+            if end < 0:
+                return []
+            try:
+                items = json.loads("[" + self._buffer[self._pos : end + 1] + "]")
+            except ValueError:
+                continue
+            self._pos = end + 1
+            return items
+        return []
+
+
+def iter_object(
+    file: TextIO, stream_key: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[str, Any]]:
+    """Walk a top-level JSON object, streaming one array member.
+
+    Yields ``(key, value)`` for every member of the object, except that the
+    array under ``stream_key`` is yielded as one ``(stream_key, element)``
+    pair per element, decoded only as the caller advances.
+    """
+    reader = JsonStreamReader(file, chunk_size)
+    reader.expect("{")
+    if reader.consume("}"):
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == stream_key and reader.peek() == "[":
+            for item in reader.array_items():
+                yield key, item
+        else:
+            yield key, reader.value()
+        if reader.consume("}"):
+            return
+        reader.expect(",")
@@ -1,49 +1,426 @@
 """Repository for managing tasks stored in a JSON file."""
 
-import datetime
 import json
 import os
 import sys
+from contextlib import contextmanager
+from itertools import chain, groupby
 from pathlib import Path
+from typing import Iterable, Iterator
 
+from tuido.atomic_file import write_atomically
+from tuido.file_lock import FileLock
+from tuido.instrumentation import span
+from tuido.json_codec import JsonCodec, get_codec
+from tuido.json_stream import iter_object
 from tuido.task import Task
-from tuido.task_data import TaskData
-from tuido.task_repository import TaskRepository
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_query import TaskQuery
+from tuido.task_repository import (
+    ConcurrentModificationError,
+    FileSignature,
+    TaskRepository,
+    file_signature,
+    resolve_path,
+)
+from tuido.task_stats import TaskStats
+
+# Layout of the tasks array as written by ``json.dumps(data, indent=4)``.
+INDENT = " " * 8
+TASKS_START = '\n    "tasks": [\n'
+TASKS_END = '\n    ],\n    "next_id": '
+TASK_START = INDENT + "{\n" + INDENT + "    "
+TASK_END = "\n" + INDENT + "}"
+FIELD_SEPARATOR = ",\n" + INDENT + "    "
+
+COMPACT_FORMAT = "compact"
+
+
+def task_to_dict(task: Task) -> dict:
+    """Convert a task to its JSON-serializable form.
+
+    Timestamps become ISO-8601 strings, which keep the local wall-clock
+    time to the microsecond. ``parent_id`` and ``blocked_by`` are only
+    present for tasks that have them, so files without links keep their
+    layout.
+    """
+    created_at, completed_at = task.iso_timestamps()
+    data = {
+        "id": task.id,
+        "description": task.description,
+        "created_at": created_at,
+        "completed_at": completed_at,
+    }
+    if task.parent_id is not None:
+        data["parent_id"] = task.parent_id
+    if task.blocked_by:
+        data["blocked_by"] = list(task.blocked_by)
+    return data
+
+
+def dict_to_task(data: dict) -> Task:
+    """Convert a decoded JSON object back into a task.
+
+    Timestamps may be ISO strings or epoch seconds; the task parses them.
+    """
+    # Positional arguments: this runs once per task on every load.
+    return Task(
+        data["id"],
+        data["description"],
+        data["created_at"],
+        data["completed_at"] or None,
+        data.get("parent_id"),
+        data.get("blocked_by", ()),
+    )
+
+
+def encode_tasks(tasks: Iterable[Task]) -> str:
+    """Encode tasks as the contents of the tasks array of an indented file.
+
+    The text is the same as ``json.dumps(data, indent=4)`` produces, but
+    comes from the much faster C encoder, which ``json`` only uses without
+    ``indent``: most task objects are flat, so a separator lays out their
+    fields and only the boundaries between tasks need rewriting. Tasks
+    with a ``blocked_by`` list are encoded on their own with ``indent``.
+    """
+    pieces = []
+    for nested, group in groupby(map(task_to_dict, tasks), key=_has_list):
+        if nested:
+            pieces.extend(
+                INDENT + json.dumps(item, indent=4).replace("\n", "\n" + INDENT)
+                for item in group
+            )
+        else:
+            pieces.append(_encode_flat(list(group)))
+    return ",\n".join(pieces)
+
+
+def _has_list(item: dict) -> bool:
+    return "blocked_by" in item
+
+
+def _encode_flat(dicts: list[dict]) -> str:
+    body = json.dumps(dicts, separators=(FIELD_SEPARATOR, ": "))[2:-2]
+    between = "}" + FIELD_SEPARATOR + "{"
+    return TASK_START + body.replace(between, TASK_END + ",\n" + TASK_START) + TASK_END
+
+
+def _read_stats(data: dict) -> TaskStats | None:
+    """Return the stats saved in a task file, or None if it has none."""
+    stats = data.get("stats")
+    if stats is None:
+        return None
+    try:
+        return TaskStats.from_dict(stats)
+    except ValueError:
+        return None
+
+
+def encode_task(task: Task) -> str:
+    """Encode a task exactly as it appears in the tasks array of a saved file."""
+    return encode_tasks([task])
+
+
+def encode_document(
+    version: int, tasks: str, next_id: int, stats: dict | None = None
+) -> str:
+    """Assemble an indented task file around encoded tasks.
+
+    The result is the same text ``json.dumps(data, indent=4)`` produces.
+    ``stats`` goes before the tasks, so it can be read without them.
+    """
+    array = "[\n" + tasks + "\n    ]" if tasks else "[]"
+    header = ""
+    if stats is not None:
+        header = '    "stats": ' + json.dumps(stats, indent=4).replace("\n", "\n    ")
+        header += ",\n"
+    return (
+        f'{{\n    "version": {version},\n{header}    "tasks": {array},\n'
+        f'    "next_id": {next_id}\n}}'
+    )
+
+
+def split_tasks(text: str) -> list[str] | None:
+    """Split a saved file into the encoded text of each task.
+
+    Returns None if the file is not laid out the way ``save_data`` writes
+    it, for example after it was reformatted by hand.
+    """
+    start = text.find(TASKS_START)
+    end = text.rfind(TASKS_END)
+    if start < 0 or end < start:
+        return None
+    pieces = text[start + len(TASKS_START) : end].split(TASK_END + ",\n")
+    last = pieces.pop()
+    return [piece + TASK_END for piece in pieces] + [last]
 
 
 class JsonTaskRepository(TaskRepository):
-    """Repository for managing tasks stored in a JSON file."""
+    """Repository for managing tasks stored in a JSON file.
+
+    ``load_data`` parses the whole file. The read methods (``iter_tasks``,
+    ``query_tasks``, ``get_task`` and the counts) instead stream the
+    ``tasks`` array and only build ``Task`` objects for the entries they
+    return.
 
-    def __init__(self, file_path: str) -> None:
+    Files are indented by default. A compact file has no whitespace and is
+    written in one call to the codec; it is marked with
+    ``"format": "compact"`` and kept compact by later saves. Compact files
+    written by earlier versions store timestamps as epoch seconds, which
+    are still read. Pass ``compact`` to choose the layout of
+    every save instead. Files are decoded, and compact files encoded, with
+    ``codec``; by default that is orjson for large files when it is
+    installed.
+
+    ``save_changes`` rewrites an indented file re-encoding only the changed
+    tasks; every other task is copied from the file as it was last loaded
+    or saved.
+    """
+
+    streaming = True
+    stores_links = True
+
+    def __init__(
+        self,
+        file_path: str | Path,
+        compact: bool | None = None,
+        codec: JsonCodec | None = None,
+    ) -> None:
         """Initialize the repository with the given file path."""
-        user_path = Path(file_path).expanduser()
-        
-        self.file_path = Path(os.path.expandvars(str(user_path))).resolve()
+        self.file_path = resolve_path(file_path)
+        self.codec = codec
+        self._compact = compact
+        self._file_compact = False
+        self._lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+        self._counts: tuple[tuple[int, int], dict[bool, int]] | None = None
+        self._tracking = False
+        self._signature: FileSignature | None = None
+        self._version = 0
+        self._saved_ids: list[int] | None = None
 
     def load_data(self) -> TaskData:
         """Load tasks from the JSON file."""
-        if not self.file_path.exists():
+        self._tracking = True
+        self._signature = file_signature(self.file_path)
+        self._version = 0
+        self._saved_ids = None
+        self._file_compact = False
+        if self._signature is None:
             return TaskData()
 
+        with span("read"):
+            document = self.file_path.read_bytes()
+        with span("decode"):
+            data = self._get_codec().loads(document)
+            tasks = [dict_to_task(task) for task in data.get("tasks", [])]
+        next_id = data.get("next_id", 1)
+        self._version = data.get("version", 0)
+        self._file_compact = data.get("format") == COMPACT_FORMAT
+        self._saved_ids = [task.id for task in tasks]
+        return TaskData(tasks=tasks, next_id=next_id, stats=_read_stats(data))
+
+    @property
+    def compact(self) -> bool:
+        """Whether saves write the compact layout."""
+        return self._file_compact if self._compact is None else self._compact
+
+    def _get_codec(self) -> JsonCodec:
+        """Return the codec, choosing one by the file's size if none was given."""
+        if self.codec is not None:
+            return self.codec
+        return get_codec(size=self._signature[1] if self._signature else 0)
+
+    def lock(self) -> FileLock:
+        """Return the advisory lock on ``<file>.lock``."""
+        return self._lock
+
+    def has_changed(self) -> bool:
+        """Whether the file was replaced or modified since the last load or save."""
+        return self._tracking and file_signature(self.file_path) != self._signature
+
+    def iter_task_dicts(self) -> Iterator[dict]:
+        """Yield the raw task objects from the file without decoding them."""
+        if not self.file_path.exists():
+            return
+
+        with self.file_path.open("r", encoding="utf-8") as file:
+            for key, value in iter_object(file, "tasks"):
+                if key == "tasks":
+                    yield value
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Stream tasks from the file, decoding only the ones yielded."""
+        return self.query_tasks(TaskQuery(completed, offset=offset, limit=limit))
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Stream the file, decoding only the tasks that match the query.
+
+        Results in id order skip the offset undecoded and stop reading at
+        the end of the page; other orders keep only the best
+        ``offset + limit`` matches while scanning.
+        """
+        matching = filter(query.dict_filter(), self.iter_task_dicts())
+        if query.sorted_by_id:
+            return map(dict_to_task, query.page(matching))
+        return query.order_and_page(map(dict_to_task, matching))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching tasks in one streaming pass."""
+        if not query.filtered:
+            return self.count_tasks(query.completed)
+        return sum(map(query.dict_filter(), self.iter_task_dicts()))
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Scan the file for a single task, decoding only that one."""
+        for item in self.iter_task_dicts():
+            if item["id"] == task_id:
+                return dict_to_task(item)
+        return None
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks in one streaming pass.
+
+        Both status counts are gathered in the same pass and reused until
+        the file changes.
+        """
+        if not self.file_path.exists():
+            return 0
+
+        stat = self.file_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._counts is None or self._counts[0] != version:
+            counts = {True: 0, False: 0}
+            for item in self.iter_task_dicts():
+                counts[bool(item.get("completed_at"))] += 1
+            self._counts = (version, counts)
+
+        counts = self._counts[1]
+        return counts[completed] if completed is not None else sum(counts.values())
+
+    def load_stats(self) -> TaskStats:
+        """Read the stats from the start of the file, without the tasks.
+
+        Files saved before stats were kept are scanned once instead.
+        """
+        if not self.file_path.exists():
+            return TaskStats()
         with self.file_path.open("r", encoding="utf-8") as file:
-            data = json.load(file)
-            tasks = [self._dict_to_task(task) for task in data.get("tasks", [])]
-            next_id = data.get("next_id", 1)
-            return TaskData(tasks=tasks, next_id=next_id)
+            for key, value in iter_object(file, "tasks"):
+                if key == "stats":
+                    stats = _read_stats({key: value})
+                    if stats is not None:
+                        return stats
+                if key == "tasks":
+                    break
+        return TaskStats.from_tasks(map(dict_to_task, self.iter_task_dicts()))
 
     def save_data(self, tasks: TaskData) -> None:
-        """Save tasks to the JSON file."""
+        """Save tasks to the JSON file.
+
+        The data is written to a temporary file that atomically replaces the
+        task file, so readers never see a half-written document. If the file
+        was changed by someone else since it was loaded, the save is refused
+        with ConcurrentModificationError.
+        """
+        with self._write_errors(), self._lock:
+            self._check_for_conflicts()
+            if self.compact:
+                document = self._get_codec().dumps(
+                    {
+                        "version": self._version + 1,
+                        "format": COMPACT_FORMAT,
+                        "stats": tasks.current_stats().to_dict(),
+                        "tasks": [task_to_dict(task) for task in tasks.tasks],
+                        "next_id": tasks.next_id,
+                    }
+                )
+            else:
+                document = encode_document(
+                    self._version + 1,
+                    encode_tasks(tasks.tasks),
+                    tasks.next_id,
+                    tasks.current_stats().to_dict(),
+                ).encode("utf-8")
+            self._write(tasks, document)
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Save several changes, re-encoding only the changed tasks."""
+        self.save_changes(
+            tasks, TaskDelta(list(inserted), list(updated), list(deleted))
+        )
+
+    def save_changes(self, tasks: TaskData, delta: TaskDelta) -> None:
+        """Save the file, re-encoding only the tasks in ``delta``.
+
+        Unchanged tasks are copied as text from the file on disk, which
+        holds exactly what was last loaded or saved once the conflict check
+        has passed. Compact files, and files that cannot be split into one
+        piece per task, are encoded in full instead.
+        """
+        with self._write_errors(), self._lock:
+            self._check_for_conflicts()
+            saved = None if self.compact else self._saved_tasks()
+            if delta.rewrite or saved is None:
+                self.save_data(tasks)
+                return
+
+            changed = {task.id for task in chain(delta.inserted, delta.updated)}
+            encoded = []
+            # Runs of changed tasks, such as a batch of new ones, are
+            # encoded together, which is much faster than one at a time.
+            for is_changed, run in groupby(
+                tasks.tasks, key=lambda task: task.id in changed
+            ):
+                if is_changed:
+                    encoded.append(encode_tasks(run))
+                else:
+                    encoded.extend(saved[task.id] for task in run)
+            document = encode_document(
+                self._version + 1,
+                ",\n".join(encoded),
+                tasks.next_id,
+                tasks.current_stats().to_dict(),
+            )
+            self._write(tasks, document.encode("utf-8"))
+
+    def _saved_tasks(self) -> dict[int, str] | None:
+        """Map the id of each task in the file to its encoded text."""
+        if self._saved_ids is None:
+            return None
+        if not self._saved_ids:
+            return {}
         try:
-            # Ensure parent directory exists
-            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            text = self.file_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        pieces = split_tasks(text)
+        if pieces is None or len(pieces) != len(self._saved_ids):
+            return None
+        return dict(zip(self._saved_ids, pieces))
+
+    def _write(self, tasks: TaskData, document: bytes) -> None:
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with span("write"):
+            write_atomically(self.file_path, document)
 
-            with open(self.file_path, mode="w", encoding="utf-8") as file:
-                data = {
-                    "tasks": [self._task_to_dict(task) for task in tasks.tasks],
-                    "next_id": tasks.next_id,
-                }
-                json.dump(data, file, indent=4)
+        self._version += 1
+        self._tracking = True
+        self._signature = file_signature(self.file_path)
+        self._saved_ids = [task.id for task in tasks.tasks]
+        self._file_compact = self.compact
 
+    @contextmanager
+    def _write_errors(self) -> Iterator[None]:
+        try:
+            yield
         except PermissionError:
             print(f"Error: Permission denied writing to {self.file_path}")
             print("Check file permissions or try running with appropriate privileges")
@@ -56,24 +433,31 @@ class JsonTaskRepository(TaskRepository):
             print(f"Error: System error writing file - {e}")
             sys.exit(1)
 
-    def _task_to_dict(self, task: Task) -> dict:
-        return {
-            "id": task.id,
-            "description": task.description,
-            "created_at": task.created_at.isoformat(),
-            "completed_at": (
-                task.completed_at.isoformat() if task.completed_at else None
-            ),
-        }
-
-    def _dict_to_task(self, data: dict) -> Task:
-        return Task(
-            id=data["id"],
-            description=data["description"],
-            created_at=datetime.datetime.fromisoformat(data["created_at"]),
-            completed_at=(
-                datetime.datetime.fromisoformat(data["completed_at"])
-                if data["completed_at"]
-                else None
-            ),
-        )
+    def _check_for_conflicts(self) -> None:
+        """Raise ConcurrentModificationError if the file changed under us.
+
+        A changed mtime, size or inode alone is not a conflict if the file's
+        version number is still the one that was loaded (for example after a
+        ``touch``). Files without a version number fall back to the stat check.
+        """
+        if not self.has_changed():
+            return
+
+        version = 0
+        if self.file_path.exists():
+            with self.file_path.open("r", encoding="utf-8") as file:
+                key, value = next(iter_object(file, "tasks"), (None, None))
+                if key == "version":
+                    version = value
+
+        if version == 0 or version != self._version:
+            raise ConcurrentModificationError(
+                f"{self.file_path} was modified by another process"
+            )
+
+
+class CompactJsonTaskRepository(JsonTaskRepository):
+    """A JSON repository that always saves the compact layout."""
+
+    def __init__(self, file_path: str | Path, codec: JsonCodec | None = None) -> None:
+        super().__init__(file_path, compact=True, codec=codec)
@@ -0,0 +1,59 @@
+"""A lightweight stand-in for ``rich.console.Console``.
+
+One-shot commands and piped output only need to print a line or two, so
+they use this console and skip importing Rich altogether.
+"""
+
+import re
+import sys
+from typing import TextIO
+
+ANSI_STYLES = {
+    "bold": "1",
+    "dim": "2",
+    "green": "32",
+    "yellow": "33",
+    "cyan": "36",
+}
+
+EMOJI = {
+    ":file_folder:": "📁",
+}
+
+MARKUP_TAG = re.compile(r"\[(/?)([a-z ]+)\]")
+
+
+def render_markup(text: str, color: bool = False) -> str:
+    """Render the subset of Rich markup that TuiDo uses.
+
+    Known style tags become ANSI escapes when ``color`` is set and are
+    removed otherwise. Anything else in brackets is left untouched.
+    """
+
+    def replace(match: re.Match) -> str:
+        closing, style = match.groups()
+        words = style.split()
+        if not words or any(word not in ANSI_STYLES for word in words):
+            return match.group(0)
+        if not color:
+            return ""
+        if closing:
+            return "\x1b[0m"
+        return "\x1b[" + ";".join(ANSI_STYLES[word] for word in words) + "m"
+
+    for code, emoji in EMOJI.items():
+        text = text.replace(code, emoji)
+    return MARKUP_TAG.sub(replace, text)
+
+
+class PlainConsole:  # pylint: disable=too-few-public-methods
+    """Console that writes plain (optionally ANSI-coloured) text."""
+
+    def __init__(self, file: TextIO | None = None, color: bool = False) -> None:
+        self.file = file or sys.stdout
+        self.color = color
+
+    def print(self, *objects, sep: str = " ", end: str = "\n", **_options) -> None:
+        """Print objects, rendering Rich markup in strings."""
+        text = sep.join(str(obj) for obj in objects)
+        self.file.write(render_markup(text, self.color) + end)
@@ -0,0 +1,55 @@
+"""Selects a task repository backend for a task file."""
+
+import importlib
+from pathlib import Path
+
+from tuido.task_repository import TaskRepository
+
+# Backends are imported on demand so that, for example, sqlite3 is only
+# loaded when a SQLite file is actually used.
+BACKENDS = {
+    "json": ("tuido.json_task_repository", "JsonTaskRepository"),
+    "json-compact": ("tuido.json_task_repository", "CompactJsonTaskRepository"),
+    "sqlite": ("tuido.sqlite_task_repository", "SqliteTaskRepository"),
+    "journal": ("tuido.journal_task_repository", "JournalTaskRepository"),
+    "binary": ("tuido.binary_task_repository", "BinaryTaskRepository"),
+}
+
+BACKEND_EXTENSIONS = {
+    ".json": "json",
+    ".db": "sqlite",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".journal": "journal",
+    ".tuido": "binary",
+}
+
+DEFAULT_EXTENSIONS = {
+    "json": ".json",
+    "json-compact": ".json",
+    "sqlite": ".db",
+    "journal": ".journal",
+    "binary": ".tuido",
+}
+
+
+def backend_for_path(file_path: str | Path) -> str:
+    """Return the backend name for a file, based on its extension.
+
+    Unknown extensions fall back to JSON, which keeps existing task files
+    working regardless of what they are called.
+    """
+    return BACKEND_EXTENSIONS.get(Path(file_path).suffix.lower(), "json")
+
+
+def create_repository(
+    file_path: str | Path, backend: str | None = None
+) -> TaskRepository:
+    """Create a repository for the given file and (optional) backend name."""
+    backend = backend or backend_for_path(file_path)
+    try:
+        module_name, class_name = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {backend}") from None
+    repository_class = getattr(importlib.import_module(module_name), class_name)
+    return repository_class(file_path)
@@ -0,0 +1,339 @@
+"""Inverted index for full-text search over task descriptions.
+
+The index is kept in ``<file>.index`` next to the task file. It holds a
+snapshot of every task's description, token count and the postings of every
+word, followed by one appended line per change made through TaskManager, so
+keeping it current costs a small append rather than a rewrite. Loading the
+snapshot restores the postings as they were saved, without tokenizing any
+description again.
+
+Every snapshot and change records the signature (mtime, size and inode) of
+the task storage it matches, and each change also records the signature it
+was applied on top of. When loading, changes are replayed only while that
+chain is unbroken; if it does not end at the storage's current signature,
+a checksum of the storage decides whether the index must be rebuilt.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from bisect import bisect_left, insort
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+from tuido.task import Task
+from tuido.task_repository import TaskRepository, file_signature
+
+INDEX_FORMAT = 2
+TOKEN = re.compile(r"\w+")
+
+# Fold changes back into a fresh snapshot after this many appended lines.
+COMPACT_AFTER = 500
+
+# Matches on a whole word count for more than matches on a word's prefix.
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.5
+
+# BM25 term-frequency saturation and length normalization.
+K1 = 1.2
+B = 0.75
+
+Signature = list[list[int] | None]
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lower-case word tokens."""
+    return TOKEN.findall(text.casefold())
+
+
+def _rank(item: tuple[int, float]) -> tuple[float, int]:
+    task_id, score = item
+    return -score, task_id
+
+
+class SearchResult(NamedTuple):
+    """A task that matched a query."""
+
+    id: int
+    description: str
+    completed: bool
+    score: float
+
+
+class SearchIndex:
+    """Maps words to the tasks whose descriptions contain them."""
+
+    def __init__(self, source_paths: list[Path], path: Path | None = None) -> None:
+        self.source_paths = source_paths
+        self.path = path or source_paths[0].with_name(source_paths[0].name + ".index")
+        self._documents: dict[int, tuple[str, bool]] = {}
+        self._lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] | None = None
+        self._total_length = 0
+
+    @classmethod
+    def for_repository(cls, repository: TaskRepository) -> "SearchIndex":
+        """Create the index for a repository's task file."""
+        return cls(repository.storage_paths())
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def source_signature(self) -> Signature:
+        """Return the current signature of the task storage."""
+        return [
+            None if signature is None else list(signature)
+            for signature in map(file_signature, self.source_paths)
+        ]
+
+    def source_checksum(self) -> str:
+        """Return a checksum of the task storage's contents."""
+        digest = hashlib.sha1()
+        for path in self.source_paths:
+            if path.exists():
+                with path.open("rb") as file:
+                    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                        digest.update(chunk)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def record(
+        self,
+        before: Signature | None,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Append a change that was just saved to the task storage.
+
+        ``before`` is the storage signature from before the save. Nothing is
+        written if there is no index yet; it is built on the first search.
+        If the change cannot be appended, the index file is removed instead.
+        """
+        if before is None or not self.path.exists():
+            return
+        entry = {
+            "before": before,
+            "after": self.source_signature(),
+            "add": [
+                [task.id, task.description, task.is_complete()]
+                for tasks in (inserted, updated)
+                for task in tasks
+            ],
+            "remove": [task.id for task in deleted],
+        }
+        try:
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except OSError:
+            # The change is already saved; a missing index is rebuilt on the
+            # next search, whereas a stale one would go unnoticed.
+            with suppress(OSError):
+                self.path.unlink(missing_ok=True)
+
+    def ensure_current(self, load_tasks: Callable[[], Iterable[Task]]) -> bool:
+        """Load the index, rebuilding it from ``load_tasks()`` if it is stale.
+
+        Returns whether the index was rebuilt.
+        """
+        signature = self.source_signature()
+        state = self._load()
+        if state is not None:
+            chain, checksum, entries = state
+            if chain == signature:
+                if entries >= COMPACT_AFTER:
+                    self.save(signature)
+                return False
+            if checksum is not None:
+                current = self.source_checksum()
+                if current == checksum:
+                    self.save(signature, current)
+                    return False
+
+        checksum = self.source_checksum()
+        self.clear()
+        for task in load_tasks():
+            self.add(task.id, task.description, task.is_complete())
+        self.save(signature, checksum)
+        return True
+
+    def clear(self) -> None:
+        """Remove every task from the index."""
+        self._documents.clear()
+        self._lengths.clear()
+        self._postings.clear()
+        self._vocabulary = None
+        self._total_length = 0
+
+    def add(self, task_id: int, description: str, completed: bool = False) -> None:
+        """Index a task, replacing any previous entry for its id."""
+        if task_id in self._documents:
+            self.remove(task_id)
+        tokens = tokenize(description)
+        self._documents[task_id] = (description, completed)
+        self._lengths[task_id] = len(tokens)
+        self._total_length += len(tokens)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                if self._vocabulary is not None:
+                    insort(self._vocabulary, token)
+            postings[task_id] = postings.get(task_id, 0) + 1
+
+    def remove(self, task_id: int) -> None:
+        """Remove a task from the index, if present."""
+        document = self._documents.pop(task_id, None)
+        if document is None:
+            return
+        self._total_length -= self._lengths.pop(task_id)
+        for token in set(tokenize(document[0])):
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                if self._vocabulary is not None:
+                    self._vocabulary.pop(bisect_left(self._vocabulary, token))
+
+    def search(self, query: str, limit: int | None = None) -> list[SearchResult]:
+        """Return tasks matching every word of ``query``, best first.
+
+        Each query word matches whole words and word prefixes, so "dep"
+        finds "deploy". Results are ranked with BM25, favouring whole-word
+        matches, and ties go to the lowest id. Only the postings of matching
+        words are visited, so the cost depends on how many tasks match, not
+        on how many tasks there are.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._documents:
+            return []
+
+        matches = sorted((self._term_scores(term) for term in terms), key=len)
+        scores = matches[0]
+        for other in matches[1:]:
+            scores = {
+                task_id: score + other[task_id]
+                for task_id, score in scores.items()
+                if task_id in other
+            }
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=_rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=_rank)
+        return [
+            SearchResult(task_id, *self._documents[task_id], score)
+            for task_id, score in ranked
+        ]
+
+    def _term_scores(self, term: str) -> dict[int, float]:
+        """Score every task containing a word that starts with ``term``."""
+        if self._vocabulary is None:
+            # Sorted lazily, so that loading the index does not pay for it.
+            self._vocabulary = sorted(self._postings)
+        documents = len(self._documents)
+        average_length = self._total_length / documents or 1.0
+        scores: dict[int, float] = {}
+        start = bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            postings = self._postings[token]
+            idf = math.log(
+                1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            weight = idf * (EXACT_WEIGHT if token == term else PREFIX_WEIGHT)
+            for task_id, frequency in postings.items():
+                length = self._lengths[task_id] / average_length
+                score = weight * (
+                    frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length))
+                )
+                if score > scores.get(task_id, 0.0):
+                    scores[task_id] = score
+        return scores
+
+    def save(self, signature: Signature, checksum: str | None = None) -> None:
+        """Write the index as a fresh snapshot matching ``signature``.
+
+        An index that cannot be written is simply not persisted; it is
+        rebuilt on the next search.
+        """
+        header = {"format": INDEX_FORMAT, "signature": signature, "checksum": checksum}
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        lengths = self._lengths
+        snapshot = {
+            "documents": [
+                [task_id, description, completed, lengths[task_id]]
+                for task_id, (description, completed) in self._documents.items()
+            ],
+            # Flattened id, frequency pairs, in vocabulary order.
+            "postings": [
+                [
+                    token,
+                    [value for pair in self._postings[token].items() for value in pair],
+                ]
+                for token in self._vocabulary
+            ],
+        }
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with temp_path.open("w", encoding="utf-8") as file:
+                file.write(json.dumps(header) + "\n")
+                file.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+            os.replace(temp_path, self.path)
+        except OSError:
+            with suppress(OSError):
+                temp_path.unlink(missing_ok=True)
+
+    def _restore(self, snapshot: dict) -> None:
+        """Restore the documents and postings of a saved snapshot."""
+        for task_id, description, completed, length in snapshot["documents"]:
+            self._documents[task_id] = (description, completed)
+            self._lengths[task_id] = length
+        self._total_length = sum(self._lengths.values())
+        postings = snapshot["postings"]
+        self._postings = {
+            token: dict(zip(pairs[::2], pairs[1::2])) for token, pairs in postings
+        }
+        self._vocabulary = [token for token, _ in postings]
+
+    def _load(self) -> tuple[Signature, str | None, int] | None:
+        """Read the snapshot and replay changes on top of it.
+
+        Returns the signature the index matches, the snapshot's checksum (or
+        None if changes were replayed, since it no longer applies) and the
+        number of replayed changes. Returns None if there is no usable index.
+        """
+        self.clear()
+        try:
+            with self.path.open("r", encoding="utf-8") as file:
+                header = json.loads(file.readline())
+                if header.get("format") != INDEX_FORMAT:
+                    return None
+                self._restore(json.loads(file.readline()))
+
+                signature, checksum, entries = (
+                    header["signature"],
+                    header["checksum"],
+                    0,
+                )
+                for line in file:
+                    entry = json.loads(line)
+                    if entry["before"] != signature:
+                        break
+                    for task_id in entry["remove"]:
+                        self.remove(task_id)
+                    for task_id, description, completed in entry["add"]:
+                        self.add(task_id, description, completed)
+                    signature, checksum = entry["after"], None
+                    entries += 1
+        except (OSError, ValueError, KeyError, TypeError):
+            self.clear()
+            return None
+        return signature, checksum, entries
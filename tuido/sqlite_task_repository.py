@@ -0,0 +1,261 @@
+"""Repository for managing tasks stored in a SQLite database."""
+
+import os
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from tuido.file_lock import FileLock
+from tuido.task import Task
+from tuido.task_data import TaskData
+from tuido.task_query import TaskQuery
+from tuido.task_repository import TaskRepository, resolve_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks (completed_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+ORDER_BY = {
+    "id": "id",
+    "created": "created_at, id",
+    "completed": "completed_at IS NULL, completed_at, id",
+}
+
+
+class SqliteTaskRepository(TaskRepository):
+    """Repository for managing tasks stored in a SQLite database.
+
+    Tasks live in a table keyed on ``id`` with indexes on ``completed_at``
+    and ``created_at``, so date-range queries are answered from an index
+    and single-task changes are written as one row instead of a full rewrite.
+    """
+
+    indexed = True
+
+    def __init__(self, file_path: str | Path) -> None:
+        """Initialize the repository with the given database path."""
+        self.file_path = resolve_path(file_path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = FileLock(self.file_path.with_name(self.file_path.name + ".lock"))
+        self._data_version: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            # AsyncTaskRepository uses the connection from its I/O thread.
+            self._connection = sqlite3.connect(self.file_path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        """Close the underlying database connection, if open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def lock(self) -> FileLock:
+        """Serialize read-modify-write cycles across processes."""
+        return self._lock
+
+    def has_changed(self) -> bool:
+        """Whether another connection committed since the last load or write.
+
+        Uses ``PRAGMA data_version``, which only changes for commits made by
+        other connections.
+        """
+        if self._data_version is None:
+            return self.file_path.exists()
+        return self._current_data_version() != self._data_version
+
+    def _current_data_version(self) -> int:
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def load_data(self) -> TaskData:
+        """Load tasks from the database."""
+        if not self.file_path.exists():
+            self._data_version = None
+            return TaskData()
+
+        connection = self._connect()
+        self._data_version = self._current_data_version()
+        rows = connection.execute(
+            "SELECT id, description, created_at, completed_at FROM tasks ORDER BY id"
+        )
+        tasks = [self._row_to_task(row) for row in rows]
+        next_id = connection.execute(
+            "SELECT value FROM meta WHERE key = 'next_id'"
+        ).fetchone()
+        return TaskData(tasks=tasks, next_id=next_id[0] if next_id else 1)
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over one page of tasks straight from the database."""
+        return self.query_tasks(TaskQuery(completed, offset=offset, limit=limit))
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Run a query in SQL, so that the indexes pick the matching rows."""
+        if not self.file_path.exists():
+            return iter(())
+
+        where, params = self._where(query)
+        rows = self._connect().execute(
+            "SELECT id, description, created_at, completed_at FROM tasks"
+            f"{where} ORDER BY {ORDER_BY[query.sort]} LIMIT ? OFFSET ?",
+            (*params, -1 if query.limit is None else query.limit, query.offset),
+        )
+        return map(self._row_to_task, rows)
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Look up a single task by its primary key."""
+        if not self.file_path.exists():
+            return None
+
+        row = (
+            self._connect()
+            .execute(
+                "SELECT id, description, created_at, completed_at FROM tasks "
+                "WHERE id = ?",
+                (task_id,),
+            )
+            .fetchone()
+        )
+        return self._row_to_task(row) if row else None
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks using the ``completed_at`` index."""
+        return self.count_matching(TaskQuery(completed))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching rows in SQL."""
+        if not self.file_path.exists():
+            return 0
+
+        where, params = self._where(query)
+        statement = f"SELECT COUNT(*) FROM tasks{where}"
+        return self._connect().execute(statement, params).fetchone()[0]
+
+    def _where(self, query: TaskQuery) -> tuple[str, list]:
+        """Translate a query's predicates into a WHERE clause."""
+        clauses, params = [], []
+        if query.completed is not None:
+            clauses.append(
+                "completed_at IS NOT NULL"
+                if query.completed
+                else "completed_at IS NULL"
+            )
+        if query.since_iso or query.until_iso:
+            # Each status has its own date column, and its own index.
+            column = {True: "completed_at", False: "created_at"}.get(
+                query.completed, "COALESCE(completed_at, created_at)"
+            )
+            if query.since_iso:
+                clauses.append(f"{column} >= ?")
+                params.append(query.since_iso)
+            if query.until_iso:
+                clauses.append(f"{column} < ?")
+                params.append(query.until_iso)
+        if query.match:
+            # LIKE ignores case for ASCII letters only.
+            clauses.append("description LIKE ? ESCAPE '\\'")
+            params.append("%" + re.sub(r"([\\%_])", r"\\\1", query.match) + "%")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def save_data(self, tasks: TaskData) -> None:
+        """Replace the database contents with the given tasks."""
+        with self._write() as connection:
+            connection.execute("DELETE FROM tasks")
+            connection.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)",
+                (self._task_to_row(task) for task in tasks.tasks),
+            )
+            self._store_next_id(connection, tasks.next_id)
+
+    def insert_task(self, tasks: TaskData, task: Task) -> None:
+        """Insert a single task row."""
+        with self._write() as connection:
+            connection.execute(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)", self._task_to_row(task)
+            )
+            self._store_next_id(connection, tasks.next_id)
+
+    def update_task(self, tasks: TaskData, task: Task) -> None:
+        """Update a single task row."""
+        with self._write() as connection:
+            connection.execute(
+                "UPDATE tasks SET description = ?, created_at = ?, completed_at = ? "
+                "WHERE id = ?",
+                self._task_to_row(task)[1:] + (task.id,),
+            )
+
+    def delete_task(self, tasks: TaskData, task: Task) -> None:
+        """Delete a single task row."""
+        with self._write() as connection:
+            connection.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Write all changed rows in a single transaction."""
+        with self._write() as connection:
+            connection.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)",
+                (self._task_to_row(task) for task in inserted),
+            )
+            connection.executemany(
+                "UPDATE tasks SET description = ?, created_at = ?, completed_at = ? "
+                "WHERE id = ?",
+                (self._task_to_row(task)[1:] + (task.id,) for task in updated),
+            )
+            connection.executemany(
+                "DELETE FROM tasks WHERE id = ?", ((task.id,) for task in deleted)
+            )
+            self._store_next_id(connection, tasks.next_id)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one transaction."""
+        try:
+            connection = self._connect()
+            with connection:
+                yield connection
+            self._data_version = self._current_data_version()
+        except sqlite3.Error as e:
+            print(f"Error: Database error writing to {self.file_path} - {e}")
+            sys.exit(1)
+
+    def _store_next_id(self, connection: sqlite3.Connection, next_id: int) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)",
+            (next_id,),
+        )
+
+    def _task_to_row(self, task: Task) -> tuple:
+        return (task.id, task.description, *task.iso_timestamps())
+
+    def _row_to_task(self, row: tuple) -> Task:
+        task_id, description, created_at, completed_at = row
+        return Task(
+            id=task_id,
+            description=description,
+            created_at=created_at,
+            completed_at=completed_at or None,
+        )
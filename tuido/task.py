@@ -1,32 +1,148 @@
 """A module for managing tasks with completion status."""
 
 from datetime import datetime
-from dataclasses import dataclass, field
+from typing import Iterable
+
+Timestamp = datetime | str | int | float
+
+
+def _to_datetime(value: Timestamp) -> datetime:
+    """Parse an ISO-8601 string or epoch seconds into a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
 
 
-@dataclass
 class Task:
-    """A class representing a task with an ID, description, and completion status."""
+    """A class representing a task with an ID, description, and completion status.
+
+    Tasks use ``__slots__`` to keep per-task memory small. Timestamps may be
+    given as datetimes, ISO-8601 strings or epoch seconds. They are parsed
+    eagerly, when the task is built or a timestamp is set, and stored as
+    datetimes: a parsed datetime takes less memory than the string it came
+    from, and queries compare and sort datetimes without converting them.
+
+    A task may be a subtask of ``parent_id`` and be blocked by the tasks in
+    ``blocked_by``; see ``tuido.task_graph`` for how links are indexed.
+    """
+
+    __slots__ = (
+        "id",
+        "description",
+        "_created_at",
+        "_completed_at",
+        "parent_id",
+        "blocked_by",
+    )
+
+    def __init__(
+        self,
+        id: int,  # pylint: disable=redefined-builtin
+        description: str,
+        created_at: Timestamp | None = None,
+        completed_at: Timestamp | None = None,
+        parent_id: int | None = None,
+        blocked_by: Iterable[int] = (),
+    ) -> None:
+        self.id = id
+        self.description = description
+        self._created_at = (
+            datetime.now() if created_at is None else _to_datetime(created_at)
+        )
+        self._completed_at = (
+            None if completed_at is None else _to_datetime(completed_at)
+        )
+        self.parent_id = parent_id
+        self.blocked_by: tuple[int, ...] = tuple(blocked_by) if blocked_by else ()
+
+    @property
+    def created_at(self) -> datetime:
+        """When the task was created."""
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: Timestamp) -> None:
+        self._created_at = _to_datetime(value)
+
+    @property
+    def completed_at(self) -> datetime | None:
+        """When the task was completed, or None if it is pending."""
+        return self._completed_at
+
+    @completed_at.setter
+    def completed_at(self, value: Timestamp | None) -> None:
+        self._completed_at = None if value is None else _to_datetime(value)
+
+    def iso_timestamps(self) -> tuple[str, str | None]:
+        """Return (created_at, completed_at) as ISO-8601 strings."""
+        completed = self._completed_at
+        return (
+            self._created_at.isoformat(),
+            None if completed is None else completed.isoformat(),
+        )
+
+    def epoch_timestamps(self) -> tuple[float, float | None]:
+        """Return (created_at, completed_at) as epoch seconds."""
+        completed = self._completed_at
+        return (
+            self._created_at.timestamp(),
+            None if completed is None else completed.timestamp(),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.id,
+            self.description,
+            self.created_at,
+            self.completed_at,
+            self.parent_id,
+            self.blocked_by,
+        ) == (
+            other.id,
+            other.description,
+            other.created_at,
+            other.completed_at,
+            other.parent_id,
+            other.blocked_by,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        links = ""
+        if self.parent_id is not None:
+            links += f", parent_id={self.parent_id!r}"
+        if self.blocked_by:
+            links += f", blocked_by={self.blocked_by!r}"
+        return (
+            f"Task(id={self.id!r}, description={self.description!r}, "
+            f"created_at={self.created_at!r}, completed_at={self.completed_at!r}"
+            f"{links})"
+        )
 
-    id: int
-    description: str
-    created_at: datetime = field(default_factory=datetime.now)
-    completed_at: datetime | None = None
+    @property
+    def linked(self) -> bool:
+        """Whether the task has a parent or is blocked by other tasks."""
+        return self.parent_id is not None or bool(self.blocked_by)
 
     def is_complete(self) -> bool:
         """Check if the task is complete."""
-        return self.completed_at is not None
+        return self._completed_at is not None
 
     def mark_complete(self) -> bool:
         """Mark the task as complete."""
         if self.is_complete():
             return False
-        self.completed_at = datetime.now()
+        self._completed_at = datetime.now()
         return True
 
     def mark_pending(self) -> bool:
         """Mark the task as pending."""
         if not self.is_complete():
             return False
-        self.completed_at = None
+        self._completed_at = None
         return True
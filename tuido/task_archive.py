@@ -0,0 +1,119 @@
+"""Long-term storage for completed tasks moved out of the task file.
+
+The archive lives in a ``<file>.archive`` directory next to the task file.
+Tasks are grouped by the month they were completed into gzip-compressed
+JSON Lines segments (``2024-05.jsonl.gz``). Archiving appends a new gzip
+member to the segment, so older archived tasks are never rewritten.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from tuido.json_task_repository import dict_to_task, task_to_dict
+from tuido.task import Task
+from tuido.task_query import TaskQuery
+from tuido.task_repository import TaskRepository
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def _month(task: Task) -> str:
+    return task.completed_at.strftime("%Y-%m")
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+class TaskArchive:
+    """Completed tasks stored in compressed monthly segments.
+
+    Reads skip segments whose month lies outside a query's date range,
+    since an archived task's status date is the date it was completed.
+    A task archived twice (if a save of the task file failed after it was
+    archived) is only returned once.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def for_repository(cls, repository: TaskRepository) -> "TaskArchive":
+        """Return the archive kept next to a repository's task file."""
+        file_path = repository.file_path
+        return cls(file_path.with_name(file_path.name + ".archive"))
+
+    def segments(self) -> list[Path]:
+        """Return the segment files, oldest month first."""
+        if not self.path.is_dir():
+            return []
+        return sorted(self.path.glob("*" + SEGMENT_SUFFIX))
+
+    def add(self, tasks: Iterable[Task]) -> None:
+        """Append completed tasks to the segments for their months.
+
+        Each segment is flushed to disk before returning, so the tasks can
+        safely be removed from the task file afterwards.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        for month, group in groupby(sorted(tasks, key=_month), key=_month):
+            lines = "".join(
+                json.dumps(task_to_dict(task), separators=(",", ":")) + "\n"
+                for task in group
+            )
+            with open(self.path / f"{month}{SEGMENT_SUFFIX}", "ab") as file:
+                file.write(gzip.compress(lines.encode("utf-8")))
+                file.flush()
+                os.fsync(file.fileno())
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Iterate over the archived tasks matching a query."""
+        if query.completed is False:
+            return iter(())
+        matching = {
+            item["id"]: item
+            for item in filter(query.dict_filter(), self._iter_dicts(query))
+        }
+        tasks = map(dict_to_task, (matching[task_id] for task_id in sorted(matching)))
+        return query.order_and_page(tasks)
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count the archived tasks matching a query, ignoring its paging."""
+        return len(self.matching_ids(query))
+
+    def matching_ids(self, query: TaskQuery) -> set[int]:
+        """Return the ids of the archived tasks matching a query."""
+        if query.completed is False:
+            return set()
+        return {
+            item["id"] for item in filter(query.dict_filter(), self._iter_dicts(query))
+        }
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Return the archived task with the given id, or None."""
+        for item in self._iter_dicts(TaskQuery()):
+            if item["id"] == task_id:
+                return dict_to_task(item)
+        return None
+
+    def _iter_dicts(self, query: TaskQuery) -> Iterator[dict]:
+        """Yield raw tasks from the segments that can hold matches."""
+        for segment in self.segments():
+            try:
+                month = datetime.strptime(segment.name[:7], "%Y-%m")
+            except ValueError:
+                continue
+            if query.until is not None and query.until <= month:
+                continue
+            if query.since is not None and query.since >= _next_month(month):
+                continue
+            with gzip.open(segment, "rt", encoding="utf-8") as file:
+                for line in file:
+                    yield json.loads(line)
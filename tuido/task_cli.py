@@ -1,131 +1,812 @@
 """TuiDo - Terminal-based Todo List Manager CLI Interface."""
 
+import argparse
+import json
+import os
 import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
-import humanize
-from rich.console import Console
-from rich.panel import Panel
-
-from tuido.argument_parser import DEFAULT_TASK_FILE, ArgumentParser
-from tuido.json_task_repository import JsonTaskRepository
+from tuido import IMPORT_STARTED, instrumentation
+from tuido.argument_parser import DEFAULT_TASK_FILE, ArgumentParser, parse_duration
+from tuido.daemon_client import DaemonError, RemoteTaskManager, connect
+from tuido.instrumentation import TRACE_VARIABLE, span
+from tuido.plain_console import PlainConsole
+from tuido.repository_factory import (
+    DEFAULT_EXTENSIONS,
+    backend_for_path,
+    create_repository,
+)
+from tuido.search_index import SearchIndex, SearchResult
+from tuido.task import Task
+from tuido.task_formats import (
+    FORMATS,
+    TaskFormatError,
+    format_for_path,
+    read_tasks,
+    write_tasks,
+)
+from tuido.task_graph import TaskLinkError
+from tuido.task_list_renderer import TaskListRenderer
 from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_repository import InvalidTaskFileError, TaskRepository
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from tuido.tiered_repository import TieredTaskRepository
+
+# Commands whose output never needs Rich: on a terminal they print through a
+# PlainConsole with ANSI colours. Most change tasks, but what matters here is
+# only that none of them renders Rich tables or panels.
+PLAIN_CONSOLE_COMMANDS = {
+    "add",
+    "do",
+    "undo",
+    "delete",
+    "link",
+    "archive",
+    "import",
+    "export",
+    "tui",
+    "migrate",
+    "serve",
+    "search",
+    "stats",
+}
+DEFAULT_PAGE_SIZE = 20
+STATS_BAR_WIDTH = 40
+
+# Set to a duration such as 30d to archive old completed tasks after each
+# command that changes tasks.
+ARCHIVE_AFTER_VARIABLE = "TUIDO_ARCHIVE_AFTER"
+AUTO_ARCHIVE_COMMANDS = {"add", "do", "undo", "delete"}
+
+# Commands that read or change task links, which the daemon does not serve.
+LINK_COMMANDS = {"ready", "link"}
+
+# Commands that take --format: list and ready write records instead of a
+# listing, and import and export read and write files in that format.
+RECORD_COMMANDS = {None, "list", "ready"}
+FORMAT_COMMANDS = RECORD_COMMANDS | {"import", "export"}
+
+
+def format_task_ids(task_ids: Iterable[int]) -> str:
+    """Format ids compactly, collapsing consecutive runs (``3, 7, 10-40``)."""
+    parts = []
+    run_start = run_end = None
+    for task_id in sorted(task_ids):
+        if run_end is not None and task_id == run_end + 1:
+            run_end = task_id
+            continue
+        if run_start is not None:
+            parts.append(_format_run(run_start, run_end))
+        run_start = run_end = task_id
+    if run_start is not None:
+        parts.append(_format_run(run_start, run_end))
+    return ", ".join(parts)
+
+
+def _format_run(start: int, end: int) -> str:
+    return str(start) if start == end else f"{start}-{end}"
+
+
+def _describe_ids(task_ids: list[int]) -> str:
+    if len(task_ids) == 1:
+        return f"Task {task_ids[0]}"
+    return f"Tasks {format_task_ids(task_ids)}"
 
 
 class TaskCLI:  # pylint: disable=too-few-public-methods
     """Command-line interface for managing tasks in TuiDo."""
 
-    def __init__(self, console: Console | None = None):
+    def __init__(self, console: "Console | PlainConsole | None" = None):
         self.parser = ArgumentParser(
             prog_name="TuiDo", description="A terminal-based todo list manager"
         )
-        self.console = console or Console()
+        self._console = console
+
+    @property
+    def console(self) -> "Console | PlainConsole":
+        """The console used for output, created on first use."""
+        if self._console is None:
+            self._console = self._create_console()
+        return self._console
+
+    def _create_console(self, command: str | None = None) -> "Console | PlainConsole":
+        """Pick the cheapest console that can render ``command``.
+
+        Output that is not going to a terminal is always plain text. On a
+        terminal, ``PLAIN_CONSOLE_COMMANDS`` use ANSI colours directly and
+        only listing loads Rich.
+        """
+        if not sys.stdout.isatty():
+            return PlainConsole()
+        if command in PLAIN_CONSOLE_COMMANDS:
+            return PlainConsole(color=True)
+
+        from rich.console import Console  # pylint: disable=import-outside-toplevel
+
+        return Console()
+
+    def _print_file_banner(self, file_path: str) -> None:
+        message = f":file_folder: Using task file: [cyan]{file_path}[/cyan]"
+        if isinstance(self.console, PlainConsole):
+            self.console.print(message)
+            return
 
-    def _initialize_task_manager(self, file_path: str) -> TaskManager:
-        repository = JsonTaskRepository(file_path)
-        return TaskManager(repository)
+        from rich.panel import Panel  # pylint: disable=import-outside-toplevel
+
+        self.console.print(Panel(message, border_style="cyan"))
+        self.console.print()
+
+    def _initialize_task_manager(
+        self, file_path: str, use_daemon: bool = True, include_archive: bool = False
+    ) -> TaskManager | RemoteTaskManager:
+        """Return a manager for the task file.
+
+        If a ``tuido serve`` daemon is serving the file, commands are
+        forwarded to it; otherwise the file is accessed directly. With
+        ``include_archive``, reads also cover archived tasks, which the
+        daemon does not serve.
+        """
+        if use_daemon and not include_archive:
+            remote = connect(file_path)
+            if remote is not None:
+                return remote
+        repository = create_repository(file_path)
+        if include_archive:
+            return TaskManager(_with_archive(repository))
+        return TaskManager(repository, SearchIndex.for_repository(repository))
 
     def run(self, args=None):
         """Parse arguments and execute the appropriate command."""
+        started = time.perf_counter()
         parsed_args = self.parser.parse_args(args)
-        task_manager = self._initialize_task_manager(parsed_args.file)
+        trace = os.environ.get(TRACE_VARIABLE)
+        if not (parsed_args.profile or parsed_args.profile_output or trace):
+            return self._execute(parsed_args)
+
+        output = parsed_args.profile_output
+        if output is None and trace not in (None, "", "1"):
+            output = trace
+        with instrumentation.profile(output) as tracer:
+            tracer.add("startup", started - IMPORT_STARTED)
+            tracer.add("parse arguments", time.perf_counter() - started)
+            with tracer.span(parsed_args.command or "list"):
+                return self._execute(parsed_args)
+
+    def _execute(self, parsed_args):
+        try:
+            return self._execute_command(parsed_args)
+        except InvalidTaskFileError as e:
+            self.console.print(f"Error: {e}")
+            sys.exit(1)
+
+    def _execute_command(self, parsed_args):
+        # Records listed with --format go straight to stdout, without a console.
+        command = parsed_args.command
+        lists_records = parsed_args.format and command in RECORD_COMMANDS
+        if self._console is None and not lists_records:
+            with span("console"):
+                self._console = self._create_console(command or "list")
 
-        if parsed_args.verbose or parsed_args.file != DEFAULT_TASK_FILE:
+        # Machine-readable output must not start with the banner.
+        machine_readable = (
+            lists_records or command == "export" or getattr(parsed_args, "json", False)
+        )
+        if (
+            parsed_args.verbose or parsed_args.file != DEFAULT_TASK_FILE
+        ) and not machine_readable:
+            self._print_file_banner(parsed_args.file)
+
+        if parsed_args.format and (
+            parsed_args.command not in FORMAT_COMMANDS
+            or getattr(parsed_args, "all_files", False)
+        ):
             self.console.print(
-                Panel(
-                    f":file_folder: Using task file: [cyan]{parsed_args.file}[/cyan]",
-                    border_style="cyan",
-                )
+                "Error: --format only applies to the list, ready, import and "
+                "export commands of a single task file."
             )
-            self.console.print()
+            sys.exit(1)
+
+        if parsed_args.command == "migrate":
+            self._handle_migrate(
+                parsed_args.file,
+                parsed_args.source_backend,
+                parsed_args.target_backend,
+                parsed_args.output,
+            )
+            return 0
+
+        if parsed_args.command == "serve":
+            self._handle_serve(parsed_args.file)
+            return 0
+
+        if getattr(parsed_args, "all_files", False):
+            self._handle_all_files(parsed_args)
+            return 0
+
+        if parsed_args.command == "search":
+            self._handle_search(
+                parsed_args.file, " ".join(parsed_args.query), parsed_args.limit
+            )
+            return 0
+
+        if parsed_args.command == "stats":
+            self._handle_stats(parsed_args.file, parsed_args.days, parsed_args.json)
+            return 0
+
+        if parsed_args.command == "archive":
+            self._handle_archive(parsed_args.file, parsed_args.older_than)
+            return 0
 
-        if not parsed_args.command or parsed_args.command == "list":
-            self._handle_list(task_manager)
+        if parsed_args.command == "import":
+            self._handle_import(parsed_args)
+            return 0
+
+        if parsed_args.command == "export":
+            self._handle_export(parsed_args)
+            return 0
+
+        if parsed_args.command == "tui":
+            self._handle_tui(parsed_args.file, parsed_args.pending_only)
+            return 0
+
+        links = parsed_args.command in LINK_COMMANDS or (
+            getattr(parsed_args, "parent", None) is not None
+            or getattr(parsed_args, "blocked_by", None)
+        )
+        task_manager = self._initialize_task_manager(
+            parsed_args.file,
+            use_daemon=not (parsed_args.no_daemon or links),
+            include_archive=getattr(parsed_args, "include_archive", False),
+        )
+        try:
+            self._dispatch(parsed_args, task_manager)
+        except (DaemonError, TaskLinkError) as e:
+            self.console.print(f"Error: {e}")
+            sys.exit(1)
+
+        if parsed_args.command in AUTO_ARCHIVE_COMMANDS and isinstance(
+            task_manager, TaskManager
+        ):
+            self._auto_archive(task_manager)
+        return 0
+
+    def _dispatch(self, parsed_args, task_manager) -> None:
+        if parsed_args.format:
+            self._handle_format(task_manager, parsed_args)
+        elif not parsed_args.command or parsed_args.command == "list":
+            self._handle_list(task_manager, *self._list_query(parsed_args))
         elif parsed_args.command == "add":
-            self._handle_add(task_manager, parsed_args.description)
+            self._handle_add(
+                task_manager,
+                parsed_args.description,
+                parsed_args.parent,
+                parsed_args.blocked_by,
+            )
+        elif parsed_args.command == "ready":
+            self._handle_ready(task_manager)
+        elif parsed_args.command == "link":
+            self._handle_link(task_manager, parsed_args)
         elif parsed_args.command == "do":
-            self._handle_do(task_manager, parsed_args.task_id)
+            self._handle_do(task_manager, parsed_args.task_ids)
         elif parsed_args.command == "undo":
-            self._handle_undo(task_manager, parsed_args.task_id)
+            self._handle_undo(task_manager, parsed_args.task_ids)
         elif parsed_args.command == "delete":
-            self._handle_delete(task_manager, parsed_args.task_id)
+            self._handle_delete(task_manager, parsed_args.task_ids)
         else:
             self.parser.parser.print_help()
 
-        return 0
+    def _list_query(self, parsed_args) -> tuple[TaskQuery, bool]:
+        """Return (query, use_pager) for a list command.
+
+        Running tuido without a command lists everything.
+        """
+        limit = getattr(parsed_args, "limit", None)
+        offset = getattr(parsed_args, "offset", None) or 0
+        page = getattr(parsed_args, "page", None)
+        if page is not None:
+            limit = limit or DEFAULT_PAGE_SIZE
+            offset = (page - 1) * limit
+        query = TaskQuery(
+            completed=getattr(parsed_args, "completed", None),
+            since=getattr(parsed_args, "since", None),
+            until=getattr(parsed_args, "until", None),
+            match=getattr(parsed_args, "match", None),
+            sort=getattr(parsed_args, "sort", "id"),
+            offset=offset,
+            limit=limit,
+        )
+        return query, getattr(parsed_args, "pager", False)
 
-    def _handle_add(self, task_manager: TaskManager, description: str):
+    def _handle_add(
+        self,
+        task_manager: TaskManager,
+        description: str,
+        parent_id: int | None = None,
+        blocked_by: list[int] | None = None,
+    ):
         description = description.strip()
 
+        if description == "-":
+            if parent_id is not None or blocked_by:
+                self.console.print(
+                    "Error: --parent and --blocked-by need a single description."
+                )
+                sys.exit(1)
+            self._handle_add_many(task_manager, sys.stdin)
+            return
+
         if not description:
             self.console.print("Error: Task description cannot be empty.")
             sys.exit(1)
 
-        new_task = task_manager.add_task(description)
+        if parent_id is not None or blocked_by:
+            new_task = task_manager.add_task(description, parent_id, blocked_by or ())
+        else:
+            new_task = task_manager.add_task(description)
         self.console.print(
             f"[bold green]✓[/bold green] Added task {new_task.id}: '{new_task.description}'"
         )
 
-    def _handle_list(self, task_manager: TaskManager):
-        tasks = task_manager.all_tasks()
+    def _handle_add_many(self, task_manager: TaskManager, lines: Iterable[str]):
+        descriptions = [line.strip() for line in lines if line.strip()]
 
-        # Separate tasks
-        completed_tasks = [task for task in tasks if task.completed_at]
-        pending_tasks = [task for task in tasks if not task.completed_at]
+        if not descriptions:
+            self.console.print("Error: No task descriptions read from stdin.")
+            sys.exit(1)
 
-        if pending_tasks:
-            self.console.print(f"[yellow]PENDING TASKS ({len(pending_tasks)})[/yellow]")
-            for task in pending_tasks:
+        new_tasks = task_manager.add_many(descriptions)
+        self.console.print(
+            f"[bold green]✓[/bold green] Added {len(new_tasks)} tasks: "
+            f"{format_task_ids(task.id for task in new_tasks)}"
+        )
+
+    def _handle_list(
+        self,
+        task_manager: TaskManager,
+        query: TaskQuery = TaskQuery(),
+        use_pager: bool = False,
+    ):
+        statuses = [
+            status for status in (False, True) if query.completed in (None, status)
+        ]
+        with span("count"):
+            counts = {
+                status: task_manager.count_matching(query._replace(completed=status))
+                for status in statuses
+            }
+        total = sum(counts.values())
+
+        if not total:
+            if query.completed is None and not query.filtered:
                 self.console.print(
-                    f"  {task.id}: {task.description} ",
-                    f"[dim](added {humanize.naturaltime(task.created_at)})[/dim]",
-                    highlight=False,
+                    "[dim]No tasks found. Use 'add' command to create a new task.[/dim]"
                 )
+            else:
+                self.console.print("[dim]No tasks match the given filters.[/dim]")
+            return
+
+        offset, limit = query.offset, query.limit
+        pager = getattr(self.console, "pager", None) if use_pager else None
+        with pager(styles=True) if pager else nullcontext(), span("render"):
+            renderer = TaskListRenderer(self.console)
+            # Pending tasks are listed first, so a page may span both sections.
+            shown, skip = 0, offset
+            for status in statuses:
+                section_limit = None if limit is None else limit - shown
+                if section_limit == 0:
+                    break
+                if skip < counts[status]:
+                    title = (
+                        f"[green]COMPLETED TASKS ({counts[status]})[/green]"
+                        if status
+                        else f"[yellow]PENDING TASKS ({counts[status]})[/yellow]"
+                    )
+                    section = query._replace(
+                        completed=status, offset=skip, limit=section_limit
+                    )
+                    shown += renderer.render_section(
+                        title, task_manager.query_tasks(section)
+                    )
+                skip = max(0, skip - counts[status])
+
+            if offset or limit is not None:
+                if shown:
+                    self.console.print(
+                        f"[dim]Showing {offset + 1}-{offset + shown} "
+                        f"of {total} tasks.[/dim]"
+                    )
+                else:
+                    self.console.print(
+                        f"[dim]No tasks on this page ({total} total).[/dim]"
+                    )
+
+    def _handle_ready(self, task_manager: TaskManager):
+        with span("ready"):
+            tasks = task_manager.ready_tasks()
+        if not tasks:
+            self.console.print("[dim]No tasks are ready to work on.[/dim]")
+            return
+        with span("render"):
+            TaskListRenderer(self.console).render_section(
+                f"[yellow]READY TASKS ({len(tasks)})[/yellow]", tasks
+            )
+
+    def _handle_format(self, task_manager: TaskManager, parsed_args):
+        """Write the tasks a list or ready command selects to stdout.
 
-        if completed_tasks:
+        All matching tasks are written in one sequence ordered by the
+        query, rather than split into pending and completed sections.
+        """
+        if parsed_args.command == "ready":
+            tasks = task_manager.ready_tasks()
+        else:
+            query = self._list_query(parsed_args)[0]
+            tasks = _read_once(task_manager, query)
+        self._write_records(tasks, parsed_args.format)
+
+    def _write_records(self, tasks: Iterable[Task], output_format: str) -> None:
+        try:
+            with span("write"):
+                write_tasks(tasks, output_format, sys.stdout)
+                sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader stopped early, as `| head` does; point stdout at
+            # /dev/null so that flushing it on exit does not fail again.
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+
+    def _handle_link(self, task_manager: TaskManager, parsed_args):
+        task_id = parsed_args.task_id
+        if not (
+            parsed_args.parent is not None
+            or parsed_args.no_parent
+            or parsed_args.blocked_by
+            or parsed_args.unblock
+        ):
             self.console.print(
-                f"[green]COMPLETED TASKS ({len(completed_tasks)})[/green]"
+                "Error: Give --parent, --no-parent, --blocked-by or --unblock."
             )
-            for task in completed_tasks:
-                completed_str = (
-                    f"[dim](completed {humanize.naturaltime(task.completed_at)})[/dim]"
-                    if task.completed_at is not None
-                    else "[dim](pending)[/dim]"
-                )
+            sys.exit(1)
+
+        task = task_manager.get_task(task_id)
+        if parsed_args.parent is not None or parsed_args.no_parent:
+            task = task_manager.set_parent(task_id, parsed_args.parent)
+        if task is not None and parsed_args.blocked_by:
+            task = task_manager.block(task_id, parsed_args.blocked_by)
+        if task is not None and parsed_args.unblock:
+            task = task_manager.unblock(task_id, parsed_args.unblock)
+        if task is None:
+            self.console.print(f"⚠️  Task {task_id} not found.")
+            sys.exit(1)
+
+        parent = "none" if task.parent_id is None else str(task.parent_id)
+        blockers = format_task_ids(task.blocked_by) or "none"
+        self.console.print(
+            f"[bold green]✓[/bold green] Task {task_id}: parent {parent}, "
+            f"blocked by {blockers}."
+        )
+
+    def _handle_stats(self, file_path: str, days: int, as_json: bool):
+        with span("stats"):
+            summary = TaskManager(create_repository(file_path)).stats().summary(days)
+        if as_json:
+            sys.stdout.write(json.dumps(summary) + "\n")
+            return
+
+        self.console.print(
+            f"[bold]{summary['total']} tasks:[/bold] {summary['pending']} pending, "
+            f"{summary['completed']} completed"
+        )
+        period = "today" if days == 1 else f"in the last {days} days"
+        self.console.print(
+            f"Completed {period} ({summary['throughput_per_day']:g} per day):"
+        )
+        completions = summary["completed_per_day"]
+        peak = max(completions.values())
+        for day, count in completions.items():
+            bar = "█" * round(count / peak * STATS_BAR_WIDTH) if peak else ""
+            self.console.print(f"  {day}  {count:>6}  [green]{bar}[/green]")
+        for title, key in [
+            ("Pending for", "pending_age_days"),
+            ("Took to complete", "lead_time_days"),
+        ]:
+            ages = summary[key]
+            if ages["max"] is not None:
                 self.console.print(
-                    f"  {task.id}: {task.description} ",
-                    completed_str,
-                    highlight=False,
+                    f"{title} (days): median {ages['p50']}, 90% {ages['p90']}, "
+                    f"99% {ages['p99']}, max {ages['max']}"
                 )
 
-        if not tasks:
+    def _handle_search(self, file_path: str, query: str, limit: int | None):
+        repository = create_repository(file_path)
+        index = SearchIndex.for_repository(repository)
+        with span("update index"):
+            index.ensure_current(_with_archive(repository).iter_tasks)
+
+        with span("search"):
+            results = index.search(query, limit)
+        self._print_search_results(query, [("", result) for result in results])
+
+    def _print_search_results(
+        self, query: str, results: list[tuple[str, SearchResult]]
+    ) -> None:
+        """Print search results, each after a label naming its file, if any."""
+        if not results:
+            self.console.print(f"[dim]No tasks match '{query}'.[/dim]")
+            return
+
+        lines = [f"[yellow]TASKS MATCHING '{query}'[/yellow]"]
+        for label, result in results:
+            status = "  [dim](completed)[/dim]" if result.completed else ""
+            lines.append(f"  {label}{result.id}: {result.description}{status}")
+        self.console.print("\n".join(lines), highlight=False)
+
+    def _handle_all_files(self, parsed_args) -> None:
+        """List or search every task file in the workspace."""
+        # pylint: disable-next=import-outside-toplevel
+        from tuido.workspace import Workspace, search_files
+
+        workspace = Workspace(
+            parsed_args.workspace or Path(parsed_args.file).expanduser().parent
+        )
+        with span("refresh catalog"):
+            files = workspace.refresh(parsed_args.jobs)
+        if not files:
+            self.console.print(f"[dim]No task files found in {workspace.root}.[/dim]")
+            return
+
+        def label(path: Path) -> str:
+            return str(
+                path.relative_to(workspace.root)
+                if path.is_relative_to(workspace.root)
+                else path
+            )
+
+        for file in files:
+            if file.error is not None:
+                self.console.print(f"⚠️  Skipped {label(file.path)}: {file.error}")
+        readable = [file for file in files if file.error is None]
+
+        if parsed_args.command == "search":
+            query = " ".join(parsed_args.query)
+            with span("search"):
+                results = search_files(readable, query, parsed_args.limit)
+            self._print_search_results(
+                query, [(f"{label(file.path)}:", result) for file, result in results]
+            )
+            return
+
+        # Files without a matching task are left out.
+        query, use_pager = self._list_query(parsed_args)
+        matching = [file for file in readable if file.count_matching(query)]
+        if not matching:
+            self.console.print(f"[dim]No matching tasks in {workspace.root}.[/dim]")
+        for number, file in enumerate(matching):
+            if number:
+                self.console.print()
+            self.console.print(f":file_folder: [cyan]{label(file.path)}[/cyan]")
+            self._handle_list(file, query, use_pager)
+
+    def _handle_do(self, task_manager: TaskManager, task_ids: list[int]):
+        self._report_batch(
+            task_manager.complete_many(task_ids),
+            "marked as complete",
+            "not found or already complete",
+        )
+
+    def _handle_undo(self, task_manager: TaskManager, task_ids: list[int]):
+        self._report_batch(
+            task_manager.pending_many(task_ids),
+            "marked pending",
+            "not found or already pending",
+        )
+
+    def _handle_delete(self, task_manager: TaskManager, task_ids: list[int]):
+        results = task_manager.delete_many(task_ids)
+        deleted = [task for task in results.values() if task is not None]
+        if len(deleted) == 1:
+            task = deleted[0]
             self.console.print(
-                "[dim]No tasks found. Use 'add' command to create a new task.[/dim]"
+                f"[bold green]✓[/bold green] Deleted task {task.id}: '{task.description}'."
             )
+        elif deleted:
+            self.console.print(
+                f"[bold green]✓[/bold green] Deleted {len(deleted)} tasks: "
+                f"{format_task_ids(task.id for task in deleted)}."
+            )
+        self._report_batch(
+            {task_id: task is not None for task_id, task in results.items()},
+            None,
+            "not found",
+        )
+
+    def _report_batch(
+        self, results: dict[int, bool], done: str | None, failed: str
+    ) -> None:
+        """Print one summary line for successes and one for failures.
 
-    def _handle_do(self, task_manager: TaskManager, task_id: int):
-        if task_manager.set_task_complete(task_id):
+        Exits with status 1 after reporting if any id failed.
+        """
+        succeeded = [task_id for task_id, ok in results.items() if ok]
+        missed = [task_id for task_id, ok in results.items() if not ok]
+
+        if succeeded and done:
             self.console.print(
-                f"[bold green]✓[/bold green] Task {task_id} marked as complete."
+                f"[bold green]✓[/bold green] {_describe_ids(succeeded)} {done}."
             )
-        else:
-            self.console.print(f"⚠️  Task {task_id} not found or already complete.")
+        if missed:
+            self.console.print(f"⚠️  {_describe_ids(missed)} {failed}.")
             sys.exit(1)
 
-    def _handle_undo(self, task_manager: TaskManager, task_id: int):
-        if task_manager.set_task_pending(task_id):
+    def _handle_archive(self, file_path: str, older_than: timedelta):
+        repository = create_repository(file_path)
+        archive = _with_archive(repository).archive
+        task_manager = TaskManager(repository, SearchIndex.for_repository(repository))
+        moved = task_manager.archive_completed(archive, datetime.now() - older_than)
+        if moved:
             self.console.print(
-                f"[bold green]✓[/bold green] Task {task_id} marked pending."
+                f"[bold green]✓[/bold green] Archived {len(moved)} completed "
+                f"tasks to {archive.path}"
             )
         else:
-            self.console.print(f"⚠️  Task {task_id} not found or already pending.")
+            self.console.print("[dim]No completed tasks to archive.[/dim]")
+
+    def _handle_import(self, parsed_args):
+        source = parsed_args.source
+        input_format = parsed_args.format or format_for_path(source)
+        if input_format is None:
+            self.console.print(
+                f"Error: Cannot tell the format of {source}; "
+                f"use --format {', '.join(FORMATS)}."
+            )
             sys.exit(1)
 
-    def _handle_delete(self, task_manager: TaskManager, task_id: int):
-        task = task_manager.delete_task(task_id)
-        if task is not None:
+        task_manager = self._initialize_task_manager(parsed_args.file, use_daemon=False)
+        try:
+            # Byte order marks, as spreadsheets write them, are skipped.
+            source_file = (
+                nullcontext(sys.stdin)
+                if source == "-"
+                else open(source, encoding="utf-8-sig", newline="")
+            )
+            read = 0
+
+            def counted(tasks: Iterable[Task]) -> Iterator[Task]:
+                nonlocal read
+                for read, task in enumerate(tasks, 1):
+                    yield task
+
+            # The file is read while the tasks are added, without a list.
+            with source_file as file:
+                added = task_manager.import_tasks(
+                    counted(read_tasks(file, input_format)), parsed_args.dedupe
+                )
+        except (OSError, TaskFormatError, TaskLinkError) as e:
+            self.console.print(f"Error: {e}")
+            sys.exit(1)
+
+        message = f"[bold green]✓[/bold green] Imported {len(added)} tasks"
+        if added:
+            message += f": {format_task_ids(task.id for task in added)}"
+        if len(added) < read:
+            message += f" (skipped {read - len(added)} duplicates)"
+        self.console.print(message)
+
+    def _handle_export(self, parsed_args):
+        output = parsed_args.output
+        output_format = parsed_args.format or format_for_path(output) or "jsonl"
+        task_manager = self._initialize_task_manager(
+            parsed_args.file, include_archive=parsed_args.include_archive
+        )
+        tasks = _read_once(task_manager, TaskQuery())
+        if output is None or output == "-":
+            self._write_records(tasks, output_format)
+            return
+
+        try:
+            with open(output, "w", encoding="utf-8", newline="") as file, span("write"):
+                written = write_tasks(tasks, output_format, file)
+        except OSError as e:
+            self.console.print(f"Error: {e}")
+            sys.exit(1)
+        self.console.print(
+            f"[bold green]✓[/bold green] Exported {written} tasks to {output}"
+        )
+
+    def _auto_archive(self, task_manager: TaskManager):
+        """Archive old completed tasks if $TUIDO_ARCHIVE_AFTER asks for it."""
+        older_than = os.environ.get(ARCHIVE_AFTER_VARIABLE)
+        if not older_than:
+            return
+        try:
+            before = datetime.now() - parse_duration(older_than)
+        except argparse.ArgumentTypeError as e:
+            self.console.print(f"⚠️  Ignoring {ARCHIVE_AFTER_VARIABLE}: {e}")
+            return
+        if task_manager.count_matching(TaskQuery(completed=True, until=before)):
+            archive = _with_archive(task_manager.repository).archive
+            task_manager.archive_completed(archive, before)
+
+    def _handle_tui(self, file_path: str, pending_only: bool):
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            from tuido.task_tui import run_tui
+        except ImportError:
+            self.console.print("Error: The full-screen view needs the curses module.")
+            sys.exit(1)
+        if not sys.stdout.isatty():
+            self.console.print("Error: The full-screen view needs a terminal.")
+            sys.exit(1)
+
+        run_tui(create_repository(file_path), pending_only=pending_only)
+
+    def _handle_serve(self, file_path: str):
+        # pylint: disable-next=import-outside-toplevel
+        from tuido.task_server import serve
+
+        serve(create_repository(file_path))
+
+    def _handle_migrate(
+        self,
+        file_path: str,
+        source_backend: str | None,
+        target_backend: str,
+        output: str | None,
+    ):
+        source_backend = source_backend or backend_for_path(file_path)
+        if output is None:
+            output = str(
+                Path(file_path).with_suffix(DEFAULT_EXTENSIONS[target_backend])
+            )
+
+        source = create_repository(file_path, source_backend)
+        target = create_repository(output, target_backend)
+
+        if target.file_path == source.file_path:
+            self.console.print("Error: Migration source and destination are the same.")
+            sys.exit(1)
+        if target.file_path.exists():
             self.console.print(
-                f"[bold green]✓[/bold green] Deleted task {task.id}: '{task.description}'."
+                f"Error: {output} already exists. Remove it or choose another --output."
+            )
+            sys.exit(1)
+
+        data = source.load_data()
+        if not target.stores_links and any(task.linked for task in data.tasks):
+            self.console.print(
+                f"Error: Task links cannot be saved in {target.file_path.name}; "
+                "migrate to a JSON or journal task file, or remove the links first."
             )
-        else:
-            self.console.print(f"⚠️  Task {task_id} not found.")
             sys.exit(1)
+        target.save_data(data)
+        self.console.print(
+            f"[bold green]✓[/bold green] Migrated {len(data.tasks)} tasks "
+            f"from {source_backend} to {target_backend}: '{output}'"
+        )
+
+
+def _read_once(
+    task_manager: TaskManager | RemoteTaskManager, query: TaskQuery
+) -> Iterator[Task]:
+    """Run a query whose tasks are only iterated over once."""
+    if isinstance(task_manager, TaskManager):
+        return task_manager.query_tasks(query, stream=True)
+    return task_manager.query_tasks(query)
+
+
+def _with_archive(repository: TaskRepository) -> "TieredTaskRepository":
+    """Wrap a repository so that reads also cover its archive."""
+    # Only commands that touch the archive pay for importing it.
+    # pylint: disable-next=import-outside-toplevel
+    from tuido.tiered_repository import TaskArchive, TieredTaskRepository
+
+    return TieredTaskRepository(repository, TaskArchive.for_repository(repository))
@@ -1,14 +1,279 @@
 """Task data management module for TUIDO."""
 
+from collections.abc import Collection, Iterable, Iterator, MutableSequence, Sequence
 from dataclasses import dataclass, field
-from typing import List
+from typing import NamedTuple
 
 from tuido.task import Task
+from tuido.task_graph import TaskGraph
+from tuido.task_stats import TaskStats
+
+
+class TaskDelta(NamedTuple):
+    """Changes made to TaskData since it was loaded or last saved.
+
+    ``rewrite`` is set when tasks were reordered or replaced by position,
+    which only a full save can record.
+    """
+
+    inserted: Sequence[Task] = ()
+    updated: Sequence[Task] = ()
+    deleted: Sequence[Task] = ()
+    next_id_delta: int = 0
+    rewrite: bool = False
+
+
+class TaskList(MutableSequence):
+    """An ordered list of tasks with an id index and status views.
+
+    Tasks are kept in an insertion-ordered ``id -> Task`` mapping, so
+    appending, looking up and removing by id are O(1) while iteration
+    still follows list order. Pending and completed tasks are kept in
+    separate ordered views; call ``refresh`` after changing a task's
+    completion status so it moves to the right view, or ``mark_changed``
+    after any other change to a task.
+
+    Positional access (indexing, slicing, inserting in the middle) is
+    supported for compatibility but costs O(N).
+
+    Appends, removals and refreshes are recorded so that only changed
+    tasks need saving; see ``changes``. Changes to the same task are
+    merged, so adding and then deleting a task records nothing.
+
+    Parent and blocked-by links are indexed by ``graph``, which is built
+    on first use and then kept up to date by the same calls.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._by_id: dict[int, Task] = {}
+        self._pending: dict[int, Task] = {}
+        self._completed: dict[int, Task] = {}
+        self._positions: list[Task] | None = None
+        self._inserted: dict[int, Task] = {}
+        self._updated: dict[int, Task] = {}
+        self._deleted: dict[int, Task] = {}
+        self._rewrite = False
+        self._graph: TaskGraph | None = None
+        for task in tasks:
+            self._add(task)
+
+    def _view_for(self, task: Task) -> dict[int, Task]:
+        return self._completed if task.is_complete() else self._pending
+
+    def _reset(self, tasks: Iterable[Task]) -> None:
+        tasks = list(tasks)
+        self._by_id.clear()
+        self._pending.clear()
+        self._completed.clear()
+        self._positions = None
+        self._graph = None
+        for task in tasks:
+            self._add(task)
+        self._rewrite = True
+
+    def _as_list(self) -> list[Task]:
+        if self._positions is None:
+            self._positions = list(self._by_id.values())
+        return self._positions
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, task: object) -> bool:
+        if not isinstance(task, Task):
+            return False
+        return self._by_id.get(task.id) == task
+
+    def __getitem__(self, index):
+        return self._as_list()[index]
+
+    def __setitem__(self, index, value) -> None:
+        tasks = self._as_list().copy()
+        tasks[index] = value
+        self._reset(tasks)
+
+    def __delitem__(self, index) -> None:
+        tasks = self._as_list().copy()
+        del tasks[index]
+        self._reset(tasks)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TaskList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TaskList({list(self)!r})"
+
+    def insert(self, index: int, value: Task) -> None:
+        """Insert a task before ``index``."""
+        if index >= len(self):
+            self.append(value)
+            return
+        tasks = self._as_list().copy()
+        tasks.insert(index, value)
+        self._reset(tasks)
+
+    def _add(self, value: Task) -> None:
+        if value.id in self._by_id:
+            raise ValueError(f"Duplicate task id: {value.id}")
+        self._by_id[value.id] = value
+        self._view_for(value)[value.id] = value
+        self._positions = None
+        if self._graph is not None:
+            self._graph.add(value)
+
+    def append(self, value: Task) -> None:
+        """Add a task to the end of the list."""
+        self._add(value)
+        self._inserted[value.id] = value
+
+    def remove(self, value: Task) -> None:
+        """Remove the task with the same id as ``value``."""
+        if self.remove_id(value.id) is None:
+            raise ValueError(f"Task {value.id} not in list")
+
+    def get(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        return self._by_id.get(task_id)
+
+    def remove_id(self, task_id: int) -> Task | None:
+        """Remove and return the task with the given id, or None."""
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._pending.pop(task_id, None)
+            self._completed.pop(task_id, None)
+            self._positions = None
+            if self._inserted.pop(task_id, None) is None:
+                self._updated.pop(task_id, None)
+                self._deleted[task_id] = task
+            if self._graph is not None:
+                self._graph.remove(task)
+        return task
+
+    def mark_changed(self, task: Task) -> None:
+        """Record that a task in the list was modified."""
+        if task.id not in self._inserted:
+            self._updated[task.id] = task
+        if self._graph is not None:
+            self._graph.update(task)
+
+    def refresh(self, task: Task) -> None:
+        """Record a change to a task and move it to the view for its status."""
+        self.mark_changed(task)
+        target = self._view_for(task)
+        if task.id in target:
+            return
+        source = self._pending if target is self._completed else self._completed
+        source.pop(task.id, None)
+
+        if not target or task.id > next(reversed(target)):
+            target[task.id] = task
+            return
+
+        # Keep the view in list order when an older task changes status.
+        complete = task.is_complete()
+        target.clear()
+        target.update(
+            (task_id, item)
+            for task_id, item in self._by_id.items()
+            if item.is_complete() == complete
+        )
+
+    def view(self, completed: bool | None = None) -> Collection[Task]:
+        """Return a live, ordered view of all, completed or pending tasks."""
+        if completed is None:
+            return self._by_id.values()
+        return self._completed.values() if completed else self._pending.values()
+
+    def pending(self) -> list[Task]:
+        """Return pending tasks in list order."""
+        return list(self._pending.values())
+
+    def completed(self) -> list[Task]:
+        """Return completed tasks in list order."""
+        return list(self._completed.values())
+
+    @property
+    def graph(self) -> TaskGraph:
+        """The index of links between the tasks, built on first use."""
+        if self._graph is None:
+            self._graph = TaskGraph(self._by_id)
+        return self._graph
+
+    def ready(self) -> list[Task]:
+        """Return pending tasks that no pending task blocks, in list order."""
+        return list(self.graph.ready(self._pending.values()))
+
+    @property
+    def dirty(self) -> bool:
+        """Whether any task was added, changed or removed since the last save."""
+        return bool(self._rewrite or self._inserted or self._updated or self._deleted)
+
+    def changes(self) -> TaskDelta:
+        """Return the tasks added, changed and removed since the last save."""
+        return TaskDelta(
+            inserted=list(self._inserted.values()),
+            updated=list(self._updated.values()),
+            deleted=list(self._deleted.values()),
+            rewrite=self._rewrite,
+        )
+
+    def clear_changes(self) -> None:
+        """Forget recorded changes, once they have been saved."""
+        self._inserted.clear()
+        self._updated.clear()
+        self._deleted.clear()
+        self._rewrite = False
 
 
 @dataclass
 class TaskData:
-    """Data structure to hold tasks and the next available task ID."""
+    """Data structure to hold tasks and the next available task ID.
+
+    ``stats`` summarizes the tasks; it is saved with them where the
+    repository supports it, and is None until loaded or first computed.
+    """
 
-    tasks: List[Task] = field(default_factory=list)
+    tasks: TaskList = field(default_factory=TaskList)
     next_id: int = 1
+    stats: TaskStats | None = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.tasks, TaskList):
+            self.tasks = TaskList(self.tasks)
+        self._saved_next_id = self.next_id
+
+    @property
+    def dirty(self) -> bool:
+        """Whether anything changed since the data was loaded or last saved."""
+        return self.tasks.dirty or self.next_id != self._saved_next_id
+
+    def changes(self) -> TaskDelta:
+        """Return everything that changed since the data was loaded or saved."""
+        return self.tasks.changes()._replace(
+            next_id_delta=self.next_id - self._saved_next_id
+        )
+
+    def current_stats(self) -> TaskStats:
+        """Return the stats, computing them afresh if they are missing or stale.
+
+        Stats whose counts do not match the task list were not kept up to
+        date with it, for example after the file was edited by hand.
+        """
+        stats = self.stats
+        if (
+            stats is None
+            or stats.pending != len(self.tasks.view(False))
+            or stats.completed != len(self.tasks.view(True))
+        ):
+            stats = self.stats = TaskStats.from_tasks(self.tasks)
+        return stats
+
+    def mark_saved(self) -> None:
+        """Start tracking changes afresh after a save."""
+        self.tasks.clear_changes()
+        self._saved_next_id = self.next_id
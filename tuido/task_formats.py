@@ -0,0 +1,350 @@
+"""Machine-readable task formats: JSON Lines, CSV, TSV and todo.txt.
+
+JSON Lines, CSV and TSV have the same fields, in the same order: ``id``,
+``description``, ``created_at`` and ``completed_at`` as ISO-8601 strings,
+``parent_id`` and ``blocked_by``. In JSON Lines a missing timestamp or
+parent is null and ``blocked_by`` is a list; in CSV and TSV they are empty
+and ``blocked_by`` holds space-separated ids. todo.txt keeps only the
+status, the dates and the description.
+
+Tasks are written and read in chunks, so a file of any size is streamed
+with a few large writes and never held in memory as text.
+"""
+
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from itertools import islice
+from json.encoder import encode_basestring as encode_string
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO, TypeVar
+
+from tuido.task import Task
+
+T = TypeVar("T")
+
+FORMATS = ["jsonl", "csv", "tsv", "todotxt"]
+FIELDS = ["id", "description", "created_at", "completed_at", "parent_id", "blocked_by"]
+CHUNK_SIZE = 10_000
+
+# The format of a file that --format does not name, from its extension.
+EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".txt": "todotxt",
+}
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+
+# Each line is formatted directly rather than built as a dict and encoded:
+# a million short-lived dicts cost more in garbage collection than the
+# encoding itself. Only strings need escaping, which the C encoder does.
+JSONL_RECORD = (
+    '{"id":%d,"description":%s,"created_at":%s,"completed_at":%s,'
+    '"parent_id":%s,"blocked_by":[%s]}\n'
+)
+
+TODO_TXT_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})(?: +|$)")
+TODO_TXT_PRIORITY = re.compile(r"\([A-Z]\) +")
+
+
+class TaskFormatError(ValueError):
+    """Raised when tasks cannot be read from a file in the given format."""
+
+
+def format_for_path(path: str | None) -> str | None:
+    """Return the format a file's extension implies, or None."""
+    if not path:
+        return None
+    return EXTENSIONS.get(Path(path).suffix.lower())
+
+
+def _chunks(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def task_line(task: Task) -> str:
+    """Return a task as a line of JSON Lines, newline included."""
+    created_at, completed_at = task.iso_timestamps()
+    parent_id = task.parent_id
+    return JSONL_RECORD % (
+        task.id,
+        encode_string(task.description),
+        encode_string(created_at),
+        "null" if completed_at is None else encode_string(completed_at),
+        "null" if parent_id is None else parent_id,
+        ",".join(map(str, task.blocked_by)),
+    )
+
+
+def task_row(task: Task) -> tuple:
+    """Return a task as a CSV or TSV row."""
+    created_at, completed_at = task.iso_timestamps()
+    return (
+        task.id,
+        task.description,
+        created_at,
+        completed_at,
+        task.parent_id,
+        " ".join(map(str, task.blocked_by)),
+    )
+
+
+def todo_txt_line(task: Task) -> str:
+    """Return a task as a todo.txt line, newline included.
+
+    Line breaks in the description become spaces, and a leading priority
+    such as ``(A)`` stays in front of the creation date.
+    """
+    description = " ".join(task.description.splitlines())
+    created = task.created_at.date().isoformat()
+    completed_at = task.completed_at
+    if completed_at is not None:
+        return f"x {completed_at.date().isoformat()} {created} {description}\n"
+    priority = TODO_TXT_PRIORITY.match(description)
+    if priority:
+        return f"{priority.group()}{created} {description[priority.end():]}\n"
+    return f"{created} {description}\n"
+
+
+def encode_jsonl(tasks: list[Task]) -> str:
+    """Encode tasks as JSON Lines, one object per line."""
+    return "".join(map(task_line, tasks))
+
+
+def encode_todo_txt(tasks: list[Task]) -> str:
+    """Encode tasks as todo.txt lines."""
+    return "".join(map(todo_txt_line, tasks))
+
+
+def _csv_encoder(delimiter: str) -> Callable[[list[Task]], str]:
+    def encode(tasks: list[Task]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+        writer.writerows(map(task_row, tasks))
+        return buffer.getvalue()
+
+    return encode
+
+
+ENCODERS: dict[str, Callable[[list[Task]], str]] = {
+    "jsonl": encode_jsonl,
+    "csv": _csv_encoder(","),
+    "tsv": _csv_encoder("\t"),
+    "todotxt": encode_todo_txt,
+}
+
+
+def write_tasks(
+    tasks: Iterable[Task], output_format: str, file: TextIO, chunk_size=CHUNK_SIZE
+) -> int:
+    """Write tasks to ``file`` in one of ``FORMATS``.
+
+    CSV and TSV start with a header row naming the fields. Returns the
+    number of tasks written.
+    """
+    encode = ENCODERS[output_format]
+    if output_format in DELIMITERS:
+        file.write(DELIMITERS[output_format].join(FIELDS) + "\n")
+    written = 0
+    for chunk in _chunks(tasks, chunk_size):
+        file.write(encode(chunk))
+        written += len(chunk)
+    return written
+
+
+def _timestamp(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if value.__class__ is str:
+        moment = datetime.fromisoformat(value)
+    elif isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        moment = datetime.fromtimestamp(value)
+    else:
+        raise TypeError(f"invalid timestamp: {value!r}")
+    if moment.tzinfo is not None:
+        # Task timestamps are naive local times.
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+def _task_id(value: Any) -> int:
+    if value.__class__ is int:
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(f"invalid task id: {value!r}")
+    return int(value)
+
+
+def _build_task(
+    number: int,
+    task_id: Any,
+    description: Any,
+    created_at: Any,
+    completed_at: Any,
+    parent_id: Any,
+    blocked_by: Iterable[Any],
+) -> Task:
+    """Build a task from the fields of record ``number``, checking them.
+
+    Records without an id get their number as one, so that every task
+    read has an id that links from other records can refer to.
+    """
+    if not isinstance(description, str) or not (description := description.strip()):
+        raise TaskFormatError(f"Line {number}: missing task description")
+    try:
+        return Task(
+            number if task_id is None or task_id == "" else _task_id(task_id),
+            description,
+            _timestamp(created_at),
+            _timestamp(completed_at),
+            None if parent_id is None or parent_id == "" else _task_id(parent_id),
+            [_task_id(blocker_id) for blocker_id in blocked_by] if blocked_by else (),
+        )
+    except (TypeError, ValueError) as e:
+        raise TaskFormatError(f"Line {number}: {e}") from None
+
+
+def _record_task(record: Any, number: int) -> Task:
+    if not isinstance(record, dict):
+        raise TaskFormatError(f"Line {number}: expected a JSON object")
+    blocked_by = record.get("blocked_by") or []
+    if not isinstance(blocked_by, list):
+        raise TaskFormatError(f"Line {number}: blocked_by must be a list")
+    return _build_task(
+        number,
+        record.get("id"),
+        record.get("description"),
+        record.get("created_at"),
+        record.get("completed_at"),
+        record.get("parent_id"),
+        blocked_by,
+    )
+
+
+def _parse_json_line(line: str, number: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise TaskFormatError(f"Line {number}: {e}") from None
+
+
+def read_jsonl(file: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Task]:
+    """Read tasks from JSON Lines, skipping blank lines.
+
+    Each chunk of lines is decoded with a single call, as one JSON array;
+    blank lines stand in as nulls so that records keep their line numbers.
+    Only a chunk that fails to decode is decoded again line by line, to
+    report where the error is.
+    """
+    number = 0
+    for lines in _chunks(file, chunk_size):
+        text = ",".join(line if line.strip() else "null" for line in lines)
+        try:
+            records = json.loads(f"[{text}]")
+        except ValueError:
+            records = None
+        if records is None or len(records) != len(lines):
+            records = [
+                _parse_json_line(line, number + offset) if line.strip() else None
+                for offset, line in enumerate(lines, 1)
+            ]
+        for record in records:
+            number += 1
+            if record is not None:
+                yield _record_task(record, number)
+
+
+def _read_delimited(file: TextIO, delimiter: str) -> Iterator[Task]:
+    """Read tasks from CSV or TSV with a header row naming the fields.
+
+    Only ``description`` is required; columns may come in any order, and
+    columns that are not task fields are ignored.
+    """
+    reader = csv.reader(file, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = {name.strip().lower(): index for index, name in enumerate(header)}
+    if "description" not in columns:
+        raise TaskFormatError("Line 1: no description column in the header")
+    indexes = [columns.get(field) for field in FIELDS]
+    for number, row in enumerate(reader, 2):
+        if not row:
+            continue
+        values = [
+            row[index] if index is not None and index < len(row) else None
+            for index in indexes
+        ]
+        task_id, description, created_at, completed_at, parent_id, blocked_by = values
+        yield _build_task(
+            number,
+            task_id,
+            description,
+            created_at,
+            completed_at,
+            parent_id,
+            (blocked_by or "").split(),
+        )
+
+
+def _todo_txt_date(text: str, number: int) -> tuple[datetime | None, str]:
+    """Split a leading date off a todo.txt line."""
+    match = TODO_TXT_DATE.match(text)
+    if match is None:
+        return None, text
+    try:
+        return datetime.fromisoformat(match.group(1)), text[match.end() :]
+    except ValueError as e:
+        raise TaskFormatError(f"Line {number}: {e}") from None
+
+
+def read_todo_txt(file: TextIO) -> Iterator[Task]:
+    """Read tasks from todo.txt, one per non-blank line.
+
+    A task is complete if its line starts with ``x``, followed by its
+    completion date and then its creation date, both optional; a pending
+    task may start with a priority, which is kept in the description.
+    Tasks without a creation date are created when they were completed,
+    or now. Tasks are numbered by line, and todo.txt has no links.
+    """
+    for number, line in enumerate(file, 1):
+        text = line.strip()
+        if not text:
+            continue
+        completed_at = None
+        priority = ""
+        if text == "x" or text.startswith("x "):
+            completed_at, text = _todo_txt_date(text[2:], number)
+            completed_at = completed_at or datetime.now()
+        elif match := TODO_TXT_PRIORITY.match(text):
+            priority, text = match.group(), text[match.end() :]
+        created_at, text = _todo_txt_date(text, number)
+        if completed_at is not None and created_at is None:
+            created_at = completed_at
+        yield _build_task(
+            number, number, priority + text, created_at, completed_at, None, ()
+        )
+
+
+def read_tasks(
+    file: TextIO, input_format: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Task]:
+    """Read tasks from ``file`` in one of ``FORMATS``.
+
+    Tasks keep the ids and links they have in the file, or are numbered
+    by line. Raises TaskFormatError, naming the line, for a record that
+    cannot be read.
+    """
+    if input_format == "jsonl":
+        return read_jsonl(file, chunk_size)
+    if input_format == "todotxt":
+        return read_todo_txt(file)
+    return _read_delimited(file, DELIMITERS[input_format])
@@ -0,0 +1,207 @@
+"""Parent and blocked-by links between tasks.
+
+A task may have a parent, making it a subtask, and may be blocked by
+other tasks: it is ready to work on once it is pending and every task
+blocking it is complete or gone. ``TaskGraph`` indexes these links in
+both directions and keeps a count of unmet blockers per task, so that
+completing or reopening a task only touches the tasks it blocks, and the
+ready set never has to be recomputed from scratch.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+
+from tuido.task import Task
+
+
+class TaskLinkError(ValueError):
+    """A link would point at a missing task or create a cycle."""
+
+
+class TaskGraph:
+    """Adjacency indexes over the links of a set of tasks.
+
+    ``tasks`` is the live ``id -> Task`` mapping the links refer to. Call
+    ``add`` and ``remove`` as tasks come and go, and ``update`` after a
+    task's links or completion status change; ``TaskList`` does this for
+    its graph.
+
+    Links to tasks that do not exist are kept, so that they take effect
+    if the task turns up, but a missing blocker does not block.
+    """
+
+    def __init__(self, tasks: Mapping[int, Task]) -> None:
+        self._tasks = tasks
+        # Links of linked tasks as last seen, to undo them on update.
+        self._links: dict[int, tuple[int | None, tuple[int, ...]]] = {}
+        # Children in insertion order; the dicts are used as ordered sets.
+        self._children: dict[int, dict[int, None]] = {}
+        self._dependents: dict[int, set[int]] = {}
+        # Completion status of existing tasks that block others.
+        self._done: dict[int, bool] = {}
+        # Tasks with at least one existing, pending blocker, and how many.
+        self._unmet: dict[int, int] = {}
+        # Blockers are looked up as they are linked, so tasks that are not
+        # linked themselves need no indexing.
+        for task in tasks.values():
+            if task.parent_id is not None or task.blocked_by:
+                self._link(task)
+
+    def add(self, task: Task) -> None:
+        """Index a task that was added to the mapping."""
+        dependents = self._dependents.get(task.id)
+        if dependents is not None:
+            done = self._done[task.id] = task.is_complete()
+            if not done:
+                for dependent in dependents:
+                    self._block(dependent, 1)
+        if task.linked:
+            self._link(task)
+
+    def remove(self, task: Task) -> None:
+        """Forget a task that was removed from the mapping.
+
+        Links pointing at it stay indexed, but it no longer blocks anyone.
+        """
+        self._unlink(task.id)
+        if self._done.pop(task.id, True) is False:
+            for dependent in self._dependents[task.id]:
+                self._block(dependent, -1)
+
+    def update(self, task: Task) -> None:
+        """Reindex a task whose links or completion status may have changed."""
+        done = self._done.get(task.id)
+        if done is not None and done != task.is_complete():
+            self._done[task.id] = not done
+            for dependent in self._dependents[task.id]:
+                self._block(dependent, 1 if done else -1)
+        if self._links.get(task.id, (None, ())) != (task.parent_id, task.blocked_by):
+            self._unlink(task.id)
+            if task.linked:
+                self._link(task)
+
+    def _block(self, task_id: int, change: int) -> None:
+        unmet = self._unmet.get(task_id, 0) + change
+        if unmet:
+            self._unmet[task_id] = unmet
+        else:
+            del self._unmet[task_id]
+
+    def _link(self, task: Task) -> None:
+        task_id = task.id
+        self._links[task_id] = (task.parent_id, task.blocked_by)
+        if task.parent_id is not None:
+            self._children.setdefault(task.parent_id, {})[task_id] = None
+        for blocker_id in task.blocked_by:
+            dependents = self._dependents.setdefault(blocker_id, set())
+            if task_id in dependents:
+                continue
+            dependents.add(task_id)
+            done = self._done.get(blocker_id)
+            if done is None:
+                blocker = self._tasks.get(blocker_id)
+                if blocker is None:
+                    continue
+                done = self._done[blocker_id] = blocker.is_complete()
+            if not done:
+                self._block(task_id, 1)
+
+    def _unlink(self, task_id: int) -> None:
+        links = self._links.pop(task_id, None)
+        if links is None:
+            return
+        parent_id, blocked_by = links
+        if parent_id is not None:
+            siblings = self._children[parent_id]
+            del siblings[task_id]
+            if not siblings:
+                del self._children[parent_id]
+        for blocker_id in set(blocked_by):
+            dependents = self._dependents[blocker_id]
+            dependents.discard(task_id)
+            if self._done.get(blocker_id) is False:
+                self._block(task_id, -1)
+            if not dependents:
+                del self._dependents[blocker_id]
+                self._done.pop(blocker_id, None)
+
+    def children(self, task_id: int) -> list[int]:
+        """Return the ids of a task's subtasks, in the order they were linked."""
+        return list(self._children.get(task_id, ()))
+
+    def descendants(self, task_id: int) -> Iterator[int]:
+        """Iterate over the ids of a task's subtasks, their subtasks and so on."""
+        seen = {task_id}
+        stack = [task_id]
+        while stack:
+            for child_id in self._children.get(stack.pop(), ()):
+                if child_id not in seen:
+                    seen.add(child_id)
+                    stack.append(child_id)
+                    yield child_id
+
+    def dependents(self, task_id: int) -> list[int]:
+        """Return the ids of the tasks a task blocks, in id order."""
+        return sorted(self._dependents.get(task_id, ()))
+
+    def is_blocked(self, task_id: int) -> bool:
+        """Whether any existing task blocking this one is still pending."""
+        return task_id in self._unmet
+
+    def blocked(self) -> set[int]:
+        """Return the ids of all tasks that are blocked."""
+        return set(self._unmet)
+
+    def ready(self, pending: Iterable[Task]) -> Iterator[Task]:
+        """Iterate over the given pending tasks that are not blocked."""
+        unmet = self._unmet
+        if not unmet:
+            return iter(pending)
+        return (task for task in pending if task.id not in unmet)
+
+    def check_parent(self, task_id: int, parent_id: int | None) -> None:
+        """Raise TaskLinkError unless ``parent_id`` can be the task's parent."""
+        if parent_id is None:
+            return
+        if parent_id == task_id:
+            raise TaskLinkError(f"Task {task_id} cannot be its own parent")
+        if parent_id not in self._tasks:
+            raise TaskLinkError(f"Task {parent_id} not found")
+        seen = set()
+        ancestor = self._tasks.get(parent_id)
+        while ancestor is not None and ancestor.id not in seen:
+            if ancestor.parent_id == task_id:
+                raise TaskLinkError(f"Task {parent_id} is a subtask of task {task_id}")
+            seen.add(ancestor.id)
+            ancestor = self._tasks.get(ancestor.parent_id)
+
+    def check_blockers(self, task_id: int, blocker_ids: Iterable[int]) -> None:
+        """Raise TaskLinkError unless the task can be blocked by these tasks.
+
+        Every blocker must exist and must not itself be waiting, directly
+        or through other tasks, for the task.
+        """
+        for blocker_id in blocker_ids:
+            if blocker_id == task_id:
+                raise TaskLinkError(f"Task {task_id} cannot block itself")
+            if blocker_id not in self._tasks:
+                raise TaskLinkError(f"Task {blocker_id} not found")
+            if self._waits_for(blocker_id, task_id):
+                raise TaskLinkError(
+                    f"Task {blocker_id} is already waiting for task {task_id}"
+                )
+
+    def _waits_for(self, task_id: int, target_id: int) -> bool:
+        """Whether ``task_id`` is blocked by ``target_id``, possibly indirectly."""
+        seen = {task_id}
+        stack = [task_id]
+        while stack:
+            task = self._tasks.get(stack.pop())
+            if task is None:
+                continue
+            for blocker_id in task.blocked_by:
+                if blocker_id == target_id:
+                    return True
+                if blocker_id not in seen:
+                    seen.add(blocker_id)
+                    stack.append(blocker_id)
+        return False
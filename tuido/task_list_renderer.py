@@ -0,0 +1,62 @@
+"""Streaming renderer for task listings."""
+
+from datetime import datetime
+from typing import Iterable
+
+from tuido.task import Task
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class TaskListRenderer:
+    """Formats task rows and writes them to a console in batched chunks.
+
+    Rows are formatted as they are pulled from the task iterator, and every
+    ``chunk_size`` rows are written with a single ``console.print`` call, so
+    the first screen of output appears without materializing the listing.
+    """
+
+    def __init__(self, console, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        import humanize  # pylint: disable=import-outside-toplevel
+
+        self.console = console
+        self.chunk_size = chunk_size
+        self._naturaltime = humanize.naturaltime
+        self._now = datetime.now()
+
+    def format_task(self, task: Task) -> str:
+        """Format a single task row."""
+        if task.completed_at is not None:
+            when = self._naturaltime(task.completed_at, when=self._now)
+            status = f"completed {when}"
+        else:
+            when = self._naturaltime(task.created_at, when=self._now)
+            status = f"added {when}"
+        if task.parent_id is not None:
+            status += f"; subtask of {task.parent_id}"
+        if task.blocked_by:
+            status += f"; after {', '.join(map(str, task.blocked_by))}"
+        return f"  {task.id}: {task.description}  [dim]({status})[/dim]"
+
+    def render_section(self, title: str, tasks: Iterable[Task]) -> int:
+        """Write a section title followed by its task rows.
+
+        The title is only written once the first row is available. Returns
+        the number of rows written.
+        """
+        chunk: list[str] = []
+        rows = 0
+        for task in tasks:
+            if rows == 0:
+                chunk.append(title)
+            chunk.append(self.format_task(task))
+            rows += 1
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+        self._flush(chunk)
+        return rows
+
+    def _flush(self, chunk: list[str]) -> None:
+        if chunk:
+            self.console.print("\n".join(chunk), highlight=False)
+            chunk.clear()
@@ -1,56 +1,543 @@
 """Task Manager for TUIDO Application"""
 
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
+
+from tuido.instrumentation import span
 from tuido.task import Task
-from tuido.task_repository import TaskRepository
+from tuido.task_data import TaskData, TaskList
+from tuido.task_graph import TaskLinkError
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError, TaskRepository
+from tuido.task_stats import TaskStats
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from tuido.search_index import SearchIndex
+    from tuido.task_archive import TaskArchive
+
+T = TypeVar("T")
+
+MAX_SAVE_ATTEMPTS = 5
+
+# Imported tasks are read and added this many at a time.
+IMPORT_CHUNK_SIZE = 10_000
 
 
 class TaskManager:
     """Manager for handling tasks in the TUIDO application."""
 
-    def __init__(self, repository: TaskRepository) -> None:
+    def __init__(
+        self, repository: TaskRepository, search_index: "SearchIndex | None" = None
+    ) -> None:
         self.repository = repository
-        self.data = self.repository.load_data()
+        self.search_index = search_index
+        self._data: TaskData | None = None
 
-    def _get_task_by_id(self, task_id: int) -> Task | None:
-        return next((t for t in self.data.tasks if t.id == task_id), None)
+    @property
+    def data(self) -> TaskData:
+        """All task data, loaded from the repository on first use."""
+        if self._data is None:
+            with span("load"):
+                self._data = self.repository.load_data()
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        """Whether task data has been loaded into memory."""
+        return self._data is not None
+
+    def reload(self) -> None:
+        """Drop the in-memory data so that it is loaded again on next use."""
+        self._data = None
+
+    def _reads_from_repository(self, bounded: bool = True) -> bool:
+        """Whether a read should bypass the in-memory data.
 
-    def _save(self):
-        self.repository.save_data(self.data)
+        Streaming repositories still read the whole file for unbounded
+        reads, so those are cheaper from a single full load.
+        """
+        if self._data is not None:
+            return False
+        return self.repository.indexed or (self.repository.streaming and bounded)
 
-    def add_task(self, description: str) -> Task:
-        """Add a new task with the given description."""
-        task = Task(id=self.data.next_id, description=description)
+    def _get_task_by_id(self, task_id: int) -> Task | None:
+        return self.data.tasks.get(task_id)
+
+    def _new_task(
+        self,
+        description: str,
+        parent_id: int | None = None,
+        blocked_by: tuple[int, ...] = (),
+    ) -> Task:
+        task_id = self.data.next_id
+        if parent_id is not None or blocked_by:
+            self._check_links(task_id, parent_id, blocked_by)
+        task = Task(task_id, description, parent_id=parent_id, blocked_by=blocked_by)
+        stats = self.data.current_stats()
         self.data.tasks.append(task)
+        stats.add(task)
         self.data.next_id += 1
-        self._save()
         return task
 
+    def _check_links(
+        self, task_id: int, parent_id: int | None, blocked_by: tuple[int, ...]
+    ) -> None:
+        self._check_stores_links()
+        graph = self.data.tasks.graph
+        graph.check_parent(task_id, parent_id)
+        graph.check_blockers(task_id, blocked_by)
+
+    def _check_stores_links(self) -> None:
+        if not self.repository.stores_links:
+            raise TaskLinkError(
+                f"Task links cannot be saved in {self.repository.file_path.name}; "
+                "use a JSON or journal task file"
+            )
+
+    def _set_status(self, task: Task, complete: bool) -> bool:
+        """Complete or reopen a task, keeping the views and stats up to date."""
+        if task.is_complete() == complete:
+            return False
+        stats = self.data.current_stats()
+        stats.remove(task)
+        if complete:
+            task.mark_complete()
+        else:
+            task.mark_pending()
+        self.data.tasks.refresh(task)
+        stats.add(task)
+        return True
+
+    def _complete(self, task_id: int) -> Task | None:
+        task = self._get_task_by_id(task_id)
+        if task and self._set_status(task, True):
+            tasks = self.data.tasks
+            # Completing a task completes its subtasks too.
+            for child_id in tasks.graph.descendants(task_id):
+                child = tasks.get(child_id)
+                if child is not None:
+                    self._set_status(child, True)
+            return task
+        return None
+
+    def _remove(self, task_id: int) -> Task | None:
+        """Remove a task and the links to it.
+
+        Its subtasks move up to its parent, and tasks it blocked stop
+        waiting for it.
+        """
+        tasks = self.data.tasks
+        task = tasks.get(task_id)
+        if task is None:
+            return None
+        graph = tasks.graph
+        for child_id in graph.children(task_id):
+            child = tasks.get(child_id)
+            if child is not None:
+                child.parent_id = task.parent_id
+                tasks.mark_changed(child)
+        for dependent_id in graph.dependents(task_id):
+            dependent = tasks.get(dependent_id)
+            if dependent is not None:
+                dependent.blocked_by = tuple(
+                    blocker_id
+                    for blocker_id in dependent.blocked_by
+                    if blocker_id != task_id
+                )
+                tasks.mark_changed(dependent)
+        self.data.current_stats().remove(task)
+        return tasks.remove_id(task_id)
+
+    def _make_pending(self, task_id: int) -> Task | None:
+        task = self._get_task_by_id(task_id)
+        if task and self._set_status(task, False):
+            return task
+        return None
+
+    def _transaction(self, apply: Callable[[], T]) -> T:
+        """Apply a change to up-to-date data and persist it.
+
+        Only what ``apply`` actually changed is saved, as recorded by the
+        task data; if it changed nothing, storage is not written at all.
+
+        The repository lock is held from (re)loading through saving, so
+        concurrent tuido processes take turns. If another process changed
+        the storage since it was loaded, the data is reloaded first; if a
+        writer that ignores the lock slips in before the save, the
+        repository raises ConcurrentModificationError and the change is
+        applied again to freshly loaded data.
+        """
+        for attempt in range(1, MAX_SAVE_ATTEMPTS + 1):
+            with self.repository.lock():
+                if self.loaded and self.repository.has_changed():
+                    self.reload()
+                before = self._index_signature()
+                with span("apply"):
+                    try:
+                        result = apply()
+                    except BaseException:
+                        # Drop whatever was applied before the failure.
+                        if self.loaded and self.data.dirty:
+                            self.reload()
+                        raise
+                if not self.data.dirty:
+                    return result
+                delta = self.data.changes()
+                try:
+                    with span("save"):
+                        self.repository.save_changes(self.data, delta)
+                except ConcurrentModificationError:
+                    self.reload()
+                    if attempt == MAX_SAVE_ATTEMPTS:
+                        raise
+                    continue
+                self.data.mark_saved()
+                if self.search_index is not None:
+                    with span("update index"):
+                        self.search_index.record(
+                            before, delta.inserted, delta.updated, delta.deleted
+                        )
+                return result
+        raise AssertionError("unreachable")
+
+    def _index_signature(self):
+        if self.search_index is None:
+            return None
+        return self.search_index.source_signature()
+
+    def add_task(
+        self,
+        description: str,
+        parent_id: int | None = None,
+        blocked_by: Iterable[int] = (),
+    ) -> Task:
+        """Add a new task with the given description.
+
+        It becomes a subtask of ``parent_id`` and waits for the tasks in
+        ``blocked_by``, if given. Raises TaskLinkError if they do not exist
+        or the repository cannot save links.
+        """
+        blocked_by = tuple(dict.fromkeys(blocked_by))
+        return self._transaction(
+            lambda: self._new_task(description, parent_id, blocked_by)
+        )
+
     def delete_task(self, task_id: int) -> Task | None:
         """Delete a task by its ID."""
-        task = self._get_task_by_id(task_id)
-        if task:
-            self.data.tasks.remove(task)
-            self._save()
-        return task
+        return self._transaction(lambda: self._remove(task_id))
 
     def set_task_complete(self, task_id: int) -> bool:
         """Mark a task as complete by its ID."""
-        task = self._get_task_by_id(task_id)
-        if task and not task.is_complete():
-            task.mark_complete()
-            self._save()
-            return True
-        return False
+        return self._update_many([task_id], self._complete)[task_id]
 
     def set_task_pending(self, task_id: int) -> bool:
         """Mark a task as pending by its ID."""
-        task = self._get_task_by_id(task_id)
-        if task and task.is_complete():
-            task.mark_pending()
-            self._save()
-            return True
-        return False
+        return self._update_many([task_id], self._make_pending)[task_id]
+
+    def add_many(self, descriptions: Iterable[str]) -> list[Task]:
+        """Add a task for each description, saving once."""
+        descriptions = list(descriptions)
+        return self._transaction(
+            lambda: [self._new_task(description) for description in descriptions]
+        )
+
+    def import_tasks(self, tasks: Iterable[Task], dedupe: bool = False) -> list[Task]:
+        """Add tasks read from elsewhere, saving once.
+
+        The tasks get new ids, in the order given, and their links follow
+        them to the new ids; links to ids that are not among the tasks are
+        dropped. With ``dedupe``, a task whose description matches an
+        existing or earlier task is skipped, and links to it point at that
+        task instead. Returns the tasks added.
+
+        ``tasks`` may be an iterator: it is consumed a chunk at a time while
+        the repository is locked, and the tasks are added as they are read.
+        If reading fails, nothing is saved.
+
+        Raises TaskLinkError if the tasks are linked and the repository
+        cannot save links, or if their links form a cycle; nothing is
+        imported then.
+        """
+        tasks = iter(tasks)
+        # Applying the change may be retried once every task has been read,
+        # so keep the tasks and what applying them overwrites. The task data
+        # holds the tasks anyway.
+        read: list[Task] = []
+        source_ids: list[int] = []
+        links: dict[int, tuple[int | None, tuple[int, ...]]] = {}
 
-    def all_tasks(self) -> list[Task]:
+        def chunks() -> Iterator[list[Task]]:
+            """Yield the tasks read so far, then read the rest in chunks."""
+            if read:
+                yield read
+            while chunk := list(islice(tasks, IMPORT_CHUNK_SIZE)):
+                for index, task in enumerate(chunk, len(read)):
+                    source_ids.append(task.id)
+                    if task.linked:
+                        if not links:
+                            self._check_stores_links()
+                        links[index] = (task.parent_id, task.blocked_by)
+                read.extend(chunk)
+                yield chunk
+
+        def apply() -> list[Task]:
+            data = self.data
+            stats = data.current_stats()
+            known = {task.description: task.id for task in data.tasks} if dedupe else {}
+            new_ids: dict[int, int] = {}
+            skipped = set()
+            added = []
+            next_id = data.next_id
+            index = 0
+            for chunk in chunks():
+                for task in chunk:
+                    source_id = source_ids[index]
+                    if dedupe:
+                        existing_id = known.get(task.description)
+                        if existing_id is not None:
+                            new_ids[source_id] = existing_id
+                            skipped.add(index)
+                            index += 1
+                            continue
+                        known[task.description] = next_id
+                    task.id = new_ids[source_id] = next_id
+                    next_id += 1
+                    # Links are set once every new id is known.
+                    if index in links:
+                        task.parent_id, task.blocked_by = None, ()
+                    data.tasks.append(task)
+                    stats.add(task)
+                    added.append(task)
+                    index += 1
+            graph = data.tasks.graph
+            for index, (parent_id, blocked_by) in links.items():
+                if index in skipped:
+                    continue
+                task = read[index]
+                parent_id = new_ids.get(parent_id)
+                if parent_id == task.id:
+                    parent_id = None
+                blocked_by = tuple(
+                    dict.fromkeys(
+                        new_ids[blocker_id]
+                        for blocker_id in blocked_by
+                        if new_ids.get(blocker_id, task.id) != task.id
+                    )
+                )
+                try:
+                    graph.check_parent(task.id, parent_id)
+                    graph.check_blockers(task.id, blocked_by)
+                except TaskLinkError as e:
+                    raise TaskLinkError(
+                        f"Links of imported task {source_ids[index]} form a cycle"
+                    ) from e
+                task.parent_id, task.blocked_by = parent_id, blocked_by
+                data.tasks.mark_changed(task)
+            data.next_id = next_id
+            return added
+
+        return self._transaction(apply)
+
+    def delete_many(self, task_ids: Iterable[int]) -> dict[int, Task | None]:
+        """Delete several tasks, saving once.
+
+        Returns a mapping of each requested id to the deleted task, or None
+        if no task had that id.
+        """
+        task_ids = list(task_ids)
+        return self._transaction(
+            lambda: {task_id: self._remove(task_id) for task_id in task_ids}
+        )
+
+    def complete_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as complete, saving once.
+
+        Returns a mapping of each requested id to whether it was completed.
+        """
+        return self._update_many(task_ids, self._complete)
+
+    def pending_many(self, task_ids: Iterable[int]) -> dict[int, bool]:
+        """Mark several tasks as pending, saving once.
+
+        Returns a mapping of each requested id to whether it was changed.
+        """
+        return self._update_many(task_ids, self._make_pending)
+
+    def _update_many(self, task_ids, update) -> dict[int, bool]:
+        task_ids = list(task_ids)
+        changed = self._transaction(
+            lambda: {task_id: update(task_id) for task_id in task_ids}
+        )
+        return {task_id: task is not None for task_id, task in changed.items()}
+
+    def set_parent(self, task_id: int, parent_id: int | None) -> Task | None:
+        """Make a task a subtask of ``parent_id``, or a top-level task for None.
+
+        Returns the task, or None if no task has ``task_id``. Raises
+        TaskLinkError if the parent does not exist or is one of the task's
+        own subtasks.
+        """
+
+        def apply() -> Task | None:
+            task = self._get_task_by_id(task_id)
+            if task is not None and task.parent_id != parent_id:
+                self._check_links(task_id, parent_id, ())
+                task.parent_id = parent_id
+                self.data.tasks.mark_changed(task)
+            return task
+
+        return self._transaction(apply)
+
+    def block(self, task_id: int, blocker_ids: Iterable[int]) -> Task | None:
+        """Make a task wait until the given tasks are complete.
+
+        Returns the task, or None if no task has ``task_id``. Raises
+        TaskLinkError if a blocker does not exist or is waiting for the task.
+        """
+        blocker_ids = list(blocker_ids)
+
+        def apply() -> Task | None:
+            task = self._get_task_by_id(task_id)
+            if task is None:
+                return None
+            added = tuple(
+                blocker_id
+                for blocker_id in dict.fromkeys(blocker_ids)
+                if blocker_id not in task.blocked_by
+            )
+            if added:
+                self._check_links(task_id, None, added)
+                task.blocked_by += added
+                self.data.tasks.mark_changed(task)
+            return task
+
+        return self._transaction(apply)
+
+    def unblock(self, task_id: int, blocker_ids: Iterable[int]) -> Task | None:
+        """Stop a task from waiting for the given tasks.
+
+        Returns the task, or None if no task has ``task_id``.
+        """
+        blocker_ids = set(blocker_ids)
+
+        def apply() -> Task | None:
+            task = self._get_task_by_id(task_id)
+            if task is not None and not blocker_ids.isdisjoint(task.blocked_by):
+                task.blocked_by = tuple(
+                    blocker_id
+                    for blocker_id in task.blocked_by
+                    if blocker_id not in blocker_ids
+                )
+                self.data.tasks.mark_changed(task)
+            return task
+
+        return self._transaction(apply)
+
+    def archive_completed(
+        self, archive: "TaskArchive", before: "datetime"
+    ) -> list[Task]:
+        """Move tasks completed before ``before`` into ``archive``, saving once.
+
+        The tasks are written to the archive before they are removed from
+        the repository, and links to them are removed as by ``delete_task``.
+        A retried save only archives tasks that the earlier attempts did not.
+        The tasks stay in the search index, which covers both.
+        """
+        old = TaskQuery(completed=True, until=before)
+        archived: set[int] = set()
+
+        def move() -> list[Task]:
+            tasks = list(old.apply(self.data.tasks.completed()))
+            new = [task for task in tasks if task.id not in archived]
+            if new:
+                archive.add(new)
+                archived.update(task.id for task in new)
+            for task in tasks:
+                self._remove(task.id)
+            return tasks
+
+        moved = self._transaction(move)
+        if moved and self.search_index is not None:
+            self.search_index.record(self._index_signature(), updated=moved)
+        return moved
+
+    def all_tasks(self) -> TaskList:
         """Return all tasks, both pending and completed."""
         return self.data.tasks
+
+    def pending_tasks(self) -> list[Task]:
+        """Return tasks that are not yet complete."""
+        return self.data.tasks.pending()
+
+    def completed_tasks(self) -> list[Task]:
+        """Return tasks that have been completed."""
+        return self.data.tasks.completed()
+
+    def stats(self) -> TaskStats:
+        """Return summary statistics of all tasks.
+
+        Repositories that save stats with the tasks answer this without
+        loading them.
+        """
+        if self._data is None:
+            return self.repository.load_stats()
+        return self._data.current_stats()
+
+    def ready_tasks(self) -> list[Task]:
+        """Return pending tasks that are not waiting for a pending task."""
+        return self.data.tasks.ready()
+
+    def subtasks(self, task_id: int) -> list[Task]:
+        """Return a task's direct subtasks, in the order they were added."""
+        tasks = self.data.tasks
+        return [tasks.get(child_id) for child_id in tasks.graph.children(task_id)]
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        if self._reads_from_repository():
+            return self.repository.get_task(task_id)
+        return self._get_task_by_id(task_id)
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over tasks in order, optionally filtered by status and paged.
+
+        Indexed and streaming repositories answer this directly, without
+        loading every task.
+        """
+        if self._reads_from_repository(bounded=limit is not None):
+            return self.repository.iter_tasks(completed, offset, limit)
+        tasks = self.data.tasks.view(completed)
+        return islice(tasks, offset, None if limit is None else offset + limit)
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally filtered by status."""
+        if self._reads_from_repository():
+            return self.repository.count_tasks(completed)
+        return len(self.data.tasks.view(completed))
+
+    def query_tasks(self, query: TaskQuery, stream: bool = False) -> Iterator[Task]:
+        """Iterate over the tasks matching a query, in its order and page.
+
+        The query is pushed down to the repository when it can avoid a full
+        load: indexed repositories answer it from their indexes, and
+        streaming ones filter raw records before building tasks. With
+        ``stream``, the tasks are read only once, so streaming repositories
+        answer even unbounded queries without loading every task.
+        """
+        bounded = stream or query.limit is not None or query.filtered
+        if self._reads_from_repository(bounded):
+            return self.repository.query_tasks(query)
+        return query.apply(self.data.tasks.view(query.completed))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count the tasks matching a query, ignoring its paging."""
+        if self._reads_from_repository():
+            return self.repository.count_matching(query)
+        tasks = self.data.tasks.view(query.completed)
+        if not query.filtered:
+            return len(tasks)
+        return sum(map(query.task_filter(), tasks))
@@ -0,0 +1,159 @@
+"""Queries over tasks: status, date range, text and ordering."""
+
+import heapq
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, NamedTuple, TypeVar
+
+from tuido.task import Task
+
+T = TypeVar("T")
+
+SORT_KEYS = ("id", "created", "completed")
+
+
+class TaskQuery(NamedTuple):
+    """Which tasks to read, in what order, and which page of them.
+
+    The date range applies to each task's status date: when it was
+    completed for completed tasks, and when it was created for pending
+    ones. ``since`` is inclusive and ``until`` exclusive. ``match`` is a
+    case-insensitive substring of the description.
+
+    Tasks' timestamps are compared as datetimes. Raw JSON timestamps are
+    compared as ISO-8601 strings, which order the same way as the datetimes
+    they represent, or as epoch seconds, so they never need to be parsed.
+    """
+
+    completed: bool | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    match: str | None = None
+    sort: str = "id"
+    offset: int = 0
+    limit: int | None = None
+
+    @classmethod
+    def from_params(cls, params: dict) -> "TaskQuery":
+        """Rebuild a query from ``to_params`` output."""
+        params = dict(params)
+        for name in ("since", "until"):
+            if params.get(name) is not None:
+                params[name] = datetime.fromisoformat(params[name])
+        if params.get("sort", "id") not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {params['sort']!r}")
+        return cls(**params)
+
+    def to_params(self) -> dict:
+        """Return the query as JSON-serializable keyword arguments."""
+        return self._replace(since=self.since_iso, until=self.until_iso)._asdict()
+
+    @property
+    def since_iso(self) -> str | None:
+        """The lower bound as an ISO string, or None."""
+        return None if self.since is None else self.since.isoformat()
+
+    @property
+    def until_iso(self) -> str | None:
+        """The upper bound as an ISO string, or None."""
+        return None if self.until is None else self.until.isoformat()
+
+    @property
+    def filtered(self) -> bool:
+        """Whether the query filters on anything besides status."""
+        return bool(self.since or self.until or self.match)
+
+    @property
+    def sorted_by_id(self) -> bool:
+        """Whether results come in storage (id) order."""
+        return self.sort == "id"
+
+    def matcher(self, timestamps: str = "datetime") -> Callable[..., bool]:
+        """Return a predicate on a task's description and timestamps.
+
+        ``timestamps`` says how they are given: as datetimes, ``"iso"``
+        strings or ``"epoch"`` seconds.
+        """
+        completed = self.completed
+        if timestamps == "epoch":
+            since, until = (
+                None if bound is None else bound.timestamp()
+                for bound in (self.since, self.until)
+            )
+        elif timestamps == "iso":
+            since, until = self.since_iso, self.until_iso
+        else:
+            since, until = self.since, self.until
+        needle = self.match.casefold() if self.match else None
+
+        def matches(description: str, created_at, completed_at) -> bool:
+            if completed is not None and (completed_at is not None) != completed:
+                return False
+            when = created_at if completed_at is None else completed_at
+            if since is not None and when < since:
+                return False
+            if until is not None and when >= until:
+                return False
+            return needle is None or needle in description.casefold()
+
+        return matches
+
+    def task_filter(self) -> Callable[[Task], bool]:
+        """Return a predicate on tasks."""
+        matches = self.matcher()
+        return lambda task: matches(
+            task.description, task.created_at, task.completed_at
+        )
+
+    def dict_filter(self) -> Callable[[dict], bool]:
+        """Return a predicate on tasks in their raw JSON form.
+
+        Timestamps may be ISO strings or, in older compact files, epoch
+        seconds.
+        """
+        iso_matches, epoch_matches = self.matcher("iso"), self.matcher("epoch")
+
+        def matches(item: dict) -> bool:
+            created_at = item["created_at"]
+            match = iso_matches if isinstance(created_at, str) else epoch_matches
+            return match(
+                item["description"], created_at, item.get("completed_at") or None
+            )
+
+        return matches
+
+    def sort_key(self) -> Callable[[Task], tuple] | None:
+        """Return the key tasks are ordered by, or None for id order."""
+        if self.sort == "created":
+            return lambda task: (task.created_at, task.id)
+        if self.sort == "completed":
+
+            def completed_key(task: Task) -> tuple:
+                completed_at = task.completed_at
+                return (completed_at is None, completed_at or datetime.min, task.id)
+
+            return completed_key
+        if self.sort != "id":
+            raise ValueError(f"Unknown sort key: {self.sort!r}")
+        return None
+
+    def apply(self, tasks: Iterable[Task]) -> Iterator[Task]:
+        """Filter, sort and page tasks given in id order."""
+        if self.completed is not None or self.filtered:
+            tasks = filter(self.task_filter(), tasks)
+        return self.order_and_page(tasks)
+
+    def order_and_page(self, tasks: Iterable[Task]) -> Iterator[Task]:
+        """Sort and page tasks that already match the query."""
+        key = self.sort_key()
+        if key is not None:
+            if self.limit is None:
+                tasks = sorted(tasks, key=key)
+            else:
+                tasks = heapq.nsmallest(self.offset + self.limit, tasks, key=key)
+        return self.page(tasks)
+
+    def page(self, items: Iterable[T]) -> Iterator[T]:
+        """Skip ``offset`` items and stop after ``limit`` more."""
+        stop = None if self.limit is None else self.offset + self.limit
+        return islice(items, self.offset, stop)
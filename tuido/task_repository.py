@@ -1,13 +1,60 @@
 """Task repository interface for loading and saving tasks."""
 
+import os
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
 
-from tuido.task_data import TaskData
+from tuido.task import Task
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_query import TaskQuery
+from tuido.task_stats import TaskStats
+
+
+def resolve_path(file_path: str | Path) -> Path:
+    """Expand ``~`` and environment variables in a task file path."""
+    user_path = Path(file_path).expanduser()
+    return Path(os.path.expandvars(str(user_path))).resolve()
+
+
+FileSignature = tuple[int, int, int]
+
+
+def file_signature(path: Path) -> FileSignature | None:
+    """Return (mtime_ns, size, inode) for a file, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class ConcurrentModificationError(Exception):
+    """Raised when storage changed since it was loaded and cannot be saved."""
+
+
+class InvalidTaskFileError(ValueError):
+    """Raised when a file is not in the format its backend reads."""
 
 
 class TaskRepository(ABC):
     """Abstract base class for task repositories."""
 
+    file_path: Path
+
+    #: True when ``iter_tasks``/``count_tasks`` are answered from an index
+    #: without loading every task, so callers can prefer them to ``load_data``.
+    indexed = False
+
+    #: True when ``iter_tasks`` decodes tasks incrementally from storage
+    #: instead of loading the whole task list first.
+    streaming = False
+
+    #: True when tasks' parent and blocked-by links are saved with them.
+    stores_links = False
+
     @abstractmethod
     def load_data(self) -> TaskData:
         """Load tasks from the repository."""
@@ -15,3 +62,116 @@ class TaskRepository(ABC):
     @abstractmethod
     def save_data(self, tasks: TaskData) -> None:
         """Save tasks to the repository."""
+
+    def lock(self) -> AbstractContextManager:
+        """Return a context manager that excludes other writers.
+
+        TaskManager holds it from loading through saving. The default does
+        not lock.
+        """
+        return nullcontext()
+
+    def has_changed(self) -> bool:
+        """Whether storage changed since this repository last loaded or saved."""
+        return False
+
+    def storage_paths(self) -> list[Path]:
+        """Files that hold this repository's tasks.
+
+        Derived data such as the search index uses them to tell whether the
+        tasks changed.
+        """
+        return [self.file_path]
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over tasks in order, optionally filtered by status and paged.
+
+        This is the read API that commands should build on: backends
+        override it to avoid loading every task, and the default simply
+        pages through ``load_data``.
+
+        Args:
+            completed: Only completed (True) or pending (False) tasks
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to yield
+        """
+        tasks = self.load_data().tasks.view(completed)
+        return islice(tasks, offset, None if limit is None else offset + limit)
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Iterate over the tasks matching a query, in its order and page.
+
+        Backends override this to filter before building tasks, or to let
+        an index answer it; the default filters ``load_data``.
+        """
+        return query.apply(self.load_data().tasks.view(query.completed))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count the tasks matching a query, ignoring its paging."""
+        if not query.filtered:
+            return self.count_tasks(query.completed)
+        tasks = self.load_data().tasks.view(query.completed)
+        return sum(map(query.task_filter(), tasks))
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Return the task with the given id, or None."""
+        return self.load_data().tasks.get(task_id)
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks, optionally filtered by status."""
+        return len(self.load_data().tasks.view(completed))
+
+    def load_stats(self) -> TaskStats:
+        """Return summary statistics of the stored tasks."""
+        return TaskStats.from_tasks(self.iter_tasks())
+
+    def insert_task(self, tasks: TaskData, task: Task) -> None:
+        """Persist a newly added task.
+
+        Backends that can write a single record should override this; the
+        default rewrites everything through ``save_data``.
+        """
+        self.save_data(tasks)
+
+    def update_task(self, tasks: TaskData, task: Task) -> None:
+        """Persist a change to an existing task."""
+        self.save_data(tasks)
+
+    def delete_task(self, tasks: TaskData, task: Task) -> None:
+        """Persist the removal of a task."""
+        self.save_data(tasks)
+
+    def save_batch(
+        self,
+        tasks: TaskData,
+        inserted: Iterable[Task] = (),
+        updated: Iterable[Task] = (),
+        deleted: Iterable[Task] = (),
+    ) -> None:
+        """Persist several changes with a single write.
+
+        The default rewrites everything once through ``save_data``.
+        """
+        self.save_data(tasks)
+
+    def save_changes(self, tasks: TaskData, delta: TaskDelta) -> None:
+        """Persist the changes made to ``tasks`` since it was loaded or saved.
+
+        The default hands a single changed task to the matching row hook
+        and anything more to ``save_batch``; a delta that reordered tasks
+        is written with ``save_data``. Backends that can write a delta more
+        cheaply some other way may override this instead.
+        """
+        inserted, updated, deleted = delta.inserted, delta.updated, delta.deleted
+        if delta.rewrite:
+            self.save_data(tasks)
+        elif len(inserted) + len(updated) + len(deleted) != 1:
+            self.save_batch(tasks, inserted, updated, deleted)
+        elif inserted:
+            self.insert_task(tasks, inserted[0])
+        elif updated:
+            self.update_task(tasks, updated[0])
+        else:
+            self.delete_task(tasks, deleted[0])
@@ -0,0 +1,324 @@
+"""The ``tuido serve`` daemon.
+
+One TaskManager stays resident with its tasks in memory and answers
+JSON-RPC requests from ``tuido.daemon_client`` over a Unix domain socket.
+Requests that arrive together are applied in memory and flushed to the
+task file with a single save before any of them is acknowledged.
+"""
+
+import json
+import os
+import selectors
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from tuido.daemon_client import DaemonError, check_socket_dir, socket_path
+from tuido.deferred_repository import DeferredRepository
+from tuido.json_task_repository import task_to_dict
+from tuido.task_manager import TaskManager
+from tuido.task_query import TaskQuery
+from tuido.task_repository import ConcurrentModificationError, TaskRepository
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+CONFLICT = -32000
+
+MUTATING_METHODS = {"add", "add_many", "complete", "pending", "delete"}
+READ_SIZE = 64 * 1024
+SEND_TIMEOUT = 5.0
+
+
+class RequestError(Exception):
+    """A JSON-RPC error to report back to the client."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class TaskServer:
+    """Serves one task file over a Unix domain socket."""
+
+    def __init__(
+        self, repository: TaskRepository, path: str | Path | None = None
+    ) -> None:
+        self.repository = repository
+        self.path = Path(path) if path else socket_path(repository.file_path)
+        self.buffer = DeferredRepository(repository)
+        self.task_manager = TaskManager(self.buffer)
+        self.selector = selectors.DefaultSelector()
+        self._listener: socket.socket | None = None
+        self._buffers: dict[socket.socket, bytes] = {}
+        self._stopping = False
+        self.methods: dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "add": self._add,
+            "add_many": self._add_many,
+            "complete": self._complete,
+            "pending": self._pending,
+            "delete": self._delete,
+            "get": self._get,
+            "list": self._list,
+            "count": self._count,
+            "query": self._query,
+            "count_matching": self._count_matching,
+            "shutdown": self._shutdown,
+        }
+
+    def bind(self) -> None:
+        """Create the listening socket, replacing a stale one.
+
+        Raises:
+            RuntimeError: If another daemon is already serving this file, or
+                the socket directory is not private to the current user
+        """
+        os.makedirs(self.path.parent, mode=0o700, exist_ok=True)
+        try:
+            check_socket_dir(self.path.parent)
+        except DaemonError as e:
+            raise RuntimeError(str(e)) from None
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+            except OSError:
+                self.path.unlink()
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        listener.listen()
+        listener.setblocking(False)
+        self.selector.register(listener, selectors.EVENT_READ)
+        self._listener = listener
+
+    def serve_forever(self) -> None:
+        """Handle requests until ``shutdown`` is requested or interrupted."""
+        if self._listener is None:
+            self.bind()
+        try:
+            while not self._stopping:
+                self.serve_once(timeout=1.0)
+        finally:
+            self.close()
+
+    def serve_once(self, timeout: float | None = None) -> None:
+        """Wait for socket activity and handle everything that is ready.
+
+        Requests read in one pass are applied together under the repository
+        lock and saved once; their responses are sent after the save.
+        """
+        events = self.selector.select(timeout)
+        if not events:
+            return
+
+        replies: list[tuple[socket.socket, list[dict]]] = []
+        with self.repository.lock():
+            if self.task_manager.loaded and self.repository.has_changed():
+                self.task_manager.reload()
+            for key, _ in events:
+                if key.fileobj is self._listener:
+                    self._accept()
+                else:
+                    replies.append((key.fileobj, self._read_requests(key.fileobj)))
+            try:
+                self.buffer.flush(self.task_manager.data)
+            except ConcurrentModificationError:
+                self.task_manager.reload()
+                replies = [
+                    (conn, [self._as_conflict(response) for response in responses])
+                    for conn, responses in replies
+                ]
+
+        for conn, responses in replies:
+            self._send(conn, responses)
+
+    def close(self) -> None:
+        """Save outstanding changes and remove the socket."""
+        if self.task_manager.loaded:
+            with self.repository.lock():
+                self.buffer.flush(self.task_manager.data)
+        for conn in list(self._buffers):
+            self._disconnect(conn)
+        if self._listener is not None:
+            self.selector.unregister(self._listener)
+            self._listener.close()
+            self._listener = None
+            self.path.unlink(missing_ok=True)
+        self.selector.close()
+
+    def handle(self, request: Any) -> dict | None:
+        """Handle one decoded JSON-RPC request and return its response.
+
+        Notifications (requests without an id) get no response.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(
+                request.get("method"), str
+            ):
+                raise RequestError(INVALID_REQUEST, "Invalid request")
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RequestError(
+                    METHOD_NOT_FOUND, f"Unknown method: {request['method']}"
+                )
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "Params must be an object")
+            try:
+                result = method(**params)
+            except (TypeError, ValueError) as e:
+                raise RequestError(INVALID_PARAMS, str(e)) from e
+        except RequestError as e:
+            response = {"error": {"code": e.code, "message": str(e)}}
+        else:
+            if "id" not in request:
+                return None
+            response = {"result": result}
+            if request["method"] in MUTATING_METHODS:
+                response["mutating"] = True
+        return {"jsonrpc": "2.0", "id": request_id} | response
+
+    def _accept(self) -> None:
+        conn, _ = self._listener.accept()
+        conn.settimeout(SEND_TIMEOUT)
+        self._buffers[conn] = b""
+        self.selector.register(conn, selectors.EVENT_READ)
+
+    def _read_requests(self, conn: socket.socket) -> list[dict]:
+        try:
+            data = conn.recv(READ_SIZE)
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(conn)
+            return []
+
+        *lines, self._buffers[conn] = (self._buffers[conn] + data).split(b"\n")
+        responses = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {"code": PARSE_ERROR, "message": "Parse error"},
+                }
+            else:
+                response = self.handle(request)
+            if response is not None:
+                responses.append(response)
+        return responses
+
+    def _as_conflict(self, response: dict) -> dict:
+        if not response.pop("mutating", False):
+            return response
+        return {
+            "jsonrpc": "2.0",
+            "id": response["id"],
+            "error": {
+                "code": CONFLICT,
+                "message": "Task file was modified by another process; retry",
+            },
+        }
+
+    def _send(self, conn: socket.socket, responses: list[dict]) -> None:
+        if not responses or conn not in self._buffers:
+            return
+        for response in responses:
+            response.pop("mutating", None)
+        payload = b"".join(
+            json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n"
+            for response in responses
+        )
+        try:
+            conn.sendall(payload)
+        except OSError:
+            self._disconnect(conn)
+
+    def _disconnect(self, conn: socket.socket) -> None:
+        self.selector.unregister(conn)
+        del self._buffers[conn]
+        conn.close()
+
+    def _add(self, description: str) -> dict:
+        if not description.strip():
+            raise ValueError("Task description cannot be empty")
+        return task_to_dict(self.task_manager.add_task(description))
+
+    def _add_many(self, descriptions: list[str]) -> list[dict]:
+        if any(not description.strip() for description in descriptions):
+            raise ValueError("Task descriptions cannot be empty")
+        return [task_to_dict(task) for task in self.task_manager.add_many(descriptions)]
+
+    def _complete(self, ids: list[int]) -> dict[int, bool]:
+        return self.task_manager.complete_many(_task_ids(ids))
+
+    def _pending(self, ids: list[int]) -> dict[int, bool]:
+        return self.task_manager.pending_many(_task_ids(ids))
+
+    def _delete(self, ids: list[int]) -> dict[int, dict | None]:
+        return {
+            task_id: task_to_dict(task) if task else None
+            for task_id, task in self.task_manager.delete_many(_task_ids(ids)).items()
+        }
+
+    def _get(self, id: int) -> dict | None:  # pylint: disable=redefined-builtin
+        task = self.task_manager.get_task(_task_ids([id])[0])
+        return task_to_dict(task) if task else None
+
+    def _list(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> list[dict]:
+        tasks = self.task_manager.iter_tasks(completed, offset, limit)
+        return [task_to_dict(task) for task in tasks]
+
+    def _count(self, completed: bool | None = None) -> int:
+        return self.task_manager.count_tasks(completed)
+
+    def _query(self, **params) -> list[dict]:
+        tasks = self.task_manager.query_tasks(TaskQuery.from_params(params))
+        return [task_to_dict(task) for task in tasks]
+
+    def _count_matching(self, **params) -> int:
+        return self.task_manager.count_matching(TaskQuery.from_params(params))
+
+    def _shutdown(self) -> str:
+        self._stopping = True
+        return "ok"
+
+
+def _task_ids(ids: list) -> list[int]:
+    if not isinstance(ids, list) or not all(
+        isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in ids
+    ):
+        raise ValueError("Task ids must be a list of integers")
+    return ids
+
+
+def serve(repository: TaskRepository, path: str | Path | None = None) -> None:
+    """Run a daemon for ``repository`` in the foreground."""
+    server = TaskServer(repository, path)
+    try:
+        server.bind()
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    server.task_manager.data  # pylint: disable=pointless-statement
+    print(f"Serving {repository.file_path} on {server.path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,170 @@
+"""Summary statistics kept alongside the tasks they describe.
+
+``TaskStats`` holds task counts and three histograms: completions per day,
+pending tasks per day they were created, and completed tasks per whole days
+they took. Adding or removing a task updates them in O(1), so they can be
+kept up to date on every change and saved with the tasks; throughput and
+age percentiles are then derived from the histograms without reading a
+single task.
+"""
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+from math import ceil
+
+from tuido.task import Task
+
+PERCENTILES = (50, 90, 99)
+
+
+def _count(histogram: dict[str, int], key: str, change: int) -> None:
+    count = histogram.get(key, 0) + change
+    if count:
+        histogram[key] = count
+    else:
+        del histogram[key]
+
+
+def percentiles(histogram: dict[int, int]) -> dict[str, int | None]:
+    """Return the 50th, 90th and 99th percentile and maximum of a histogram.
+
+    Percentiles use the nearest-rank method, so they are always values
+    that occur. All of them are None for an empty histogram.
+    """
+    total = sum(histogram.values())
+    points = {f"p{point}": ceil(point / 100 * total) for point in PERCENTILES}
+    result: dict[str, int | None] = dict.fromkeys([*points, "max"])
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        for name, rank in points.items():
+            if result[name] is None and seen >= rank:
+                result[name] = value
+        result["max"] = value
+    return result
+
+
+class TaskStats:
+    """Task counts and histograms, updated one task at a time.
+
+    Days are the local calendar dates of the task timestamps, as ISO
+    strings so that the histograms can be saved as JSON objects.
+    """
+
+    def __init__(
+        self,
+        pending: int = 0,
+        completed: int = 0,
+        completed_per_day: dict[str, int] | None = None,
+        pending_per_day: dict[str, int] | None = None,
+        lead_time_days: dict[str, int] | None = None,
+    ) -> None:
+        self.pending = pending
+        self.completed = completed
+        self.completed_per_day = completed_per_day or {}
+        self.pending_per_day = pending_per_day or {}
+        self.lead_time_days = lead_time_days or {}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> "TaskStats":
+        """Compute the stats of some tasks from scratch."""
+        stats = cls()
+        for task in tasks:
+            stats.add(task)
+        return stats
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskStats":
+        """Rebuild stats saved with ``to_dict``.
+
+        Raises ValueError if ``data`` is not laid out as ``to_dict`` writes.
+        """
+        try:
+            return cls(
+                int(data["pending"]),
+                int(data["completed"]),
+                dict(data["completed_per_day"]),
+                dict(data["pending_per_day"]),
+                dict(data["lead_time_days"]),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid task stats: {e}") from None
+
+    def to_dict(self) -> dict:
+        """Return the stats as a JSON-serializable dict with sorted histograms."""
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "completed_per_day": dict(sorted(self.completed_per_day.items())),
+            "pending_per_day": dict(sorted(self.pending_per_day.items())),
+            "lead_time_days": dict(
+                sorted(self.lead_time_days.items(), key=lambda item: int(item[0]))
+            ),
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TaskStats):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"TaskStats({self.to_dict()!r})"
+
+    @property
+    def total(self) -> int:
+        """The number of tasks."""
+        return self.pending + self.completed
+
+    def add(self, task: Task) -> None:
+        """Count a task as it is now."""
+        self._change(task, 1)
+
+    def remove(self, task: Task) -> None:
+        """Stop counting a task, which must be as it was when it was added."""
+        self._change(task, -1)
+
+    def _change(self, task: Task, change: int) -> None:
+        created_at, completed_at = task.created_at, task.completed_at
+        if completed_at is None:
+            self.pending += change
+            _count(self.pending_per_day, created_at.date().isoformat(), change)
+        else:
+            self.completed += change
+            _count(self.completed_per_day, completed_at.date().isoformat(), change)
+            days = max((completed_at - created_at).days, 0)
+            _count(self.lead_time_days, str(days), change)
+
+    def completions(self, days: int, today: date | None = None) -> dict[str, int]:
+        """Return the completions on each of the last ``days`` days, oldest first."""
+        today = today or date.today()
+        keys = ((today - timedelta(days=back)).isoformat() for back in range(days))
+        return {key: self.completed_per_day.get(key, 0) for key in reversed(list(keys))}
+
+    def pending_age(self, today: date | None = None) -> dict[str, int | None]:
+        """Return percentiles of how many days ago pending tasks were created."""
+        today = today or date.today()
+        ages: dict[int, int] = {}
+        for day, count in self.pending_per_day.items():
+            age = max((today - date.fromisoformat(day)).days, 0)
+            ages[age] = ages.get(age, 0) + count
+        return percentiles(ages)
+
+    def lead_time(self) -> dict[str, int | None]:
+        """Return percentiles of how many days completed tasks took."""
+        return percentiles(
+            {int(days): count for days, count in self.lead_time_days.items()}
+        )
+
+    def summary(self, days: int = 7, today: date | None = None) -> dict:
+        """Return what ``tuido stats`` reports, as a JSON-serializable dict."""
+        completions = self.completions(days, today)
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "total": self.total,
+            "days": days,
+            "completed_per_day": completions,
+            "throughput_per_day": round(sum(completions.values()) / days, 2),
+            "pending_age_days": self.pending_age(today),
+            "lead_time_days": self.lead_time(),
+        }
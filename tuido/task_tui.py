@@ -0,0 +1,381 @@
+"""The ``tuido tui`` full-screen task browser.
+
+The task file is loaded once into a TaskManager. Only the rows that fit on
+the screen are formatted and drawn, so moving through 100k tasks costs the
+same as moving through ten. Edits are applied in memory and collected in a
+DeferredRepository; a worker thread saves them once the keyboard has been
+idle for a moment, so a burst of keypresses is written with one save.
+"""
+
+import curses
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+from tuido.deferred_repository import DeferredRepository
+from tuido.task import Task
+from tuido.task_manager import TaskManager
+from tuido.task_repository import ConcurrentModificationError, TaskRepository
+
+DEFAULT_SAVE_DELAY = 1.0
+# How often the screen checks for finished saves and outside changes.
+POLL_INTERVAL_MS = 250
+
+HELP = (
+    "j/k move  space done/undo  a add  d delete  p pending only  "
+    "g/G top/bottom  s save  q quit"
+)
+
+
+class TaskBrowser:
+    """The rows, cursor and scroll position of the browser.
+
+    Rows are the loaded tasks in id order, or only the pending ones. The
+    browser keeps no per-row state beyond the list of tasks, and formats a
+    row only when it is asked for the visible ones.
+    """
+
+    def __init__(
+        self,
+        task_manager: TaskManager,
+        lock: "threading.Lock | None" = None,
+        pending_only: bool = False,
+    ) -> None:
+        self.task_manager = task_manager
+        self.lock = lock or threading.Lock()
+        self.pending_only = pending_only
+        self.rows: list[Task] = []
+        self.cursor = 0
+        self.top = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the rows from the loaded tasks, keeping the cursor's task."""
+        current = self.current
+        with self.lock:
+            self.rows = list(
+                self.task_manager.data.tasks.view(False if self.pending_only else None)
+            )
+        if current is not None:
+            self.select(current.id)
+        self.cursor = min(self.cursor, max(len(self.rows) - 1, 0))
+
+    @property
+    def current(self) -> Task | None:
+        """The task under the cursor."""
+        return self.rows[self.cursor] if self.rows else None
+
+    def counts(self) -> tuple[int, int]:
+        """Return the number of pending and completed tasks."""
+        tasks = self.task_manager.data.tasks
+        return len(tasks.view(False)), len(tasks.view(True))
+
+    def select(self, task_id: int) -> None:
+        """Move the cursor to a task, or to where it would be."""
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self.rows[middle].id < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        self.cursor = min(low, max(len(self.rows) - 1, 0))
+
+    def move(self, offset: int) -> None:
+        """Move the cursor by ``offset`` rows, stopping at either end."""
+        self.cursor = max(0, min(self.cursor + offset, len(self.rows) - 1))
+
+    def visible(self, height: int) -> list[Task]:
+        """Scroll so the cursor is on screen and return the rows to draw."""
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + height:
+            self.top = self.cursor - height + 1
+        self.top = max(0, min(self.top, len(self.rows) - height))
+        return self.rows[self.top : self.top + height]
+
+    def toggle(self) -> str:
+        """Complete the task under the cursor, or mark it pending again."""
+        task = self.current
+        if task is None:
+            return ""
+        with self.lock:
+            if task.is_complete():
+                self.task_manager.set_task_pending(task.id)
+                return f"Task {task.id} marked pending."
+            self.task_manager.set_task_complete(task.id)
+            if self.pending_only:
+                del self.rows[self.cursor]
+                self.move(0)
+        return f"Task {task.id} marked as complete."
+
+    def delete(self) -> str:
+        """Delete the task under the cursor."""
+        task = self.current
+        if task is None:
+            return ""
+        with self.lock:
+            self.task_manager.delete_task(task.id)
+            del self.rows[self.cursor]
+        self.move(0)
+        return f"Deleted task {task.id}."
+
+    def add(self, description: str) -> str:
+        """Add a task and move the cursor to it."""
+        description = description.strip()
+        if not description:
+            return "Task description cannot be empty."
+        with self.lock:
+            task = self.task_manager.add_task(description)
+            self.rows.append(task)
+        self.cursor = len(self.rows) - 1
+        return f"Added task {task.id}."
+
+    def toggle_filter(self) -> str:
+        """Switch between all tasks and pending tasks only."""
+        self.pending_only = not self.pending_only
+        self.refresh()
+        return "Showing pending tasks." if self.pending_only else "Showing all tasks."
+
+
+class DebouncedSaver:
+    """Saves deferred changes on a worker thread once edits pause.
+
+    Every ``touch`` pushes the save back by ``delay`` seconds. Saves hold
+    the browser's lock, so tasks do not change while they are written. If
+    the file was changed by another process, the tasks are reloaded and
+    ``reloaded`` is set so the screen can rebuild its rows.
+    """
+
+    def __init__(
+        self,
+        buffer: DeferredRepository,
+        task_manager: TaskManager,
+        lock: "threading.Lock",
+        delay: float = DEFAULT_SAVE_DELAY,
+    ) -> None:
+        self.buffer = buffer
+        self.task_manager = task_manager
+        self.lock = lock
+        self.delay = delay
+        self.error: str | None = None
+        self.reloaded = False
+        self._due: float | None = None
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are changes that have not been saved yet."""
+        return self.buffer.dirty
+
+    def touch(self) -> None:
+        """Schedule a save ``delay`` seconds from now."""
+        with self._condition:
+            self._due = time.monotonic() + self.delay
+            self._condition.notify()
+
+    def save(self) -> None:
+        """Write outstanding changes now."""
+        with self._condition:
+            self._due = None
+        with self.lock, self.buffer.repository.lock():
+            try:
+                self.buffer.flush(self.task_manager.data)
+                self.error = None
+            except ConcurrentModificationError:
+                self.task_manager.reload()
+                self.reloaded = True
+                self.error = "The task file was changed elsewhere; reloaded it."
+            except (OSError, SystemExit):
+                # Repositories report write errors themselves and exit.
+                self.error = "Could not save the task file."
+
+    def close(self) -> None:
+        """Stop the worker and save what is left."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        if self.pending:
+            self.save()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and (
+                    self._due is None or time.monotonic() < self._due
+                ):
+                    timeout = (
+                        None if self._due is None else self._due - time.monotonic()
+                    )
+                    self._condition.wait(timeout)
+                if self._stopping:
+                    return
+            self.save()
+
+
+class TaskTUI:
+    """Draws a TaskBrowser with curses and turns keys into actions."""
+
+    def __init__(self, browser: TaskBrowser, saver: DebouncedSaver, title: str):
+        import humanize  # pylint: disable=import-outside-toplevel
+
+        self.browser = browser
+        self.saver = saver
+        self.title = title
+        self.message = HELP
+        self._naturaltime = humanize.naturaltime
+        self.actions: dict[int, Callable[[], str | None]] = {
+            ord(" "): browser.toggle,
+            ord("x"): browser.toggle,
+            ord("d"): browser.delete,
+            curses.KEY_DC: browser.delete,
+            ord("p"): browser.toggle_filter,
+        }
+        self.moves: dict[int, Callable[[int], int]] = {
+            ord("j"): lambda height: 1,
+            curses.KEY_DOWN: lambda height: 1,
+            ord("k"): lambda height: -1,
+            curses.KEY_UP: lambda height: -1,
+            curses.KEY_NPAGE: lambda height: height,
+            curses.KEY_PPAGE: lambda height: -height,
+            ord("g"): lambda height: -len(browser.rows),
+            curses.KEY_HOME: lambda height: -len(browser.rows),
+            ord("G"): lambda height: len(browser.rows),
+            curses.KEY_END: lambda height: len(browser.rows),
+        }
+
+    def run(self, screen) -> None:
+        """Handle keys until the user quits."""
+        curses.curs_set(0)
+        screen.timeout(POLL_INTERVAL_MS)
+        while True:
+            self._poll()
+            self.draw(screen)
+            key = screen.getch()
+            if key == -1:
+                continue
+            if key in (ord("q"), 27):
+                return
+            if key == ord("a"):
+                description = self._prompt(screen, "New task: ")
+                if description is not None:
+                    self._apply(lambda: self.browser.add(description))
+            elif key == ord("s"):
+                self.saver.save()
+                self.message, self.saver.error = self.saver.error or "Saved.", None
+            elif key in self.actions:
+                self._apply(self.actions[key])
+            elif key in self.moves:
+                height = self._list_height(screen)
+                self.browser.move(self.moves[key](height))
+
+    def _apply(self, action: Callable[[], str | None]) -> None:
+        self.message = action() or self.message
+        if self.saver.pending:
+            self.saver.touch()
+
+    def _poll(self) -> None:
+        """Pick up reloads done by the saver and changes made elsewhere."""
+        repository = self.saver.buffer.repository
+        if not self.saver.pending and repository.has_changed():
+            with self.browser.lock:
+                self.browser.task_manager.reload()
+            self.saver.reloaded = True
+            self.message = "The task file was changed elsewhere; reloaded it."
+        if self.saver.reloaded:
+            self.saver.reloaded = False
+            self.browser.refresh()
+        if self.saver.error:
+            self.message, self.saver.error = self.saver.error, None
+
+    @staticmethod
+    def _list_height(screen) -> int:
+        return max(screen.getmaxyx()[0] - 2, 1)
+
+    def format_row(self, task: Task, width: int, now: datetime) -> str:
+        """Format one task to fit ``width`` columns."""
+        if task.completed_at is not None:
+            mark = "[x]"
+            when = "completed " + self._naturaltime(task.completed_at, when=now)
+        else:
+            mark = "[ ]"
+            when = "added " + self._naturaltime(task.created_at, when=now)
+        line = f"{mark} {task.id:>6}  {task.description}"
+        room = width - len(when) - 2
+        if len(line) > room:
+            line = line[: max(room - 1, 0)] + "…"
+        return f"{line:<{room}}  {when}"[: width - 1]
+
+    def draw(self, screen) -> None:
+        """Draw the header, the visible rows and the status line."""
+        height, width = screen.getmaxyx()
+        screen.erase()
+        pending, completed = self.browser.counts()
+        state = "saving…" if self.saver.pending else "saved"
+        header = (
+            f" TuiDo  {self.title}  {pending} pending, {completed} completed"
+            f"{'  (pending only)' if self.browser.pending_only else ''}  [{state}]"
+        )
+        screen.addnstr(0, 0, header.ljust(width), width - 1, curses.A_REVERSE)
+
+        now = datetime.now()
+        rows = self.browser.visible(self._list_height(screen))
+        for line, task in enumerate(rows, start=1):
+            attributes = curses.A_DIM if task.completed_at is not None else 0
+            if line - 1 + self.browser.top == self.browser.cursor:
+                attributes |= curses.A_REVERSE
+            screen.addnstr(
+                line, 0, self.format_row(task, width, now), width - 1, attributes
+            )
+        if not rows:
+            screen.addnstr(1, 0, "No tasks. Press 'a' to add one.", width - 1)
+        screen.addnstr(height - 1, 0, self.message, width - 1, curses.A_BOLD)
+        screen.refresh()
+
+    def _prompt(self, screen, label: str) -> str | None:
+        """Read a line of text on the status line; None if cancelled."""
+        height, width = screen.getmaxyx()
+        text = ""
+        screen.timeout(-1)
+        curses.curs_set(1)
+        try:
+            while True:
+                screen.move(height - 1, 0)
+                screen.clrtoeol()
+                screen.addnstr(height - 1, 0, label + text, width - 1)
+                key = screen.get_wch()
+                if key in ("\n", "\r", curses.KEY_ENTER):
+                    return text
+                if key == "\x1b":
+                    return None
+                if key in ("\b", "\x7f", curses.KEY_BACKSPACE):
+                    text = text[:-1]
+                elif isinstance(key, str) and key.isprintable():
+                    text += key
+        finally:
+            curses.curs_set(0)
+            screen.timeout(POLL_INTERVAL_MS)
+
+
+def run_tui(
+    repository: TaskRepository,
+    pending_only: bool = False,
+    save_delay: float = DEFAULT_SAVE_DELAY,
+) -> None:
+    """Load the tasks once and browse them full-screen until the user quits."""
+    buffer = DeferredRepository(repository)
+    task_manager = TaskManager(buffer)
+    with repository.lock():
+        task_manager.data  # pylint: disable=pointless-statement
+    lock = threading.Lock()
+    browser = TaskBrowser(task_manager, lock, pending_only)
+    saver = DebouncedSaver(buffer, task_manager, lock, save_delay)
+    try:
+        curses.wrapper(TaskTUI(browser, saver, str(repository.file_path)).run)
+    finally:
+        saver.close()
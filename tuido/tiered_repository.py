@@ -0,0 +1,110 @@
+"""A repository that reads a task file together with its archive."""
+
+import heapq
+from operator import attrgetter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from tuido.task import Task
+from tuido.task_archive import TaskArchive
+from tuido.task_data import TaskData, TaskDelta
+from tuido.task_query import TaskQuery
+from tuido.task_repository import TaskRepository
+
+
+def _unique(tasks: Iterable[Task]) -> Iterator[Task]:
+    """Drop tasks whose id repeats the one before, keeping the first."""
+    last_id = None
+    for task in tasks:
+        if task.id != last_id:
+            last_id = task.id
+            yield task
+
+
+class TieredTaskRepository(TaskRepository):
+    """Answers reads from the task file and its archive, merged by id.
+
+    Loading and saving only touch the task file: the archive is changed by
+    ``TaskManager.archive_completed``. A task found in both tiers, which
+    can only happen if archiving was interrupted, is read from the task
+    file.
+    """
+
+    # Reads must go through query_tasks to reach the archive.
+    indexed = True
+
+    def __init__(self, repository: TaskRepository, archive: TaskArchive) -> None:
+        self.repository = repository
+        self.archive = archive
+
+    @property
+    def file_path(self) -> Path:  # type: ignore[override]
+        """The task file."""
+        return self.repository.file_path
+
+    @property
+    def stores_links(self) -> bool:  # type: ignore[override]
+        """Whether the task file saves task links."""
+        return self.repository.stores_links
+
+    def storage_paths(self) -> list[Path]:
+        """The files of the wrapped repository."""
+        return self.repository.storage_paths()
+
+    def lock(self):
+        """Return the wrapped repository's lock."""
+        return self.repository.lock()
+
+    def has_changed(self) -> bool:
+        """Whether the task file changed since it was loaded or saved."""
+        return self.repository.has_changed()
+
+    def load_data(self) -> TaskData:
+        """Load the tasks in the task file."""
+        return self.repository.load_data()
+
+    def save_data(self, tasks: TaskData) -> None:
+        """Save the tasks to the task file."""
+        self.repository.save_data(tasks)
+
+    def save_changes(self, tasks: TaskData, delta: TaskDelta) -> None:
+        """Save changes to the task file."""
+        self.repository.save_changes(tasks, delta)
+
+    def iter_tasks(
+        self, completed: bool | None = None, offset: int = 0, limit: int | None = None
+    ) -> Iterator[Task]:
+        """Iterate over tasks from both tiers in id order."""
+        return self.query_tasks(TaskQuery(completed, offset=offset, limit=limit))
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Run a query against both tiers and merge the results."""
+        limit = None
+        if query.sorted_by_id and query.limit is not None:
+            limit = query.offset + query.limit
+        by_id = query._replace(sort="id", offset=0, limit=limit)
+        tasks = heapq.merge(
+            self.repository.query_tasks(by_id),
+            self.archive.query_tasks(by_id),
+            key=attrgetter("id"),
+        )
+        return query.order_and_page(_unique(tasks))
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching tasks in both tiers, a task found in both once."""
+        archived = self.archive.matching_ids(query)
+        if not archived:
+            return self.repository.count_matching(query)
+        by_id = query._replace(sort="id", offset=0, limit=None)
+        return len(archived) + sum(
+            1 for task in self.repository.query_tasks(by_id) if task.id not in archived
+        )
+
+    def count_tasks(self, completed: bool | None = None) -> int:
+        """Count tasks in both tiers."""
+        return self.count_matching(TaskQuery(completed))
+
+    def get_task(self, task_id: int) -> Task | None:
+        """Look a task up in the task file, then in the archive."""
+        task = self.repository.get_task(task_id)
+        return task if task is not None else self.archive.get_task(task_id)
@@ -0,0 +1,216 @@
+"""Workspaces: task files that are listed and searched together.
+
+A workspace is a directory of task files, or a glob pattern matching them.
+Its catalog, ``.tuido-catalog.json`` in the directory (or in the fixed part
+of the pattern), records for every file the signature of its storage, its
+task counts and each task's id, description and timestamps. Listing or
+searching the workspace only parses the files whose signature changed
+since the catalog was written, optionally in a pool of processes.
+"""
+
+import glob
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from tuido.atomic_file import write_atomically
+from tuido.json_codec import get_codec
+from tuido.json_task_repository import dict_to_task, task_to_dict
+from tuido.repository_factory import BACKEND_EXTENSIONS, create_repository
+from tuido.search_index import SearchIndex, SearchResult, tokenize
+from tuido.task import Task
+from tuido.task_query import TaskQuery
+from tuido.task_repository import file_signature, resolve_path
+
+CATALOG_NAME = ".tuido-catalog.json"
+CATALOG_FORMAT = 2
+
+# A directory, or a glob pattern, used by --all-files instead of the
+# directory of the task file.
+WORKSPACE_VARIABLE = "TUIDO_WORKSPACE"
+
+
+def storage_signature(path: Path) -> list:
+    """Return the signature of every file holding a task file's tasks."""
+    return [
+        None if signature is None else list(signature)
+        for signature in map(file_signature, create_repository(path).storage_paths())
+    ]
+
+
+def scan_file(path: str) -> dict:
+    """Read a task file into a catalog entry.
+
+    The signature is taken before reading, so a write that races with the
+    read leaves the entry stale rather than wrongly current. A file that
+    cannot be read gets an entry with the error instead of tasks.
+    """
+    signature = storage_signature(Path(path))
+    repository = create_repository(path)
+    try:
+        data = repository.load_data()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return {"signature": signature, "error": str(e) or type(e).__name__}
+    finally:
+        close = getattr(repository, "close", None)
+        if close is not None:
+            close()
+    tasks = data.tasks
+    return {
+        "signature": signature,
+        "pending": len(tasks.view(False)),
+        "completed": len(tasks.view(True)),
+        "tasks": [task_to_dict(task) for task in tasks],
+    }
+
+
+class CatalogFile:
+    """The cataloged tasks of one file.
+
+    It answers the same count and query calls as TaskManager, so a file
+    can be listed without being loaded.
+    """
+
+    def __init__(self, path: Path, entry: dict) -> None:
+        self.path = path
+        self.error: str | None = entry.get("error")
+        self.pending: int = entry.get("pending", 0)
+        self.completed: int = entry.get("completed", 0)
+        self.tasks: list[dict] = entry.get("tasks", [])
+
+    def count_matching(self, query: TaskQuery) -> int:
+        """Count matching tasks, ignoring the query's paging."""
+        if not query.filtered:
+            if query.completed is None:
+                return self.pending + self.completed
+            return self.completed if query.completed else self.pending
+        return sum(1 for _ in filter(query.dict_filter(), self.tasks))
+
+    def query_tasks(self, query: TaskQuery) -> Iterator[Task]:
+        """Iterate over the tasks matching a query."""
+        tasks = self.tasks
+        if query.completed is not None or query.filtered:
+            tasks = filter(query.dict_filter(), tasks)
+        return query.order_and_page(map(dict_to_task, tasks))
+
+    def search(self, text: str, limit: int | None = None) -> list[SearchResult]:
+        """Find tasks by words in their description, as SearchIndex does.
+
+        Only tasks whose description contains every query word are
+        indexed, so the index built for a search stays small.
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+        index = SearchIndex([self.path])
+        for item in self.tasks:
+            description = item["description"]
+            folded = description.casefold()
+            if all(word in folded for word in words):
+                index.add(item["id"], description, item["completed_at"] is not None)
+        return index.search(text, limit)
+
+
+def search_files(
+    files: list[CatalogFile], text: str, limit: int | None = None
+) -> list[tuple[CatalogFile, SearchResult]]:
+    """Search several files and merge their results, best first."""
+    results = [
+        [(file, result) for result in file.search(text, limit)]
+        for file in files
+        if file.error is None
+    ]
+    best = heapq.merge(*results, key=lambda item: (-item[1].score, str(item[0].path)))
+    return list(islice(best, limit))
+
+
+class Workspace:
+    """A set of task files with a shared catalog."""
+
+    def __init__(self, spec: str | Path) -> None:
+        spec = os.path.expanduser(str(spec))
+        if glob.has_magic(spec):
+            self.pattern: str | None = spec
+            fixed: list[str] = []
+            for part in Path(spec).parts[:-1]:
+                if glob.has_magic(part):
+                    break
+                fixed.append(part)
+            self.root = resolve_path(Path(*fixed) if fixed else Path("."))
+        else:
+            self.pattern = None
+            self.root = resolve_path(spec)
+        self.catalog_path = self.root / CATALOG_NAME
+
+    def task_files(self) -> list[Path]:
+        """Return the workspace's task files, sorted by path.
+
+        In a directory, these are the visible files whose extension belongs
+        to a storage backend; a pattern picks its files itself.
+        """
+        if self.pattern is not None:
+            paths = (Path(path) for path in glob.glob(self.pattern, recursive=True))
+        elif self.root.is_dir():
+            paths = (
+                path
+                for path in self.root.iterdir()
+                if path.suffix.lower() in BACKEND_EXTENSIONS
+                and not path.name.startswith(".")
+            )
+        else:
+            paths = iter(())
+        return sorted(
+            resolve_path(path)
+            for path in paths
+            if path.is_file() and path.name != CATALOG_NAME
+        )
+
+    def refresh(self, jobs: int = 1) -> list[CatalogFile]:
+        """Bring the catalog up to date and return its files.
+
+        Files whose storage signature changed are parsed again, in ``jobs``
+        processes when there are several of them, and the catalog is saved
+        if anything changed. Entries of files that no longer exist are
+        dropped; other files stay cataloged, since another pattern may share
+        the catalog.
+        """
+        catalog = self._load()
+        paths = self.task_files()
+        stale = [
+            path
+            for path in paths
+            if catalog.get(str(path), {}).get("signature") != storage_signature(path)
+        ]
+        if jobs > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(min(jobs, len(stale))) as pool:
+                entries = list(pool.map(scan_file, map(str, stale)))
+        else:
+            entries = [scan_file(str(path)) for path in stale]
+        catalog.update(zip(map(str, stale), entries))
+
+        missing = [name for name in catalog if not os.path.exists(name)]
+        for name in missing:
+            del catalog[name]
+        if stale or missing:
+            self._save(catalog)
+        return [CatalogFile(path, catalog[str(path)]) for path in paths]
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            document = self.catalog_path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        try:
+            data = get_codec(size=len(document)).loads(document)
+        except ValueError:
+            return {}
+        if data.get("format") != CATALOG_FORMAT:
+            return {}
+        return data.get("files", {})
+
+    def _save(self, catalog: dict[str, dict]) -> None:
+        document = {"format": CATALOG_FORMAT, "files": catalog}
+        write_atomically(self.catalog_path, get_codec().dumps(document))